@@ -0,0 +1,63 @@
+"""Hourly audit-log and payment rollups for worker analytics.
+
+Revision ID: 20260601_stats_rollups
+Revises: 20260531_messaging_core, 20260531_offer_channels_jsonb
+Create Date: 2026-06-01 09:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260601_stats_rollups"
+down_revision: str | Sequence[str] | None = (
+    "20260531_messaging_core",
+    "20260531_offer_channels_jsonb",
+)
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_log_hourly_rollups",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("new_users", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("churned_users", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("admin_ops", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("bucket_start"),
+    )
+    op.create_table(
+        "payment_hourly_rollups",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("currency", sa.String(length=10), nullable=False),
+        sa.Column("provider", sa.String(length=20), nullable=False),
+        sa.Column("plan_name", sa.String(length=120), nullable=False),
+        sa.Column("payment_count", sa.Integer(), nullable=False),
+        sa.Column("amount_total", sa.Numeric(20, 8), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("bucket_start", "currency", "provider", "plan_name"),
+    )
+    op.create_table(
+        "stats_rollup_watermarks",
+        sa.Column("rollup_name", sa.String(length=40), nullable=False),
+        sa.Column("watermark_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("rollup_name"),
+    )
+    # Payments change status after creation, so their rollup is refreshed from updated_at
+    # and the touched hours are re-aggregated by created_at.
+    op.create_index("ix_payments_updated_at", "payments", ["updated_at"])
+    op.create_index("ix_payments_created_at", "payments", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_created_at", table_name="payments")
+    op.drop_index("ix_payments_updated_at", table_name="payments")
+    op.drop_table("stats_rollup_watermarks")
+    op.drop_table("payment_hourly_rollups")
+    op.drop_table("audit_log_hourly_rollups")
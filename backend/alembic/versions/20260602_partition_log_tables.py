@@ -0,0 +1,137 @@
+"""Range-partition audit_logs and webhook_logs by created_at.
+
+Retention then drops whole partitions instead of running mass DELETEs. The existing
+table is kept in place as the ``*_legacy`` partition covering everything up to the
+next period boundary, so no rows are copied; the task worker's partition manager
+creates later partitions ahead of time and drops expired ones. A ``*_default``
+partition catches rows outside every range, so inserts keep working if the
+partition manager falls behind.
+
+The attach is prepared without blocking writers: the unique index matching the
+new primary key is built ``CONCURRENTLY``, and the legacy rows are proven to fit
+the partition bound by a ``NOT VALID`` check validated before ``ATTACH``, which
+then skips its own full scan under the exclusive lock.
+
+Revision ID: 20260602_partition_log_tables
+Revises: 20260601_stats_rollups
+Create Date: 2026-06-02 09:00:00.000000
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260602_partition_log_tables"
+down_revision: str | Sequence[str] | None = "20260601_stats_rollups"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Partitions created beyond the legacy one; the partition manager keeps extending this.
+PARTITIONS_AHEAD = 2
+
+_TABLES: dict[str, dict] = {
+    "audit_logs": {
+        "interval": "month",
+        "indexes": {
+            "ix_audit_logs_admin_id": ["admin_id"],
+            "ix_audit_logs_action": ["action"],
+            "ix_audit_logs_entity_type": ["entity_type"],
+            "ix_audit_logs_created_at": ["created_at"],
+        },
+        "foreign_keys": {
+            "audit_logs_admin_id_fkey": ("admin_id", "admin_users", "id", "SET NULL"),
+        },
+    },
+    "webhook_logs": {
+        "interval": "day",
+        "indexes": {
+            "ix_webhook_logs_source": ["source"],
+            "ix_webhook_logs_created_at": ["created_at"],
+        },
+        "foreign_keys": {},
+    },
+}
+
+
+def _next_period(value: datetime, interval: str) -> datetime:
+    start = value.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _partition(table: str) -> None:
+    spec = _TABLES[table]
+    interval = spec["interval"]
+    legacy = f"{table}_legacy"
+    boundary = _next_period(datetime.now(UTC), interval)
+
+    # Unique index matching the new primary key, so ATTACH reuses it; built outside
+    # the migration transaction so writes to the table continue meanwhile.
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {legacy}_id_created_at_key ON {table} (id, created_at)"
+        )
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {legacy}_bound CHECK (created_at < '{boundary.isoformat()}') NOT VALID"
+    )
+    op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {legacy}_bound")
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    for name in [f"{table}_pkey", *spec["indexes"]]:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_legacy")
+
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING COMMENTS) PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)")
+    for name, columns in spec["indexes"].items():
+        op.create_index(name, table, columns)
+    for name, (column, referred_table, referred_column, ondelete) in spec["foreign_keys"].items():
+        op.create_foreign_key(name, table, referred_table, [column], [referred_column], ondelete=ondelete)
+
+    # The validated check proves the bound, so ATTACH does not scan the legacy rows.
+    op.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {legacy}_bound")
+
+    start = boundary
+    for _ in range(PARTITIONS_AHEAD):
+        end = _next_period(start, interval)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y%m%d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _unpartition(table: str) -> None:
+    spec = _TABLES[table]
+    legacy = f"{table}_legacy"
+
+    op.execute(f"ALTER TABLE {table} DETACH PARTITION {legacy}")
+    op.execute(f"INSERT INTO {legacy} SELECT * FROM {table}")  # noqa: S608 - identifiers are constants.
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"DROP INDEX IF EXISTS {legacy}_id_created_at_key")
+
+    op.execute(f"ALTER TABLE {legacy} RENAME TO {table}")
+    for name in [f"{table}_pkey", *spec["indexes"]]:
+        op.execute(f"ALTER INDEX IF EXISTS {name}_legacy RENAME TO {name}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in _TABLES:
+        _partition(table)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in _TABLES:
+        _unpartition(table)
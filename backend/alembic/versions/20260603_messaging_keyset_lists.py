@@ -0,0 +1,102 @@
+"""Keyset-pagination indexes for messaging lists and a site-notification unread counter.
+
+Conversation lists page on ``(updated_at, id)`` and notification lists on the
+delivery's ``(created_at, id)``. ``site_notification_unread_counters`` keeps one
+row per recipient and is maintained by a trigger on ``site_notification_deliveries``,
+so deliveries written by the task worker are counted too.
+
+Revision ID: 20260603_messaging_keyset_lists
+Revises: 20260602_partition_log_tables
+Create Date: 2026-06-03 09:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260603_messaging_keyset_lists"
+down_revision: str | Sequence[str] | None = "20260602_partition_log_tables"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Deliveries in 'read', 'dismissed' or 'expired' no longer count as unread.
+_COUNTER_FUNCTION = """
+CREATE OR REPLACE FUNCTION site_notification_unread_counter_sync() RETURNS trigger AS $$
+DECLARE
+    old_unread boolean := coalesce(TG_OP <> 'INSERT' AND OLD.status NOT IN ('read', 'dismissed', 'expired'), false);
+    new_unread boolean := coalesce(TG_OP <> 'DELETE' AND NEW.status NOT IN ('read', 'dismissed', 'expired'), false);
+BEGIN
+    IF TG_OP = 'UPDATE' AND old_unread = new_unread
+        AND OLD.recipient_type = NEW.recipient_type
+        AND OLD.recipient_id IS NOT DISTINCT FROM NEW.recipient_id THEN
+        RETURN NULL;
+    END IF;
+    IF old_unread THEN
+        UPDATE site_notification_unread_counters
+        SET unread_count = greatest(unread_count - 1, 0), updated_at = now()
+        WHERE recipient_type = OLD.recipient_type AND recipient_id = OLD.recipient_id;
+    END IF;
+    IF new_unread THEN
+        INSERT INTO site_notification_unread_counters (recipient_type, recipient_id, unread_count, updated_at)
+        VALUES (NEW.recipient_type, NEW.recipient_id, 1, now())
+        ON CONFLICT (recipient_type, recipient_id)
+        DO UPDATE SET unread_count = site_notification_unread_counters.unread_count + 1, updated_at = now();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messaging_conversations_customer_updated_id",
+        "messaging_conversations",
+        ["customer_account_id", "updated_at", "id"],
+    )
+    op.create_index("ix_messaging_conversations_updated_id", "messaging_conversations", ["updated_at", "id"])
+    op.create_index(
+        "ix_site_notification_deliveries_recipient_created_id",
+        "site_notification_deliveries",
+        ["recipient_type", "recipient_id", "created_at", "id"],
+    )
+
+    op.create_table(
+        "site_notification_unread_counters",
+        sa.Column("recipient_type", sa.String(length=20), nullable=False),
+        sa.Column("recipient_id", sa.Uuid(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("recipient_type", "recipient_id"),
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Take the delivery table lock first so no write lands between the backfill and the trigger.
+    op.execute("LOCK TABLE site_notification_deliveries IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(_COUNTER_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER site_notification_unread_counter_sync "
+        "AFTER INSERT OR DELETE OR UPDATE OF status, recipient_type, recipient_id "
+        "ON site_notification_deliveries "
+        "FOR EACH ROW EXECUTE FUNCTION site_notification_unread_counter_sync()"
+    )
+    op.execute(
+        "INSERT INTO site_notification_unread_counters (recipient_type, recipient_id, unread_count) "
+        "SELECT recipient_type, recipient_id, count(*) FROM site_notification_deliveries "
+        "WHERE recipient_id IS NOT NULL AND status NOT IN ('read', 'dismissed', 'expired') "
+        "GROUP BY recipient_type, recipient_id"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS site_notification_unread_counter_sync ON site_notification_deliveries")
+        op.execute("DROP FUNCTION IF EXISTS site_notification_unread_counter_sync()")
+    op.drop_table("site_notification_unread_counters")
+    op.drop_index("ix_site_notification_deliveries_recipient_created_id", table_name="site_notification_deliveries")
+    op.drop_index("ix_messaging_conversations_updated_id", table_name="messaging_conversations")
+    op.drop_index("ix_messaging_conversations_customer_updated_id", table_name="messaging_conversations")
@@ -0,0 +1,96 @@
+"""Materialized partner notification feed and per-operator counters.
+
+``partner_notification_feed_items`` stores each operator's rendered workspace
+feed with read state folded in and is paged on ``(created_at, notification_key)``.
+``partner_notification_feed_states`` keeps the maintained counters and the
+source version the feed was last synced at. Existing operators get their feed
+built on first read, so there is nothing to backfill.
+
+Revision ID: 20260604_partner_notification_feed
+Revises: 20260603_messaging_keyset_lists
+Create Date: 2026-06-04 09:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260604_partner_notification_feed"
+down_revision: str | Sequence[str] | None = "20260603_messaging_keyset_lists"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "partner_notification_feed_items",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("partner_account_id", sa.Uuid(), nullable=False),
+        sa.Column("admin_user_id", sa.Uuid(), nullable=False),
+        sa.Column("notification_key", sa.String(length=255), nullable=False),
+        sa.Column("kind", sa.String(length=80), nullable=False),
+        sa.Column("tone", sa.String(length=20), nullable=False),
+        sa.Column("route_slug", sa.String(length=255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("notes", sa.JSON(), nullable=False),
+        sa.Column("action_required", sa.Boolean(), nullable=False),
+        sa.Column("unread", sa.Boolean(), nullable=False),
+        sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("source_kind", sa.String(length=80), nullable=True),
+        sa.Column("source_id", sa.String(length=255), nullable=True),
+        sa.Column("source_event_id", sa.String(length=255), nullable=True),
+        sa.Column("source_event_kind", sa.String(length=80), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["partner_account_id"], ["partner_accounts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["admin_user_id"], ["admin_users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "partner_account_id",
+            "admin_user_id",
+            "notification_key",
+            name="uq_partner_notification_feed_item_workspace_actor_key",
+        ),
+    )
+    op.create_index(
+        "ix_partner_notification_feed_items_workspace_actor_created_key",
+        "partner_notification_feed_items",
+        ["partner_account_id", "admin_user_id", "created_at", "notification_key"],
+    )
+
+    op.create_table(
+        "partner_notification_feed_states",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("partner_account_id", sa.Uuid(), nullable=False),
+        sa.Column("admin_user_id", sa.Uuid(), nullable=False),
+        sa.Column("source_version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("synced_version", sa.Integer(), nullable=True),
+        sa.Column("source_fingerprint", sa.String(length=64), nullable=True),
+        sa.Column("total_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("action_required_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["partner_account_id"], ["partner_accounts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["admin_user_id"], ["admin_users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "partner_account_id",
+            "admin_user_id",
+            name="uq_partner_notification_feed_state_workspace_actor",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("partner_notification_feed_states")
+    op.drop_index(
+        "ix_partner_notification_feed_items_workspace_actor_created_key",
+        table_name="partner_notification_feed_items",
+    )
+    op.drop_table("partner_notification_feed_items")
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Benchmark the phase reconciliation pack builders on synthetic streaming snapshots.
+
+Generates one streaming snapshot directory per pack type (rows are written
+straight to NDJSON, so generation itself stays in bounded memory), builds each
+pack in a fresh subprocess and reports input rows per second and the peak RSS
+of that subprocess.
+
+Usage:
+    python scripts/benchmark_snapshot_packs.py --orders 200000
+    python scripts/benchmark_snapshot_packs.py --orders 50000 --packs phase7 phase8-settlement --json
+    python scripts/benchmark_snapshot_packs.py --packs phase7 phase8-settlement --engine columnar
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+_SRC_ROOT = _BACKEND_ROOT / "src"
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+if "src" not in sys.modules:
+    src_package = types.ModuleType("src")
+    src_package.__file__ = str(_SRC_ROOT / "__init__.py")
+    src_package.__path__ = [str(_SRC_ROOT)]
+    sys.modules["src"] = src_package
+
+from src.application.services.phase7_reporting_marts import REPORTING_ENGINES  # noqa: E402
+from src.application.services.snapshot_store import METADATA_FILE, write_ndjson_rows  # noqa: E402
+
+_PARTNER_COUNT = 500
+_BASE_TIMESTAMP = 1_776_000_000
+
+
+def _timestamp(offset: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(_BASE_TIMESTAMP + offset))
+
+
+def _partner(index: int) -> str:
+    return f"partner-{index % _PARTNER_COUNT}"
+
+
+def _write_metadata(directory: Path, snapshot_id: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        "metadata": {
+            "snapshot_id": snapshot_id,
+            "source": "benchmark_snapshot_packs",
+            "replay_generated_at": _timestamp(0),
+        }
+    }
+    (directory / METADATA_FILE).write_text(json.dumps(metadata), encoding="utf-8")
+
+
+def _write_table(directory: Path, name: str, rows: Iterator[dict[str, Any]]) -> int:
+    return write_ndjson_rows(directory / f"{name}.ndjson.gz", rows)
+
+
+def _generate_phase2(directory: Path, orders: int) -> int:
+    _write_metadata(directory, "benchmark-phase2")
+    # Rows are generated newest first so builders cannot rely on file order.
+    payments = (
+        {
+            "id": f"payment-{index}",
+            "status": "completed" if index % 7 else "pending",
+            "amount": "19.99",
+            "final_amount": "19.99",
+            "currency": "USD",
+            "provider": "cryptobot",
+            "user_uuid": f"user-{index % (orders // 3 + 1)}",
+            "created_at": _timestamp(index),
+        }
+        for index in range(orders - 1, -1, -1)
+    )
+    refunds = (
+        {
+            "id": f"refund-{index}",
+            "payment_id": f"payment-{index * 10}",
+            "amount": "19.99",
+            "status": "succeeded",
+            "created_at": _timestamp(index * 10 + 60),
+        }
+        for index in range(orders // 10)
+    )
+    disputes = (
+        {
+            "id": f"dispute-{index}",
+            "payment_id": f"payment-{index * 50 + 1}",
+            "amount": "19.99",
+            "outcome_class": "open",
+            "created_at": _timestamp(index * 50 + 120),
+        }
+        for index in range(orders // 50)
+    )
+    return (
+        _write_table(directory, "payments", payments)
+        + _write_table(directory, "refunds", refunds)
+        + _write_table(directory, "payment_disputes", disputes)
+    )
+
+
+def _generate_phase4(directory: Path, orders: int) -> int:
+    _write_metadata(directory, "benchmark-phase4")
+    earning_events = (
+        {
+            "id": f"event-{index}",
+            "partner_account_id": _partner(index),
+            "order_id": f"order-{index}",
+            "event_status": ("available", "on_hold", "blocked")[index % 3],
+            "total_amount": "4.00",
+            "created_at": _timestamp(index),
+        }
+        for index in range(orders - 1, -1, -1)
+    )
+    holds = (
+        {
+            "id": f"hold-{index}",
+            "earning_event_id": f"event-{index * 3 + 1}",
+            "hold_status": "active",
+            "created_at": _timestamp(index * 3 + 30),
+        }
+        for index in range(orders // 3)
+    )
+    reserves = (
+        {
+            "id": f"reserve-{index}",
+            "partner_account_id": _partner(index),
+            "source_earning_event_id": f"event-{index * 20}",
+            "reserve_scope": "partner_account" if index % 2 else "earning_event",
+            "reserve_status": "active",
+            "amount": "1.00",
+            "created_at": _timestamp(index * 20 + 40),
+        }
+        for index in range(orders // 20)
+    )
+    instructions = (
+        {
+            "id": f"instruction-{index}",
+            "partner_account_id": _partner(index),
+            "instruction_status": "approved",
+            "payout_amount": "100.00",
+            "created_at": _timestamp(index * 100),
+        }
+        for index in range(orders // 100)
+    )
+    executions = (
+        {
+            "id": f"execution-{index}",
+            "payout_instruction_id": f"instruction-{index // 2}",
+            "execution_mode": "dry_run" if index % 2 else "live",
+            "execution_status": "reconciled",
+            "created_at": _timestamp(index * 50 + 80),
+        }
+        for index in range(orders // 50)
+    )
+    return (
+        _write_table(directory, "earning_events", earning_events)
+        + _write_table(directory, "earning_holds", holds)
+        + _write_table(directory, "reserves", reserves)
+        + _write_table(directory, "payout_instructions", instructions)
+        + _write_table(directory, "payout_executions", executions)
+    )
+
+
+def _generate_phase7(directory: Path, orders: int) -> int:
+    _write_metadata(directory, "benchmark-phase7")
+    order_rows = (
+        {
+            "id": f"order-{index}",
+            "user_id": f"user-{index % (orders // 3 + 1)}",
+            "order_status": "committed",
+            "settlement_status": "paid",
+            "sale_channel": "web",
+            "currency_code": "USD",
+            "displayed_price": "19.99",
+            "commission_base_amount": "19.99",
+            "created_at": _timestamp(index),
+        }
+        for index in range(orders - 1, -1, -1)
+    )
+    attribution = (
+        {
+            "id": f"attribution-{index}",
+            "order_id": f"order-{index}",
+            "partner_account_id": _partner(index),
+            "owner_type": "affiliate",
+            "created_at": _timestamp(index + 1),
+        }
+        for index in range(orders)
+        if index % 4
+    )
+    evaluations = (
+        {
+            "id": f"evaluation-{index}",
+            "order_id": f"order-{index}",
+            "commissionability_status": "eligible",
+            "created_at": _timestamp(index + 2),
+        }
+        for index in range(orders)
+    )
+    refunds = (
+        {
+            "id": f"refund-{index}",
+            "order_id": f"order-{index * 10}",
+            "refund_status": "succeeded",
+            "created_at": _timestamp(index * 10 + 60),
+        }
+        for index in range(orders // 10)
+    )
+    earning_events = (
+        {
+            "id": f"event-{index}",
+            "partner_account_id": _partner(index),
+            "order_id": f"order-{index}",
+            "event_status": "available",
+            "total_amount": "4.00",
+            "created_at": _timestamp(index + 3),
+        }
+        for index in range(orders)
+    )
+    outbox_events = (
+        {
+            "id": f"evt-{index}",
+            "event_name": "order.committed",
+            "event_family": "order",
+            "created_at": _timestamp(index + 4),
+        }
+        for index in range(orders)
+    )
+    publications = (
+        {
+            "id": f"pub-{index}-{consumer}",
+            "outbox_event_id": f"evt-{index}",
+            "consumer_key": consumer,
+            "publication_status": "published",
+            "created_at": _timestamp(index + 5),
+        }
+        for index in range(orders)
+        for consumer in ("analytics_mart", "operational_replay")
+    )
+    return (
+        _write_table(directory, "orders", order_rows)
+        + _write_table(directory, "order_attribution_results", attribution)
+        + _write_table(directory, "commissionability_evaluations", evaluations)
+        + _write_table(directory, "refunds", refunds)
+        + _write_table(directory, "earning_events", earning_events)
+        + _write_table(directory, "outbox_events", outbox_events)
+        + _write_table(directory, "outbox_publications", publications)
+    )
+
+
+def _generate_phase8_settlement(directory: Path, orders: int) -> int:
+    _write_metadata(directory, "benchmark-phase8-settlement")
+    return _generate_phase4(directory / "phase4_snapshot", orders) + _generate_phase7(
+        directory / "analytical_snapshot", orders
+    )
+
+
+def _build(pack: str, snapshot: Any, engine: str) -> dict[str, Any]:
+    if pack == "phase2":
+        from src.application.services.phase2_reconciliation import build_phase2_reconciliation_pack
+
+        return build_phase2_reconciliation_pack(snapshot)
+    if pack == "phase4":
+        from src.application.services.phase4_reconciliation import build_phase4_settlement_reconciliation_pack
+
+        return build_phase4_settlement_reconciliation_pack(snapshot)
+    if pack == "phase7":
+        from src.application.services.phase7_reporting_marts import build_phase7_reporting_marts_pack
+
+        return build_phase7_reporting_marts_pack(snapshot, engine=engine)
+    from src.application.services.phase8_settlement_shadow import build_phase8_settlement_shadow_pack
+
+    return build_phase8_settlement_shadow_pack(snapshot, engine=engine)
+
+
+_GENERATORS: dict[str, Callable[[Path, int], int]] = {
+    "phase2": _generate_phase2,
+    "phase4": _generate_phase4,
+    "phase7": _generate_phase7,
+    "phase8-settlement": _generate_phase8_settlement,
+}
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_pack(pack: str, input_path: Path, rows: int, engine: str) -> None:
+    from src.application.services.snapshot_store import open_snapshot
+
+    started = time.perf_counter()
+    with open_snapshot(input_path) as snapshot:
+        report = _build(pack, snapshot, engine)
+        json.dumps(report, default=str)
+    elapsed = time.perf_counter() - started
+    result = {
+        "pack": pack,
+        "engine": engine,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed) if elapsed else None,
+        "peak_rss_mib": round(_peak_rss_mib(), 1),
+    }
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark phase pack builders on streaming snapshots.")
+    parser.add_argument("--orders", type=int, default=100_000, help="Orders (and order-scaled rows) per snapshot.")
+    parser.add_argument("--packs", nargs="+", choices=sorted(_GENERATORS), default=sorted(_GENERATORS))
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep generated snapshots in this directory.")
+    parser.add_argument(
+        "--engine",
+        choices=REPORTING_ENGINES,
+        default="reference",
+        help="Reporting marts engine for the phase7 and phase8-settlement packs.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per pack instead of a table.")
+    parser.add_argument("--run-pack", choices=sorted(_GENERATORS), help=argparse.SUPPRESS)
+    parser.add_argument("--input", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_pack:
+        _run_pack(args.run_pack, args.input, args.rows, args.engine)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="snapshot-bench-") as scratch:
+        workdir = args.workdir or Path(scratch)
+        results = []
+        for pack in args.packs:
+            snapshot_dir = workdir / pack
+            rows = _GENERATORS[pack](snapshot_dir, args.orders)
+            completed = subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    str(Path(__file__).resolve()),
+                    "--run-pack",
+                    pack,
+                    "--input",
+                    str(snapshot_dir),
+                    "--rows",
+                    str(rows),
+                    "--engine",
+                    args.engine,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+    print(f"{'pack':<20}{'rows':>12}{'seconds':>10}{'rows/s':>12}{'peak RSS MiB':>15}")
+    for result in results:
+        print(
+            f"{result['pack']:<20}{result['rows']:>12}{result['seconds']:>10}"
+            f"{result['rows_per_second']:>12}{result['peak_rss_mib']:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
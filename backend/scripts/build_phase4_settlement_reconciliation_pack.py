@@ -26,10 +26,6 @@ logger = logging.getLogger("build_phase4_settlement_reconciliation_pack")
 DEFAULT_OUTPUT = _BACKEND_ROOT / "docs" / "evidence" / "partner-platform" / "phase4-settlement-reconciliation-pack.json"
 
 
-def _read_snapshot(input_path: Path) -> dict:
-    return json.loads(input_path.read_text(encoding="utf-8"))
-
-
 def _write_report(report: dict, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(
@@ -40,9 +36,16 @@ def _write_report(report: dict, output_path: Path) -> None:
 
 def main() -> None:
     from src.application.services.phase4_reconciliation import build_phase4_settlement_reconciliation_pack
+    from src.application.services.snapshot_store import open_snapshot
 
     parser = argparse.ArgumentParser(description="Build the Phase 4 settlement reconciliation pack.")
-    parser.add_argument("--input", "-i", type=Path, required=True, help="Path to the settlement snapshot JSON file.")
+    parser.add_argument(
+        "--input",
+        "-i",
+        type=Path,
+        required=True,
+        help="Path to the settlement snapshot JSON file or a streaming snapshot directory.",
+    )
     parser.add_argument(
         "--output",
         "-o",
@@ -52,8 +55,8 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    snapshot = _read_snapshot(args.input)
-    report = build_phase4_settlement_reconciliation_pack(snapshot)
+    with open_snapshot(args.input) as snapshot:
+        report = build_phase4_settlement_reconciliation_pack(snapshot)
     _write_report(report, args.output)
     logger.info("Phase 4 settlement reconciliation pack written to %s", args.output)
 
@@ -26,10 +26,6 @@ logger = logging.getLogger("build_phase7_reporting_marts_pack")
 DEFAULT_OUTPUT = _BACKEND_ROOT / "docs" / "evidence" / "partner-platform" / "phase7-reporting-marts-pack.json"
 
 
-def _read_snapshot(input_path: Path) -> dict:
-    return json.loads(input_path.read_text(encoding="utf-8"))
-
-
 def _write_report(report: dict, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(
@@ -39,10 +35,17 @@ def _write_report(report: dict, output_path: Path) -> None:
 
 
 def main() -> None:
-    from src.application.services.phase7_reporting_marts import build_phase7_reporting_marts_pack
+    from src.application.services.phase7_reporting_marts import REPORTING_ENGINES, build_phase7_reporting_marts_pack
+    from src.application.services.snapshot_store import open_snapshot
 
     parser = argparse.ArgumentParser(description="Build the Phase 7 reporting marts pack.")
-    parser.add_argument("--input", "-i", type=Path, required=True, help="Path to the reporting snapshot JSON file.")
+    parser.add_argument(
+        "--input",
+        "-i",
+        type=Path,
+        required=True,
+        help="Path to the reporting snapshot JSON file or a streaming snapshot directory.",
+    )
     parser.add_argument(
         "--output",
         "-o",
@@ -50,10 +53,16 @@ def main() -> None:
         default=DEFAULT_OUTPUT,
         help=f"Output file path (default: {DEFAULT_OUTPUT})",
     )
+    parser.add_argument(
+        "--engine",
+        choices=REPORTING_ENGINES,
+        default="reference",
+        help="Reporting marts engine; 'columnar' needs the optional numpy dependency (default: reference).",
+    )
     args = parser.parse_args()
 
-    snapshot = _read_snapshot(args.input)
-    report = build_phase7_reporting_marts_pack(snapshot)
+    with open_snapshot(args.input) as snapshot:
+        report = build_phase7_reporting_marts_pack(snapshot, engine=args.engine)
     _write_report(report, args.output)
     logger.info("Phase 7 reporting marts pack written to %s", args.output)
 
@@ -19,20 +19,21 @@ if "src" not in sys.modules:
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build a deterministic Phase 8 attribution shadow pack.")
-    parser.add_argument("--input", required=True, help="Path to the input snapshot JSON.")
+    parser.add_argument("--input", required=True, help="Path to the input snapshot JSON or snapshot directory.")
     parser.add_argument("--output", required=True, help="Path to the output report JSON.")
     return parser.parse_args()
 
 
 def main() -> None:
     from src.application.services.phase8_attribution_shadow import build_phase8_attribution_shadow_pack
+    from src.application.services.snapshot_store import open_snapshot
 
     args = _parse_args()
     input_path = Path(args.input)
     output_path = Path(args.output)
 
-    snapshot = json.loads(input_path.read_text(encoding="utf-8"))
-    report = build_phase8_attribution_shadow_pack(snapshot)
+    with open_snapshot(input_path) as snapshot:
+        report = build_phase8_attribution_shadow_pack(snapshot)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
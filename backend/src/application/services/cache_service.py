@@ -26,6 +26,28 @@ class CacheService:
     async def set(self, key: str, value: Any, ttl: int = 300) -> None:
         await self._redis.set(self._key(key), json.dumps(value, default=str), ex=ttl)
 
+    @track_cache_operation("mget")
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Read ``keys`` with one ``MGET``; missing keys come back as ``None``."""
+        if not keys:
+            return []
+        values = await self._redis.mget([self._key(key) for key in keys])
+        return [None if data is None else json.loads(data) for data in values]
+
+    @track_cache_operation("mset")
+    async def set_many(self, values: dict[str, tuple[Any, int]]) -> None:
+        """Write ``{key: (value, ttl)}`` in one pipelined round trip."""
+        if not values:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, (value, ttl) in values.items():
+            pipe.set(self._key(key), json.dumps(value, default=str, separators=(",", ":")), ex=ttl)
+        await pipe.execute()
+
+    async def add(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """Set ``key`` only if it does not exist yet; returns whether it was set."""
+        return bool(await self._redis.set(self._key(key), json.dumps(value, default=str), ex=ttl, nx=True))
+
     @track_cache_operation("delete")
     async def delete(self, key: str) -> None:
         await self._redis.delete(self._key(key))
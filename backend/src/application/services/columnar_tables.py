@@ -0,0 +1,242 @@
+"""Columnar building blocks for the vectorized reporting pack engines.
+
+A snapshot table is read once into per-column lists. Joins are hash lookups on
+string keys that yield NumPy row indices, group-bys and flags run over integer
+codes, and money is carried as fixed-point int64 minor units. Whenever a value
+cannot be reproduced exactly this way, ``ColumnarFallback`` is raised so the
+caller can hand the snapshot to the row-at-a-time reference builder instead.
+"""
+
+from __future__ import annotations
+
+import gc
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from types import ModuleType
+from typing import Any
+
+from src.application.services.snapshot_store import SnapshotTable
+
+Row = dict[str, Any]
+SortKey = Callable[[Row], Any]
+
+MISSING = object()
+
+# Minor units and their sums stay clear of int64 overflow; floats are only
+# produced from integers and powers of ten that doubles hold exactly, and
+# rounded totals stay within 15 digits so a later str()/Decimal round-trip is
+# lossless.
+_MAX_INTEGER_DIGITS = 18
+_MAX_MAGNITUDE = 10**_MAX_INTEGER_DIGITS
+_MAX_SUM_MAGNITUDE = 2**62
+_MAX_EXACT_FLOAT_INTEGER = 2**53
+_MAX_EXACT_POWER_OF_TEN = 22
+_MAX_CENTS = 10**15
+
+
+class ColumnarFallback(Exception):
+    """Raised when a snapshot holds values the columnar engine cannot reproduce exactly."""
+
+
+def require_numpy() -> ModuleType:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError("The columnar reporting engine requires the 'numpy' package") from exc
+    return numpy
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Suspend the cyclic collector while large acyclic column lists are built.
+
+    Loading a table allocates millions of containers, and each allocation
+    threshold crossing triggers a collection that finds nothing to free.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class ColumnarTable:
+    """One snapshot table held as per-column lists.
+
+    The source rows are kept only by reference (a list or a streaming
+    ``SnapshotTable``) so the rare order-dependent questions, such as which of
+    several rows sharing a key sorts last, can rescan just the rows involved.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Row] | None,
+        fields: Sequence[str],
+        *,
+        sort_key: SortKey,
+        defaults: Mapping[str, Any] | None = None,
+    ) -> None:
+        if rows is None:
+            rows = []
+        self._source = rows if isinstance(rows, (list, tuple, SnapshotTable)) else list(rows)
+        self._sort_key = sort_key
+        loaded = self._source if isinstance(self._source, (list, tuple)) else list(self._scan())
+        defaults = defaults or {}
+        self.size = len(loaded)
+        self.columns = {field: _column(loaded, field, defaults.get(field)) for field in fields}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, field: str) -> list[Any]:
+        return self.columns[field]
+
+    def in_sort_order(self, indices: Iterable[int]) -> list[int]:
+        """Return ``indices`` in the order a stable sort of the whole table would visit them."""
+        wanted = set(indices)
+        if not wanted:
+            return []
+        keyed = [(self._sort_key(row), index) for index, row in enumerate(self._scan()) if index in wanted]
+        keyed.sort()
+        return [index for _, index in keyed]
+
+    def _scan(self) -> Iterable[Row]:
+        return self._source.scan() if isinstance(self._source, SnapshotTable) else self._source
+
+    def last_by_key(self, keys: list[str | None]) -> dict[str, int]:
+        """Map each non-null key to its last row in sort order, as ``rows_by_key`` over sorted rows does."""
+        positions = dict(zip(keys, range(self.size), strict=True))
+        positions.pop(None, None)  # type: ignore[call-overload]
+        if len(positions) + keys.count(None) < self.size:
+            counts = Counter(keys)
+            duplicated = (index for index, key in enumerate(keys) if key is not None and counts[key] > 1)
+            for index in self.in_sort_order(duplicated):
+                positions[keys[index]] = index  # type: ignore[index]
+        return positions  # type: ignore[return-value]
+
+
+def _column(rows: Sequence[Row], field: str, default: Any) -> list[Any]:
+    return [row.get(field, default) for row in rows]
+
+
+@dataclass(frozen=True)
+class DecimalColumn:
+    """Decimal values as ``magnitude / 10**scale``; the sign is kept apart so ``-0`` survives.
+
+    ``float_exact`` records whether every value comes back unchanged from
+    ``Decimal(str(float(value)))``, which sums over already-converted floats rely on.
+    """
+
+    magnitude: Any
+    negative: Any
+    scale: int
+    float_exact: bool
+
+    def select(self, mask: Any) -> DecimalColumn:
+        return DecimalColumn(self.magnitude[mask], self.negative[mask], self.scale, self.float_exact)
+
+
+def strings_or_none(values: Iterable[Any]) -> list[str | None]:
+    return [None if value is None else str(value) for value in values]
+
+
+def lookup(np: ModuleType, keys: Iterable[Any], positions: Mapping[Any, int]) -> Any:
+    """Row index in ``positions`` for every key, ``-1`` where the key has no row."""
+    return np.array([positions.get(key, -1) for key in keys], dtype=np.int64)
+
+
+def gather(np: ModuleType, values: Sequence[Any], indices: Any) -> Any:
+    """``values[index]`` as an object array, ``None`` wherever the index is ``-1``."""
+    column = np.empty(len(values) + 1, dtype=object)
+    column[:-1] = np.fromiter(values, dtype=object, count=len(values))
+    column[-1] = None
+    return column[indices]
+
+
+def first_truthy(np: ModuleType, *columns: Any) -> Any:
+    """Element-wise ``a or b or ...`` over object arrays (the last column is the fallback value)."""
+    result = columns[-1]
+    for column in reversed(columns[:-1]):
+        result = np.where(column.astype(bool), column, result)
+    return result
+
+
+def factorize(values: Iterable[Any]) -> tuple[list[int], list[Any]]:
+    index: dict[Any, int] = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return codes, list(index)
+
+
+def decimal_column(np: ModuleType, texts: Iterable[str]) -> DecimalColumn:
+    """``Decimal(text)`` for every text, parsed once per distinct value and spread over the column."""
+    codes, uniques = factorize(texts)
+    try:
+        values = [Decimal(text) for text in uniques]
+    except (InvalidOperation, ValueError) as exc:
+        raise ColumnarFallback("amount is not a decimal") from exc
+    if not all(value.is_finite() for value in values):
+        raise ColumnarFallback("amount is not a finite decimal")
+    parts = [value.as_tuple() for value in values]
+    scale = max([0, *(-int(part.exponent) for part in parts)])
+    if scale > _MAX_INTEGER_DIGITS or any(int(part.exponent) + scale > _MAX_INTEGER_DIGITS for part in parts):
+        raise ColumnarFallback("amount does not fit int64 minor units")
+    magnitudes = [int("".join(map(str, part.digits))) * 10 ** (int(part.exponent) + scale) for part in parts]
+    if max(magnitudes, default=0) >= _MAX_MAGNITUDE:
+        raise ColumnarFallback("amount does not fit int64 minor units")
+    column_codes = np.array(codes, dtype=np.int64)
+    return DecimalColumn(
+        magnitude=np.array(magnitudes, dtype=np.int64)[column_codes],
+        negative=np.array([value.is_signed() for value in values], dtype=bool)[column_codes],
+        scale=scale,
+        float_exact=all(Decimal(str(float(value))) == value for value in values),
+    )
+
+
+def decimal_floats(np: ModuleType, column: DecimalColumn) -> list[float]:
+    """``float(Decimal(text))`` for every value: one correctly rounded division of two exact doubles."""
+    if column.scale > _MAX_EXACT_POWER_OF_TEN or column.magnitude.max(initial=0) >= _MAX_EXACT_FLOAT_INTEGER:
+        raise ColumnarFallback("amount is not exactly representable before conversion")
+    values = column.magnitude / 10.0**column.scale
+    return np.where(column.negative, -values, values).tolist()
+
+
+def grouped_money_totals(np: ModuleType, column: DecimalColumn, codes: Any, size: int) -> list[float]:
+    """Per-group sums rounded half-even to cents, as quantizing a Decimal total does."""
+    signed = np.where(column.negative, -column.magnitude, column.magnitude)
+    if np.abs(signed).astype(np.float64).sum() >= _MAX_SUM_MAGNITUDE:
+        raise ColumnarFallback("amount total does not fit int64 minor units")
+    totals = np.zeros(size, dtype=np.int64)
+    np.add.at(totals, codes, signed)
+    return cents_to_floats(np, totals, column.scale)
+
+
+def cents_to_floats(np: ModuleType, totals: Any, scale: int) -> list[float]:
+    negative = totals < 0
+    magnitude = np.abs(totals)
+    if scale <= 2:
+        if magnitude.max(initial=0) >= _MAX_CENTS // 10 ** (2 - scale):
+            raise ColumnarFallback("amount total exceeds exact float cents")
+        cents = magnitude * 10 ** (2 - scale)
+    else:
+        divisor = 10 ** (scale - 2)
+        cents, remainder = np.divmod(magnitude, divisor)
+        twice = remainder * 2
+        cents = cents + ((twice > divisor) | ((twice == divisor) & (cents % 2 == 1)))
+        if cents.max(initial=0) >= _MAX_CENTS:
+            raise ColumnarFallback("amount total exceeds exact float cents")
+    values = cents / 100.0
+    return np.where(negative, -values, values).tolist()
+
+
+def percentages(np: ModuleType, numerators: Any, denominators: Any) -> list[float]:
+    """``numerator / denominator * 100`` rounded half-even to two places, ``0.0`` for empty denominators."""
+    safe = np.maximum(denominators, 1)
+    hundredths, remainder = np.divmod(numerators.astype(np.int64) * 10000, safe)
+    twice = remainder * 2
+    hundredths = hundredths + ((twice > safe) | ((twice == safe) & (hundredths % 2 == 1)))
+    return np.where(denominators > 0, hundredths / 100.0, 0.0).tolist()
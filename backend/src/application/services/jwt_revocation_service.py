@@ -5,9 +5,12 @@ Implements token revocation via Redis-based blocklist:
 - Revoked jti values stored in Redis with TTL matching token expiry
 - Token validation checks revocation list
 - Supports logout (single token), logout-all (all user tokens)
+- Revocations are also appended to a Redis stream so replicas can keep a
+  local revocation filter current (see ``infrastructure/cache/auth_cache.py``)
 """
 
 import logging
+import time
 import uuid
 from datetime import UTC, datetime
 
@@ -25,6 +28,10 @@ class JWTRevocationService:
     REVOKED_PREFIX = "jwt_revoked:"
     USER_TOKENS_PREFIX = "jwt_user_tokens:"
     MAX_TOKENS_PER_USER = 10  # Limit concurrent sessions
+    EVENTS_STREAM = "auth_cache_events"
+    EVENTS_STREAM_MAXLEN = 100_000
+    EVENT_REVOKED = "revoked"
+    EVENT_PRINCIPAL = "principal"
 
     def __init__(self, redis_client: redis.Redis) -> None:
         self._redis = redis_client
@@ -138,6 +145,19 @@ class JWTRevocationService:
         if ttl_seconds <= 0:
             return  # Token already expired, no need to revoke
 
+        # Announce first: if the stream write fails the revocation fails as a whole,
+        # so no replica can keep trusting a token the blocklist rejects.
+        await self._redis.xadd(
+            self.EVENTS_STREAM,
+            {
+                "kind": self.EVENT_REVOKED,
+                "jti": jti,
+                "exp": str(expires_at.timestamp()),
+                "at": str(time.time()),
+            },
+            maxlen=self.EVENTS_STREAM_MAXLEN,
+            approximate=True,
+        )
         key = f"{self.REVOKED_PREFIX}{jti}"
         await self._redis.setex(key, ttl_seconds, "revoked")
 
@@ -701,6 +701,8 @@ class MessagingService:
 
     @staticmethod
     def unread_count(conversation: MessagingConversation, own_sender_type: MessagingSenderType) -> int:
+        if own_sender_type == MessagingSenderType.CUSTOMER and conversation.customer_unread_count is not None:
+            return conversation.customer_unread_count
         read_at = None
         read_message_id = None
         for read_state in conversation.read_states:
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
+from src.application.services.snapshot_store import SnapshotTable, rows_by_key, rows_grouped_by
+
 REPORT_VERSION = "phase2-order-reconciliation-v1"
 
 BLOCKING_MISMATCH_CODES = {
@@ -41,13 +44,13 @@ class ReconciliationMismatch:
 
 def build_phase2_reconciliation_pack(snapshot: dict[str, Any]) -> dict[str, Any]:
     metadata = dict(snapshot.get("metadata") or {})
-    payments = [dict(item) for item in snapshot.get("payments", [])]
-    refunds = [dict(item) for item in snapshot.get("refunds", [])]
-    payment_disputes = [dict(item) for item in snapshot.get("payment_disputes", [])]
+    payments = _snapshot_rows(snapshot.get("payments", []))
+    refunds = _snapshot_rows(snapshot.get("refunds", []))
+    payment_disputes = _snapshot_rows(snapshot.get("payment_disputes", []))
 
-    payment_by_id = {str(payment["id"]): payment for payment in payments}
-    refunds_by_payment_id: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    disputes_by_payment_id: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    payment_by_id = rows_by_key(payments, _row_id)
+    refunds_by_payment_id = rows_grouped_by(refunds, _payment_id)
+    disputes_by_payment_id = rows_grouped_by(payment_disputes, _payment_id)
     mismatches: list[ReconciliationMismatch] = []
 
     for refund in refunds:
@@ -63,8 +66,6 @@ def build_phase2_reconciliation_pack(snapshot: dict[str, Any]) -> dict[str, Any]
                     details={"payment_id": payment_id},
                 )
             )
-            continue
-        refunds_by_payment_id[payment_id].append(refund)
 
     for dispute in payment_disputes:
         payment_id = _string_or_none(dispute.get("payment_id"))
@@ -79,8 +80,6 @@ def build_phase2_reconciliation_pack(snapshot: dict[str, Any]) -> dict[str, Any]
                     details={"payment_id": payment_id},
                 )
             )
-            continue
-        disputes_by_payment_id[payment_id].append(dispute)
 
     replayed_orders: list[dict[str, Any]] = []
     replayed_payment_attempts: list[dict[str, Any]] = []
@@ -413,6 +412,20 @@ def _string_or_none(value: Any) -> str | None:
     return str(value)
 
 
+def _snapshot_rows(rows: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+    if isinstance(rows, SnapshotTable):
+        return rows
+    return [dict(item) for item in rows]
+
+
+def _row_id(row: dict[str, Any]) -> str:
+    return str(row["id"])
+
+
+def _payment_id(row: dict[str, Any]) -> str | None:
+    return _string_or_none(row.get("payment_id"))
+
+
 def _row_sort_key(row: dict[str, Any]) -> tuple[str, str]:
     return (str(row.get("created_at") or ""), str(row.get("id") or ""))
 
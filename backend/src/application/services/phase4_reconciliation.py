@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
+from src.application.services.snapshot_store import rows_by_key, rows_grouped_by, sorted_rows
+
 REPORT_VERSION = "phase4-settlement-reconciliation-v1"
 
 BLOCKING_MISMATCH_CODES = {
@@ -63,35 +66,10 @@ def build_phase4_settlement_reconciliation_pack(snapshot: dict[str, Any]) -> dic
     reserve_by_id = _rows_by_id(reserves)
     adjustment_by_id = _rows_by_id(statement_adjustments)
     statement_by_id = _rows_by_id(partner_statements)
-    active_holds_by_event: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for hold in earning_holds:
-        if str(hold.get("hold_status")) == "active" and hold.get("earning_event_id") is not None:
-            active_holds_by_event[str(hold["earning_event_id"])].append(hold)
-
-    active_reserves_by_event: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    active_partner_reserves_by_account: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for reserve in reserves:
-        if str(reserve.get("reserve_status")) != "active":
-            continue
-        if reserve.get("source_earning_event_id") is not None:
-            active_reserves_by_event[str(reserve["source_earning_event_id"])].append(reserve)
-        if (
-            reserve.get("partner_account_id") is not None
-            and str(reserve.get("reserve_scope")) == "partner_account"
-        ):
-            active_partner_reserves_by_account[str(reserve["partner_account_id"])].append(reserve)
-
-    adjustments_by_statement: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for adjustment in statement_adjustments:
-        partner_statement_id = _string_or_none(adjustment.get("partner_statement_id"))
-        if partner_statement_id is not None:
-            adjustments_by_statement[partner_statement_id].append(adjustment)
-
-    executions_by_instruction: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for execution in payout_executions:
-        instruction_id = _string_or_none(execution.get("payout_instruction_id"))
-        if instruction_id is not None:
-            executions_by_instruction[instruction_id].append(execution)
+    active_holds_by_event = rows_grouped_by(earning_holds, _active_hold_event_id)
+    active_reserves_by_event = rows_grouped_by(reserves, _active_reserve_event_id)
+    active_partner_reserves_by_account = rows_grouped_by(reserves, _active_partner_reserve_account_id)
+    executions_by_instruction = rows_grouped_by(payout_executions, _payout_instruction_id)
 
     mismatches: list[SettlementMismatch] = []
     statement_views: list[dict[str, Any]] = []
@@ -165,9 +143,9 @@ def build_phase4_settlement_reconciliation_pack(snapshot: dict[str, Any]) -> dic
 def _build_statement_view(
     *,
     statement: dict[str, Any],
-    event_by_id: dict[str, dict[str, Any]],
-    reserve_by_id: dict[str, dict[str, Any]],
-    adjustment_by_id: dict[str, dict[str, Any]],
+    event_by_id: Mapping[str, dict[str, Any]],
+    reserve_by_id: Mapping[str, dict[str, Any]],
+    adjustment_by_id: Mapping[str, dict[str, Any]],
     mismatches: list[SettlementMismatch],
 ) -> dict[str, Any]:
     statement_id = str(statement["id"])
@@ -339,10 +317,10 @@ def _build_statement_view(
 
 def _build_payout_views(
     *,
-    payout_instructions: list[dict[str, Any]],
-    payout_executions: list[dict[str, Any]],
-    statement_by_id: dict[str, dict[str, Any]],
-    executions_by_instruction: dict[str, list[dict[str, Any]]],
+    payout_instructions: Iterable[dict[str, Any]],
+    payout_executions: Iterable[dict[str, Any]],
+    statement_by_id: Mapping[str, dict[str, Any]],
+    executions_by_instruction: Mapping[str, list[dict[str, Any]]],
     mismatches: list[SettlementMismatch],
 ) -> list[dict[str, Any]]:
     instruction_by_id = _rows_by_id(payout_instructions)
@@ -505,21 +483,15 @@ def _build_payout_views(
 
 def _build_liability_views(
     *,
-    earning_events: list[dict[str, Any]],
-    active_holds_by_event: dict[str, list[dict[str, Any]]],
-    active_reserves_by_event: dict[str, list[dict[str, Any]]],
-    active_partner_reserves_by_account: dict[str, list[dict[str, Any]]],
+    earning_events: Iterable[dict[str, Any]],
+    active_holds_by_event: Mapping[str, list[dict[str, Any]]],
+    active_reserves_by_event: Mapping[str, list[dict[str, Any]]],
+    active_partner_reserves_by_account: Mapping[str, list[dict[str, Any]]],
     statement_views: list[dict[str, Any]],
-    payout_instructions: list[dict[str, Any]],
-    payout_executions: list[dict[str, Any]],
+    payout_instructions: Iterable[dict[str, Any]],
+    payout_executions: Iterable[dict[str, Any]],
     mismatches: list[SettlementMismatch],
 ) -> list[dict[str, Any]]:
-    payout_execution_ids_by_instruction: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for execution in payout_executions:
-        instruction_id = _string_or_none(execution.get("payout_instruction_id"))
-        if instruction_id is not None:
-            payout_execution_ids_by_instruction[instruction_id].append(execution)
-
     statements_by_partner: dict[str, list[dict[str, Any]]] = defaultdict(list)
     active_statement_event_ids_by_partner: dict[str, set[str]] = defaultdict(set)
     for statement_view in statement_views:
@@ -532,17 +504,9 @@ def _build_liability_views(
                 statement_view["linked_object_ids"]["earning_event_ids"]
             )
 
-    instructions_by_partner: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for instruction in payout_instructions:
-        partner_account_id = _string_or_none(instruction.get("partner_account_id"))
-        if partner_account_id is not None:
-            instructions_by_partner[partner_account_id].append(instruction)
-
-    events_by_partner: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for event in earning_events:
-        partner_account_id = _string_or_none(event.get("partner_account_id"))
-        if partner_account_id is not None:
-            events_by_partner[partner_account_id].append(event)
+    payout_execution_ids_by_instruction = rows_grouped_by(payout_executions, _payout_instruction_id)
+    instructions_by_partner = rows_grouped_by(payout_instructions, _partner_account_id)
+    events_by_partner = rows_grouped_by(earning_events, _partner_account_id)
 
     partner_ids = sorted(
         set(events_by_partner)
@@ -726,12 +690,46 @@ def _build_liability_views(
     return liability_views
 
 
-def _rows_by_id(rows: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    return {str(item["id"]): item for item in rows if item.get("id") is not None}
+def _rows_by_id(rows: Iterable[dict[str, Any]]) -> Mapping[str, dict[str, Any]]:
+    return rows_by_key(rows, _row_id)
+
+
+def _sorted_rows(rows: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+    return sorted_rows(rows, _row_sort_key)
 
 
-def _sorted_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    return sorted((dict(item) for item in rows), key=_row_sort_key)
+def _row_id(item: dict[str, Any]) -> str | None:
+    return str(item["id"]) if item.get("id") is not None else None
+
+
+def _partner_account_id(item: dict[str, Any]) -> str | None:
+    return _string_or_none(item.get("partner_account_id"))
+
+
+def _payout_instruction_id(item: dict[str, Any]) -> str | None:
+    return _string_or_none(item.get("payout_instruction_id"))
+
+
+def _active_hold_event_id(hold: dict[str, Any]) -> str | None:
+    if str(hold.get("hold_status")) != "active" or hold.get("earning_event_id") is None:
+        return None
+    return str(hold["earning_event_id"])
+
+
+def _active_reserve_event_id(reserve: dict[str, Any]) -> str | None:
+    if str(reserve.get("reserve_status")) != "active" or reserve.get("source_earning_event_id") is None:
+        return None
+    return str(reserve["source_earning_event_id"])
+
+
+def _active_partner_reserve_account_id(reserve: dict[str, Any]) -> str | None:
+    if (
+        str(reserve.get("reserve_status")) != "active"
+        or reserve.get("partner_account_id") is None
+        or str(reserve.get("reserve_scope")) != "partner_account"
+    ):
+        return None
+    return str(reserve["partner_account_id"])
 
 
 def _row_sort_key(item: dict[str, Any]) -> tuple[str, str]:
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
+from src.application.services.snapshot_store import rows_by_key, rows_grouped_by, sorted_rows
+
 REPORT_VERSION = "phase7-reporting-marts-v1"
 
 BLOCKING_MISMATCH_CODES = {
@@ -21,9 +24,48 @@ BLOCKING_MISMATCH_CODES = {
     "outbox_event_missing_required_publication",
 }
 
+REPORTING_ENGINES = ("reference", "columnar")
+
 _REQUIRED_OUTBOX_CONSUMERS = ("analytics_mart", "operational_replay")
 _PAID_ORDER_STATUSES = {"paid"}
 _TERMINAL_DISPUTE_OUTCOMES = {"lost", "reversed"}
+_BACKLOG_PUBLICATION_STATUSES = {"pending", "claimed", "submitted"}
+
+_MISMATCH_MESSAGES = {
+    "attribution_result_without_order": (
+        "Order attribution result references an order missing from the analytical snapshot."
+    ),
+    "commissionability_evaluation_without_order": (
+        "Commissionability evaluation references an order missing from the analytical snapshot."
+    ),
+    "renewal_order_without_order": "Renewal order references an order missing from the analytical snapshot.",
+    "refund_without_order": "Refund references an order missing from the analytical snapshot.",
+    "payment_dispute_without_order": "Payment dispute references an order missing from the analytical snapshot.",
+    "earning_event_without_partner_account": (
+        "Earning event is missing partner_account_id and cannot be mapped into partner reporting marts."
+    ),
+    "partner_statement_without_partner_account": (
+        "Partner statement is missing partner_account_id and cannot be mapped into reporting marts."
+    ),
+    "committed_order_missing_attribution_result": (
+        "Committed order is missing canonical attribution result and will degrade reporting explainability."
+    ),
+    "paid_order_missing_commissionability_evaluation": (
+        "Paid order is missing commissionability evaluation and cannot fully participate in payout-facing reporting."
+    ),
+    "eligible_partner_orders_missing_earning_events": (
+        "Partner has eligible paid orders but no earning events in the analytical snapshot."
+    ),
+    "outbox_event_missing_required_publication": (
+        "Outbox event is missing a required consumer publication row for analytical processing."
+    ),
+    "reporting_publication_backlog_present": (
+        "Reporting consumer still has backlog publications pending analytical completion."
+    ),
+    "reporting_publication_failed": (
+        "Reporting consumer has failed publication rows that require replay or operator attention."
+    ),
+}
 
 
 @dataclass(frozen=True)
@@ -46,7 +88,16 @@ class ReportingMismatch:
         }
 
 
-def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any]:
+def build_phase7_reporting_marts_pack(snapshot: dict[str, Any], *, engine: str = "reference") -> dict[str, Any]:
+    if engine == "columnar":
+        from src.application.services.phase7_reporting_marts_columnar import (
+            build_phase7_reporting_marts_pack_columnar,
+        )
+
+        return build_phase7_reporting_marts_pack_columnar(snapshot)
+    if engine != "reference":
+        raise ValueError(f"Unknown reporting engine {engine!r}; expected one of {', '.join(REPORTING_ENGINES)}")
+
     metadata = dict(snapshot.get("metadata") or {})
     orders = _sorted_rows(snapshot.get("orders", []))
     attribution_results = _sorted_rows(snapshot.get("order_attribution_results", []))
@@ -60,14 +111,14 @@ def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any
     outbox_publications = _sorted_rows(snapshot.get("outbox_publications", []))
 
     order_by_id = _rows_by_id(orders)
-    attribution_by_order_id: dict[str, dict[str, Any]] = {}
-    evaluation_by_order_id: dict[str, dict[str, Any]] = {}
-    renewal_by_order_id: dict[str, dict[str, Any]] = {}
-    refunds_by_order_id: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    disputes_by_order_id: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    earning_events_by_partner: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    statements_by_partner: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    publications_by_event_id: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    attribution_by_order_id = rows_by_key(attribution_results, _order_id)
+    evaluation_by_order_id = rows_by_key(commissionability_evaluations, _order_id)
+    renewal_by_order_id = rows_by_key(renewal_orders, _order_id)
+    refunds_by_order_id = rows_grouped_by(refunds, _order_id)
+    disputes_by_order_id = rows_grouped_by(payment_disputes, _order_id)
+    earning_events_by_partner = rows_grouped_by(earning_events, _partner_account_id)
+    statements_by_partner = rows_grouped_by(partner_statements, _partner_account_id)
+    publications_by_event_id = rows_grouped_by(outbox_publications, _outbox_event_id)
 
     mismatches: list[ReportingMismatch] = []
 
@@ -75,124 +126,83 @@ def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any
         order_id = _string_or_none(item.get("order_id"))
         if order_id is None or order_id not in order_by_id:
             mismatches.append(
-                ReportingMismatch(
-                    code="attribution_result_without_order",
-                    severity="blocking",
+                _mismatch(
+                    "attribution_result_without_order",
                     object_family="order_attribution_result",
                     source_reference=str(item.get("id", "unknown")),
-                    message="Order attribution result references an order missing from the analytical snapshot.",
                     details={"order_id": order_id},
                 )
             )
-            continue
-        attribution_by_order_id[order_id] = item
 
     for item in commissionability_evaluations:
         order_id = _string_or_none(item.get("order_id"))
         if order_id is None or order_id not in order_by_id:
             mismatches.append(
-                ReportingMismatch(
-                    code="commissionability_evaluation_without_order",
-                    severity="blocking",
+                _mismatch(
+                    "commissionability_evaluation_without_order",
                     object_family="commissionability_evaluation",
                     source_reference=str(item.get("id", "unknown")),
-                    message="Commissionability evaluation references an order missing from the analytical snapshot.",
                     details={"order_id": order_id},
                 )
             )
-            continue
-        evaluation_by_order_id[order_id] = item
 
     for item in renewal_orders:
         order_id = _string_or_none(item.get("order_id"))
         if order_id is None or order_id not in order_by_id:
             mismatches.append(
-                ReportingMismatch(
-                    code="renewal_order_without_order",
-                    severity="blocking",
+                _mismatch(
+                    "renewal_order_without_order",
                     object_family="renewal_order",
                     source_reference=str(item.get("id", "unknown")),
-                    message="Renewal order references an order missing from the analytical snapshot.",
                     details={"order_id": order_id},
                 )
             )
-            continue
-        renewal_by_order_id[order_id] = item
 
     for item in refunds:
         order_id = _string_or_none(item.get("order_id"))
         if order_id is None or order_id not in order_by_id:
             mismatches.append(
-                ReportingMismatch(
-                    code="refund_without_order",
-                    severity="blocking",
+                _mismatch(
+                    "refund_without_order",
                     object_family="refund",
                     source_reference=str(item.get("id", "unknown")),
-                    message="Refund references an order missing from the analytical snapshot.",
                     details={"order_id": order_id},
                 )
             )
-            continue
-        refunds_by_order_id[order_id].append(item)
 
     for item in payment_disputes:
         order_id = _string_or_none(item.get("order_id"))
         if order_id is None or order_id not in order_by_id:
             mismatches.append(
-                ReportingMismatch(
-                    code="payment_dispute_without_order",
-                    severity="blocking",
+                _mismatch(
+                    "payment_dispute_without_order",
                     object_family="payment_dispute",
                     source_reference=str(item.get("id", "unknown")),
-                    message="Payment dispute references an order missing from the analytical snapshot.",
                     details={"order_id": order_id},
                 )
             )
-            continue
-        disputes_by_order_id[order_id].append(item)
 
     for item in earning_events:
         partner_account_id = _string_or_none(item.get("partner_account_id"))
         if partner_account_id is None:
             mismatches.append(
-                ReportingMismatch(
-                    code="earning_event_without_partner_account",
-                    severity="blocking",
+                _mismatch(
+                    "earning_event_without_partner_account",
                     object_family="earning_event",
                     source_reference=str(item.get("id", "unknown")),
-                    message=(
-                        "Earning event is missing partner_account_id and cannot "
-                        "be mapped into partner reporting marts."
-                    ),
-                    details={},
                 )
             )
-            continue
-        earning_events_by_partner[partner_account_id].append(item)
 
     for item in partner_statements:
         partner_account_id = _string_or_none(item.get("partner_account_id"))
         if partner_account_id is None:
             mismatches.append(
-                ReportingMismatch(
-                    code="partner_statement_without_partner_account",
-                    severity="blocking",
+                _mismatch(
+                    "partner_statement_without_partner_account",
                     object_family="partner_statement",
                     source_reference=str(item.get("id", "unknown")),
-                    message=(
-                        "Partner statement is missing partner_account_id and cannot "
-                        "be mapped into reporting marts."
-                    ),
-                    details={},
                 )
             )
-            continue
-        statements_by_partner[partner_account_id].append(item)
-
-    for item in outbox_publications:
-        event_id = _string_or_none(item.get("outbox_event_id"))
-        if event_id is not None:
-            publications_by_event_id[event_id].append(item)
 
     order_mart_rows: list[dict[str, Any]] = []
     qualifying_candidates_by_user: dict[str, list[tuple[datetime, str]]] = defaultdict(list)
@@ -207,31 +217,19 @@ def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any
 
         if str(order.get("order_status")) == "committed" and attribution is None:
             mismatches.append(
-                ReportingMismatch(
-                    code="committed_order_missing_attribution_result",
-                    severity="warning",
+                _mismatch(
+                    "committed_order_missing_attribution_result",
                     object_family="order",
                     source_reference=order_id,
-                    message=(
-                        "Committed order is missing canonical attribution result "
-                        "and will degrade reporting explainability."
-                    ),
-                    details={},
                 )
             )
 
         if _is_paid_order(order) and evaluation is None:
             mismatches.append(
-                ReportingMismatch(
-                    code="paid_order_missing_commissionability_evaluation",
-                    severity="warning",
+                _mismatch(
+                    "paid_order_missing_commissionability_evaluation",
                     object_family="order",
                     source_reference=order_id,
-                    message=(
-                        "Paid order is missing commissionability evaluation and "
-                        "cannot fully participate in payout-facing reporting."
-                    ),
-                    details={},
                 )
             )
 
@@ -312,6 +310,36 @@ def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any
         mismatches=mismatches,
     )
 
+    return _reporting_pack(
+        metadata=metadata,
+        input_summary={
+            "orders": len(orders),
+            "order_attribution_results": len(attribution_results),
+            "commissionability_evaluations": len(commissionability_evaluations),
+            "renewal_orders": len(renewal_orders),
+            "refunds": len(refunds),
+            "payment_disputes": len(payment_disputes),
+            "earning_events": len(earning_events),
+            "partner_statements": len(partner_statements),
+            "outbox_events": len(outbox_events),
+            "outbox_publications": len(outbox_publications),
+        },
+        order_reporting_mart=sorted(order_mart_rows, key=lambda item: item["order_id"]),
+        partner_reporting_mart=partner_reporting_mart,
+        reporting_health_views=reporting_health_views,
+        mismatches=mismatches,
+    )
+
+
+def _reporting_pack(
+    *,
+    metadata: dict[str, Any],
+    input_summary: dict[str, int],
+    order_reporting_mart: list[dict[str, Any]],
+    partner_reporting_mart: list[dict[str, Any]],
+    reporting_health_views: dict[str, Any],
+    mismatches: list[ReportingMismatch],
+) -> dict[str, Any]:
     mismatch_counts = dict(Counter(item.code for item in mismatches))
     blocking_mismatches = [item.to_dict() for item in mismatches if item.code in BLOCKING_MISMATCH_CODES]
     status = "green"
@@ -327,19 +355,8 @@ def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any
             "snapshot_id": metadata.get("snapshot_id"),
             "source": metadata.get("source"),
         },
-        "input_summary": {
-            "orders": len(orders),
-            "order_attribution_results": len(attribution_results),
-            "commissionability_evaluations": len(commissionability_evaluations),
-            "renewal_orders": len(renewal_orders),
-            "refunds": len(refunds),
-            "payment_disputes": len(payment_disputes),
-            "earning_events": len(earning_events),
-            "partner_statements": len(partner_statements),
-            "outbox_events": len(outbox_events),
-            "outbox_publications": len(outbox_publications),
-        },
-        "order_reporting_mart": sorted(order_mart_rows, key=lambda item: item["order_id"]),
+        "input_summary": input_summary,
+        "order_reporting_mart": order_reporting_mart,
         "partner_reporting_mart": partner_reporting_mart,
         "reporting_health_views": reporting_health_views,
         "reconciliation": {
@@ -354,8 +371,8 @@ def build_phase7_reporting_marts_pack(snapshot: dict[str, Any]) -> dict[str, Any
 def _build_partner_reporting_mart(
     *,
     order_mart_rows: list[dict[str, Any]],
-    earning_events_by_partner: dict[str, list[dict[str, Any]]],
-    statements_by_partner: dict[str, list[dict[str, Any]]],
+    earning_events_by_partner: Mapping[str, list[dict[str, Any]]],
+    statements_by_partner: Mapping[str, list[dict[str, Any]]],
     mismatches: list[ReportingMismatch],
 ) -> list[dict[str, Any]]:
     orders_by_partner: dict[str, list[dict[str, Any]]] = defaultdict(list)
@@ -388,12 +405,10 @@ def _build_partner_reporting_mart(
         ]
         if eligible_paid_orders and not partner_events:
             mismatches.append(
-                ReportingMismatch(
-                    code="eligible_partner_orders_missing_earning_events",
-                    severity="warning",
+                _mismatch(
+                    "eligible_partner_orders_missing_earning_events",
                     object_family="partner_reporting_mart",
                     source_reference=partner_account_id,
-                    message="Partner has eligible paid orders but no earning events in the analytical snapshot.",
                     details={"eligible_paid_order_count": len(eligible_paid_orders)},
                 )
             )
@@ -435,8 +450,8 @@ def _build_partner_reporting_mart(
 
 def _build_reporting_health_views(
     *,
-    outbox_events: list[dict[str, Any]],
-    publications_by_event_id: dict[str, list[dict[str, Any]]],
+    outbox_events: Iterable[dict[str, Any]],
+    publications_by_event_id: Mapping[str, list[dict[str, Any]]],
     mismatches: list[ReportingMismatch],
 ) -> dict[str, Any]:
     consumer_counts: dict[str, Counter] = defaultdict(Counter)
@@ -454,15 +469,10 @@ def _build_reporting_health_views(
         for required_consumer in _REQUIRED_OUTBOX_CONSUMERS:
             if required_consumer not in present_consumers:
                 mismatches.append(
-                    ReportingMismatch(
-                        code="outbox_event_missing_required_publication",
-                        severity="blocking",
+                    _mismatch(
+                        "outbox_event_missing_required_publication",
                         object_family="outbox_event",
                         source_reference=event_id,
-                        message=(
-                            "Outbox event is missing a required consumer "
-                            "publication row for analytical processing."
-                        ),
                         details={"missing_consumer_key": required_consumer},
                     )
                 )
@@ -471,7 +481,7 @@ def _build_reporting_health_views(
             consumer_key = str(publication.get("consumer_key") or "unknown")
             publication_status = str(publication.get("publication_status") or "unknown")
             consumer_counts[consumer_key][publication_status] += 1
-            if publication_status in {"pending", "claimed", "submitted"}:
+            if publication_status in _BACKLOG_PUBLICATION_STATUSES:
                 consumer_backlog_event_ids[consumer_key].append(event_id)
             if publication_status == "failed":
                 consumer_failed_event_ids[consumer_key].append(event_id)
@@ -479,24 +489,20 @@ def _build_reporting_health_views(
     for consumer_key, event_ids in consumer_backlog_event_ids.items():
         if event_ids:
             mismatches.append(
-                ReportingMismatch(
-                    code="reporting_publication_backlog_present",
-                    severity="warning",
+                _mismatch(
+                    "reporting_publication_backlog_present",
                     object_family="outbox_publication",
                     source_reference=consumer_key,
-                    message="Reporting consumer still has backlog publications pending analytical completion.",
                     details={"backlog_event_ids": sorted(set(event_ids))},
                 )
             )
     for consumer_key, event_ids in consumer_failed_event_ids.items():
         if event_ids:
             mismatches.append(
-                ReportingMismatch(
-                    code="reporting_publication_failed",
-                    severity="warning",
+                _mismatch(
+                    "reporting_publication_failed",
                     object_family="outbox_publication",
                     source_reference=consumer_key,
-                    message="Reporting consumer has failed publication rows that require replay or operator attention.",
                     details={"failed_event_ids": sorted(set(event_ids))},
                 )
             )
@@ -523,19 +529,53 @@ def _build_reporting_health_views(
     }
 
 
-def _sorted_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    return sorted(
-        [dict(item) for item in rows],
-        key=lambda item: (
-            str(item.get("created_at") or ""),
-            str(item.get("updated_at") or ""),
-            str(item.get("id") or ""),
-        ),
+def _mismatch(
+    code: str,
+    *,
+    object_family: str,
+    source_reference: str,
+    details: dict[str, Any] | None = None,
+) -> ReportingMismatch:
+    return ReportingMismatch(
+        code=code,
+        severity="blocking" if code in BLOCKING_MISMATCH_CODES else "warning",
+        object_family=object_family,
+        source_reference=source_reference,
+        message=_MISMATCH_MESSAGES[code],
+        details={} if details is None else details,
     )
 
 
-def _rows_by_id(rows: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    return {str(item["id"]): item for item in rows if item.get("id") is not None}
+def _row_sort_key(item: dict[str, Any]) -> tuple[str, str, str]:
+    return (
+        str(item.get("created_at") or ""),
+        str(item.get("updated_at") or ""),
+        str(item.get("id") or ""),
+    )
+
+
+def _sorted_rows(rows: Iterable[dict[str, Any]] | None) -> Iterable[dict[str, Any]]:
+    return sorted_rows(rows, _row_sort_key)
+
+
+def _row_id(item: dict[str, Any]) -> str | None:
+    return _string_or_none(item.get("id"))
+
+
+def _order_id(item: dict[str, Any]) -> str | None:
+    return _string_or_none(item.get("order_id"))
+
+
+def _partner_account_id(item: dict[str, Any]) -> str | None:
+    return _string_or_none(item.get("partner_account_id"))
+
+
+def _outbox_event_id(item: dict[str, Any]) -> str | None:
+    return _string_or_none(item.get("outbox_event_id"))
+
+
+def _rows_by_id(rows: Iterable[dict[str, Any]]) -> Mapping[str, dict[str, Any]]:
+    return rows_by_key(rows, _row_id)
 
 
 def _string_or_none(value: Any) -> str | None:
@@ -0,0 +1,692 @@
+"""Columnar engine for the Phase 7 analytical marts pack.
+
+Produces the same pack as ``build_phase7_reporting_marts_pack`` without walking
+every table row by row: each table is loaded into columns once, joins resolve
+to NumPy row indices, partner and consumer roll-ups are integer group-bys and
+money is summed and rounded in fixed-point minor units. Only the rows that
+need an ordering decision (mismatch candidates, duplicate keys) are ever
+sorted. Snapshots holding values the fixed-point path cannot reproduce exactly
+fall back to the reference builder, so both engines always agree.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+from types import ModuleType
+from typing import Any
+
+from src.application.services.columnar_tables import (
+    MISSING,
+    ColumnarFallback,
+    ColumnarTable,
+    decimal_column,
+    decimal_floats,
+    factorize,
+    first_truthy,
+    gather,
+    grouped_money_totals,
+    lookup,
+    paused_gc,
+    percentages,
+    require_numpy,
+    strings_or_none,
+)
+from src.application.services.phase7_reporting_marts import (
+    _BACKLOG_PUBLICATION_STATUSES,
+    _PAID_ORDER_STATUSES,
+    _REQUIRED_OUTBOX_CONSUMERS,
+    _TERMINAL_DISPUTE_OUTCOMES,
+    ReportingMismatch,
+    _as_dt,
+    _mismatch,
+    _reporting_pack,
+    _row_sort_key,
+    build_phase7_reporting_marts_pack,
+)
+
+_ORDER_FIELDS = (
+    "id",
+    "user_id",
+    "order_status",
+    "settlement_status",
+    "sale_channel",
+    "currency_code",
+    "commission_base_amount",
+    "displayed_price",
+    "created_at",
+)
+_ORDER_REFERENCE_TABLES = (
+    ("order_attribution_results", "attribution_result_without_order", "order_attribution_result"),
+    ("commissionability_evaluations", "commissionability_evaluation_without_order", "commissionability_evaluation"),
+    ("renewal_orders", "renewal_order_without_order", "renewal_order"),
+    ("refunds", "refund_without_order", "refund"),
+    ("payment_disputes", "payment_dispute_without_order", "payment_dispute"),
+)
+_ORDER_REFERENCE_FIELDS = {
+    "order_attribution_results": ("partner_account_id", "partner_code_id", "owner_type", "owner_source"),
+    "commissionability_evaluations": ("commissionability_status",),
+    "renewal_orders": (
+        "effective_partner_account_id",
+        "effective_partner_code_id",
+        "effective_owner_type",
+        "effective_owner_source",
+    ),
+    "refunds": ("refund_status",),
+    "payment_disputes": ("outcome_class",),
+}
+_PARTNER_REFERENCE_TABLES = (
+    ("earning_events", "earning_event_without_partner_account", "earning_event"),
+    ("partner_statements", "partner_statement_without_partner_account", "partner_statement"),
+)
+
+
+def build_phase7_reporting_marts_pack_columnar(snapshot: dict[str, Any]) -> dict[str, Any]:
+    np = require_numpy()
+    try:
+        with paused_gc():
+            return _build(np, snapshot)
+    except ColumnarFallback:
+        return build_phase7_reporting_marts_pack(snapshot)
+
+
+def _build(np: ModuleType, snapshot: dict[str, Any]) -> dict[str, Any]:
+    metadata = dict(snapshot.get("metadata") or {})
+    orders = _table(snapshot, "orders", _ORDER_FIELDS, strict_id=True)
+    if MISSING in orders["id"]:
+        raise ColumnarFallback("order row without id")
+    references = {
+        table_name: _table(snapshot, table_name, ("order_id", "id", *_ORDER_REFERENCE_FIELDS[table_name]))
+        for table_name, _, _ in _ORDER_REFERENCE_TABLES
+    }
+    earning_events = _table(
+        snapshot, "earning_events", ("partner_account_id", "id", "available_amount", "currency_code")
+    )
+    partner_statements = _table(
+        snapshot,
+        "partner_statements",
+        ("partner_account_id", "id", "superseded_by_statement_id", "available_amount", "currency_code"),
+    )
+    outbox_events = _table(snapshot, "outbox_events", ("id", "event_family"), strict_id=True)
+    if MISSING in outbox_events["id"]:
+        raise ColumnarFallback("outbox event row without id")
+    outbox_publications = _table(
+        snapshot, "outbox_publications", ("outbox_event_id", "consumer_key", "publication_status")
+    )
+
+    mismatches: list[ReportingMismatch] = []
+    order_ids = [str(value) for value in orders["id"]]
+    known_order_ids = {str(value) for value in orders["id"] if value is not None}
+    reference_keys = {table_name: strings_or_none(table["order_id"]) for table_name, table in references.items()}
+
+    for table_name, code, object_family in _ORDER_REFERENCE_TABLES:
+        table = references[table_name]
+        keys = reference_keys[table_name]
+        orphans = [index for index, key in enumerate(keys) if key is None or key not in known_order_ids]
+        for index in table.in_sort_order(orphans):
+            mismatches.append(
+                _mismatch(
+                    code,
+                    object_family=object_family,
+                    source_reference=str(table["id"][index]),
+                    details={"order_id": keys[index]},
+                )
+            )
+
+    partner_tables = {"earning_events": earning_events, "partner_statements": partner_statements}
+    partner_keys = {
+        table_name: strings_or_none(table["partner_account_id"]) for table_name, table in partner_tables.items()
+    }
+    for table_name, code, object_family in _PARTNER_REFERENCE_TABLES:
+        table = partner_tables[table_name]
+        unmapped = [index for index, key in enumerate(partner_keys[table_name]) if key is None]
+        for index in table.in_sort_order(unmapped):
+            mismatches.append(_mismatch(code, object_family=object_family, source_reference=str(table["id"][index])))
+
+    order_rows, order_flags = _order_reporting_rows(np, orders, order_ids, references, reference_keys, mismatches)
+    partner_rows = _partner_reporting_rows(
+        np,
+        order_rows=order_rows,
+        order_flags=order_flags,
+        orders=orders,
+        earning_events=earning_events,
+        partner_statements=partner_statements,
+        partner_keys=partner_keys,
+        mismatches=mismatches,
+    )
+    health_views = _reporting_health_views(np, outbox_events, outbox_publications, mismatches)
+
+    return _reporting_pack(
+        metadata=metadata,
+        input_summary={
+            "orders": len(orders),
+            "order_attribution_results": len(references["order_attribution_results"]),
+            "commissionability_evaluations": len(references["commissionability_evaluations"]),
+            "renewal_orders": len(references["renewal_orders"]),
+            "refunds": len(references["refunds"]),
+            "payment_disputes": len(references["payment_disputes"]),
+            "earning_events": len(earning_events),
+            "partner_statements": len(partner_statements),
+            "outbox_events": len(outbox_events),
+            "outbox_publications": len(outbox_publications),
+        },
+        order_reporting_mart=_sorted_by_order_id(orders, order_ids, order_rows),
+        partner_reporting_mart=partner_rows,
+        reporting_health_views=health_views,
+        mismatches=mismatches,
+    )
+
+
+def _table(
+    snapshot: dict[str, Any], table_name: str, fields: tuple[str, ...], *, strict_id: bool = False
+) -> ColumnarTable:
+    return ColumnarTable(
+        snapshot.get(table_name, []),
+        fields,
+        sort_key=_row_sort_key,
+        defaults={"id": MISSING if strict_id else "unknown"},
+    )
+
+
+def _order_reporting_rows(
+    np: ModuleType,
+    orders: ColumnarTable,
+    order_ids: list[str],
+    references: dict[str, ColumnarTable],
+    reference_keys: dict[str, list[str | None]],
+    mismatches: list[ReportingMismatch],
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    attributions = references["order_attribution_results"]
+    evaluations = references["commissionability_evaluations"]
+    renewals = references["renewal_orders"]
+    attribution_index = lookup(np, order_ids, attributions.last_by_key(reference_keys["order_attribution_results"]))
+    evaluation_index = lookup(np, order_ids, evaluations.last_by_key(reference_keys["commissionability_evaluations"]))
+    renewal_index = lookup(np, order_ids, renewals.last_by_key(reference_keys["renewal_orders"]))
+
+    is_committed = np.array([str(value) == "committed" for value in orders["order_status"]], dtype=bool)
+    is_paid = np.array([str(value) in _PAID_ORDER_STATUSES for value in orders["settlement_status"]], dtype=bool)
+    missing_attribution = is_committed & (attribution_index < 0)
+    missing_evaluation = is_paid & (evaluation_index < 0)
+    flagged = np.flatnonzero(missing_attribution | missing_evaluation).tolist()
+    missing_attribution, missing_evaluation = missing_attribution.tolist(), missing_evaluation.tolist()
+    for index in orders.in_sort_order(flagged):
+        if missing_attribution[index]:
+            mismatches.append(
+                _mismatch(
+                    "committed_order_missing_attribution_result",
+                    object_family="order",
+                    source_reference=order_ids[index],
+                )
+            )
+        if missing_evaluation[index]:
+            mismatches.append(
+                _mismatch(
+                    "paid_order_missing_commissionability_evaluation",
+                    object_family="order",
+                    source_reference=order_ids[index],
+                )
+            )
+
+    refunds = references["refunds"]
+    disputes = references["payment_disputes"]
+    refunded = {
+        key
+        for key, status in zip(reference_keys["refunds"], refunds["refund_status"], strict=True)
+        if str(status) == "succeeded"
+    }
+    dispute_outcomes = [str(value) for value in disputes["outcome_class"]]
+    disputed_open = {
+        key
+        for key, outcome in zip(reference_keys["payment_disputes"], dispute_outcomes, strict=True)
+        if outcome == "open"
+    }
+    charged_back = {
+        key
+        for key, outcome in zip(reference_keys["payment_disputes"], dispute_outcomes, strict=True)
+        if outcome in _TERMINAL_DISPUTE_OUTCOMES
+    }
+    has_refund = np.array([order_id in refunded for order_id in order_ids], dtype=bool)
+    has_open_dispute = np.array([order_id in disputed_open for order_id in order_ids], dtype=bool)
+    has_chargeback = np.array([order_id in charged_back for order_id in order_ids], dtype=bool)
+    is_paid_conversion = is_paid & ~has_refund & ~has_chargeback
+    is_renewal = renewal_index >= 0
+
+    def joined(table: ColumnarTable, field: str, indices: Any) -> Any:
+        return gather(np, table[field], indices)
+
+    partner_account_ids = strings_or_none(
+        first_truthy(
+            np,
+            joined(renewals, "effective_partner_account_id", renewal_index),
+            joined(attributions, "partner_account_id", attribution_index),
+        ).tolist()
+    )
+    partner_code_ids = strings_or_none(
+        first_truthy(
+            np,
+            joined(renewals, "effective_partner_code_id", renewal_index),
+            joined(attributions, "partner_code_id", attribution_index),
+        ).tolist()
+    )
+    owner_types = [
+        str(value)
+        for value in first_truthy(
+            np,
+            joined(renewals, "effective_owner_type", renewal_index),
+            joined(attributions, "owner_type", attribution_index),
+            np.full(len(order_ids), "none", dtype=object),
+        ).tolist()
+    ]
+    owner_sources = strings_or_none(
+        first_truthy(
+            np,
+            joined(renewals, "effective_owner_source", renewal_index),
+            joined(attributions, "owner_source", attribution_index),
+        ).tolist()
+    )
+    commissionability_statuses = strings_or_none(
+        joined(evaluations, "commissionability_status", evaluation_index).tolist()
+    )
+    is_eligible = np.array([status == "eligible" for status in commissionability_statuses], dtype=bool)
+    has_partner = np.array([partner is not None for partner in partner_account_ids], dtype=bool)
+
+    user_ids = [str(value) for value in orders["user_id"]]
+    qualifying_first_payment_order_ids = _qualifying_first_payment_order_ids(
+        candidates=np.flatnonzero(is_paid_conversion & ~is_renewal & is_eligible & has_partner).tolist(),
+        order_ids=order_ids,
+        user_ids=user_ids,
+        created_at=orders["created_at"],
+    )
+    is_qualifying_first_payment = np.array(
+        [order_id in qualifying_first_payment_order_ids for order_id in order_ids], dtype=bool
+    )
+
+    commission_base = decimal_column(np, _money_texts(orders["commission_base_amount"]))
+    displayed_price = decimal_column(np, _money_texts(orders["displayed_price"]))
+
+    rows = [
+        {
+            "order_id": order_id,
+            "user_id": user_id,
+            "partner_account_id": partner_account_id,
+            "partner_code_id": partner_code_id,
+            "owner_type": owner_type,
+            "owner_source": owner_source,
+            "sale_channel": sale_channel,
+            "currency_code": currency_code,
+            "order_status": order_status,
+            "settlement_status": settlement_status,
+            "commissionability_status": commissionability_status,
+            "is_paid_conversion": paid_conversion,
+            "is_renewal": renewal,
+            "has_refund": refund,
+            "has_open_dispute": open_dispute,
+            "has_chargeback": chargeback,
+            "commission_base_amount": commission_base_amount,
+            "displayed_price": displayed,
+            "created_at": created_at,
+            "is_qualifying_first_payment": qualifying_first_payment,
+        }
+        for (
+            order_id,
+            user_id,
+            partner_account_id,
+            partner_code_id,
+            owner_type,
+            owner_source,
+            sale_channel,
+            currency_code,
+            order_status,
+            settlement_status,
+            commissionability_status,
+            paid_conversion,
+            renewal,
+            refund,
+            open_dispute,
+            chargeback,
+            commission_base_amount,
+            displayed,
+            created_at,
+            qualifying_first_payment,
+        ) in zip(
+            order_ids,
+            user_ids,
+            partner_account_ids,
+            partner_code_ids,
+            owner_types,
+            owner_sources,
+            orders["sale_channel"],
+            orders["currency_code"],
+            orders["order_status"],
+            orders["settlement_status"],
+            commissionability_statuses,
+            is_paid_conversion.tolist(),
+            is_renewal.tolist(),
+            has_refund.tolist(),
+            has_open_dispute.tolist(),
+            has_chargeback.tolist(),
+            decimal_floats(np, commission_base),
+            decimal_floats(np, displayed_price),
+            orders["created_at"],
+            is_qualifying_first_payment.tolist(),
+            strict=True,
+        )
+    ]
+    flags = {
+        "partner_account_ids": partner_account_ids,
+        "is_paid_conversion": is_paid_conversion,
+        "is_eligible": is_eligible,
+        "is_renewal": is_renewal,
+        "has_refund": has_refund,
+        "has_chargeback": has_chargeback,
+        "is_qualifying_first_payment": is_qualifying_first_payment,
+        "commission_base": commission_base,
+    }
+    return rows, flags
+
+
+def _qualifying_first_payment_order_ids(
+    *, candidates: list[int], order_ids: list[str], user_ids: list[str], created_at: list[Any]
+) -> set[str]:
+    ranked: list[tuple[datetime, str, str]] = sorted(
+        (_as_dt(created_at[index]), order_ids[index], user_ids[index]) for index in candidates
+    )
+    first_by_user: dict[str, str] = {}
+    for _, order_id, user_id in ranked:
+        first_by_user.setdefault(user_id, order_id)
+    return set(first_by_user.values())
+
+
+def _partner_reporting_rows(
+    np: ModuleType,
+    *,
+    order_rows: list[dict[str, Any]],
+    order_flags: dict[str, Any],
+    orders: ColumnarTable,
+    earning_events: ColumnarTable,
+    partner_statements: ColumnarTable,
+    partner_keys: dict[str, list[str | None]],
+    mismatches: list[ReportingMismatch],
+) -> list[dict[str, Any]]:
+    order_partners = order_flags["partner_account_ids"]
+    event_partners = partner_keys["earning_events"]
+    statement_partners = partner_keys["partner_statements"]
+    partner_ids = sorted({*order_partners, *event_partners, *statement_partners} - {None})
+    partner_count = len(partner_ids)
+    partner_codes = {partner_account_id: code for code, partner_account_id in enumerate(partner_ids)}
+
+    order_codes = lookup(np, order_partners, partner_codes)
+    event_codes = lookup(np, event_partners, partner_codes)
+    statement_codes = lookup(np, statement_partners, partner_codes)
+    in_partner = order_codes >= 0
+    is_current_statement = np.array(
+        [value is None for value in partner_statements["superseded_by_statement_id"]], dtype=bool
+    )
+    current_statement_codes = statement_codes[(statement_codes >= 0) & is_current_statement]
+    mapped_event_codes = event_codes[event_codes >= 0]
+
+    def order_count(mask: Any) -> Any:
+        return np.bincount(order_codes[in_partner & mask], minlength=partner_count)
+
+    paid = order_flags["is_paid_conversion"]
+    paid_conversion_counts = order_count(paid)
+    refund_counts = order_count(order_flags["has_refund"])
+    chargeback_counts = order_count(order_flags["has_chargeback"])
+    eligible_paid_counts = order_count(paid & order_flags["is_eligible"])
+    event_counts = np.bincount(mapped_event_codes, minlength=partner_count)
+
+    for code in np.flatnonzero((eligible_paid_counts > 0) & (event_counts == 0)).tolist():
+        mismatches.append(
+            _mismatch(
+                "eligible_partner_orders_missing_earning_events",
+                object_family="partner_reporting_mart",
+                source_reference=partner_ids[code],
+                details={"eligible_paid_order_count": int(eligible_paid_counts[code])},
+            )
+        )
+
+    paid_in_partner = in_partner & paid
+    current_statement_mask = (statement_codes >= 0) & is_current_statement
+    mapped_event_mask = event_codes >= 0
+    commission_base = order_flags["commission_base"]
+    if not commission_base.float_exact:
+        raise ColumnarFallback("commission base amount changes when rounded through a float")
+    paid_commission_base = commission_base.select(paid_in_partner)
+    event_amounts = decimal_column(np, _amount_texts(earning_events["available_amount"])).select(mapped_event_mask)
+    statement_amounts = decimal_column(np, _amount_texts(partner_statements["available_amount"])).select(
+        current_statement_mask
+    )
+
+    currency_codes: list[set[str]] = [set() for _ in partner_ids]
+    currency_sources = (
+        (order_codes.tolist(), orders["currency_code"]),
+        (np.where(current_statement_mask, statement_codes, -1).tolist(), partner_statements["currency_code"]),
+        (event_codes.tolist(), earning_events["currency_code"]),
+    )
+    for codes, currencies in currency_sources:
+        for code, currency_code in zip(codes, currencies, strict=True):
+            if code >= 0 and currency_code:
+                currency_codes[code].add(str(currency_code))
+
+    return [
+        {
+            "partner_account_id": partner_account_id,
+            "paid_conversion_count": paid_conversion_count,
+            "qualifying_first_payment_count": qualifying_first_payment_count,
+            "renewal_paid_count": renewal_paid_count,
+            "refund_count": refund_count,
+            "chargeback_count": chargeback_count,
+            "refund_rate": refund_rate,
+            "chargeback_rate": chargeback_rate,
+            "paid_conversion_commission_base_amount": paid_conversion_commission_base_amount,
+            "available_earnings_amount": available_earnings_amount,
+            "statement_liability_amount": statement_liability_amount,
+            "statement_count": statement_count,
+            "earning_event_count": earning_event_count,
+            "currency_codes": sorted(partner_currency_codes),
+        }
+        for (
+            partner_account_id,
+            paid_conversion_count,
+            qualifying_first_payment_count,
+            renewal_paid_count,
+            refund_count,
+            chargeback_count,
+            refund_rate,
+            chargeback_rate,
+            paid_conversion_commission_base_amount,
+            available_earnings_amount,
+            statement_liability_amount,
+            statement_count,
+            earning_event_count,
+            partner_currency_codes,
+        ) in zip(
+            partner_ids,
+            paid_conversion_counts.tolist(),
+            order_count(order_flags["is_qualifying_first_payment"]).tolist(),
+            order_count(paid & order_flags["is_renewal"]).tolist(),
+            refund_counts.tolist(),
+            chargeback_counts.tolist(),
+            percentages(np, refund_counts, paid_conversion_counts),
+            percentages(np, chargeback_counts, paid_conversion_counts),
+            grouped_money_totals(np, paid_commission_base, order_codes[paid_in_partner], partner_count),
+            grouped_money_totals(np, event_amounts, mapped_event_codes, partner_count),
+            grouped_money_totals(np, statement_amounts, current_statement_codes, partner_count),
+            np.bincount(current_statement_codes, minlength=partner_count).tolist(),
+            event_counts.tolist(),
+            currency_codes,
+            strict=True,
+        )
+    ]
+
+
+def _reporting_health_views(
+    np: ModuleType,
+    outbox_events: ColumnarTable,
+    outbox_publications: ColumnarTable,
+    mismatches: list[ReportingMismatch],
+) -> dict[str, Any]:
+    event_ids = [str(value) for value in outbox_events["id"]]
+    family_counts = Counter(str(value or "unknown") for value in outbox_events["event_family"])
+    event_codes, distinct_event_ids = factorize(event_ids)
+    event_code_array = np.array(event_codes, dtype=np.int64)
+    event_rows_by_code = np.bincount(event_code_array, minlength=len(distinct_event_ids))
+
+    publication_event_ids = strings_or_none(outbox_publications["outbox_event_id"])
+    raw_consumer_keys = outbox_publications["consumer_key"]
+    event_positions = {event_id: code for code, event_id in enumerate(distinct_event_ids)}
+    publication_event_codes = lookup(np, publication_event_ids, event_positions)
+    # A publication is counted once for every outbox event row carrying its event id;
+    # the trailing zero is what publications of unknown events (code -1) pick up.
+    weights = np.append(event_rows_by_code, 0)[publication_event_codes]
+    known_event = publication_event_codes >= 0
+
+    missing_consumers: dict[str, Any] = {}
+    for consumer_key in _REQUIRED_OUTBOX_CONSUMERS:
+        for_consumer = np.array([bool(raw) and str(raw) == consumer_key for raw in raw_consumer_keys], dtype=bool)
+        present = np.zeros(len(distinct_event_ids), dtype=bool)
+        present[publication_event_codes[for_consumer & known_event]] = True
+        missing_consumers[consumer_key] = ~present[event_code_array]
+    flagged = np.flatnonzero(np.logical_or.reduce(list(missing_consumers.values()))).tolist()
+    for index in outbox_events.in_sort_order(flagged):
+        for consumer_key in _REQUIRED_OUTBOX_CONSUMERS:
+            if missing_consumers[consumer_key][index]:
+                mismatches.append(
+                    _mismatch(
+                        "outbox_event_missing_required_publication",
+                        object_family="outbox_event",
+                        source_reference=event_ids[index],
+                        details={"missing_consumer_key": consumer_key},
+                    )
+                )
+
+    consumer_codes, consumer_keys = factorize(str(value or "unknown") for value in raw_consumer_keys)
+    status_codes, statuses = factorize(str(value or "unknown") for value in outbox_publications["publication_status"])
+    status_code_array = np.array(status_codes, dtype=np.int64)
+    counts = np.zeros((len(consumer_keys), len(statuses)), dtype=np.int64)
+    np.add.at(counts, (np.array(consumer_codes, dtype=np.int64), status_code_array), weights)
+
+    is_backlog_status = np.array([status in _BACKLOG_PUBLICATION_STATUSES for status in statuses], dtype=bool)
+    is_failed_status = np.array([status == "failed" for status in statuses], dtype=bool)
+    counted = weights > 0
+    backlog = counted & is_backlog_status[status_code_array]
+    failed = counted & is_failed_status[status_code_array]
+    _append_consumer_mismatches(
+        np,
+        mask=backlog,
+        code="reporting_publication_backlog_present",
+        details_key="backlog_event_ids",
+        outbox_events=outbox_events,
+        outbox_publications=outbox_publications,
+        event_ids=event_ids,
+        publication_event_ids=publication_event_ids,
+        consumer_codes=consumer_codes,
+        consumer_keys=consumer_keys,
+        mismatches=mismatches,
+    )
+    _append_consumer_mismatches(
+        np,
+        mask=failed,
+        code="reporting_publication_failed",
+        details_key="failed_event_ids",
+        outbox_events=outbox_events,
+        outbox_publications=outbox_publications,
+        event_ids=event_ids,
+        publication_event_ids=publication_event_ids,
+        consumer_codes=consumer_codes,
+        consumer_keys=consumer_keys,
+        mismatches=mismatches,
+    )
+
+    status_column = {status: column for column, status in enumerate(statuses)}
+
+    def status_counts(status: str) -> list[int]:
+        column = status_column.get(status)
+        return [0] * len(consumer_keys) if column is None else counts[:, column].tolist()
+
+    pending, claimed, submitted = status_counts("pending"), status_counts("claimed"), status_counts("submitted")
+    published, failed_counts = status_counts("published"), status_counts("failed")
+    counted_consumers = counts.sum(axis=1) > 0 if consumer_keys else np.zeros(0, dtype=bool)
+    consumer_views = [
+        {
+            "consumer_key": consumer_keys[code],
+            "pending_count": pending[code],
+            "claimed_count": claimed[code],
+            "submitted_count": submitted[code],
+            "published_count": published[code],
+            "failed_count": failed_counts[code],
+            "backlog_count": pending[code] + claimed[code] + submitted[code],
+        }
+        for code in sorted(np.flatnonzero(counted_consumers).tolist(), key=consumer_keys.__getitem__)
+    ]
+    family_views = [
+        {"event_family": event_family, "event_count": count} for event_family, count in sorted(family_counts.items())
+    ]
+    return {
+        "consumer_health_views": consumer_views,
+        "family_health_views": family_views,
+    }
+
+
+def _append_consumer_mismatches(
+    np: ModuleType,
+    *,
+    mask: Any,
+    code: str,
+    details_key: str,
+    outbox_events: ColumnarTable,
+    outbox_publications: ColumnarTable,
+    event_ids: list[str],
+    publication_event_ids: list[str | None],
+    consumer_codes: list[int],
+    consumer_keys: list[str],
+    mismatches: list[ReportingMismatch],
+) -> None:
+    publications = np.flatnonzero(mask).tolist()
+    if not publications:
+        return
+    # Consumers are reported in the order the reference walk first meets them:
+    # outbox events in sort order, then each event's publications in sort order.
+    involved_event_ids = {publication_event_ids[index] for index in publications}
+    event_rank: dict[str, int] = {}
+    for rank, index in enumerate(
+        outbox_events.in_sort_order(index for index, event_id in enumerate(event_ids) if event_id in involved_event_ids)
+    ):
+        event_rank.setdefault(event_ids[index], rank)
+    publication_rank = {index: rank for rank, index in enumerate(outbox_publications.in_sort_order(publications))}
+
+    event_ids_by_consumer: dict[int, set[str]] = {}
+    for index in sorted(
+        publications, key=lambda index: (event_rank[publication_event_ids[index]], publication_rank[index])
+    ):
+        event_ids_by_consumer.setdefault(consumer_codes[index], set()).add(publication_event_ids[index])
+    for consumer_code, consumer_event_ids in event_ids_by_consumer.items():
+        mismatches.append(
+            _mismatch(
+                code,
+                object_family="outbox_publication",
+                source_reference=consumer_keys[consumer_code],
+                details={details_key: sorted(consumer_event_ids)},
+            )
+        )
+
+
+def _sorted_by_order_id(
+    orders: ColumnarTable, order_ids: list[str], rows: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    if len(set(order_ids)) == len(order_ids):
+        return [rows[index] for index in sorted(range(len(rows)), key=order_ids.__getitem__)]
+    # Equal order ids keep their relative position from the reference sort of the orders table.
+    counts = Counter(order_ids)
+    duplicated = [index for index, order_id in enumerate(order_ids) if counts[order_id] > 1]
+    tie_rank = {index: rank for rank, index in enumerate(orders.in_sort_order(duplicated))}
+    order = sorted(range(len(rows)), key=lambda index: (order_ids[index], tie_rank.get(index, 0)))
+    return [rows[index] for index in order]
+
+
+def _money_texts(values: list[Any]) -> list[str]:
+    return ["0" if value is None or value == "" else str(value) for value in values]
+
+
+def _amount_texts(values: list[Any]) -> list[str]:
+    return [str(value or 0) for value in values]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
@@ -10,6 +11,7 @@ from typing import Any
 
 from src.application.services.phase3_explainability_replay import build_phase3_explainability_replay_pack
 from src.application.services.phase7_reporting_marts import build_phase7_reporting_marts_pack
+from src.application.services.snapshot_store import rows_by_key, sorted_rows
 
 REPORT_VERSION = "phase8-attribution-shadow-v1"
 
@@ -60,18 +62,14 @@ def build_phase8_attribution_shadow_pack(snapshot: dict[str, Any]) -> dict[str,
     phase3_snapshot = dict(snapshot.get("phase3_snapshot") or {})
     analytical_snapshot = dict(snapshot.get("analytical_snapshot") or {})
     legacy_shadow_observations = _sorted_rows(snapshot.get("legacy_shadow_observations", []))
-    approved_divergences = _sorted_rows(snapshot.get("approved_divergences", []))
-    lane_tolerances = _sorted_rows(snapshot.get("lane_tolerances", []))
+    approved_divergences = list(_sorted_rows(snapshot.get("approved_divergences", [])))
+    lane_tolerances = list(_sorted_rows(snapshot.get("lane_tolerances", [])))
 
     phase3_report = build_phase3_explainability_replay_pack(phase3_snapshot)
     analytical_report = build_phase7_reporting_marts_pack(analytical_snapshot)
 
     orders = _sorted_rows(phase3_snapshot.get("orders", []))
-    bindings_by_id = {
-        str(binding["id"]): dict(binding)
-        for binding in phase3_snapshot.get("bindings", [])
-        if binding.get("id") is not None
-    }
+    bindings_by_id = rows_by_key(phase3_snapshot.get("bindings", []), _row_id)
     order_cases_by_order_id = {
         str(item["order_id"]): dict(item)
         for item in phase3_report.get("order_cases", [])
@@ -926,18 +924,22 @@ def _resolve_primary_lane(lane_views: dict[str, Any]) -> str:
     return "direct_store"
 
 
-def _sorted_rows(rows: Any) -> list[dict[str, Any]]:
-    materialized = [dict(item) for item in rows or []]
-    return sorted(
-        materialized,
-        key=lambda item: (
-            str(item.get("lane_key") or ""),
-            str(item.get("order_id") or item.get("id") or ""),
-            str(item.get("approval_reference") or ""),
-        ),
+def _sorted_rows(rows: Any) -> Iterable[dict[str, Any]]:
+    return sorted_rows(rows, _row_sort_key)
+
+
+def _row_sort_key(item: dict[str, Any]) -> tuple[str, str, str]:
+    return (
+        str(item.get("lane_key") or ""),
+        str(item.get("order_id") or item.get("id") or ""),
+        str(item.get("approval_reference") or ""),
     )
 
 
+def _row_id(item: dict[str, Any]) -> str | None:
+    return str(item["id"]) if item.get("id") is not None else None
+
+
 def _string_or_none(value: Any) -> str | None:
     if value is None:
         return None
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Set
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
@@ -10,6 +11,7 @@ from typing import Any
 
 from src.application.services.phase4_reconciliation import build_phase4_settlement_reconciliation_pack
 from src.application.services.phase7_reporting_marts import build_phase7_reporting_marts_pack
+from src.application.services.snapshot_store import rows_grouped_by, sorted_rows
 
 REPORT_VERSION = "phase8-settlement-shadow-v1"
 
@@ -19,6 +21,97 @@ _WARNING_ONLY_CODES = {
 }
 
 
+@dataclass(frozen=True)
+class AmountCheck:
+    comparison_family: str
+    metric_key: str
+    mismatch_code: str
+    message: str
+
+    @property
+    def observed_field(self) -> str:
+        return f"observed_{self.metric_key}"
+
+
+_STATEMENT_AMOUNT_CHECKS = (
+    AmountCheck(
+        comparison_family="statement",
+        metric_key="available_amount",
+        mismatch_code="statement_available_amount_delta_exceeded",
+        message="Observed statement available amount differs from canonical statement truth beyond tolerance.",
+    ),
+    AmountCheck(
+        comparison_family="statement",
+        metric_key="reserve_amount",
+        mismatch_code="statement_reserve_amount_delta_exceeded",
+        message="Observed statement reserve amount differs from canonical statement truth beyond tolerance.",
+    ),
+    AmountCheck(
+        comparison_family="statement",
+        metric_key="adjustment_net_amount",
+        mismatch_code="statement_adjustment_net_amount_delta_exceeded",
+        message="Observed statement adjustment net amount differs from canonical statement truth beyond tolerance.",
+    ),
+)
+_LIABILITY_AMOUNT_CHECKS = (
+    AmountCheck(
+        comparison_family="liability",
+        metric_key="outstanding_statement_liability_amount",
+        mismatch_code="liability_outstanding_statement_amount_delta_exceeded",
+        message="Observed outstanding statement liability differs from canonical settlement truth beyond tolerance.",
+    ),
+    AmountCheck(
+        comparison_family="liability",
+        metric_key="completed_payout_amount",
+        mismatch_code="liability_completed_payout_amount_delta_exceeded",
+        message="Observed completed payout amount differs from canonical settlement truth beyond tolerance.",
+    ),
+    AmountCheck(
+        comparison_family="liability",
+        metric_key="total_active_reserve_amount",
+        mismatch_code="liability_total_active_reserve_amount_delta_exceeded",
+        message="Observed active reserve total differs from canonical settlement truth beyond tolerance.",
+    ),
+)
+_PAYOUT_DRY_RUN_AMOUNT_CHECKS = (
+    AmountCheck(
+        comparison_family="payout_dry_run",
+        metric_key="completed_payout_amount",
+        mismatch_code="payout_dry_run_completed_payout_amount_delta_exceeded",
+        message=(
+            "Observed dry-run completed payout amount differs from canonical settlement liability beyond tolerance."
+        ),
+    ),
+    AmountCheck(
+        comparison_family="payout_dry_run",
+        metric_key="outstanding_statement_liability_amount",
+        mismatch_code="payout_dry_run_outstanding_liability_amount_delta_exceeded",
+        message=(
+            "Observed dry-run outstanding liability differs from canonical settlement liability beyond tolerance."
+        ),
+    ),
+)
+_PARTNER_EXPORT_AMOUNT_CHECKS = (
+    AmountCheck(
+        comparison_family="partner_export",
+        metric_key="available_earnings_amount",
+        mismatch_code="partner_export_available_earnings_amount_mismatch",
+        message="Partner export available earnings amount differs from canonical partner reporting beyond tolerance.",
+    ),
+    AmountCheck(
+        comparison_family="partner_export",
+        metric_key="statement_liability_amount",
+        mismatch_code="partner_export_statement_liability_amount_mismatch",
+        message=(
+            "Partner export statement liability amount differs from canonical partner reporting beyond tolerance."
+        ),
+    ),
+)
+
+# (check, expected value, observed value) of one canonical object, before Decimal conversion.
+AmountComparison = tuple[AmountCheck, Any, Any]
+
+
 @dataclass(frozen=True)
 class SettlementShadowMismatch:
     code: str
@@ -43,7 +136,7 @@ class SettlementShadowMismatch:
         }
 
 
-def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, Any]:
+def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any], *, engine: str = "reference") -> dict[str, Any]:
     metadata = dict(snapshot.get("metadata") or {})
     phase4_snapshot = dict(snapshot.get("phase4_snapshot") or {})
     analytical_snapshot = dict(snapshot.get("analytical_snapshot") or {})
@@ -51,11 +144,11 @@ def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, A
     liability_shadow_observations = _sorted_rows(snapshot.get("liability_shadow_observations", []))
     payout_dry_run_observations = _sorted_rows(snapshot.get("payout_dry_run_observations", []))
     partner_export_observations = _sorted_rows(snapshot.get("partner_export_observations", []))
-    amount_tolerances = _sorted_rows(snapshot.get("amount_tolerances", []))
-    approved_divergences = _sorted_rows(snapshot.get("approved_divergences", []))
+    amount_tolerances = list(_sorted_rows(snapshot.get("amount_tolerances", [])))
+    approved_divergences = list(_sorted_rows(snapshot.get("approved_divergences", [])))
 
     phase4_report = build_phase4_settlement_reconciliation_pack(phase4_snapshot)
-    analytical_report = build_phase7_reporting_marts_pack(analytical_snapshot)
+    analytical_report = build_phase7_reporting_marts_pack(analytical_snapshot, engine=engine)
 
     statement_views_by_id = {
         str(item["statement_id"]): dict(item)
@@ -165,6 +258,24 @@ def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, A
         mismatches=mismatches,
     )
 
+    candidates = None
+    if engine == "columnar":
+        from src.application.services.phase8_settlement_shadow_columnar import amount_delta_candidates
+
+        candidates = amount_delta_candidates(
+            _amount_comparisons(
+                statement_views_by_id=statement_views_by_id,
+                statement_observations_by_id=statement_observations_by_id,
+                liability_views_by_partner_id=liability_views_by_partner_id,
+                liability_observations_by_partner=liability_observations_by_partner,
+                payout_views_by_instruction_id=payout_views_by_instruction_id,
+                payout_observations_by_instruction=payout_observations_by_instruction,
+                partner_reporting_rows_by_partner_id=partner_reporting_rows_by_partner_id,
+                export_observations_by_key=export_observations_by_key,
+            ),
+            tolerance_map,
+        )
+
     statement_shadow_views: list[dict[str, Any]] = []
     for statement_id in sorted(statement_views_by_id):
         canonical_view = statement_views_by_id[statement_id]
@@ -175,6 +286,7 @@ def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, A
             observation=observation,
             tolerance_map=tolerance_map,
             approved_divergences=approved_divergences,
+            candidates=candidates,
         )
         statement_shadow_views.append(view)
         mismatches.extend(view_mismatches)
@@ -209,6 +321,7 @@ def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, A
             observation=observation,
             tolerance_map=tolerance_map,
             approved_divergences=approved_divergences,
+            candidates=candidates,
         )
         liability_shadow_views.append(view)
         mismatches.extend(view_mismatches)
@@ -247,6 +360,7 @@ def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, A
             observation=observation,
             tolerance_map=tolerance_map,
             approved_divergences=approved_divergences,
+            candidates=candidates,
         )
         payout_dry_run_views.append(view)
         mismatches.extend(view_mismatches)
@@ -282,6 +396,7 @@ def build_phase8_settlement_shadow_pack(snapshot: dict[str, Any]) -> dict[str, A
             canonical_row=canonical_row,
             tolerance_map=tolerance_map,
             approved_divergences=approved_divergences,
+            candidates=candidates,
         )
         partner_export_views.append(view)
         mismatches.extend(view_mismatches)
@@ -364,6 +479,7 @@ def _build_statement_shadow_view(
     observation: dict[str, Any] | None,
     tolerance_map: dict[tuple[str, str], Decimal],
     approved_divergences: list[dict[str, Any]],
+    candidates: Set[tuple[str, str, str]] | None,
 ) -> tuple[dict[str, Any], list[SettlementShadowMismatch]]:
     mismatches: list[SettlementShadowMismatch] = []
     if observation is None:
@@ -413,45 +529,18 @@ def _build_statement_shadow_view(
             )
         )
 
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="statement_shadow",
-            source_reference=statement_id,
-            comparison_family="statement",
-            metric_key="available_amount",
-            expected_value=_to_decimal(canonical_view["statement_totals"]["available_amount"]),
-            observed_value=_to_decimal(observation.get("observed_available_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="statement_available_amount_delta_exceeded",
-            message="Observed statement available amount differs from canonical statement truth beyond tolerance.",
-        )
-    )
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="statement_shadow",
-            source_reference=statement_id,
-            comparison_family="statement",
-            metric_key="reserve_amount",
-            expected_value=_to_decimal(canonical_view["statement_totals"]["reserve_amount"]),
-            observed_value=_to_decimal(observation.get("observed_reserve_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="statement_reserve_amount_delta_exceeded",
-            message="Observed statement reserve amount differs from canonical statement truth beyond tolerance.",
-        )
-    )
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="statement_shadow",
-            source_reference=statement_id,
-            comparison_family="statement",
-            metric_key="adjustment_net_amount",
-            expected_value=_to_decimal(canonical_view["statement_totals"]["adjustment_net_amount"]),
-            observed_value=_to_decimal(observation.get("observed_adjustment_net_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="statement_adjustment_net_amount_delta_exceeded",
-            message="Observed statement adjustment net amount differs from canonical statement truth beyond tolerance.",
+    for check, expected_value, observed_value in _statement_amounts(canonical_view, observation):
+        mismatches.extend(
+            _compare_amount_delta(
+                source_family="statement_shadow",
+                source_reference=statement_id,
+                check=check,
+                expected_value=expected_value,
+                observed_value=observed_value,
+                tolerance_map=tolerance_map,
+                candidates=candidates,
+            )
         )
-    )
     mismatches = _approve_mismatches(mismatches=mismatches, approved_divergences=approved_divergences)
     return (
         {
@@ -475,6 +564,7 @@ def _build_liability_shadow_view(
     observation: dict[str, Any] | None,
     tolerance_map: dict[tuple[str, str], Decimal],
     approved_divergences: list[dict[str, Any]],
+    candidates: Set[tuple[str, str, str]] | None,
 ) -> tuple[dict[str, Any], list[SettlementShadowMismatch]]:
     mismatches: list[SettlementShadowMismatch] = []
     if observation is None:
@@ -506,50 +596,18 @@ def _build_liability_shadow_view(
             mismatches,
         )
 
-    liability_totals = canonical_view["liability_totals"]
-    reserve_totals = canonical_view["reserve_totals"]
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="liability_shadow",
-            source_reference=partner_account_id,
-            comparison_family="liability",
-            metric_key="outstanding_statement_liability_amount",
-            expected_value=_to_decimal(liability_totals["outstanding_statement_liability_amount"]),
-            observed_value=_to_decimal(observation.get("observed_outstanding_statement_liability_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="liability_outstanding_statement_amount_delta_exceeded",
-            message=(
-                "Observed outstanding statement liability differs from canonical "
-                "settlement truth beyond tolerance."
-            ),
-        )
-    )
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="liability_shadow",
-            source_reference=partner_account_id,
-            comparison_family="liability",
-            metric_key="completed_payout_amount",
-            expected_value=_to_decimal(liability_totals["completed_payout_amount"]),
-            observed_value=_to_decimal(observation.get("observed_completed_payout_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="liability_completed_payout_amount_delta_exceeded",
-            message="Observed completed payout amount differs from canonical settlement truth beyond tolerance.",
-        )
-    )
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="liability_shadow",
-            source_reference=partner_account_id,
-            comparison_family="liability",
-            metric_key="total_active_reserve_amount",
-            expected_value=_to_decimal(reserve_totals["total_active_reserve_amount"]),
-            observed_value=_to_decimal(observation.get("observed_total_active_reserve_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="liability_total_active_reserve_amount_delta_exceeded",
-            message="Observed active reserve total differs from canonical settlement truth beyond tolerance.",
+    for check, expected_value, observed_value in _liability_amounts(canonical_view, observation):
+        mismatches.extend(
+            _compare_amount_delta(
+                source_family="liability_shadow",
+                source_reference=partner_account_id,
+                check=check,
+                expected_value=expected_value,
+                observed_value=observed_value,
+                tolerance_map=tolerance_map,
+                candidates=candidates,
+            )
         )
-    )
     mismatches = _approve_mismatches(mismatches=mismatches, approved_divergences=approved_divergences)
     return (
         {
@@ -574,6 +632,7 @@ def _build_payout_dry_run_view(
     observation: dict[str, Any] | None,
     tolerance_map: dict[tuple[str, str], Decimal],
     approved_divergences: list[dict[str, Any]],
+    candidates: Set[tuple[str, str, str]] | None,
 ) -> tuple[dict[str, Any], list[SettlementShadowMismatch]]:
     mismatches: list[SettlementShadowMismatch] = []
     if not dry_run_executions:
@@ -675,39 +734,18 @@ def _build_payout_dry_run_view(
             )
         )
 
-    liability_totals = dict((liability_view or {}).get("liability_totals") or {})
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="payout_dry_run",
-            source_reference=instruction_id,
-            comparison_family="payout_dry_run",
-            metric_key="completed_payout_amount",
-            expected_value=_to_decimal(liability_totals.get("completed_payout_amount", 0)),
-            observed_value=_to_decimal(observation.get("observed_completed_payout_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="payout_dry_run_completed_payout_amount_delta_exceeded",
-            message=(
-                "Observed dry-run completed payout amount differs from canonical "
-                "settlement liability beyond tolerance."
-            ),
-        )
-    )
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="payout_dry_run",
-            source_reference=instruction_id,
-            comparison_family="payout_dry_run",
-            metric_key="outstanding_statement_liability_amount",
-            expected_value=_to_decimal(liability_totals.get("outstanding_statement_liability_amount", 0)),
-            observed_value=_to_decimal(observation.get("observed_outstanding_statement_liability_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="payout_dry_run_outstanding_liability_amount_delta_exceeded",
-            message=(
-                "Observed dry-run outstanding liability differs from canonical "
-                "settlement liability beyond tolerance."
-            ),
+    for check, expected_value, observed_value in _payout_dry_run_amounts(liability_view, observation):
+        mismatches.extend(
+            _compare_amount_delta(
+                source_family="payout_dry_run",
+                source_reference=instruction_id,
+                check=check,
+                expected_value=expected_value,
+                observed_value=observed_value,
+                tolerance_map=tolerance_map,
+                candidates=candidates,
+            )
         )
-    )
     mismatches = _approve_mismatches(mismatches=mismatches, approved_divergences=approved_divergences)
     return (
         {
@@ -732,6 +770,7 @@ def _build_partner_export_view(
     canonical_row: dict[str, Any] | None,
     tolerance_map: dict[tuple[str, str], Decimal],
     approved_divergences: list[dict[str, Any]],
+    candidates: Set[tuple[str, str, str]] | None,
 ) -> tuple[dict[str, Any], list[SettlementShadowMismatch]]:
     partner_account_id = _string_or_none(observation.get("partner_account_id"))
     mismatches: list[SettlementShadowMismatch] = []
@@ -782,38 +821,18 @@ def _build_partner_export_view(
             )
         )
 
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="partner_export",
-            source_reference=export_key,
-            comparison_family="partner_export",
-            metric_key="available_earnings_amount",
-            expected_value=_to_decimal(canonical_row.get("available_earnings_amount")),
-            observed_value=_to_decimal(observation.get("observed_available_earnings_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="partner_export_available_earnings_amount_mismatch",
-            message=(
-                "Partner export available earnings amount differs from canonical "
-                "partner reporting beyond tolerance."
-            ),
-        )
-    )
-    mismatches.extend(
-        _compare_amount_delta(
-            source_family="partner_export",
-            source_reference=export_key,
-            comparison_family="partner_export",
-            metric_key="statement_liability_amount",
-            expected_value=_to_decimal(canonical_row.get("statement_liability_amount")),
-            observed_value=_to_decimal(observation.get("observed_statement_liability_amount")),
-            tolerance_map=tolerance_map,
-            mismatch_code="partner_export_statement_liability_amount_mismatch",
-            message=(
-                "Partner export statement liability amount differs from canonical "
-                "partner reporting beyond tolerance."
-            ),
+    for check, expected_value, observed_value in _partner_export_amounts(canonical_row, observation):
+        mismatches.extend(
+            _compare_amount_delta(
+                source_family="partner_export",
+                source_reference=export_key,
+                check=check,
+                expected_value=expected_value,
+                observed_value=observed_value,
+                tolerance_map=tolerance_map,
+                candidates=candidates,
+            )
         )
-    )
 
     observed_currency_codes = _sorted_strings(observation.get("observed_currency_codes") or [])
     expected_currency_codes = _sorted_strings(canonical_row.get("currency_codes") or [])
@@ -848,6 +867,42 @@ def _build_partner_export_view(
     )
 
 
+def _amount_comparisons(
+    *,
+    statement_views_by_id: dict[str, dict[str, Any]],
+    statement_observations_by_id: dict[str, dict[str, Any]],
+    liability_views_by_partner_id: dict[str, dict[str, Any]],
+    liability_observations_by_partner: dict[str, dict[str, Any]],
+    payout_views_by_instruction_id: dict[str, dict[str, Any]],
+    payout_observations_by_instruction: dict[str, dict[str, Any]],
+    partner_reporting_rows_by_partner_id: dict[str, dict[str, Any]],
+    export_observations_by_key: dict[str, dict[str, Any]],
+) -> Iterator[tuple[str, AmountComparison]]:
+    """Yield ``(source_reference, comparison)`` for every amount check the view builders will run."""
+    for statement_id, canonical_view in statement_views_by_id.items():
+        observation = statement_observations_by_id.get(statement_id)
+        if observation is not None:
+            for comparison in _statement_amounts(canonical_view, observation):
+                yield statement_id, comparison
+    for partner_account_id, canonical_view in liability_views_by_partner_id.items():
+        observation = liability_observations_by_partner.get(partner_account_id)
+        if observation is not None:
+            for comparison in _liability_amounts(canonical_view, observation):
+                yield partner_account_id, comparison
+    for instruction_id, canonical_view in payout_views_by_instruction_id.items():
+        observation = payout_observations_by_instruction.get(instruction_id)
+        if observation is not None:
+            liability_view = liability_views_by_partner_id.get(str(canonical_view.get("partner_account_id") or ""))
+            for comparison in _payout_dry_run_amounts(liability_view, observation):
+                yield instruction_id, comparison
+    for export_key, observation in export_observations_by_key.items():
+        partner_account_id = _string_or_none(observation.get("partner_account_id"))
+        canonical_row = partner_reporting_rows_by_partner_id.get(partner_account_id or "")
+        if canonical_row is not None:
+            for comparison in _partner_export_amounts(canonical_row, observation):
+                yield export_key, comparison
+
+
 def _unique_observations_by_key(
     *,
     rows: list[dict[str, Any]],
@@ -910,29 +965,32 @@ def _compare_amount_delta(
     *,
     source_family: str,
     source_reference: str,
-    comparison_family: str,
-    metric_key: str,
-    expected_value: Decimal,
-    observed_value: Decimal,
+    check: AmountCheck,
+    expected_value: Any,
+    observed_value: Any,
     tolerance_map: dict[tuple[str, str], Decimal],
-    mismatch_code: str,
-    message: str,
+    candidates: Set[tuple[str, str, str]] | None,
 ) -> list[SettlementShadowMismatch]:
-    tolerance = tolerance_map.get((comparison_family, metric_key), Decimal("0.00"))
-    delta = abs(observed_value - expected_value)
+    # ``candidates`` holds the comparisons the columnar engine could not rule out; all others are within tolerance.
+    if candidates is not None and (check.comparison_family, check.metric_key, source_reference) not in candidates:
+        return []
+    expected = _to_decimal(expected_value)
+    observed = _to_decimal(observed_value)
+    tolerance = tolerance_map.get((check.comparison_family, check.metric_key), Decimal("0.00"))
+    delta = abs(observed - expected)
     if delta <= tolerance:
         return []
     return [
         SettlementShadowMismatch(
-            code=mismatch_code,
+            code=check.mismatch_code,
             severity="blocking",
             source_family=source_family,
             source_reference=source_reference,
-            message=message,
+            message=check.message,
             details={
-                "metric_key": metric_key,
-                "expected_value": float(expected_value),
-                "observed_value": float(observed_value),
+                "metric_key": check.metric_key,
+                "expected_value": float(expected),
+                "observed_value": float(observed),
                 "delta_amount": float(delta),
                 "max_delta_amount": float(tolerance),
             },
@@ -940,6 +998,44 @@ def _compare_amount_delta(
     ]
 
 
+def _statement_amounts(canonical_view: dict[str, Any], observation: dict[str, Any]) -> list[AmountComparison]:
+    totals = canonical_view["statement_totals"]
+    return [
+        (check, totals[check.metric_key], observation.get(check.observed_field)) for check in _STATEMENT_AMOUNT_CHECKS
+    ]
+
+
+def _liability_amounts(canonical_view: dict[str, Any], observation: dict[str, Any]) -> list[AmountComparison]:
+    liability_totals = canonical_view["liability_totals"]
+    reserve_totals = canonical_view["reserve_totals"]
+    outstanding, completed, reserve = _LIABILITY_AMOUNT_CHECKS
+    return [
+        (check, totals[check.metric_key], observation.get(check.observed_field))
+        for check, totals in (
+            (outstanding, liability_totals),
+            (completed, liability_totals),
+            (reserve, reserve_totals),
+        )
+    ]
+
+
+def _payout_dry_run_amounts(
+    liability_view: dict[str, Any] | None, observation: dict[str, Any]
+) -> list[AmountComparison]:
+    liability_totals = dict((liability_view or {}).get("liability_totals") or {})
+    return [
+        (check, liability_totals.get(check.metric_key, 0), observation.get(check.observed_field))
+        for check in _PAYOUT_DRY_RUN_AMOUNT_CHECKS
+    ]
+
+
+def _partner_export_amounts(canonical_row: dict[str, Any], observation: dict[str, Any]) -> list[AmountComparison]:
+    return [
+        (check, canonical_row.get(check.metric_key), observation.get(check.observed_field))
+        for check in _PARTNER_EXPORT_AMOUNT_CHECKS
+    ]
+
+
 def _approve_mismatches(
     *, mismatches: list[SettlementShadowMismatch], approved_divergences: list[dict[str, Any]]
 ) -> list[SettlementShadowMismatch]:
@@ -986,41 +1082,35 @@ def _match_approved_divergence(
     return None
 
 
-def _payout_executions_by_instruction(rows: Any) -> dict[str, list[dict[str, Any]]]:
-    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for row in rows or []:
-        materialized = dict(row)
-        if str(materialized.get("execution_mode")) != "dry_run":
-            continue
-        instruction_id = _string_or_none(materialized.get("payout_instruction_id"))
-        if instruction_id is None:
-            continue
-        grouped[instruction_id].append(materialized)
-    for instruction_id in grouped:
-        grouped[instruction_id] = sorted(
-            grouped[instruction_id],
-            key=lambda item: (
-                _normalize_timestamp(item.get("created_at")),
-                str(item.get("id", "")),
-            ),
-        )
-    return grouped
-
-
-def _sorted_rows(rows: Any) -> list[dict[str, Any]]:
-    materialized = [dict(item) for item in rows or []]
-    return sorted(
-        materialized,
-        key=lambda item: (
-            str(item.get("source_family") or item.get("comparison_family") or ""),
-            str(
-                item.get("statement_id")
-                or item.get("partner_account_id")
-                or item.get("payout_instruction_id")
-                or item.get("export_key")
-                or item.get("id")
-                or ""
-            ),
+def _payout_executions_by_instruction(rows: Any) -> Mapping[str, list[dict[str, Any]]]:
+    # Sorting first and grouping in that order equals sorting each group: both sorts are stable.
+    return rows_grouped_by(sorted_rows(rows, _execution_sort_key), _dry_run_instruction_id)
+
+
+def _execution_sort_key(item: dict[str, Any]) -> tuple[str, str]:
+    return (_normalize_timestamp(item.get("created_at")), str(item.get("id", "")))
+
+
+def _dry_run_instruction_id(item: dict[str, Any]) -> str | None:
+    if str(item.get("execution_mode")) != "dry_run":
+        return None
+    return _string_or_none(item.get("payout_instruction_id"))
+
+
+def _sorted_rows(rows: Any) -> Iterable[dict[str, Any]]:
+    return sorted_rows(rows, _row_sort_key)
+
+
+def _row_sort_key(item: dict[str, Any]) -> tuple[str, str]:
+    return (
+        str(item.get("source_family") or item.get("comparison_family") or ""),
+        str(
+            item.get("statement_id")
+            or item.get("partner_account_id")
+            or item.get("payout_instruction_id")
+            or item.get("export_key")
+            or item.get("id")
+            or ""
         ),
     )
 
@@ -0,0 +1,88 @@
+"""Columnar amount comparisons for the Phase 8 settlement shadow pack.
+
+Every canonical statement, liability, payout instruction and partner export is
+compared with its shadow observation on a few money metrics. Instead of
+building a ``Decimal`` pair per object and metric, the values of each metric
+are parsed into fixed-point int64 columns once (every distinct text a single
+time) and the deltas are checked against the metric tolerance for the whole
+column. Only the comparisons that are not provably within tolerance go back
+through the reference ``Decimal`` path, which also builds their mismatches, so
+both engines produce the same pack. A metric whose values the fixed-point path
+cannot reproduce exactly leaves all of its comparisons to the reference path.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from types import ModuleType
+from typing import Any
+
+from src.application.services.columnar_tables import (
+    ColumnarFallback,
+    DecimalColumn,
+    decimal_column,
+    paused_gc,
+    require_numpy,
+)
+from src.application.services.phase8_settlement_shadow import AmountComparison
+
+# Scaled values stay below 2**61, so the difference of two never overflows int64.
+_MAX_SCALE = 18
+_MAX_SCALED_MAGNITUDE = 2**61
+
+
+def amount_delta_candidates(
+    comparisons: Iterable[tuple[str, AmountComparison]],
+    tolerance_map: Mapping[tuple[str, str], Decimal],
+) -> set[tuple[str, str, str]]:
+    """Return ``(comparison_family, metric_key, source_reference)`` of comparisons that may exceed tolerance."""
+    np = require_numpy()
+    metrics: dict[tuple[str, str], tuple[list[str], list[str], list[str]]] = {}
+    with paused_gc():
+        for source_reference, (check, expected_value, observed_value) in comparisons:
+            references, expected, observed = metrics.setdefault(
+                (check.comparison_family, check.metric_key), ([], [], [])
+            )
+            references.append(source_reference)
+            expected.append(_amount_text(expected_value))
+            observed.append(_amount_text(observed_value))
+
+    candidates: set[tuple[str, str, str]] = set()
+    for (comparison_family, metric_key), (references, expected, observed) in metrics.items():
+        tolerance = tolerance_map.get((comparison_family, metric_key), Decimal("0.00"))
+        try:
+            beyond = _beyond_tolerance(np, decimal_column(np, expected), decimal_column(np, observed), tolerance)
+        except ColumnarFallback:
+            candidates.update((comparison_family, metric_key, reference) for reference in references)
+            continue
+        candidates.update((comparison_family, metric_key, references[index]) for index in np.flatnonzero(beyond))
+    return candidates
+
+
+def _amount_text(value: Any) -> str:
+    # Same text the reference ``_to_decimal`` parses.
+    return "0" if value is None else str(value)
+
+
+def _beyond_tolerance(np: ModuleType, expected: DecimalColumn, observed: DecimalColumn, tolerance: Decimal) -> Any:
+    """``abs(observed - expected) > tolerance`` per row, evaluated exactly in shared minor units."""
+    if not tolerance.is_finite():
+        raise ColumnarFallback("tolerance is not a finite decimal")
+    sign, digits, exponent = tolerance.as_tuple()
+    scale = max(expected.scale, observed.scale, -int(exponent), 0)
+    if scale > _MAX_SCALE:
+        raise ColumnarFallback("tolerance does not fit int64 minor units")
+    limit = int("".join(map(str, digits))) * 10 ** (int(exponent) + scale)
+    if limit >= _MAX_SCALED_MAGNITUDE:
+        raise ColumnarFallback("tolerance does not fit int64 minor units")
+    delta = np.abs(_scaled(np, observed, scale) - _scaled(np, expected, scale))
+    return delta > (-limit if sign else limit)
+
+
+def _scaled(np: ModuleType, column: DecimalColumn, scale: int) -> Any:
+    factor = 10 ** (scale - column.scale)
+    if int(column.magnitude.max(initial=0)) * factor >= _MAX_SCALED_MAGNITUDE:
+        raise ColumnarFallback("amount does not fit int64 minor units")
+    magnitude = column.magnitude * factor
+    return np.where(column.negative, -magnitude, magnitude)
@@ -0,0 +1,479 @@
+"""Streaming, disk-backed snapshots for the phase reconciliation pack builders.
+
+A streaming snapshot is a directory instead of one JSON document::
+
+    snapshot/
+        metadata.json              # small scalar sections (metadata, totals, ...)
+        orders.ndjson.gz           # one table per file: .ndjson/.jsonl, optionally .gz, or .parquet
+        refunds.ndjson
+        phase4_snapshot/           # nested snapshots are subdirectories with the same layout
+            metadata.json
+            earning_events.ndjson
+
+Tables are read incrementally into a temporary SQLite database on first use,
+so a builder never holds a whole table in memory. Ordered iteration walks a
+B-tree index built from the builder's sort key (SQLite spills to disk), and
+joins go through keyed indexes instead of Python dicts. ``sorted_rows``,
+``rows_by_key`` and ``rows_grouped_by`` accept either plain lists (the legacy
+JSON snapshots) or ``SnapshotTable`` and return the same shapes, so every
+builder keeps a single code path.
+
+Optional dependencies:
+- ``parquet``: ``pyarrow``
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import IO, Any
+
+Row = dict[str, Any]
+SortKey = Callable[[Row], tuple[str, ...]]
+RowKey = Callable[[Row], str | None]
+
+METADATA_FILE = "metadata.json"
+TABLE_SUFFIXES = (".ndjson.gz", ".jsonl.gz", ".ndjson", ".jsonl", ".parquet")
+
+_BATCH_SIZE = 5000
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return str(value)
+
+
+def _encode_row(row: Row) -> str:
+    return json.dumps(row, default=_json_default, separators=(",", ":"))
+
+
+def _batched(rows: Iterable[Any], size: int = _BATCH_SIZE) -> Iterator[list[Any]]:
+    batch: list[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _open_text(path: Path) -> IO[str]:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def iter_ndjson_rows(path: Path) -> Iterator[Row]:
+    """Yield one row per non-blank line of an NDJSON (optionally gzip) file."""
+    with _open_text(path) as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_parquet_rows(path: Path) -> Iterator[Row]:
+    """Yield rows of a Parquet file one record batch at a time."""
+    try:
+        import pyarrow.parquet as pq  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise RuntimeError("Parquet snapshot tables require the 'pyarrow' package") from exc
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=_BATCH_SIZE):
+        yield from batch.to_pylist()
+
+
+def iter_table_file(path: Path) -> Iterator[Row]:
+    if path.name.endswith(".parquet"):
+        return iter_parquet_rows(path)
+    return iter_ndjson_rows(path)
+
+
+def write_ndjson_rows(path: Path, rows: Iterable[Row]) -> int:
+    """Write ``rows`` as NDJSON (gzip when the name ends in ``.gz``); returns the row count."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    opener = gzip.open if path.name.endswith(".gz") else open
+    count = 0
+    with opener(path, "wt", encoding="utf-8") as handle:
+        for batch in _batched(rows):
+            handle.write("".join(_encode_row(row) + "\n" for row in batch))
+            count += len(batch)
+    return count
+
+
+def write_streaming_snapshot(snapshot: Mapping[str, Any], directory: Path, *, compress: bool = True) -> None:
+    """Write a legacy in-memory snapshot in the streaming layout.
+
+    Lists of rows become table files, nested dicts that contain row lists
+    become subdirectories and everything else goes to ``metadata.json``.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    scalars: dict[str, Any] = {}
+    suffix = ".ndjson.gz" if compress else ".ndjson"
+    for name, value in snapshot.items():
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            write_ndjson_rows(directory / f"{name}{suffix}", value)
+        elif isinstance(value, dict) and any(isinstance(item, list) for item in value.values()):
+            write_streaming_snapshot(value, directory / name, compress=compress)
+        else:
+            scalars[name] = value
+    (directory / METADATA_FILE).write_text(json.dumps(scalars, default=_json_default), encoding="utf-8")
+
+
+class SnapshotStore:
+    """Temporary SQLite database holding the tables of one streaming snapshot."""
+
+    def __init__(self, *, cache_size_kib: int = 65536) -> None:
+        self._directory = Path(tempfile.mkdtemp(prefix="snapshot-store-"))
+        self.connection = sqlite3.connect(self._directory / "rows.sqlite3")
+        # Scratch data: no journal or fsync, and a fixed page cache so memory stays bounded.
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("PRAGMA temp_store = FILE")
+        self.connection.execute(f"PRAGMA cache_size = -{int(cache_size_kib)}")
+        self._next_name = 0
+
+    def new_name(self, prefix: str) -> str:
+        self._next_name += 1
+        return f"{prefix}_{self._next_name}"
+
+    def close(self) -> None:
+        self.connection.close()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+class SnapshotTable:
+    """A snapshot table kept on disk; iterable any number of times, in file order."""
+
+    def __init__(self, store: SnapshotStore, source: Callable[[], Iterable[Row]]) -> None:
+        self._store = store
+        self._source: Callable[[], Iterable[Row]] | None = source
+        self._name = store.new_name("rows")
+        self._sorted: dict[SortKey, SnapshotTable] = {}
+        self._indexes: dict[RowKey, _KeyIndex] = {}
+
+    @property
+    def name(self) -> str:
+        self._ingest()
+        return self._name
+
+    def _ingest(self) -> None:
+        if self._source is None:
+            return
+        source, self._source = self._source, None
+        connection = self._store.connection
+        connection.execute(f"CREATE TABLE {self._name} (seq INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+        for batch in _batched(source()):
+            connection.executemany(
+                f"INSERT INTO {self._name} (data) VALUES (?)",  # noqa: S608 - generated identifier
+                [(_encode_row(row),) for row in batch],
+            )
+        connection.commit()
+
+    def _data_table(self) -> str:
+        return self.name
+
+    def _select(self) -> str:
+        return f"SELECT seq, data FROM {self.name} ORDER BY seq"  # noqa: S608 - generated identifier
+
+    def _iter_seq_rows(self) -> Iterator[tuple[int, Row]]:
+        cursor = self._store.connection.execute(self._select())
+        while batch := cursor.fetchmany(_BATCH_SIZE):
+            for seq, data in batch:
+                yield seq, json.loads(data)
+
+    def __iter__(self) -> Iterator[Row]:
+        for _seq, row in self._iter_seq_rows():
+            yield row
+
+    def __len__(self) -> int:
+        (count,) = self._store.connection.execute(f"SELECT count(*) FROM {self.name}").fetchone()  # noqa: S608
+        return int(count)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def scan(self) -> Iterator[Row]:
+        """Iterate once in file order, reading the source directly unless the table is already ingested.
+
+        For single-pass consumers that never sort or index the table, this
+        skips the round trip through the on-disk store.
+        """
+        if self._source is None:
+            return iter(self)
+        return iter(self._source())
+
+    def sorted_by(self, key: SortKey) -> SnapshotTable:
+        """Return a view iterating in ``key`` order (ties keep file order), backed by an on-disk index."""
+        view = self._sorted.get(key)
+        if view is None:
+            view = _SortedSnapshotTable(self, key)
+            self._sorted[key] = view
+        return view
+
+    def index(self, key: RowKey) -> _KeyIndex:
+        index = self._indexes.get(key)
+        if index is None:
+            index = _KeyIndex(self, key)
+            self._indexes[key] = index
+        return index
+
+
+class _SortedSnapshotTable(SnapshotTable):
+    def __init__(self, base: SnapshotTable, key: SortKey) -> None:
+        super().__init__(base._store, lambda: ())
+        self._base = base
+        self._key = key
+        self._base_name = ""
+        self._columns: list[str] = []
+
+    def scan(self) -> Iterator[Row]:
+        return iter(self)
+
+    def _ingest(self) -> None:
+        if self._source is None:
+            return
+        self._source = None
+        connection = self._store.connection
+        self._base_name = self._base._data_table()
+        entries = ((*self._key(row), seq) for seq, row in self._base._iter_seq_rows())
+        for batch in _batched(entries):
+            if not self._columns:
+                self._create(width=len(batch[0]) - 1)
+            placeholders = ", ".join("?" for _ in batch[0])
+            connection.executemany(f"INSERT INTO {self._name} VALUES ({placeholders})", batch)  # noqa: S608
+        if not self._columns:
+            self._create(width=1)
+        connection.execute(f"CREATE INDEX {self._name}_order ON {self._name} ({', '.join(self._columns)}, seq)")
+        connection.commit()
+
+    def _data_table(self) -> str:
+        return self._base._data_table()
+
+    def _create(self, *, width: int) -> None:
+        self._columns = [f"k{position}" for position in range(width)]
+        self._store.connection.execute(
+            f"CREATE TABLE {self._name} ({', '.join(f'{column} TEXT' for column in self._columns)}, seq INTEGER)"
+        )
+
+    def _select(self) -> str:
+        name = self.name
+        order = ", ".join(f"o.{column}" for column in self._columns)
+        return (
+            f"SELECT r.seq, r.data FROM {name} AS o JOIN {self._base_name} AS r ON r.seq = o.seq "  # noqa: S608
+            f"ORDER BY {order}, o.seq"
+        )
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+
+class _KeyIndex:
+    """Rows of a table keyed by ``key(row)``; rows whose key is ``None`` are left out."""
+
+    def __init__(self, table: SnapshotTable, key: RowKey) -> None:
+        self._table = table
+        connection = table._store.connection
+        self._name = table._store.new_name("idx")
+        connection.execute(f"CREATE TABLE {self._name} (key TEXT NOT NULL, pos INTEGER NOT NULL, seq INTEGER)")
+        entries = (
+            (row_key, position, seq)
+            for position, (seq, row) in enumerate(table._iter_seq_rows())
+            if (row_key := key(row)) is not None
+        )
+        for batch in _batched(entries):
+            connection.executemany(f"INSERT INTO {self._name} VALUES (?, ?, ?)", batch)  # noqa: S608
+        connection.execute(f"CREATE INDEX {self._name}_key ON {self._name} (key, pos)")
+        connection.commit()
+        self._base_name = table._data_table()
+
+    def _query(self, sql: str, parameters: tuple[Any, ...] = ()) -> sqlite3.Cursor:
+        return self._table._store.connection.execute(sql, parameters)
+
+    def last(self, key: str) -> Row | None:
+        row = self._query(
+            f"SELECT r.data FROM {self._name} AS i JOIN {self._base_name} AS r ON r.seq = i.seq "  # noqa: S608
+            "WHERE i.key = ? ORDER BY i.pos DESC LIMIT 1",
+            (key,),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def all(self, key: str) -> list[Row]:
+        cursor = self._query(
+            f"SELECT r.data FROM {self._name} AS i JOIN {self._base_name} AS r ON r.seq = i.seq "  # noqa: S608
+            "WHERE i.key = ? ORDER BY i.pos",
+            (key,),
+        )
+        return [json.loads(data) for (data,) in cursor.fetchall()]
+
+    def contains(self, key: str) -> bool:
+        return self._query(f"SELECT 1 FROM {self._name} WHERE key = ? LIMIT 1", (key,)).fetchone() is not None  # noqa: S608
+
+    def keys(self) -> Iterator[str]:
+        cursor = self._query(f"SELECT key FROM {self._name} GROUP BY key ORDER BY min(pos)")  # noqa: S608
+        while batch := cursor.fetchmany(_BATCH_SIZE):
+            for (key,) in batch:
+                yield key
+
+    def key_count(self) -> int:
+        (count,) = self._query(f"SELECT count(DISTINCT key) FROM {self._name}").fetchone()  # noqa: S608
+        return int(count)
+
+
+class RowsByKey(Mapping[str, Row]):
+    """``{key: row}`` over an index, keeping the last row per key like a dict comprehension."""
+
+    def __init__(self, index: _KeyIndex) -> None:
+        self._index = index
+
+    def __getitem__(self, key: str) -> Row:
+        row = self._index.last(key) if isinstance(key, str) else None
+        if row is None:
+            raise KeyError(key)
+        return row
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._index.contains(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._index.keys()
+
+    def __len__(self) -> int:
+        return self._index.key_count()
+
+
+class RowsGroupedByKey(Mapping[str, list[Row]]):
+    """``{key: [rows...]}`` over an index, rows in table order."""
+
+    def __init__(self, index: _KeyIndex) -> None:
+        self._index = index
+
+    def __getitem__(self, key: str) -> list[Row]:
+        rows = self._index.all(key) if isinstance(key, str) else []
+        if not rows:
+            raise KeyError(key)
+        return rows
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._index.contains(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._index.keys()
+
+    def __len__(self) -> int:
+        return self._index.key_count()
+
+
+def sorted_rows(rows: Iterable[Row] | None, key: SortKey) -> list[Row] | SnapshotTable:
+    """Rows in ``key`` order: an on-disk sorted view for tables, a sorted list of copies otherwise."""
+    if isinstance(rows, SnapshotTable):
+        return rows.sorted_by(key)
+    return sorted((dict(item) for item in rows or []), key=key)
+
+
+def rows_by_key(rows: Iterable[Row], key: RowKey) -> Mapping[str, Row]:
+    """Map ``key(row)`` to the last row with that key, skipping rows keyed ``None``."""
+    if isinstance(rows, SnapshotTable):
+        return RowsByKey(rows.index(key))
+    result: dict[str, Row] = {}
+    for row in rows:
+        row_key = key(row)
+        if row_key is not None:
+            result[row_key] = row
+    return result
+
+
+def rows_grouped_by(rows: Iterable[Row], key: RowKey) -> Mapping[str, list[Row]]:
+    """Map ``key(row)`` to every row with that key in iteration order, skipping rows keyed ``None``."""
+    if isinstance(rows, SnapshotTable):
+        return RowsGroupedByKey(rows.index(key))
+    result: dict[str, list[Row]] = {}
+    for row in rows:
+        row_key = key(row)
+        if row_key is not None:
+            result.setdefault(row_key, []).append(row)
+    return result
+
+
+class StreamingSnapshot(Mapping[str, Any]):
+    """Read-only mapping view of a streaming snapshot directory."""
+
+    def __init__(self, directory: Path, *, store: SnapshotStore | None = None) -> None:
+        self._directory = directory
+        self._owns_store = store is None
+        self._store = store or SnapshotStore()
+        metadata_path = directory / METADATA_FILE
+        self._scalars: dict[str, Any] = (
+            json.loads(metadata_path.read_text(encoding="utf-8")) if metadata_path.exists() else {}
+        )
+        self._table_paths: dict[str, Path] = {}
+        self._nested_paths: dict[str, Path] = {}
+        for path in sorted(directory.iterdir()):
+            if path.is_dir():
+                self._nested_paths[path.name] = path
+                continue
+            for suffix in TABLE_SUFFIXES:
+                if path.name.endswith(suffix):
+                    self._table_paths[path.name[: -len(suffix)]] = path
+                    break
+        self._loaded: dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._loaded:
+            return self._loaded[name]
+        if name in self._table_paths:
+            path = self._table_paths[name]
+            value: Any = SnapshotTable(self._store, lambda: iter_table_file(path))
+        elif name in self._nested_paths:
+            value = StreamingSnapshot(self._nested_paths[name], store=self._store)
+        elif name in self._scalars:
+            return self._scalars[name]
+        else:
+            raise KeyError(name)
+        self._loaded[name] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._scalars
+        yield from (name for name in self._table_paths if name not in self._scalars)
+        yield from (name for name in self._nested_paths if name not in self._scalars)
+
+    def __len__(self) -> int:
+        return len(set(self._scalars) | set(self._table_paths) | set(self._nested_paths))
+
+    def close(self) -> None:
+        if self._owns_store:
+            self._store.close()
+
+    def __enter__(self) -> StreamingSnapshot:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+class _LoadedSnapshot(dict[str, Any]):
+    def __enter__(self) -> dict[str, Any]:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+
+def open_snapshot(path: Path) -> StreamingSnapshot | _LoadedSnapshot:
+    """Open a snapshot directory for streaming, or load a legacy single-file JSON snapshot.
+
+    Use the result as a context manager so the temporary store is removed afterwards.
+    """
+    if path.is_dir():
+        return StreamingSnapshot(path)
+    return _LoadedSnapshot(json.loads(path.read_text(encoding="utf-8")))
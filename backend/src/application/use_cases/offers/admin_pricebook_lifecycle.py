@@ -9,6 +9,7 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.application.use_cases.public_catalog.catalog_cache import public_catalog_cache
 from src.domain.entities.commercial_context import (
     COUNTRY_CURRENCY_DEFAULTS,
     normalize_country_code,
@@ -109,6 +110,7 @@ class AdminPricebookLifecycleUseCase:
             raise
 
         _record_pricebook_lifecycle(action="update", status="success")
+        public_catalog_cache.invalidate_after_commit(self._session)
         return PricebookLifecycleResult(
             pricebook=updated,
             action=PRICEBOOK_UPDATED_ACTION,
@@ -137,6 +139,7 @@ class AdminPricebookLifecycleUseCase:
             raise
 
         _record_pricebook_lifecycle(action="publish", status="success")
+        public_catalog_cache.invalidate_after_commit(self._session)
         return PricebookLifecycleResult(
             pricebook=updated,
             action=PRICEBOOK_PUBLISHED_ACTION,
@@ -161,6 +164,7 @@ class AdminPricebookLifecycleUseCase:
             raise
 
         _record_pricebook_lifecycle(action="schedule", status="success")
+        public_catalog_cache.invalidate_after_commit(self._session)
         return PricebookLifecycleResult(
             pricebook=updated,
             action=PRICEBOOK_SCHEDULED_ACTION,
@@ -215,6 +219,7 @@ class AdminPricebookLifecycleUseCase:
             raise
 
         _record_pricebook_lifecycle(action="rollback", status="success")
+        public_catalog_cache.invalidate_after_commit(self._session)
         return PricebookLifecycleResult(
             pricebook=created,
             action=PRICEBOOK_ROLLED_BACK_ACTION,
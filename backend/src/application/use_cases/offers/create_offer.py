@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.application.use_cases.public_catalog.catalog_cache import public_catalog_cache
 from src.infrastructure.database.models.offer_model import OfferModel
 from src.infrastructure.database.models.plan_addon_model import PlanAddonModel
 from src.infrastructure.database.models.subscription_plan_model import SubscriptionPlanModel
@@ -65,4 +66,6 @@ class CreateOfferUseCase:
             effective_to=effective_to,
             is_active=is_active,
         )
-        return await self._repo.create(model)
+        created = await self._repo.create(model)
+        public_catalog_cache.invalidate_after_commit(self._session)
+        return created
@@ -4,6 +4,7 @@ from datetime import UTC, datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.application.use_cases.public_catalog.catalog_cache import public_catalog_cache
 from src.infrastructure.database.models.merchant_profile_model import MerchantProfileModel
 from src.infrastructure.database.models.pricebook_model import PricebookEntryModel, PricebookModel
 from src.infrastructure.database.models.storefront_model import StorefrontModel
@@ -73,4 +74,6 @@ class CreatePricebookUseCase:
                 for entry in entries
             ],
         )
-        return await self._repo.create(model)
+        created = await self._repo.create(model)
+        public_catalog_cache.invalidate_after_commit(self._session)
+        return created
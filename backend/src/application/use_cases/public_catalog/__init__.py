@@ -1,3 +1,4 @@
+from .catalog_cache import PublicCatalogCache, public_catalog_cache
 from .public_catalog import (
     PublicCatalogAddon,
     PublicCatalogBillingPeriod,
@@ -15,6 +16,7 @@ from .public_catalog import (
 __all__ = [
     "PublicCatalogAddon",
     "PublicCatalogBillingPeriod",
+    "PublicCatalogCache",
     "PublicCatalogContext",
     "PublicCatalogMetadata",
     "PublicCatalogMoney",
@@ -24,4 +26,5 @@ __all__ = [
     "PublicPaymentMethodAvailability",
     "ResolvePublicCatalogContextUseCase",
     "ResolvePublicCommercialCatalogUseCase",
+    "public_catalog_cache",
 ]
@@ -0,0 +1,128 @@
+"""Process-local cache of compiled public catalog inputs.
+
+Entries are plain Python objects (catalog items, compiled pricebook overrides,
+resolved plans and add-ons), so a hit costs neither a DB query nor any
+deserialization. Every key is scoped to a catalog generation: a Redis counter
+that commercial catalog changes bump once their transaction commits (see
+``invalidate_after_commit``). One ``GET`` of that counter per request is enough
+for every replica to notice that its entries are out of date. Entries also
+expire after ``public_catalog_cache_ttl_seconds`` so time-based changes, such
+as a scheduled pricebook becoming effective, are picked up without an event.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.infrastructure.cache.redis_client import get_redis_pool
+from src.infrastructure.monitoring.metrics import cache_operations_total
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PublicCatalogCache:
+    """Generation-scoped LRU with single-flight builds."""
+
+    GENERATION_KEY = "cybervpn:commercial-catalog:generation"
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        self._ttl_seconds = settings.public_catalog_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._max_entries = settings.public_catalog_cache_max_entries if max_entries is None else max_entries
+        self._redis = redis_client
+        self._local_generation = 0
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[tuple[Hashable, ...], asyncio.Task[Any]] = {}
+        self._background: set[asyncio.Task[None]] = set()
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(connection_pool=get_redis_pool())
+        return self._redis
+
+    async def generation(self) -> str:
+        """Return the current generation; falls back to the local one while Redis is unavailable."""
+        try:
+            shared = await self._get_redis().get(self.GENERATION_KEY)
+        except Exception:
+            logger.warning("Public catalog generation unavailable, using local generation only")
+            shared = "local"
+        return f"{shared or 0}.{self._local_generation}"
+
+    async def get_or_build(self, generation: str, key: tuple[Hashable, ...], build: Callable[[], Awaitable[T]]) -> T:
+        """Return the entry for ``key`` in ``generation``, building it at most once per process."""
+        full_key = (generation, *key)
+        entry = self._entries.get(full_key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(full_key)
+            cache_operations_total.labels(operation="public_catalog", status="hit").inc()
+            return entry[1]
+
+        cache_operations_total.labels(operation="public_catalog", status="miss").inc()
+        task = self._inflight.get(full_key)
+        if task is None:
+            task = asyncio.ensure_future(self._build(full_key, build))
+            self._inflight[full_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(full_key, None))
+        return await asyncio.shield(task)
+
+    async def _build(self, full_key: tuple[Hashable, ...], build: Callable[[], Awaitable[T]]) -> T:
+        local_generation = self._local_generation
+        value = await build()
+        # A result built while this process was invalidated is returned but not kept.
+        if self._max_entries > 0 and local_generation == self._local_generation:
+            self._entries[full_key] = (time.monotonic() + self._ttl_seconds, value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    async def invalidate(self) -> None:
+        """Drop local entries and bump the shared generation for every replica."""
+        self._forget_local()
+        await self._bump_shared()
+
+    def invalidate_after_commit(self, session: AsyncSession) -> None:
+        """Invalidate once ``session`` commits; a rollback leaves the cache alone."""
+
+        def _on_commit(_session: Session) -> None:
+            self._forget_local()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            task = loop.create_task(self._bump_shared())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        event.listen(session.sync_session, "after_commit", _on_commit, once=True)
+
+    def _forget_local(self) -> None:
+        self._local_generation += 1
+        self._entries.clear()
+
+    async def _bump_shared(self) -> None:
+        try:
+            await self._get_redis().incr(self.GENERATION_KEY)
+        except Exception:
+            logger.warning("Public catalog generation bump failed; other replicas expire by TTL")
+
+
+# Module-level singleton
+public_catalog_cache = PublicCatalogCache()
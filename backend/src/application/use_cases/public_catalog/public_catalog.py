@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass, field, replace
 from decimal import Decimal, InvalidOperation
 from time import perf_counter
-from typing import Any
+from typing import Any, TypeVar
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -29,9 +30,11 @@ from src.domain.services.pricing_engine import (
     ArrayOverride,
     CatalogItem,
     CatalogOverride,
+    CompiledCatalogOverrides,
     EffectiveCatalogResolver,
     PricingContext,
     build_catalog_cache_key,
+    compile_overrides,
 )
 from src.infrastructure.database.repositories.offer_repo import OfferRepository
 from src.infrastructure.database.repositories.plan_addon_repo import PlanAddonRepository
@@ -43,6 +46,10 @@ from src.infrastructure.monitoring.metrics import (
     commerce_catalog_resolution_duration_seconds,
 )
 
+from .catalog_cache import PublicCatalogCache
+
+T = TypeVar("T")
+
 PUBLIC_CATALOG_DEFAULT_CHANNEL = "web"
 PUBLIC_CATALOG_ACTIVE_CHANNELS = ("web", "miniapp", "telegram_bot")
 PUBLIC_CATALOG_BASE_VERSION = "public-commercial-v1"
@@ -172,6 +179,20 @@ class PublicCommercialCatalog:
     metadata: PublicCatalogMetadata
 
 
+@dataclass(frozen=True)
+class _PublicCatalogSource:
+    active_currencies: frozenset[str]
+    catalog_items: tuple[CatalogItem, ...]
+    item_metadata: dict[str, dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class _CompiledPublicCatalog:
+    cache_key: str
+    plans: tuple[PublicCatalogPlan, ...]
+    invalidation_events: tuple[str, ...]
+
+
 class ResolvePublicCatalogContextUseCase:
     def __init__(
         self,
@@ -248,12 +269,14 @@ class ResolvePublicCommercialCatalogUseCase:
         offer_repo: Any | None = None,
         pricebook_repo: Any | None = None,
         resolver: EffectiveCatalogResolver | None = None,
+        cache: PublicCatalogCache | None = None,
     ) -> None:
         self._plan_repo = plan_repo or SubscriptionPlanRepository(session)  # type: ignore[arg-type]
         self._addon_repo = addon_repo or PlanAddonRepository(session)  # type: ignore[arg-type]
         self._offer_repo = offer_repo or OfferRepository(session)  # type: ignore[arg-type]
         self._pricebook_repo = pricebook_repo or PricebookRepository(session)  # type: ignore[arg-type]
         self._resolver = resolver or EffectiveCatalogResolver()
+        self._cache = cache
 
     async def execute(
         self,
@@ -265,56 +288,58 @@ class ResolvePublicCommercialCatalogUseCase:
         started_at = perf_counter()
         channel_key = _normalize_channel(channel or signals.channel_key)
         try:
-            raw_plans = await self._plan_repo.list_catalog(
-                visibility=CatalogVisibility.PUBLIC,
-                sale_channel=channel_key,
-                active_only=True,
-            )
-            public_plans = filter_stage1_public_paid_plans(raw_plans, sale_channel=channel_key)
-            active_currencies = _collect_complete_plan_currencies(public_plans)
+            generation = await self._cache.generation() if self._cache is not None else ""
+            source = await self._cached(generation, ("source", channel_key), lambda: self._load_source(channel_key))
             context = await ResolvePublicCatalogContextUseCase(
                 None,
                 plan_repo=self._plan_repo,
             ).execute(
                 signals=signals,
                 channel=channel_key,
-                active_currency_codes=active_currencies,
+                active_currency_codes=set(source.active_currencies),
                 catalog_version=_catalog_version(channel=channel_key, storefront_key=storefront_key),
             )
             pricing_context = _pricing_context_from_resolved(context.resolved, channel=channel_key)
-            offers = await self._offer_repo.list_active(sale_channel=channel_key)
-            offers_by_plan_id = _latest_offer_by_plan_id(offers)
-            catalog_items, item_metadata = _build_catalog_items(public_plans, offers_by_plan_id=offers_by_plan_id)
-            pricebook_overrides, pricebook_version_refs = await self._build_pricebook_overrides(
-                storefront_key=storefront_key,
-                currency=context.resolved.currency,
-                pricing_country=context.resolved.pricing_country,
-                item_key_by_plan_id={metadata["plan_id"]: key for key, metadata in item_metadata.items()},
+            currency = context.resolved.currency
+            pricing_country = context.resolved.pricing_country
+            pricebook_overrides, pricebook_version_refs = await self._cached(
+                generation,
+                ("pricebooks", channel_key, storefront_key, currency, pricing_country),
+                lambda: self._build_pricebook_overrides(
+                    storefront_key=storefront_key,
+                    currency=currency,
+                    pricing_country=pricing_country,
+                    item_key_by_plan_id={metadata["plan_id"]: key for key, metadata in source.item_metadata.items()},
+                ),
             )
             catalog_version = _catalog_version(
                 channel=channel_key,
                 storefront_key=storefront_key,
                 pricebook_version_refs=pricebook_version_refs,
             )
-            effective_catalog = self._resolver.resolve(
-                context=pricing_context,
-                items=catalog_items,
-                overrides=pricebook_overrides,
-                catalog_version=catalog_version,
+            compiled = await self._cached(
+                generation,
+                ("catalog", build_catalog_cache_key(context=pricing_context, catalog_version=catalog_version)),
+                lambda: self._compile_catalog(
+                    source,
+                    pricing_context=pricing_context,
+                    overrides=pricebook_overrides,
+                    catalog_version=catalog_version,
+                ),
             )
-            addons = await self._public_addons(channel=channel_key, currency=context.resolved.currency)
-
-            plans = _build_public_plans(
-                effective_catalog.items,
-                item_metadata=item_metadata,
-                context_cache_key=effective_catalog.cache_key,
+            addons = await self._cached(
+                generation,
+                ("addons", channel_key, currency),
+                lambda: self._public_addons(channel=channel_key, currency=currency),
             )
+
+            plans = compiled.plans
             catalog = PublicCommercialCatalog(
                 catalog_version=catalog_version,
-                cache_key=effective_catalog.cache_key,
+                cache_key=compiled.cache_key,
                 context=PublicCatalogContext(
                     resolved=context.resolved,
-                    cache_key=effective_catalog.cache_key,
+                    cache_key=compiled.cache_key,
                     payment_methods=context.payment_methods,
                 ),
                 plans=plans,
@@ -330,7 +355,7 @@ class ResolvePublicCommercialCatalogUseCase:
                     addons_enabled=settings.stage1_addons_enabled,
                     promo_codes_enabled=settings.promo_codes_enabled,
                     checkout_code_discounts_enabled=settings.checkout_code_discounts_enabled,
-                    invalidation_events=effective_catalog.invalidation_events,
+                    invalidation_events=compiled.invalidation_events,
                 ),
             )
         except Exception:
@@ -346,6 +371,53 @@ class ResolvePublicCommercialCatalogUseCase:
         ).observe(perf_counter() - started_at)
         return catalog
 
+    async def _cached(self, generation: str, key: tuple[Hashable, ...], build: Callable[[], Awaitable[T]]) -> T:
+        if self._cache is None:
+            return await build()
+        return await self._cache.get_or_build(generation, key, build)
+
+    async def _load_source(self, channel: str) -> _PublicCatalogSource:
+        raw_plans = await self._plan_repo.list_catalog(
+            visibility=CatalogVisibility.PUBLIC,
+            sale_channel=channel,
+            active_only=True,
+        )
+        public_plans = filter_stage1_public_paid_plans(raw_plans, sale_channel=channel)
+        offers = await self._offer_repo.list_active(sale_channel=channel)
+        catalog_items, item_metadata = _build_catalog_items(
+            public_plans,
+            offers_by_plan_id=_latest_offer_by_plan_id(offers),
+        )
+        return _PublicCatalogSource(
+            active_currencies=frozenset(_collect_complete_plan_currencies(public_plans)),
+            catalog_items=catalog_items,
+            item_metadata=item_metadata,
+        )
+
+    async def _compile_catalog(
+        self,
+        source: _PublicCatalogSource,
+        *,
+        pricing_context: PricingContext,
+        overrides: CompiledCatalogOverrides,
+        catalog_version: str,
+    ) -> _CompiledPublicCatalog:
+        effective_catalog = self._resolver.resolve(
+            context=pricing_context,
+            items=source.catalog_items,
+            overrides=overrides,
+            catalog_version=catalog_version,
+        )
+        return _CompiledPublicCatalog(
+            cache_key=effective_catalog.cache_key,
+            plans=_build_public_plans(
+                effective_catalog.items,
+                item_metadata=source.item_metadata,
+                context_cache_key=effective_catalog.cache_key,
+            ),
+            invalidation_events=effective_catalog.invalidation_events,
+        )
+
     async def _build_pricebook_overrides(
         self,
         *,
@@ -353,9 +425,9 @@ class ResolvePublicCommercialCatalogUseCase:
         currency: str,
         pricing_country: str,
         item_key_by_plan_id: dict[UUID, str],
-    ) -> tuple[tuple[CatalogOverride, ...], tuple[str, ...]]:
+    ) -> tuple[CompiledCatalogOverrides, tuple[str, ...]]:
         if not storefront_key:
-            return (), ()
+            return compile_overrides(()), ()
 
         pricebooks = await self._pricebook_repo.list_active(
             storefront_key=storefront_key,
@@ -401,7 +473,7 @@ class ResolvePublicCommercialCatalogUseCase:
                         },
                     )
                 )
-        return tuple(overrides), tuple(version_refs)
+        return compile_overrides(overrides), tuple(version_refs)
 
     async def _public_addons(self, *, channel: str, currency: str) -> tuple[PublicCatalogAddon, ...]:
         raw_addons = await self._addon_repo.list_catalog(active_only=True, sale_channel=channel)
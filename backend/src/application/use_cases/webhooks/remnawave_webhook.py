@@ -10,6 +10,7 @@ from src.application.use_cases.webhooks.webhook_log_redaction import (
 )
 from src.infrastructure.database.models.webhook_log_model import WebhookLog
 from src.infrastructure.messaging.websocket_manager import ws_manager
+from src.infrastructure.remnawave.expiry_index import RemnawaveExpiryIndex
 from src.infrastructure.remnawave.webhook_validator import RemnawaveWebhookValidator
 
 _REMNAWAVE_WEBSOCKET_DATA_ALLOWLIST = frozenset(
@@ -31,9 +32,15 @@ _REMNAWAVE_WEBSOCKET_VALUE_TYPES = (str, int, float, bool, type(None))
 
 
 class ProcessRemnawaveWebhookUseCase:
-    def __init__(self, session: AsyncSession, validator: RemnawaveWebhookValidator) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        validator: RemnawaveWebhookValidator,
+        expiry_index: RemnawaveExpiryIndex | None = None,
+    ) -> None:
         self._session = session
         self._validator = validator
+        self._expiry_index = expiry_index
 
     async def execute(
         self,
@@ -91,6 +98,9 @@ class ProcessRemnawaveWebhookUseCase:
         event = payload.get("event", "")
         data = payload.get("data", {})
 
+        if self._expiry_index is not None and isinstance(event, str) and isinstance(data, dict):
+            await self._expiry_index.apply_event(event, data)
+
         websocket_payload = _build_remnawave_websocket_payload(event, data)
         await ws_manager.broadcast("events", websocket_payload)
 
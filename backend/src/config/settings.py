@@ -40,6 +40,13 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     redis_max_connections: int = 100
     redis_pool_wait_seconds: float = 5.0
+    response_cache_l1_max_entries: int = 1024
+    response_cache_l1_ttl_seconds: float = 5.0
+    response_cache_stale_ttl_seconds: int = 30
+    response_cache_lock_timeout_seconds: float = 5.0
+    response_cache_invalidation_channel: str = "cybervpn:cache:invalidate"
+    public_catalog_cache_ttl_seconds: float = 300.0
+    public_catalog_cache_max_entries: int = 512
 
     # Remnawave API
     remnawave_url: str = "http://localhost:3000"
@@ -56,6 +63,15 @@ class Settings(BaseSettings):
     remnawave_ru_bundle_subscription_template_name: str = "Mihomo (RU bundle)"
     remnawave_request_retries: int = 1
     remnawave_retry_backoff_seconds: float = 0.25
+    remnawave_retry_backoff_max_seconds: float = 2.0
+    # Retries allowed per first attempt, e.g. 0.2 = at most one retry per five requests under sustained failure.
+    remnawave_retry_budget_ratio: float = 0.2
+    remnawave_http2: bool = False
+    remnawave_max_connections: int = 100
+    remnawave_max_keepalive_connections: int = 20
+    remnawave_keepalive_expiry_seconds: float = 30.0
+    remnawave_connect_timeout_seconds: float = 5.0
+    remnawave_read_timeout_seconds: float = 30.0
     stage1_trial_provisioning_enabled: bool = False
     stage1_paid_provisioning_enabled: bool = False
     stage1_provisioning_retry_claiming_enabled: bool = False
@@ -80,6 +96,11 @@ class Settings(BaseSettings):
     refresh_token_expire_days: int = 7
     jwt_issuer: str | None = None
     jwt_audience: str | None = None
+    auth_local_cache_enabled: bool = True
+    auth_local_cache_channel: str = "cybervpn:auth:invalidate"
+    auth_revocation_max_staleness_seconds: float = 5.0
+    auth_principal_cache_ttl_seconds: float = 30.0
+    auth_principal_cache_max_entries: int = 10_000
 
     # CORS (SEC-013: Default to empty list, require explicit config)
     cors_origins: Annotated[list[str], NoDecode] = []
@@ -187,6 +208,9 @@ class Settings(BaseSettings):
     uvicorn_limit_concurrency: int | None = None
     uvicorn_limit_max_requests: int | None = None
 
+    # Bulk exports written by the task worker (shared volume)
+    export_dir: str = "/tmp/exports"  # noqa: S108 - matches the worker export directory
+
     # Rate limiting
     rate_limit_enabled: bool = True
     rate_limit_requests: int = 100
@@ -201,6 +225,8 @@ class Settings(BaseSettings):
     rate_limit_messaging_realtime_requests: int = 60
     rate_limit_messaging_admin_read_requests: int = 120
     rate_limit_messaging_broadcast_requests: int = 10
+    rate_limit_local_batch_size: int = 0  # >1 reserves tokens per Redis call and spends them locally
+    rate_limit_local_lease_seconds: float = 1.0
     trust_proxy_headers: bool = False
 
     # OTP Configuration
@@ -269,6 +295,8 @@ class Settings(BaseSettings):
     nats_messaging_stream_name: str = "MESSAGING_EVENTS"
     nats_messaging_subject_prefix: str = "messaging"
     outbox_dispatch_batch_size: int = 100
+    outbox_dispatch_max_batch_size: int = 1000
+    outbox_dispatch_publish_concurrency: int = 64
     outbox_dispatch_interval_seconds: float = 1.0
     outbox_dispatch_lease_seconds: int = 30
     outbox_dispatch_retry_after_seconds: int = 5
@@ -276,9 +304,15 @@ class Settings(BaseSettings):
     nats_consumer_fetch_batch_size: int = 25
     nats_consumer_fetch_timeout_seconds: float = 1.0
     partner_realtime_backlog_limit: int = 100
+    partner_notification_feed_max_age_seconds: int = 300
     messaging_presence_ttl_seconds: int = 45
     messaging_realtime_heartbeat_seconds: float = 15.0
     messaging_realtime_queue_size: int = 100
+    websocket_send_queue_size: int = 256
+    websocket_send_timeout_seconds: float = 10.0
+    websocket_overflow_policy: Literal["drop_oldest", "disconnect"] = "drop_oldest"
+    websocket_backplane_enabled: bool = True
+    websocket_backplane_channel: str = "cybervpn:ws:fanout"
 
     # PostHog product intelligence
     posthog_enabled: bool = False
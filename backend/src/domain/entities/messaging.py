@@ -225,6 +225,8 @@ class MessagingConversation:
     participants: tuple[MessagingConversationParticipant, ...] = field(default_factory=tuple)
     messages: tuple[MessagingMessage, ...] = field(default_factory=tuple)
     read_states: tuple[MessagingMessageReadState, ...] = field(default_factory=tuple)
+    # Set by list projections, which carry no messages or read states to count from.
+    customer_unread_count: int | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
 from hashlib import sha256
+from operator import itemgetter
 from typing import Any, Literal
 
 PricingScope = Literal["global", "country_group", "country", "channel", "partner", "segment", "promo"]
@@ -171,23 +173,72 @@ class _ResolvedItemState:
     applied_override_keys: tuple[str, ...]
 
 
+OverrideMatchKey = tuple[str | None, str | None]
+
+
+@dataclass(frozen=True)
+class CompiledCatalogOverrides:
+    """Overrides indexed by scope and ``(item_key, normalized target)``.
+
+    ``None`` in a match key stands for "any item" or, in the global scope, "no target".
+    Each bucket keeps ``(position, override)`` pairs so overrides within a scope are
+    still applied in their original order.
+    """
+
+    buckets: dict[PricingScope, dict[OverrideMatchKey, tuple[tuple[int, CatalogOverride], ...]]]
+
+    def matching(self, item_key: str, scope_values: dict[PricingScope, str | None]) -> list[CatalogOverride]:
+        matched: list[CatalogOverride] = []
+        for scope in FALLBACK_ORDER:
+            bucket = self.buckets.get(scope)
+            if not bucket:
+                continue
+            target = scope_values.get(scope)
+            if scope != "global" and target is None:
+                continue
+            candidates = (*bucket.get((item_key, target), ()), *bucket.get((None, target), ()))
+            matched.extend(override for _, override in sorted(candidates, key=itemgetter(0)))
+        return matched
+
+
+def compile_overrides(overrides: Sequence[CatalogOverride]) -> CompiledCatalogOverrides:
+    buckets: dict[PricingScope, dict[OverrideMatchKey, list[tuple[int, CatalogOverride]]]] = {}
+    for position, override in enumerate(overrides):
+        if override.scope == "global":
+            targets: tuple[str | None, ...] = (None,)
+        else:
+            raw_targets = override.targets or ((override.target,) if override.target is not None else ())
+            targets = tuple(dict.fromkeys(_normalize_scope_value(override.scope, target) for target in raw_targets))
+        scope_buckets = buckets.setdefault(override.scope, {})
+        for target in targets:
+            scope_buckets.setdefault((override.item_key, target), []).append((position, override))
+    return CompiledCatalogOverrides(
+        buckets={
+            scope: {match_key: tuple(entries) for match_key, entries in scope_buckets.items()}
+            for scope, scope_buckets in buckets.items()
+        }
+    )
+
+
 class EffectiveCatalogResolver:
     def resolve(
         self,
         *,
         context: PricingContext,
         items: list[CatalogItem] | tuple[CatalogItem, ...],
-        overrides: list[CatalogOverride] | tuple[CatalogOverride, ...] = (),
+        overrides: Sequence[CatalogOverride] | CompiledCatalogOverrides = (),
         catalog_version: str = "current",
         include_hidden: bool = False,
         include_disabled: bool = False,
         include_archived: bool = False,
     ) -> EffectiveCatalog:
         currency_code = _norm_currency(context.currency_code)
+        compiled = overrides if isinstance(overrides, CompiledCatalogOverrides) else compile_overrides(overrides)
+        scope_values = _context_scope_values(context)
         effective_items: list[EffectiveCatalogItem] = []
 
         for item in items:
-            state = self._resolve_item(item=item, context=context, overrides=tuple(overrides))
+            state = self._resolve_item(item=item, overrides=compiled, scope_values=scope_values)
             if state.archived and not include_archived:
                 continue
             if state.disabled and not include_disabled:
@@ -229,8 +280,8 @@ class EffectiveCatalogResolver:
         self,
         *,
         item: CatalogItem,
-        context: PricingContext,
-        overrides: tuple[CatalogOverride, ...],
+        overrides: CompiledCatalogOverrides,
+        scope_values: dict[PricingScope, str | None],
     ) -> _ResolvedItemState:
         state = _ResolvedItemState(
             prices=dict(item.prices),
@@ -244,11 +295,8 @@ class EffectiveCatalogResolver:
             applied_override_keys=(),
         )
 
-        for scope in FALLBACK_ORDER:
-            for override in overrides:
-                if override.scope != scope or not override.matches(item, context):
-                    continue
-                state = _apply_override(state, override)
+        for override in overrides.matching(item.key, scope_values):
+            state = _apply_override(state, override)
         return state
 
 
@@ -355,6 +403,14 @@ def _scope_context_value(scope: PricingScope, context: PricingContext) -> str |
     }.get(scope)
 
 
+def _context_scope_values(context: PricingContext) -> dict[PricingScope, str | None]:
+    values: dict[PricingScope, str | None] = {}
+    for scope in FALLBACK_ORDER:
+        value = _scope_context_value(scope, context)
+        values[scope] = None if value is None else _normalize_scope_value(scope, value)
+    return values
+
+
 def _normalize_scope_value(scope: PricingScope, value: str) -> str:
     upper_scopes = {"country_group", "country", "promo"}
     return value.strip().upper() if scope in upper_scopes else value.strip().lower()
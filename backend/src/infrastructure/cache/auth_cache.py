@@ -0,0 +1,278 @@
+"""In-process auth caches that keep authenticated requests off Redis and the DB.
+
+``LocalAuthCache`` holds two things:
+
+- a revocation filter: every revoked JTI, kept current by tailing the
+  ``auth_cache_events`` Redis stream that ``JWTRevocationService`` appends
+  to. The filter only answers "not revoked" while the tail loop has heard
+  from Redis within ``max_staleness_seconds``; otherwise callers fall back to
+  the Redis blocklist, so a revocation is never missed for longer than that
+  bound.
+- a principal cache: the ``is_active`` flag per ``(realm, user id)`` for a short
+  TTL. Changes to a user's activity, role or status evict the entry locally and
+  on every replica through the same stream once the changing transaction
+  commits; a rollback evicts nothing.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from src.application.services.jwt_revocation_service import JWTRevocationService
+from src.config.settings import settings
+from src.infrastructure.database.models.admin_user_model import AdminUserModel
+from src.infrastructure.database.models.mobile_user_model import MobileUserModel
+from src.infrastructure.monitoring.metrics import (
+    auth_local_cache_lookups_total,
+    auth_revocation_propagation_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_REALM_ADMIN = "admin"
+PRINCIPAL_REALM_MOBILE = "mobile"
+
+_EVENTS_STREAM = JWTRevocationService.EVENTS_STREAM
+_REVOKED_PREFIX = JWTRevocationService.REVOKED_PREFIX
+_SCAN_BATCH = 1000
+_PRUNE_INTERVAL_SECONDS = 60.0
+_RECONNECT_SECONDS = 1.0
+_PENDING_PRINCIPALS_KEY = "auth_cache_pending_principals"
+_PRINCIPAL_FIELDS = {
+    PRINCIPAL_REALM_ADMIN: ("is_active", "role", "deleted_at"),
+    PRINCIPAL_REALM_MOBILE: ("is_active", "status"),
+}
+
+
+class LocalAuthCache:
+    """Process-local revocation filter and principal cache."""
+
+    def __init__(
+        self,
+        *,
+        max_staleness_seconds: float | None = None,
+        principal_ttl_seconds: float | None = None,
+        principal_max_entries: int | None = None,
+    ) -> None:
+        self._max_staleness_seconds = max_staleness_seconds or settings.auth_revocation_max_staleness_seconds
+        self._principal_ttl_seconds = (
+            settings.auth_principal_cache_ttl_seconds if principal_ttl_seconds is None else principal_ttl_seconds
+        )
+        self._principal_max_entries = principal_max_entries or settings.auth_principal_cache_max_entries
+        self._revoked: dict[str, float] = {}
+        self._principals: OrderedDict[tuple[str, str], tuple[float, bool]] = OrderedDict()
+        self._synced_at: float | None = None
+        self._pruned_at = 0.0
+        self._redis: redis.Redis | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._background: set[asyncio.Task[Any]] = set()
+
+    # -- revocation filter -------------------------------------------------
+
+    @property
+    def is_synced(self) -> bool:
+        return self._synced_at is not None and time.monotonic() - self._synced_at <= self._max_staleness_seconds
+
+    def check_revoked(self, jti: str) -> bool | None:
+        """Return the local revocation verdict, or ``None`` when Redis must be asked."""
+        expires_at = self._revoked.get(jti)
+        if expires_at is not None and expires_at > time.time():
+            auth_local_cache_lookups_total.labels(cache="revocation", result="hit").inc()
+            return True
+        if self.is_synced:
+            auth_local_cache_lookups_total.labels(cache="revocation", result="hit").inc()
+            return False
+        auth_local_cache_lookups_total.labels(cache="revocation", result="fallback").inc()
+        return None
+
+    # -- principal cache ---------------------------------------------------
+
+    def principal_active(self, realm: str, user_id: UUID | str) -> bool | None:
+        """Return the cached ``is_active`` flag, or ``None`` on a miss.
+
+        Principals are only cached while the sync loop runs, since that is what
+        carries invalidations from the other replicas.
+        """
+        if self._redis is None:
+            return None
+        key = (realm, str(user_id))
+        entry = self._principals.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._principals.pop(key, None)
+            auth_local_cache_lookups_total.labels(cache="principal", result="miss").inc()
+            return None
+        self._principals.move_to_end(key)
+        auth_local_cache_lookups_total.labels(cache="principal", result="hit").inc()
+        return entry[1]
+
+    def remember_principal(self, realm: str, user_id: UUID | str, *, is_active: bool) -> None:
+        if self._redis is None or self._principal_ttl_seconds <= 0:
+            return
+        key = (realm, str(user_id))
+        self._principals[key] = (time.monotonic() + self._principal_ttl_seconds, is_active)
+        self._principals.move_to_end(key)
+        while len(self._principals) > self._principal_max_entries:
+            self._principals.popitem(last=False)
+
+    def forget_principal(self, realm: str, user_id: UUID | str) -> None:
+        self._principals.pop((realm, str(user_id)), None)
+
+    def broadcast_principal_change(self, realm: str, user_id: UUID | str) -> None:
+        """Evict a principal here and, best effort, on every other replica."""
+        self.forget_principal(realm, user_id)
+        if self._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish_principal_change(realm, str(user_id)))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self, redis_client: redis.Redis) -> None:
+        """Seed the filter from the blocklist and start tailing revocation events."""
+        if self._listener is None:
+            self._redis = redis_client
+            self._listener = asyncio.create_task(self._run(), name="auth-cache-sync")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._synced_at = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _run(self) -> None:
+        block_ms = max(int(self._max_staleness_seconds * 1000 / 2), 1)
+        while True:
+            try:
+                last_id = await self._resync()
+                while True:
+                    response = await self._redis.xread({_EVENTS_STREAM: last_id}, block=block_ms, count=1000)
+                    for _stream, entries in response or ():
+                        for entry_id, fields in entries:
+                            self._apply(fields)
+                            last_id = entry_id
+                    self._synced_at = time.monotonic()
+                    self._prune()
+            except (RedisError, OSError) as e:
+                self._synced_at = None
+                logger.warning("Auth cache sync lost Redis, falling back to direct checks: %s", e)
+                await asyncio.sleep(_RECONNECT_SECONDS)
+
+    async def _resync(self) -> str:
+        """Reload the blocklist; returns the stream position to tail from."""
+        tail = await self._redis.xrevrange(_EVENTS_STREAM, count=1)
+        last_id = tail[0][0] if tail else "0-0"
+        revoked: dict[str, float] = {}
+        now = time.time()
+        async for key in self._redis.scan_iter(match=f"{_REVOKED_PREFIX}*", count=_SCAN_BATCH):
+            revoked[key.removeprefix(_REVOKED_PREFIX)] = now
+        if revoked:
+            pipe = self._redis.pipeline(transaction=False)
+            for jti in revoked:
+                pipe.ttl(f"{_REVOKED_PREFIX}{jti}")
+            for jti, ttl in zip(list(revoked), await pipe.execute(), strict=True):
+                if ttl is None or ttl < 0:
+                    revoked.pop(jti)
+                else:
+                    revoked[jti] = now + ttl
+        self._revoked = revoked
+        self._principals.clear()
+        return last_id
+
+    def _apply(self, fields: dict[str, str]) -> None:
+        kind = fields.get("kind")
+        if kind == JWTRevocationService.EVENT_REVOKED:
+            self._revoked[fields["jti"]] = float(fields["exp"])
+            auth_revocation_propagation_seconds.observe(max(time.time() - float(fields["at"]), 0.0))
+        elif kind == JWTRevocationService.EVENT_PRINCIPAL:
+            self.forget_principal(fields["realm"], fields["id"])
+
+    def _prune(self) -> None:
+        now = time.time()
+        if now - self._pruned_at < _PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+
+    async def _publish_principal_change(self, realm: str, user_id: str) -> None:
+        try:
+            await self._redis.xadd(
+                _EVENTS_STREAM,
+                {"kind": JWTRevocationService.EVENT_PRINCIPAL, "realm": realm, "id": user_id, "at": str(time.time())},
+                maxlen=JWTRevocationService.EVENTS_STREAM_MAXLEN,
+                approximate=True,
+            )
+        except RedisError:
+            logger.warning("Failed to broadcast principal change for %s", user_id)
+
+
+auth_cache = LocalAuthCache()
+
+
+def _principal_changed(realm: str, target: Any) -> bool:
+    state = inspect(target)
+    return any(state.attrs[field].history.has_changes() for field in _PRINCIPAL_FIELDS[realm])
+
+
+def _defer_principal_change(realm: str, target: Any) -> None:
+    # Mapper events fire at flush time; a concurrent request could still read
+    # and re-cache the old row before commit, so eviction waits for after_commit.
+    session = object_session(target)
+    if session is None:
+        auth_cache.broadcast_principal_change(realm, target.id)
+        return
+    session.info.setdefault(_PENDING_PRINCIPALS_KEY, set()).add((realm, str(target.id)))
+
+
+def _on_admin_update(_mapper, _connection, target: AdminUserModel) -> None:
+    if _principal_changed(PRINCIPAL_REALM_ADMIN, target):
+        _defer_principal_change(PRINCIPAL_REALM_ADMIN, target)
+
+
+def _on_admin_delete(_mapper, _connection, target: AdminUserModel) -> None:
+    _defer_principal_change(PRINCIPAL_REALM_ADMIN, target)
+
+
+def _on_mobile_update(_mapper, _connection, target: MobileUserModel) -> None:
+    if _principal_changed(PRINCIPAL_REALM_MOBILE, target):
+        _defer_principal_change(PRINCIPAL_REALM_MOBILE, target)
+
+
+def _on_mobile_delete(_mapper, _connection, target: MobileUserModel) -> None:
+    _defer_principal_change(PRINCIPAL_REALM_MOBILE, target)
+
+
+def _on_commit(session: Session) -> None:
+    for realm, user_id in session.info.pop(_PENDING_PRINCIPALS_KEY, ()):
+        auth_cache.broadcast_principal_change(realm, user_id)
+
+
+def _on_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_PRINCIPALS_KEY, None)
+
+
+event.listen(AdminUserModel, "after_update", _on_admin_update)
+event.listen(AdminUserModel, "after_delete", _on_admin_delete)
+event.listen(MobileUserModel, "after_update", _on_mobile_update)
+event.listen(MobileUserModel, "after_delete", _on_mobile_delete)
+event.listen(Session, "after_commit", _on_commit)
+event.listen(Session, "after_rollback", _on_rollback)
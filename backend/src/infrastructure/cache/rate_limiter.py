@@ -0,0 +1,158 @@
+"""Sliding-window-counter rate limiter backed by a single Redis Lua script.
+
+Each bucket is one small hash (``s`` = current window start, ``c`` = current
+window count, ``p`` = previous window count), so memory per client/bucket is
+constant regardless of the request rate. The request estimate is the usual
+sliding-window-counter approximation::
+
+    previous_count * (remaining fraction of the window) + current_count
+
+One ``EVALSHA`` per decision replaces the old MULTI pipeline that stored a
+sorted-set member per request.
+
+Optional local pre-allocation: with ``local_batch_size > 0`` a process reserves
+up to that many tokens per Redis call and spends them locally for a short lease.
+Reserved tokens are already counted in Redis, so replicas can never admit more
+than the budget together; unused tokens simply expire with the lease. Buckets
+whose limit is too small to split into batches always go to Redis.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local current_start = now - (now % window)
+
+local state = redis.call('HMGET', KEYS[1], 's', 'c', 'p')
+local start = tonumber(state[1]) or current_start
+local count = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+
+if start ~= current_start then
+    if start == current_start - window then
+        previous = count
+    else
+        previous = 0
+    end
+    count = 0
+    start = current_start
+end
+
+local estimated = previous * ((window - (now - current_start)) / window) + count
+local granted = math.min(cost, math.floor(limit - estimated))
+if granted < 1 then
+    granted = 0
+else
+    count = count + granted
+end
+
+redis.call('HSET', KEYS[1], 's', start, 'c', count, 'p', previous)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {granted, math.ceil(estimated + granted)}
+"""
+
+# Upper bound on locally cached leases before expired ones are swept.
+_MAX_LOCAL_LEASES = 10_000
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a single rate-limit check."""
+
+    allowed: bool
+    count: int
+
+
+@dataclass
+class _LocalLease:
+    remaining: int
+    expires_at: float
+
+
+class SlidingWindowRateLimiter:
+    """Redis sliding-window-counter limiter with optional local token leases.
+
+    Args:
+        local_batch_size: Tokens reserved per Redis call (0 disables leasing)
+        local_lease_seconds: How long reserved tokens may be spent locally
+        min_limit_per_batch: Only lease when ``limit >= batch * min_limit_per_batch``
+    """
+
+    def __init__(
+        self,
+        *,
+        local_batch_size: int = 0,
+        local_lease_seconds: float = 1.0,
+        min_limit_per_batch: int = 4,
+    ) -> None:
+        self.local_batch_size = max(0, local_batch_size)
+        self.local_lease_seconds = local_lease_seconds
+        self.min_limit_per_batch = max(1, min_limit_per_batch)
+        self._leases: dict[str, _LocalLease] = {}
+        self._script_client: redis.Redis | None = None
+        self._script: AsyncScript | None = None
+
+    async def hit(self, client: redis.Redis, key: str, *, limit: int, window_seconds: int) -> RateLimitDecision:
+        """Count one request against ``key`` and decide whether it may pass.
+
+        Args:
+            client: Long-lived Redis client
+            key: Bucket key
+            limit: Requests allowed per window
+            window_seconds: Window length in seconds
+
+        Returns:
+            Decision with the estimated request count in the current window
+        """
+        batch = self._batch_for(limit)
+        if batch > 1:
+            lease = self._leases.get(key)
+            now = time.monotonic()
+            if lease is not None and lease.remaining > 0 and lease.expires_at > now:
+                lease.remaining -= 1
+                return RateLimitDecision(allowed=True, count=0)
+
+        granted, count = await self._script_for(client)(
+            keys=[key],
+            args=[int(time.time() * 1000), window_seconds * 1000, limit, batch],
+        )
+        granted = int(granted)
+        if granted < 1:
+            self._leases.pop(key, None)
+            return RateLimitDecision(allowed=False, count=int(count))
+
+        if batch > 1:
+            self._store_lease(key, granted - 1)
+        return RateLimitDecision(allowed=True, count=int(count))
+
+    def _batch_for(self, limit: int) -> int:
+        if self.local_batch_size <= 1 or limit < self.local_batch_size * self.min_limit_per_batch:
+            return 1
+        return self.local_batch_size
+
+    def _store_lease(self, key: str, remaining: int) -> None:
+        now = time.monotonic()
+        if len(self._leases) >= _MAX_LOCAL_LEASES:
+            self._leases = {k: v for k, v in self._leases.items() if v.expires_at > now and v.remaining > 0}
+            if len(self._leases) >= _MAX_LOCAL_LEASES:
+                self._leases.clear()
+        if remaining > 0:
+            self._leases[key] = _LocalLease(remaining=remaining, expires_at=now + self.local_lease_seconds)
+        else:
+            self._leases.pop(key, None)
+
+    def _script_for(self, client: redis.Redis) -> AsyncScript:
+        # Script objects cache the SHA and fall back to SCRIPT LOAD on NOSCRIPT.
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = client
+        return self._script
@@ -1,24 +1,114 @@
-"""Redis-backed response cache for API endpoints."""
+"""Two-tier (in-process LRU + Redis) response cache for API endpoints.
 
+Reads check a small per-process LRU first and fall back to Redis. Redis
+entries outlive their freshness window by ``stale_ttl_seconds`` so a hot key
+that just expired is served stale while a single background refresh runs.
+Refreshes are single-flight per process and guarded by a short Redis lock
+across processes. Invalidations are broadcast over pub/sub so every replica
+drops its in-process copy.
+"""
+
+import asyncio
 import json
 import logging
-from collections.abc import Callable, Coroutine
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Iterable
 from typing import Any
+from uuid import uuid4
 
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 
+from src.config.settings import settings
 from src.infrastructure.cache.redis_client import get_redis_pool
+from src.infrastructure.monitoring.metrics import cache_operations_total
 
 logger = logging.getLogger(__name__)
 
+_LOCK_POLL_SECONDS = 0.05
+_INVALIDATION_RECONNECT_SECONDS = 1.0
+
+FetchFn = Callable[[], Coroutine[Any, Any, Any]]
+
+# Returned by a background refresh that found another process holding the lock.
+_SKIPPED = object()
+
+
+def _encode(value: Any, fresh_until: float) -> str:
+    return json.dumps({"f": fresh_until, "v": value}, default=str, separators=(",", ":"))
+
+
+def _decode(raw: str) -> tuple[Any, float]:
+    """Return ``(value, fresh_until)``; plain values written before envelopes count as fresh."""
+    payload = json.loads(raw)
+    if isinstance(payload, dict) and payload.keys() == {"f", "v"}:
+        return payload["v"], float(payload["f"])
+    return payload, float("inf")
+
+
+class _LocalLRU:
+    """Bounded in-process LRU of decoded values with per-entry expiry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        if self._max_entries <= 0 or ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
 
 class ResponseCache:
-    """Simple Redis cache with TTL for API response caching."""
+    """Two-tier TTL cache with single-flight, stale-while-revalidate and tag invalidation."""
 
     _PREFIX = "cache:"
+    _LOCK_PREFIX = "cache:lock:"
+    _TAG_PREFIX = "cache:tag:"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        l1_max_entries: int | None = None,
+        l1_ttl_seconds: float | None = None,
+        stale_ttl_seconds: int | None = None,
+        lock_timeout_seconds: float | None = None,
+        invalidation_channel: str | None = None,
+    ) -> None:
         self._redis: redis.Redis | None = None
+        self._l1 = _LocalLRU(settings.response_cache_l1_max_entries if l1_max_entries is None else l1_max_entries)
+        self._l1_ttl_seconds = settings.response_cache_l1_ttl_seconds if l1_ttl_seconds is None else l1_ttl_seconds
+        self._stale_ttl_seconds = (
+            settings.response_cache_stale_ttl_seconds if stale_ttl_seconds is None else stale_ttl_seconds
+        )
+        self._lock_timeout_seconds = lock_timeout_seconds or settings.response_cache_lock_timeout_seconds
+        self._invalidation_channel = invalidation_channel or settings.response_cache_invalidation_channel
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._listener: asyncio.Task[None] | None = None
+        self._listener_redis: redis.Redis | None = None
 
     def _get_redis(self) -> redis.Redis:
         if self._redis is None:
@@ -30,57 +120,254 @@ class ResponseCache:
         self,
         key: str,
         ttl: int,
-        fetch_fn: Callable[[], Coroutine[Any, Any, Any]],
+        fetch_fn: FetchFn,
+        *,
+        tags: Iterable[str] = (),
     ) -> Any:
-        """Return cached value or call fetch_fn, cache result, and return it."""
+        """Return the cached value for ``key`` or compute it once with ``fetch_fn``.
+
+        Fresh values come from the in-process LRU or Redis. A value past ``ttl``
+        but within the stale window is returned immediately and refreshed in the
+        background. On a miss only one coroutine per process (and, while the
+        Redis lock is held, one process) calls ``fetch_fn``. ``tags`` register
+        the key for :meth:`invalidate_tags`.
+        """
+        full_key = f"{self._PREFIX}{key}"
+        found, value = self._l1.get(full_key)
+        if found:
+            cache_operations_total.labels(operation="get", status="l1_hit").inc()
+            return value
+
+        cached = await self._read(full_key)
+        if cached is not None:
+            value, fresh_until = cached
+            remaining = fresh_until - time.time()
+            if remaining > 0:
+                cache_operations_total.labels(operation="get", status="hit").inc()
+                self._l1.put(full_key, value, min(remaining, self._l1_ttl_seconds))
+                return value
+            cache_operations_total.labels(operation="get", status="stale").inc()
+            if full_key not in self._inflight:
+                self._spawn(self._revalidate(full_key, ttl, fetch_fn, tuple(tags)))
+            return value
+
+        cache_operations_total.labels(operation="get", status="miss").inc()
+        return await self._single_flight(full_key, ttl, fetch_fn, tuple(tags), wait_for_lock=True)
+
+    async def get(self, key: str) -> Any | None:
+        """Return a cached JSON value or ``None`` when the key is absent/unreadable."""
+        full_key = f"{self._PREFIX}{key}"
+        found, value = self._l1.get(full_key)
+        if found:
+            return value
+        cached = await self._read(full_key)
+        return None if cached is None else cached[0]
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store a JSON-serializable value with TTL."""
         full_key = f"{self._PREFIX}{key}"
         client = self._get_redis()
         try:
-            cached = await client.get(full_key)
-            if cached is not None:
-                return json.loads(cached)
+            await client.set(full_key, _encode(value, time.time() + ttl), ex=ttl)
         except Exception:
-            logger.warning("Cache read failed for %s, falling through", full_key)
+            logger.warning("Cache direct write failed for %s", full_key)
+            return
+        self._l1.discard([full_key])
+        await self._publish_invalidation([full_key])
 
-        result = await fetch_fn()
+    async def invalidate(self, *keys: str) -> None:
+        """Delete one or more cache keys on Redis and in every replica's local tier."""
+        full_keys = [f"{self._PREFIX}{k}" for k in keys]
+        self._l1.discard(full_keys)
+        client = self._get_redis()
+        try:
+            await client.delete(*full_keys)
+        except Exception:
+            logger.warning("Cache invalidation failed for %s", full_keys)
+        await self._publish_invalidation(full_keys)
 
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Delete every key registered under ``tags`` (see ``get_or_fetch(tags=...)``)."""
+        tag_keys = [f"{self._TAG_PREFIX}{tag}" for tag in tags]
+        client = self._get_redis()
         try:
-            await client.setex(full_key, ttl, json.dumps(result, default=str))
+            pipe = client.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+            full_keys = sorted({key for keys in members for key in keys})
+            await client.delete(*full_keys, *tag_keys)
         except Exception:
-            logger.warning("Cache write failed for %s", full_key)
+            logger.warning("Cache tag invalidation failed for %s", tag_keys)
+            return
+        self._l1.discard(full_keys)
+        await self._publish_invalidation(full_keys)
 
-        return result
+    async def start_invalidation_listener(self, redis_client: redis.Redis) -> None:
+        """Evict local entries when any replica invalidates or rewrites a key."""
+        if self._listener is None:
+            self._listener_redis = redis_client
+            self._listener = asyncio.create_task(self._listen(redis_client), name="response-cache-invalidation")
 
-    async def get(self, key: str) -> Any | None:
-        """Return a cached JSON value or ``None`` when the key is absent/unreadable."""
-        full_key = f"{self._PREFIX}{key}"
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._listener_redis is not None:
+            await self._listener_redis.aclose()
+            self._listener_redis = None
+
+    async def _read(self, full_key: str) -> tuple[Any, float] | None:
         client = self._get_redis()
         try:
-            cached = await client.get(full_key)
-            if cached is None:
+            raw = await client.get(full_key)
+            if raw is None:
                 return None
-            return json.loads(cached)
+            return _decode(raw)
         except Exception:
-            logger.warning("Cache direct read failed for %s", full_key)
+            logger.warning("Cache read failed for %s, falling through", full_key)
             return None
 
-    async def set(self, key: str, value: Any, ttl: int) -> None:
-        """Store a JSON-serializable value with TTL."""
-        full_key = f"{self._PREFIX}{key}"
+    async def _single_flight(
+        self,
+        full_key: str,
+        ttl: int,
+        fetch_fn: FetchFn,
+        tags: tuple[str, ...],
+        *,
+        wait_for_lock: bool,
+    ) -> Any:
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            result = await asyncio.shield(inflight)
+            if result is _SKIPPED and wait_for_lock:
+                return await self._single_flight(full_key, ttl, fetch_fn, tags, wait_for_lock=True)
+            return result
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            result = await self._fetch_with_lock(full_key, ttl, fetch_fn, tags, wait_for_lock=wait_for_lock)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when no follower is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(full_key, None)
+
+    async def _fetch_with_lock(
+        self,
+        full_key: str,
+        ttl: int,
+        fetch_fn: FetchFn,
+        tags: tuple[str, ...],
+        *,
+        wait_for_lock: bool,
+    ) -> Any:
         client = self._get_redis()
+        lock_key = f"{self._LOCK_PREFIX}{full_key}"
+        token = uuid4().hex
         try:
-            await client.setex(full_key, ttl, json.dumps(value, default=str))
+            acquired = bool(await client.set(lock_key, token, nx=True, px=int(self._lock_timeout_seconds * 1000)))
         except Exception:
-            logger.warning("Cache direct write failed for %s", full_key)
+            logger.warning("Cache lock unavailable for %s, fetching without it", full_key)
+            acquired, token = False, ""
 
-    async def invalidate(self, *keys: str) -> None:
-        """Delete one or more cache keys."""
+        if not acquired and token:
+            if not wait_for_lock:
+                return _SKIPPED
+            deadline = time.monotonic() + self._lock_timeout_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_SECONDS)
+                cached = await self._read(full_key)
+                if cached is not None and cached[1] > time.time():
+                    return cached[0]
+
+        try:
+            result = await fetch_fn()
+            return await self._store(full_key, ttl, result, tags)
+        finally:
+            if acquired:
+                await self._release_lock(lock_key, token)
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        """Delete the lock only while it still holds our token (WATCH/MULTI compare-and-delete)."""
+        try:
+            async with self._get_redis().pipeline(transaction=True) as pipe:
+                await pipe.watch(lock_key)
+                if await pipe.get(lock_key) != token:
+                    await pipe.unwatch()
+                    return
+                pipe.multi()
+                pipe.delete(lock_key)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Cache lock release failed for %s", lock_key)
+
+    async def _store(self, full_key: str, ttl: int, result: Any, tags: tuple[str, ...]) -> Any:
+        encoded = _encode(result, time.time() + ttl)
         client = self._get_redis()
-        full_keys = [f"{self._PREFIX}{k}" for k in keys]
         try:
-            await client.delete(*full_keys)
+            pipe = client.pipeline(transaction=False)
+            pipe.set(full_key, encoded, ex=ttl + self._stale_ttl_seconds)
+            for tag in tags:
+                tag_key = f"{self._TAG_PREFIX}{tag}"
+                pipe.sadd(tag_key, full_key)
+                pipe.expire(tag_key, ttl + self._stale_ttl_seconds, gt=True)
+                pipe.expire(tag_key, ttl + self._stale_ttl_seconds, nx=True)
+            await pipe.execute()
         except Exception:
-            logger.warning("Cache invalidation failed for %s", full_keys)
+            logger.warning("Cache write failed for %s", full_key)
+        # Keep the local tier identical to what other readers decode from Redis.
+        value = json.loads(encoded)["v"]
+        self._l1.put(full_key, value, min(ttl, self._l1_ttl_seconds))
+        return result
+
+    async def _revalidate(self, full_key: str, ttl: int, fetch_fn: FetchFn, tags: tuple[str, ...]) -> None:
+        try:
+            await self._single_flight(full_key, ttl, fetch_fn, tags, wait_for_lock=False)
+        except Exception:
+            logger.warning("Cache background refresh failed for %s", full_key, exc_info=True)
+
+    async def _publish_invalidation(self, full_keys: list[str]) -> None:
+        if not full_keys:
+            return
+        try:
+            await self._get_redis().publish(self._invalidation_channel, json.dumps(full_keys))
+        except RedisError:
+            logger.warning("Cache invalidation broadcast failed for %s", full_keys)
+
+    async def _listen(self, redis_client: redis.Redis) -> None:
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._invalidation_channel)
+                async for item in pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    try:
+                        self._l1.discard(json.loads(item["data"]))
+                    except (TypeError, ValueError):
+                        logger.warning("Ignoring malformed cache invalidation message")
+            except (RedisError, OSError) as e:
+                logger.warning("Cache invalidation listener lost connection, reconnecting: %s", e)
+                # Anything may have changed while disconnected.
+                self._l1.clear()
+                await asyncio.sleep(_INVALIDATION_RECONNECT_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
 
 # Module-level singleton
@@ -81,6 +81,7 @@ from src.infrastructure.database.models.messaging_conversation_model import (
 from src.infrastructure.database.models.messaging_notification_model import (
     SiteNotificationDeliveryModel,
     SiteNotificationModel,
+    SiteNotificationUnreadCounterModel,
 )
 from src.infrastructure.database.models.mobile_device_model import MobileDeviceModel
 from src.infrastructure.database.models.mobile_user_model import MobileUserModel
@@ -107,6 +108,10 @@ from src.infrastructure.database.models.partner_integration_credential_model imp
     PartnerIntegrationCredentialModel,
 )
 from src.infrastructure.database.models.partner_model import PartnerAccountModel, PartnerCodeModel, PartnerEarningModel
+from src.infrastructure.database.models.partner_notification_feed_model import (
+    PartnerNotificationFeedItemModel,
+    PartnerNotificationFeedStateModel,
+)
 from src.infrastructure.database.models.partner_notification_read_state_model import (
     PartnerNotificationReadStateModel,
 )
@@ -163,6 +168,11 @@ from src.infrastructure.database.models.service_identity_model import ServiceIde
 from src.infrastructure.database.models.settlement_period_model import SettlementPeriodModel
 from src.infrastructure.database.models.stage1_provisioning_retry_model import Stage1ProvisioningRetryJobModel
 from src.infrastructure.database.models.statement_adjustment_model import StatementAdjustmentModel
+from src.infrastructure.database.models.stats_rollup_model import (
+    AuditLogHourlyRollupModel,
+    PaymentHourlyRollupModel,
+    StatsRollupWatermarkModel,
+)
 from src.infrastructure.database.models.storefront_model import StorefrontModel
 from src.infrastructure.database.models.subscription_plan_model import SubscriptionPlanModel
 from src.infrastructure.database.models.support_profile_model import SupportProfileModel
@@ -183,6 +193,7 @@ __all__ = [
     "AuthRealmModel",
     "AttributionTouchpointModel",
     "AuditLog",
+    "AuditLogHourlyRollupModel",
     "BrandModel",
     "BillingDescriptorModel",
     "CheckoutSessionModel",
@@ -246,6 +257,8 @@ __all__ = [
     "PartnerApplicationReviewRequestModel",
     "PartnerBotModel",
     "PartnerBotProvisioningJobModel",
+    "PartnerNotificationFeedItemModel",
+    "PartnerNotificationFeedStateModel",
     "PartnerNotificationReadStateModel",
     "PartnerIntegrationCredentialModel",
     "PartnerCodeModel",
@@ -268,6 +281,7 @@ __all__ = [
     "PayoutInstructionModel",
     "PaymentAttemptModel",
     "PaymentDisputeModel",
+    "PaymentHourlyRollupModel",
     "PaymentModel",
     "PlanAddonModel",
     "PolicyVersionModel",
@@ -296,7 +310,9 @@ __all__ = [
     "ServiceIdentityModel",
     "SiteNotificationDeliveryModel",
     "SiteNotificationModel",
+    "SiteNotificationUnreadCounterModel",
     "StatementAdjustmentModel",
+    "StatsRollupWatermarkModel",
     "Stage1ProvisioningRetryJobModel",
     "SubscriptionAddonModel",
     "SubscriptionPlanModel",
@@ -18,6 +18,9 @@ class AuditLog(Base):
 
     Records all significant actions performed by admin users, including
     entity changes with before/after values for compliance and debugging.
+
+    The table is range-partitioned by month on ``created_at`` (primary key
+    ``(id, created_at)``); expired months are dropped by the task worker.
     """
 
     __tablename__ = "audit_logs"
@@ -43,7 +46,7 @@ class AuditLog(Base):
     user_agent: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True
     )
 
     def __repr__(self) -> str:
@@ -57,6 +57,8 @@ class MessagingConversationModel(Base):
             "category",
             "updated_at",
         ),
+        Index("ix_messaging_conversations_customer_updated_id", "customer_account_id", "updated_at", "id"),
+        Index("ix_messaging_conversations_updated_id", "updated_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -104,6 +104,13 @@ class SiteNotificationDeliveryModel(Base):
             "created_at",
         ),
         Index("ix_site_notification_deliveries_status_created", "status", "created_at"),
+        Index(
+            "ix_site_notification_deliveries_recipient_created_id",
+            "recipient_type",
+            "recipient_id",
+            "created_at",
+            "id",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -136,3 +143,24 @@ class SiteNotificationDeliveryModel(Base):
     )
 
     notification: Mapped[SiteNotificationModel] = relationship(back_populates="deliveries", lazy="raise")
+
+
+class SiteNotificationUnreadCounterModel(Base):
+    """Unread deliveries per recipient.
+
+    Maintained by the ``site_notification_unread_counter_sync`` trigger on
+    ``site_notification_deliveries`` (migration ``20260603_messaging_keyset_lists``);
+    the application only reads it.
+    """
+
+    __tablename__ = "site_notification_unread_counters"
+
+    recipient_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    recipient_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True)
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=_utc_now,
+        server_default=func.now(),
+        nullable=False,
+    )
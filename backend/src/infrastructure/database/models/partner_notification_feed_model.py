@@ -0,0 +1,119 @@
+"""Materialized partner notification feed per workspace operator.
+
+``partner_notification_feed_items`` holds the rendered feed with read and
+archive state folded in, and ``partner_notification_feed_states`` keeps one
+row per ``(workspace, operator)`` with the maintained counters and the
+versions used to decide when the feed has to be re-synced from its sources.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.database.session import Base
+
+
+class PartnerNotificationFeedItemModel(Base):
+    """One rendered notification in an operator's workspace feed."""
+
+    __tablename__ = "partner_notification_feed_items"
+    __table_args__ = (
+        UniqueConstraint(
+            "partner_account_id",
+            "admin_user_id",
+            "notification_key",
+            name="uq_partner_notification_feed_item_workspace_actor_key",
+        ),
+        Index(
+            "ix_partner_notification_feed_items_workspace_actor_created_key",
+            "partner_account_id",
+            "admin_user_id",
+            "created_at",
+            "notification_key",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    partner_account_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("partner_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    admin_user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("admin_users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    notification_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    kind: Mapped[str] = mapped_column(String(80), nullable=False)
+    tone: Mapped[str] = mapped_column(String(20), nullable=False)
+    route_slug: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    notes: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    action_required: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    unread: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    source_kind: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    source_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    source_event_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    source_event_kind: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class PartnerNotificationFeedStateModel(Base):
+    """Counters and sync bookkeeping for one operator's workspace feed.
+
+    ``source_version`` is bumped whenever a flush touches rows of the workspace
+    (see ``partner_notification_feed_repository``); the feed is current while
+    ``synced_version`` matches it and the operator's permissions and
+    preferences still hash to ``source_fingerprint``.
+    """
+
+    __tablename__ = "partner_notification_feed_states"
+    __table_args__ = (
+        UniqueConstraint(
+            "partner_account_id",
+            "admin_user_id",
+            name="uq_partner_notification_feed_state_workspace_actor",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    partner_account_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("partner_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    admin_user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("admin_users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    source_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    synced_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    source_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    action_required_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
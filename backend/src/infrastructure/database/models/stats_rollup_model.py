@@ -0,0 +1,52 @@
+"""Hourly rollups of audit-log and payment history refreshed by the task worker."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.database.session import Base
+
+
+class AuditLogHourlyRollupModel(Base):
+    __tablename__ = "audit_log_hourly_rollups"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    new_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    churned_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    admin_ops: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+
+class PaymentHourlyRollupModel(Base):
+    __tablename__ = "payment_hourly_rollups"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    currency: Mapped[str] = mapped_column(String(10), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(20), primary_key=True)
+    plan_name: Mapped[str] = mapped_column(String(120), primary_key=True)
+    payment_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    amount_total: Mapped[float] = mapped_column(Numeric(20, 8), nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+
+class StatsRollupWatermarkModel(Base):
+    __tablename__ = "stats_rollup_watermarks"
+
+    rollup_name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    watermark_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
@@ -18,6 +18,9 @@ class WebhookLog(Base):
 
     Stores allowlisted webhook metadata, non-replayable signature fingerprints,
     and processing status for debugging and audit purposes.
+
+    The table is range-partitioned by day on ``created_at`` (primary key
+    ``(id, created_at)``); expired days are dropped by the task worker.
     """
 
     __tablename__ = "webhook_logs"
@@ -39,7 +42,7 @@ class WebhookLog(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True
     )
 
     def __repr__(self) -> str:
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import base64
+import json
+from dataclasses import replace
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import String, cast, func, or_, select
+from sqlalchemy import String, cast, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from src.domain.entities.messaging import (
     BroadcastAudienceType,
@@ -67,8 +70,12 @@ from src.infrastructure.database.models.messaging_conversation_model import (
 from src.infrastructure.database.models.messaging_notification_model import (
     SiteNotificationDeliveryModel,
     SiteNotificationModel,
+    SiteNotificationUnreadCounterModel,
 )
 
+# Read marker used when the customer has never opened the conversation.
+_NEVER_READ = datetime(1970, 1, 1, tzinfo=UTC)
+
 
 def _utc_now() -> datetime:
     return datetime.now(UTC)
@@ -81,14 +88,54 @@ def _parse_uuid(value: str) -> UUID | None:
         return None
 
 
-def _parse_cursor(cursor: str | None) -> int:
-    if cursor is None:
-        return 0
+def _encode_cursor(position: datetime, row_id: UUID) -> str:
+    """Opaque keyset cursor for the row after which the next page starts."""
+    payload = json.dumps([position.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str | None) -> tuple[datetime, UUID] | None:
+    """Decode a keyset cursor; anything unreadable (including old offset cursors) means the first page."""
+    if not cursor:
+        return None
     try:
-        value = int(cursor)
-    except ValueError:
-        return 0
-    return max(value, 0)
+        position, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(position), UUID(row_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _keyset_after(position_column, id_column, cursor: str | None):
+    """Condition for rows after ``cursor`` in ``position DESC, id DESC`` order, or None on the first page."""
+    decoded = _decode_cursor(cursor)
+    if decoded is None:
+        return None
+    return tuple_(position_column, id_column) < tuple_(*decoded)
+
+
+def _customer_unread_count():
+    """Public non-customer messages newer than the customer's read marker, per listed conversation."""
+    last_read_at = (
+        select(func.max(MessagingMessageReadStateModel.last_read_at))
+        .where(
+            MessagingMessageReadStateModel.conversation_id == MessagingConversationModel.id,
+            MessagingMessageReadStateModel.participant_type == MessagingParticipantType.CUSTOMER.value,
+        )
+        .correlate(MessagingConversationModel)
+        .scalar_subquery()
+    )
+    return (
+        select(func.count(MessagingMessageModel.id))
+        .where(
+            MessagingMessageModel.conversation_id == MessagingConversationModel.id,
+            MessagingMessageModel.visibility == MessagingMessageVisibility.PUBLIC.value,
+            MessagingMessageModel.sender_type != MessagingSenderType.CUSTOMER.value,
+            MessagingMessageModel.created_at > func.coalesce(last_read_at, _NEVER_READ),
+        )
+        .correlate(MessagingConversationModel)
+        .scalar_subquery()
+        .label("customer_unread_count")
+    )
 
 
 class SQLAlchemyMessagingRepository(MessagingRepository):
@@ -225,23 +272,20 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
         cursor: str | None = None,
         limit: int = 50,
     ) -> MessagingConversationListResult:
-        offset = _parse_cursor(cursor)
         bounded_limit = min(max(limit, 1), 100)
-        stmt = self._detail_select().where(MessagingConversationModel.customer_account_id == customer_account_id)
+        stmt = self._summary_select(_customer_unread_count()).where(
+            MessagingConversationModel.customer_account_id == customer_account_id
+        )
         if status is not None:
             stmt = stmt.where(MessagingConversationModel.status == status.value)
-        result = await self._session.execute(
-            stmt.order_by(MessagingConversationModel.updated_at.desc(), MessagingConversationModel.id.desc())
-            .offset(offset)
-            .limit(bounded_limit + 1)
-        )
-        models = list(result.scalars().unique().all())
-        next_cursor = str(offset + bounded_limit) if len(models) > bounded_limit else None
+        result = await self._session.execute(self._conversation_page(stmt, cursor, bounded_limit))
+        rows = list(result.all())
         return MessagingConversationListResult(
             conversations=tuple(
-                self._to_conversation_domain(model, include_internal_messages=False) for model in models[:bounded_limit]
+                self._to_conversation_summary(model, customer_unread_count=unread_count)
+                for model, unread_count in rows[:bounded_limit]
             ),
-            next_cursor=next_cursor,
+            next_cursor=self._conversation_next_cursor([model for model, _unread in rows], bounded_limit),
         )
 
     async def list_for_admin(
@@ -256,9 +300,8 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
         cursor: str | None = None,
         limit: int = 50,
     ) -> MessagingConversationListResult:
-        offset = _parse_cursor(cursor)
         bounded_limit = min(max(limit, 1), 100)
-        stmt = self._detail_select()
+        stmt = self._summary_select()
         if status is not None:
             stmt = stmt.where(MessagingConversationModel.status == status.value)
         if category is not None:
@@ -278,16 +321,11 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
                     cast(MessagingConversationModel.customer_account_id, String).ilike(pattern),
                 )
             )
-        result = await self._session.execute(
-            stmt.order_by(MessagingConversationModel.updated_at.desc(), MessagingConversationModel.id.desc())
-            .offset(offset)
-            .limit(bounded_limit + 1)
-        )
-        models = list(result.scalars().unique().all())
-        next_cursor = str(offset + bounded_limit) if len(models) > bounded_limit else None
+        result = await self._session.execute(self._conversation_page(stmt, cursor, bounded_limit))
+        models = list(result.scalars().all())
         return MessagingConversationListResult(
-            conversations=tuple(self._to_conversation_domain(model) for model in models[:bounded_limit]),
-            next_cursor=next_cursor,
+            conversations=tuple(self._to_conversation_summary(model) for model in models[:bounded_limit]),
+            next_cursor=self._conversation_next_cursor(models, bounded_limit),
         )
 
     async def add_message(
@@ -511,22 +549,30 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
         cursor: str | None = None,
         limit: int = 50,
     ) -> SiteNotificationListResult:
-        offset = _parse_cursor(cursor)
         bounded_limit = min(max(limit, 1), 100)
-        result = await self._session.execute(
+        stmt = (
             select(SiteNotificationDeliveryModel, SiteNotificationModel)
             .join(SiteNotificationModel, SiteNotificationModel.id == SiteNotificationDeliveryModel.notification_id)
+            .options(raiseload(SiteNotificationModel.deliveries))
             .where(
                 SiteNotificationDeliveryModel.recipient_type == recipient_type.value,
                 SiteNotificationDeliveryModel.recipient_id == recipient_id,
                 SiteNotificationDeliveryModel.status != SiteNotificationDeliveryStatus.DISMISSED.value,
             )
-            .order_by(SiteNotificationModel.created_at.desc(), SiteNotificationDeliveryModel.id.desc())
-            .offset(offset)
-            .limit(bounded_limit + 1)
+        )
+        after = _keyset_after(SiteNotificationDeliveryModel.created_at, SiteNotificationDeliveryModel.id, cursor)
+        if after is not None:
+            stmt = stmt.where(after)
+        result = await self._session.execute(
+            stmt.order_by(
+                SiteNotificationDeliveryModel.created_at.desc(), SiteNotificationDeliveryModel.id.desc()
+            ).limit(bounded_limit + 1)
         )
         rows = list(result.all())
-        next_cursor = str(offset + bounded_limit) if len(rows) > bounded_limit else None
+        next_cursor = None
+        if len(rows) > bounded_limit:
+            last_delivery = rows[bounded_limit - 1][0]
+            next_cursor = _encode_cursor(last_delivery.created_at, last_delivery.id)
         return SiteNotificationListResult(
             notifications=tuple(
                 SiteNotificationDeliveryView(
@@ -588,20 +634,14 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
         recipient_type: SiteNotificationRecipientType,
         recipient_id: UUID,
     ) -> int:
+        # Maintained by a trigger on site_notification_deliveries; no row means nothing unread.
         result = await self._session.execute(
-            select(func.count(SiteNotificationDeliveryModel.id)).where(
-                SiteNotificationDeliveryModel.recipient_type == recipient_type.value,
-                SiteNotificationDeliveryModel.recipient_id == recipient_id,
-                SiteNotificationDeliveryModel.status.not_in(
-                    (
-                        SiteNotificationDeliveryStatus.READ.value,
-                        SiteNotificationDeliveryStatus.DISMISSED.value,
-                        SiteNotificationDeliveryStatus.EXPIRED.value,
-                    )
-                ),
+            select(SiteNotificationUnreadCounterModel.unread_count).where(
+                SiteNotificationUnreadCounterModel.recipient_type == recipient_type.value,
+                SiteNotificationUnreadCounterModel.recipient_id == recipient_id,
             )
         )
-        return int(result.scalar_one())
+        return int(result.scalar_one_or_none() or 0)
 
     async def create_broadcast_campaign(
         self,
@@ -712,6 +752,31 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
             selectinload(MessagingConversationModel.read_states),
         )
 
+    @staticmethod
+    def _summary_select(*columns):
+        """Conversation rows for list views, without participants, messages or read states."""
+        return select(MessagingConversationModel, *columns).options(
+            raiseload(MessagingConversationModel.participants),
+            raiseload(MessagingConversationModel.messages),
+            raiseload(MessagingConversationModel.read_states),
+        )
+
+    @staticmethod
+    def _conversation_page(stmt, cursor: str | None, bounded_limit: int):
+        after = _keyset_after(MessagingConversationModel.updated_at, MessagingConversationModel.id, cursor)
+        if after is not None:
+            stmt = stmt.where(after)
+        return stmt.order_by(MessagingConversationModel.updated_at.desc(), MessagingConversationModel.id.desc()).limit(
+            bounded_limit + 1
+        )
+
+    @staticmethod
+    def _conversation_next_cursor(models: list[MessagingConversationModel], bounded_limit: int) -> str | None:
+        if len(models) <= bounded_limit:
+            return None
+        last = models[bounded_limit - 1]
+        return _encode_cursor(last.updated_at, last.id)
+
     async def _get_conversation_model(self, conversation_id: UUID) -> MessagingConversationModel | None:
         result = await self._session.execute(
             select(MessagingConversationModel).where(MessagingConversationModel.id == conversation_id)
@@ -811,6 +876,21 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
         messages = tuple(SQLAlchemyMessagingRepository._to_message_domain(item) for item in model.messages)
         if not include_internal_messages:
             messages = tuple(message for message in messages if message.visibility == MessagingMessageVisibility.PUBLIC)
+        return replace(
+            SQLAlchemyMessagingRepository._to_conversation_summary(model),
+            participants=tuple(
+                SQLAlchemyMessagingRepository._to_participant_domain(item) for item in model.participants
+            ),
+            messages=messages,
+            read_states=tuple(SQLAlchemyMessagingRepository._to_read_state_domain(item) for item in model.read_states),
+        )
+
+    @staticmethod
+    def _to_conversation_summary(
+        model: MessagingConversationModel,
+        *,
+        customer_unread_count: int | None = None,
+    ) -> MessagingConversation:
         return MessagingConversation(
             id=model.id,
             public_id=model.public_id,
@@ -829,11 +909,7 @@ class SQLAlchemyMessagingRepository(MessagingRepository):
             metadata=dict(model.metadata_json or {}),
             created_at=model.created_at,
             updated_at=model.updated_at,
-            participants=tuple(
-                SQLAlchemyMessagingRepository._to_participant_domain(item) for item in model.participants
-            ),
-            messages=messages,
-            read_states=tuple(SQLAlchemyMessagingRepository._to_read_state_domain(item) for item in model.read_states),
+            customer_unread_count=customer_unread_count,
         )
 
     @staticmethod
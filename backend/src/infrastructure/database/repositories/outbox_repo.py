@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import or_, select
+from sqlalchemy import bindparam, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -138,11 +138,10 @@ class OutboxRepository:
             item.lease_owner = lease_owner
             item.leased_until = leased_until
             item.attempts = int(item.attempts or 0) + 1
-        await self._session.flush()
-        for item in items:
-            await self.refresh_event_status(item.outbox_event_id)
         if not items:
             return []
+        await self._session.flush()
+        await self.refresh_event_statuses(list({item.outbox_event_id for item in items}))
 
         item_ids = [item.id for item in items]
         refreshed = await self._session.execute(
@@ -227,36 +226,149 @@ class OutboxRepository:
         await self.refresh_event_status(publication.outbox_event_id)
         return publication
 
+    async def record_publication_outcomes(
+        self,
+        *,
+        lease_owner: str,
+        published: list[dict],
+        failed: list[dict],
+        dead_lettered: list[dict],
+    ) -> int:
+        """Persist a dispatched batch with one executemany UPDATE per outcome.
+
+        Rows are matched by publication id and ``lease_owner``, so outcomes for
+        publications whose lease was taken over by another dispatcher are
+        skipped. Each ``published`` row carries ``publication_id``,
+        ``published_at`` and ``publication_payload``; ``failed`` rows carry
+        ``publication_id``, ``failed_at``, ``retry_at`` and ``error_message``;
+        ``dead_lettered`` rows the same without ``retry_at``.
+
+        Returns:
+            Number of publication rows updated.
+        """
+        table = OutboxPublicationModel.__table__
+        owned = (table.c.id == bindparam("b_publication_id"), table.c.lease_owner == lease_owner)
+        updated = 0
+
+        if published:
+            result = await self._session.execute(
+                update(table)
+                .where(*owned)
+                .values(
+                    publication_status=OutboxPublicationStatus.PUBLISHED.value,
+                    submitted_at=bindparam("b_published_at"),
+                    published_at=bindparam("b_published_at"),
+                    publication_payload=bindparam("b_publication_payload"),
+                    leased_until=None,
+                    lease_owner=None,
+                    last_error=None,
+                ),
+                _bind_rows(published),
+            )
+            updated += result.rowcount
+        if failed:
+            result = await self._session.execute(
+                update(table)
+                .where(*owned)
+                .values(
+                    publication_status=OutboxPublicationStatus.FAILED.value,
+                    leased_until=None,
+                    lease_owner=None,
+                    next_attempt_at=bindparam("b_retry_at"),
+                    last_error=bindparam("b_error_message"),
+                    submitted_at=func.coalesce(table.c.submitted_at, bindparam("b_failed_at")),
+                ),
+                _bind_rows(failed),
+            )
+            updated += result.rowcount
+        if dead_lettered:
+            result = await self._session.execute(
+                update(table)
+                .where(*owned)
+                .values(
+                    publication_status=OutboxPublicationStatus.DEAD_LETTER.value,
+                    leased_until=None,
+                    lease_owner=None,
+                    next_attempt_at=bindparam("b_failed_at"),
+                    last_error=bindparam("b_error_message"),
+                    submitted_at=func.coalesce(table.c.submitted_at, bindparam("b_failed_at")),
+                ),
+                _bind_rows(dead_lettered),
+            )
+            updated += result.rowcount
+
+        publication_ids = [row["publication_id"] for row in (*published, *failed, *dead_lettered)]
+        if publication_ids:
+            event_ids = await self._session.execute(
+                select(OutboxPublicationModel.outbox_event_id)
+                .where(OutboxPublicationModel.id.in_(publication_ids))
+                .distinct()
+            )
+            await self.refresh_event_statuses(list(event_ids.scalars().all()))
+        return updated
+
+    async def refresh_event_statuses(self, outbox_event_ids: list[UUID]) -> None:
+        """Recompute ``event_status`` for many events with one SELECT and one UPDATE per status."""
+        if not outbox_event_ids:
+            return
+        result = await self._session.execute(
+            select(OutboxPublicationModel.outbox_event_id, OutboxPublicationModel.publication_status).where(
+                OutboxPublicationModel.outbox_event_id.in_(outbox_event_ids)
+            )
+        )
+        statuses_by_event: dict[UUID, set[str]] = {event_id: set() for event_id in outbox_event_ids}
+        for event_id, publication_status in result.all():
+            statuses_by_event[event_id].add(publication_status)
+
+        events_by_status: dict[str, list[UUID]] = {}
+        for event_id, publication_statuses in statuses_by_event.items():
+            events_by_status.setdefault(_event_status_for(publication_statuses), []).append(event_id)
+        for event_status, event_ids in events_by_status.items():
+            await self._session.execute(
+                update(OutboxEventModel)
+                .where(OutboxEventModel.id.in_(event_ids))
+                .values(event_status=event_status)
+                .execution_options(synchronize_session=False)
+            )
+
     async def refresh_event_status(self, outbox_event_id: UUID) -> OutboxEventModel | None:
         event = await self.get_event_by_id(outbox_event_id)
         if event is None:
             return None
 
-        publication_statuses = {item.publication_status for item in event.publications}
-        if publication_statuses and publication_statuses == {OutboxPublicationStatus.PUBLISHED.value}:
-            event.event_status = OutboxEventStatus.PUBLISHED.value
-        elif publication_statuses.intersection(
-            {
-                OutboxPublicationStatus.CLAIMED.value,
-                OutboxPublicationStatus.SUBMITTED.value,
-                OutboxPublicationStatus.PUBLISHED.value,
-            }
-        ):
-            event.event_status = OutboxEventStatus.PARTIALLY_PUBLISHED.value
-        elif publication_statuses and publication_statuses.issubset(
-            {
-                OutboxPublicationStatus.FAILED.value,
-                OutboxPublicationStatus.DEAD_LETTER.value,
-            }
-        ):
-            event.event_status = OutboxEventStatus.FAILED.value
-        else:
-            event.event_status = OutboxEventStatus.PENDING_PUBLICATION.value
+        event.event_status = _event_status_for({item.publication_status for item in event.publications})
 
         await self._session.flush()
         return event
 
 
+def _bind_rows(rows: list[dict]) -> list[dict]:
+    return [
+        {f"b_{key}": value.strip() if key == "error_message" else value for key, value in row.items()} for row in rows
+    ]
+
+
+def _event_status_for(publication_statuses: set[str]) -> str:
+    if publication_statuses and publication_statuses == {OutboxPublicationStatus.PUBLISHED.value}:
+        return OutboxEventStatus.PUBLISHED.value
+    if publication_statuses.intersection(
+        {
+            OutboxPublicationStatus.CLAIMED.value,
+            OutboxPublicationStatus.SUBMITTED.value,
+            OutboxPublicationStatus.PUBLISHED.value,
+        }
+    ):
+        return OutboxEventStatus.PARTIALLY_PUBLISHED.value
+    if publication_statuses and publication_statuses.issubset(
+        {
+            OutboxPublicationStatus.FAILED.value,
+            OutboxPublicationStatus.DEAD_LETTER.value,
+        }
+    ):
+        return OutboxEventStatus.FAILED.value
+    return OutboxEventStatus.PENDING_PUBLICATION.value
+
+
 def _ensure_lease_owner(*, publication: OutboxPublicationModel, lease_owner: str) -> None:
     if publication.lease_owner != lease_owner:
         raise ValueError("Publication is not leased by the requested owner")
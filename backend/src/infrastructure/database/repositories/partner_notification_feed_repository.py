@@ -0,0 +1,373 @@
+"""Repository for the materialized partner notification feed.
+
+The feed rows are synced from the notification sources only when the
+operator's feed state says they are out of date. Row events on the feed
+source models (any model carrying ``partner_account_id``, the workspace
+itself, new outbox events and operational feed events for it) note the
+workspace in ``session.info``; right before the transaction commits,
+``source_version`` is bumped once on each noted workspace's feed states, so
+the next read knows a re-sync is due without touching the sources.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, SessionTransaction, object_session
+
+from src.infrastructure.database.models.outbox_event_model import OutboxEventModel
+from src.infrastructure.database.models.partner_model import PartnerAccountModel
+from src.infrastructure.database.models.partner_notification_feed_model import (
+    PartnerNotificationFeedItemModel,
+    PartnerNotificationFeedStateModel,
+)
+from src.infrastructure.database.models.partner_notification_read_state_model import (
+    PartnerNotificationReadStateModel,
+)
+from src.infrastructure.database.models.partner_workspace_feed_event_model import PartnerWorkspaceFeedEventModel
+from src.infrastructure.database.session import Base
+
+_FEED_BOOKKEEPING_MODELS = (
+    PartnerNotificationFeedItemModel,
+    PartnerNotificationFeedStateModel,
+    PartnerNotificationReadStateModel,
+)
+
+_TOUCHED_WORKSPACES_KEY = "partner_feed_touched_workspaces"
+
+_ENTRY_FIELDS = (
+    "kind",
+    "tone",
+    "route_slug",
+    "message",
+    "notes",
+    "action_required",
+    "unread",
+    "read_at",
+    "archived_at",
+    "source_kind",
+    "source_id",
+    "source_event_id",
+    "source_event_kind",
+    "created_at",
+)
+
+
+@dataclass(frozen=True)
+class PartnerNotificationFeedEntry:
+    """A notification rendered from its sources, with read state applied."""
+
+    notification_key: str
+    kind: str
+    tone: str
+    route_slug: str
+    message: str
+    created_at: datetime
+    notes: list[str] = field(default_factory=list)
+    action_required: bool = False
+    unread: bool = True
+    read_at: datetime | None = None
+    archived_at: datetime | None = None
+    source_kind: str | None = None
+    source_id: str | None = None
+    source_event_id: str | None = None
+    source_event_kind: str | None = None
+
+
+def encode_feed_cursor(item: PartnerNotificationFeedItemModel) -> str:
+    """Opaque keyset cursor for the item after which the next page starts."""
+    payload = json.dumps([item.created_at.isoformat(), item.notification_key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_feed_cursor(cursor: str | None) -> tuple[datetime, str] | None:
+    """Decode a keyset cursor; anything unreadable means the first page."""
+    if not cursor:
+        return None
+    try:
+        position, notification_key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(position), str(notification_key)
+    except (TypeError, ValueError):
+        return None
+
+
+def _uuid_or_none(value: Any) -> UUID | None:
+    if not value:
+        return None
+    try:
+        return UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _outbox_workspace_id(model: OutboxEventModel) -> UUID | None:
+    for context in (model.event_payload or {}, model.source_context or {}):
+        for key in ("partner_account_id", "workspace_id"):
+            workspace_id = _uuid_or_none(context.get(key))
+            if workspace_id is not None:
+                return workspace_id
+    return None
+
+
+def _note_workspace(target: Any, workspace_id: Any) -> None:
+    session = object_session(target)
+    if session is not None and isinstance(workspace_id, UUID):
+        session.info.setdefault(_TOUCHED_WORKSPACES_KEY, set()).add(workspace_id)
+
+
+def _on_partner_account_row(_mapper: Mapper, _connection: Any, target: PartnerAccountModel) -> None:
+    _note_workspace(target, target.id)
+
+
+def _on_workspace_feed_event_row(_mapper: Mapper, _connection: Any, target: PartnerWorkspaceFeedEventModel) -> None:
+    _note_workspace(target, target.workspace_id)
+
+
+def _on_outbox_event_insert(_mapper: Mapper, _connection: Any, target: OutboxEventModel) -> None:
+    # Publication bookkeeping updates the event row later; only new events carry news.
+    _note_workspace(target, _outbox_workspace_id(target))
+
+
+def _on_workspace_scoped_row(_mapper: Mapper, _connection: Any, target: Any) -> None:
+    # Read the loaded value only: an expired attribute must not trigger IO inside a flush.
+    _note_workspace(target, inspect(target).dict.get("partner_account_id"))
+
+
+def _register_feed_source(mapper: Mapper, class_: type) -> None:
+    """Attach row listeners to the models whose writes make a workspace feed stale."""
+    if issubclass(class_, _FEED_BOOKKEEPING_MODELS):
+        return
+    if class_ is OutboxEventModel:
+        event.listen(mapper, "after_insert", _on_outbox_event_insert)
+        return
+    if class_ is PartnerAccountModel:
+        handler = _on_partner_account_row
+    elif class_ is PartnerWorkspaceFeedEventModel:
+        handler = _on_workspace_feed_event_row
+    elif "partner_account_id" in mapper.columns:
+        handler = _on_workspace_scoped_row
+    else:
+        return
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(mapper, name, handler)
+
+
+def _bump_feed_source_versions(session: Session) -> None:
+    # Commit flushes only after before_commit, so flush here to collect the last changes first.
+    session.flush()
+    workspace_ids = session.info.pop(_TOUCHED_WORKSPACES_KEY, None)
+    if not workspace_ids:
+        return
+    states = PartnerNotificationFeedStateModel.__table__
+    session.connection().execute(
+        update(states)
+        .where(states.c.partner_account_id.in_(workspace_ids))
+        .values(source_version=states.c.source_version + 1)
+    )
+
+
+def _forget_touched_workspaces(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A rolled-back savepoint keeps the outer transaction's notes; over-bumping is harmless.
+    if previous_transaction.parent is None:
+        session.info.pop(_TOUCHED_WORKSPACES_KEY, None)
+
+
+event.listen(Base, "mapper_configured", _register_feed_source, propagate=True)
+for _mapper in Base.registry.mappers:
+    if _mapper.configured:
+        _register_feed_source(_mapper, _mapper.class_)
+event.listen(Session, "before_commit", _bump_feed_source_versions)
+event.listen(Session, "after_soft_rollback", _forget_touched_workspaces)
+
+
+class PartnerNotificationFeedRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_state(
+        self,
+        *,
+        partner_account_id: UUID,
+        admin_user_id: UUID,
+        for_update: bool = False,
+        skip_locked: bool = False,
+    ) -> PartnerNotificationFeedStateModel | None:
+        query = select(PartnerNotificationFeedStateModel).where(
+            PartnerNotificationFeedStateModel.partner_account_id == partner_account_id,
+            PartnerNotificationFeedStateModel.admin_user_id == admin_user_id,
+        )
+        if for_update:
+            query = query.with_for_update(skip_locked=skip_locked).execution_options(populate_existing=True)
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def lock_or_create_state(
+        self,
+        *,
+        partner_account_id: UUID,
+        admin_user_id: UUID,
+    ) -> PartnerNotificationFeedStateModel:
+        """Return the state row locked for a re-sync, creating it on first use."""
+        state = await self.get_state(
+            partner_account_id=partner_account_id,
+            admin_user_id=admin_user_id,
+            for_update=True,
+        )
+        if state is not None:
+            return state
+        state = PartnerNotificationFeedStateModel(
+            partner_account_id=partner_account_id,
+            admin_user_id=admin_user_id,
+            source_version=0,
+        )
+        try:
+            async with self._session.begin_nested():
+                self._session.add(state)
+        except IntegrityError:
+            # A concurrent request created it first; wait for its lock instead.
+            existing = await self.get_state(
+                partner_account_id=partner_account_id,
+                admin_user_id=admin_user_id,
+                for_update=True,
+            )
+            if existing is None:
+                raise
+            return existing
+        return state
+
+    async def sync_items(
+        self,
+        state: PartnerNotificationFeedStateModel,
+        entries: Sequence[PartnerNotificationFeedEntry],
+        *,
+        synced_version: int,
+        source_fingerprint: str,
+        synced_at: datetime,
+    ) -> None:
+        """Diff ``entries`` into the stored feed and recompute the counters."""
+        entry_by_key: dict[str, PartnerNotificationFeedEntry] = {}
+        for entry in entries:
+            entry_by_key.setdefault(entry.notification_key, entry)
+
+        result = await self._session.execute(
+            select(PartnerNotificationFeedItemModel).where(
+                PartnerNotificationFeedItemModel.partner_account_id == state.partner_account_id,
+                PartnerNotificationFeedItemModel.admin_user_id == state.admin_user_id,
+            )
+        )
+        stored_by_key = {item.notification_key: item for item in result.scalars().all()}
+
+        for key, item in stored_by_key.items():
+            if key not in entry_by_key:
+                await self._session.delete(item)
+
+        for key, entry in entry_by_key.items():
+            item = stored_by_key.get(key)
+            if item is None:
+                item = PartnerNotificationFeedItemModel(
+                    partner_account_id=state.partner_account_id,
+                    admin_user_id=state.admin_user_id,
+                    notification_key=key,
+                )
+                self._session.add(item)
+            for name in _ENTRY_FIELDS:
+                value = getattr(entry, name)
+                if getattr(item, name, None) != value:
+                    setattr(item, name, value)
+
+        visible = [entry for entry in entry_by_key.values() if entry.archived_at is None]
+        state.total_count = len(visible)
+        state.unread_count = sum(1 for entry in visible if entry.unread)
+        state.action_required_count = sum(1 for entry in visible if entry.action_required)
+        state.synced_version = synced_version
+        state.source_fingerprint = source_fingerprint
+        state.synced_at = synced_at
+        await self._session.flush()
+
+    async def list_items(
+        self,
+        *,
+        partner_account_id: UUID,
+        admin_user_id: UUID,
+        include_archived: bool = False,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> list[PartnerNotificationFeedItemModel]:
+        """Feed items newest first, in ``(created_at, notification_key)`` keyset order."""
+        query = select(PartnerNotificationFeedItemModel).where(
+            PartnerNotificationFeedItemModel.partner_account_id == partner_account_id,
+            PartnerNotificationFeedItemModel.admin_user_id == admin_user_id,
+        )
+        if not include_archived:
+            query = query.where(PartnerNotificationFeedItemModel.archived_at.is_(None))
+        decoded = _decode_feed_cursor(cursor)
+        if decoded is not None:
+            query = query.where(
+                tuple_(PartnerNotificationFeedItemModel.created_at, PartnerNotificationFeedItemModel.notification_key)
+                < tuple_(*decoded)
+            )
+        query = query.order_by(
+            PartnerNotificationFeedItemModel.created_at.desc(),
+            PartnerNotificationFeedItemModel.notification_key.desc(),
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_item(
+        self,
+        *,
+        partner_account_id: UUID,
+        admin_user_id: UUID,
+        notification_key: str,
+    ) -> PartnerNotificationFeedItemModel | None:
+        result = await self._session.execute(
+            select(PartnerNotificationFeedItemModel).where(
+                PartnerNotificationFeedItemModel.partner_account_id == partner_account_id,
+                PartnerNotificationFeedItemModel.admin_user_id == admin_user_id,
+                PartnerNotificationFeedItemModel.notification_key == notification_key,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def apply_read_state(
+        self,
+        state: PartnerNotificationFeedStateModel,
+        item: PartnerNotificationFeedItemModel,
+        *,
+        read_at: datetime | None,
+        archived_at: datetime | None,
+    ) -> None:
+        """Fold a read or archive into ``item`` and adjust the counters by the difference."""
+        was_visible = item.archived_at is None
+        was_unread = was_visible and item.unread
+        item.read_at = read_at
+        item.archived_at = archived_at
+        item.unread = item.unread and read_at is None and archived_at is None
+        is_visible = archived_at is None
+        is_unread = is_visible and item.unread
+
+        total_delta = int(is_visible) - int(was_visible)
+        unread_delta = int(is_unread) - int(was_unread)
+        action_delta = total_delta if item.action_required else 0
+        if total_delta or unread_delta:
+            await self._session.execute(
+                update(PartnerNotificationFeedStateModel)
+                .where(PartnerNotificationFeedStateModel.id == state.id)
+                .values(
+                    total_count=PartnerNotificationFeedStateModel.total_count + total_delta,
+                    unread_count=PartnerNotificationFeedStateModel.unread_count + unread_delta,
+                    action_required_count=PartnerNotificationFeedStateModel.action_required_count + action_delta,
+                )
+            )
+        await self._session.flush()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
@@ -16,6 +17,14 @@ from src.infrastructure.database.models.outbox_event_model import OutboxPublicat
 from src.infrastructure.database.repositories.outbox_consumer_receipt_repo import OutboxConsumerReceiptRepository
 from src.infrastructure.database.repositories.outbox_repo import OutboxRepository
 from src.infrastructure.database.session import AsyncSessionLocal
+from src.infrastructure.messaging.outbox_dispatch import (
+    RESULT_SUCCESS,
+    AdaptiveBatchSize,
+    ClaimedPublication,
+    observe_dispatch_batch,
+    persist_publication_outcomes,
+    publish_claimed,
+)
 from src.infrastructure.messaging.sse_manager import sse_manager
 from src.infrastructure.messaging.websocket_manager import ws_manager
 from src.infrastructure.monitoring.metrics import (
@@ -95,6 +104,7 @@ class NatsMessagingRuntime:
         self._stop_event = asyncio.Event()
         self._tasks: list[asyncio.Task[None]] = []
         self._realtime_dispatcher = realtime_dispatcher or MessagingRealtimeDispatcher()
+        self._batch_sizes: dict[str, AdaptiveBatchSize] = {}
 
     async def start(self) -> None:
         if self._tasks:
@@ -150,73 +160,96 @@ class NatsMessagingRuntime:
     async def _dispatch_loop(self) -> None:
         lease_owner = f"messaging-dispatcher-{uuid4().hex}"
         while not self._stop_event.is_set():
+            backlog = False
             try:
                 for consumer_key in SUPPORTED_MESSAGING_CONSUMERS:
-                    await self._dispatch_pending_publications(consumer_key=consumer_key, lease_owner=lease_owner)
+                    backlog |= await self._dispatch_pending_publications(
+                        consumer_key=consumer_key, lease_owner=lease_owner
+                    )
             except asyncio.CancelledError:
                 raise
             except Exception:
                 logger.exception("Messaging outbox dispatcher iteration failed")
-            await asyncio.sleep(settings.outbox_dispatch_interval_seconds)
-
-    async def _dispatch_pending_publications(self, *, consumer_key: str, lease_owner: str) -> None:
+            if not backlog:
+                await asyncio.sleep(settings.outbox_dispatch_interval_seconds)
+
+    async def _dispatch_pending_publications(self, *, consumer_key: str, lease_owner: str) -> bool:
+        """Publish one claimed batch and settle it; returns True when the batch came back full."""
+        batch_size = self._batch_sizes.setdefault(
+            consumer_key,
+            AdaptiveBatchSize(
+                minimum=settings.outbox_dispatch_batch_size,
+                maximum=settings.outbox_dispatch_max_batch_size,
+            ),
+        )
+        requested = batch_size.current
         now = datetime.now(UTC)
         async with AsyncSessionLocal() as session:
             repo = OutboxRepository(session)
             claimed = await repo.claim_publications(
                 consumer_key=consumer_key,
-                batch_size=settings.outbox_dispatch_batch_size,
+                batch_size=requested,
                 lease_owner=lease_owner,
                 leased_until=now.replace(microsecond=0) + timedelta(seconds=settings.outbox_dispatch_lease_seconds),
                 now=now,
             )
-            envelopes = [(publication.id, self._build_envelope(publication=publication)) for publication in claimed]
+            items = [
+                (ClaimedPublication.from_model(publication), self._build_envelope(publication=publication))
+                for publication in claimed
+            ]
             await session.commit()
 
-        for publication_id, envelope in envelopes:
-            try:
-                ack = await self._publish_envelope(envelope)
-                async with AsyncSessionLocal() as session:
-                    repo = OutboxRepository(session)
-                    publication = await repo.get_publication_by_id(publication_id)
-                    if publication is None:
-                        continue
-                    outbox_event = publication.outbox_event
-                    await repo.mark_publication_submitted(
-                        publication=publication,
-                        lease_owner=lease_owner,
-                        submitted_at=datetime.now(UTC),
-                    )
-                    await repo.mark_publication_published(
-                        publication=publication,
-                        lease_owner=lease_owner,
-                        published_at=datetime.now(UTC),
-                        publication_payload=ack,
-                    )
-                    _observe_publish_success(
-                        event_type=outbox_event.event_name,
-                        consumer_name=publication.consumer_key,
-                        lag_seconds=_lag_seconds(
-                            start=outbox_event.occurred_at,
-                            end=publication.published_at or datetime.now(UTC),
-                        ),
-                    )
-                    await session.commit()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                async with AsyncSessionLocal() as session:
-                    repo = OutboxRepository(session)
-                    publication = await repo.get_publication_by_id(publication_id)
-                    if publication is not None:
-                        await self._mark_publication_failure(
-                            repo=repo,
-                            publication=publication,
-                            lease_owner=lease_owner,
-                            exc=exc,
-                        )
-                        await session.commit()
-                logger.exception("Messaging outbox publication failed", extra={"consumer_key": consumer_key})
+        batch_size.observe(len(items))
+        if not items:
+            return False
+
+        started = time.perf_counter()
+        outcomes = await publish_claimed(
+            items,
+            self._publish_envelope,
+            concurrency=settings.outbox_dispatch_publish_concurrency,
+            dead_letter_after_attempts=settings.outbox_dispatch_dead_letter_after_attempts,
+        )
+        async with AsyncSessionLocal() as session:
+            await persist_publication_outcomes(
+                OutboxRepository(session),
+                outcomes,
+                lease_owner=lease_owner,
+                retry_after_seconds=settings.outbox_dispatch_retry_after_seconds,
+            )
+            await session.commit()
+
+        for outcome in outcomes:
+            if outcome.result == RESULT_SUCCESS:
+                _observe_publish_success(
+                    event_type=outcome.publication.event_name,
+                    consumer_name=outcome.publication.consumer_key,
+                    lag_seconds=outcome.lag_seconds,
+                )
+            else:
+                _observe_publish_failure(
+                    event_type=outcome.publication.event_name,
+                    consumer_name=outcome.publication.consumer_key,
+                    result=outcome.result,
+                    lag_seconds=outcome.lag_seconds,
+                )
+                logger.warning(
+                    "Messaging outbox publication failed",
+                    extra={
+                        "consumer_key": consumer_key,
+                        "publication_id": str(outcome.publication.publication_id),
+                        "result": outcome.result,
+                        "error": outcome.error_message,
+                    },
+                )
+        observe_dispatch_batch(
+            runtime="messaging",
+            consumer_key=consumer_key,
+            batch_size=batch_size.current,
+            outcomes=outcomes,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+        return len(items) >= requested
 
     async def _publish_envelope(self, envelope: MessagingOutboxEnvelope) -> dict[str, Any]:
         payload = json.dumps(envelope.as_payload(), separators=(",", ":"), default=str).encode("utf-8")
@@ -297,43 +330,6 @@ class NatsMessagingRuntime:
             )
             await session.commit()
 
-    async def _mark_publication_failure(
-        self,
-        *,
-        repo: OutboxRepository,
-        publication: OutboxPublicationModel,
-        lease_owner: str,
-        exc: Exception,
-    ) -> str:
-        outbox_event = publication.outbox_event
-        failed_at = datetime.now(UTC)
-        error_message = str(exc)
-        if int(publication.attempts or 0) >= settings.outbox_dispatch_dead_letter_after_attempts:
-            await repo.mark_publication_dead_letter(
-                publication=publication,
-                lease_owner=lease_owner,
-                failed_at=failed_at,
-                error_message=error_message,
-            )
-            failure_result = "dead_letter"
-        else:
-            await repo.mark_publication_failed(
-                publication=publication,
-                lease_owner=lease_owner,
-                failed_at=failed_at,
-                retry_at=failed_at.replace(microsecond=0)
-                + timedelta(seconds=settings.outbox_dispatch_retry_after_seconds),
-                error_message=error_message,
-            )
-            failure_result = "failure"
-        _observe_publish_failure(
-            event_type=outbox_event.event_name,
-            consumer_name=publication.consumer_key,
-            result=failure_result,
-            lag_seconds=_lag_seconds(start=outbox_event.occurred_at, end=failed_at),
-        )
-        return failure_result
-
     def _build_envelope(self, *, publication: OutboxPublicationModel) -> MessagingOutboxEnvelope:
         event = publication.outbox_event
         subject = _build_subject(
@@ -410,10 +406,6 @@ def _normalize_utc(value: datetime) -> datetime:
     return value.astimezone(UTC)
 
 
-def _lag_seconds(*, start: datetime, end: datetime) -> float:
-    return max((_normalize_utc(end) - _normalize_utc(start)).total_seconds(), 0.0)
-
-
 def _observe_publish_success(*, event_type: str, consumer_name: str, lag_seconds: float | None) -> None:
     labels = {"event_type": event_type, "consumer_name": consumer_name, "result": "success"}
     messaging_outbox_events_published_total.labels(**labels).inc()
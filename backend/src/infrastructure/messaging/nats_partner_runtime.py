@@ -5,6 +5,7 @@ import json
 import logging
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from time import perf_counter
 from typing import Any
 from uuid import UUID, uuid4
 
@@ -16,6 +17,14 @@ from src.infrastructure.database.models.partner_workspace_feed_event_model impor
 from src.infrastructure.database.repositories.outbox_repo import OutboxRepository
 from src.infrastructure.database.repositories.partner_event_runtime_repo import PartnerEventRuntimeRepository
 from src.infrastructure.database.session import AsyncSessionLocal
+from src.infrastructure.messaging.outbox_dispatch import (
+    RESULT_SUCCESS,
+    AdaptiveBatchSize,
+    ClaimedPublication,
+    observe_dispatch_batch,
+    persist_publication_outcomes,
+    publish_claimed,
+)
 from src.infrastructure.messaging.partner_workspace_feed_broker import (
     PartnerWorkspaceFeedBroadcast,
     partner_workspace_feed_broker,
@@ -76,6 +85,7 @@ class NatsPartnerRuntime:
         self._stop_event = asyncio.Event()
         self._tasks: list[asyncio.Task[None]] = []
         self._posthog = PostHogDeliveryService()
+        self._batch_sizes: dict[str, AdaptiveBatchSize] = {}
 
     async def start(self) -> None:
         if self._tasks:
@@ -131,120 +141,108 @@ class NatsPartnerRuntime:
     async def _dispatch_loop(self) -> None:
         lease_owner = f"dispatcher-{uuid4().hex}"
         while not self._stop_event.is_set():
+            backlog = False
             try:
                 for consumer_key in SUPPORTED_CONSUMERS:
-                    await self._dispatch_pending_publications(consumer_key=consumer_key, lease_owner=lease_owner)
+                    backlog |= await self._dispatch_pending_publications(
+                        consumer_key=consumer_key, lease_owner=lease_owner
+                    )
             except asyncio.CancelledError:
                 raise
             except Exception:
                 logger.exception("Partner outbox dispatcher iteration failed")
-            await asyncio.sleep(settings.outbox_dispatch_interval_seconds)
-
-    async def _dispatch_pending_publications(self, *, consumer_key: str, lease_owner: str) -> None:
+            if not backlog:
+                await asyncio.sleep(settings.outbox_dispatch_interval_seconds)
+
+    async def _dispatch_pending_publications(self, *, consumer_key: str, lease_owner: str) -> bool:
+        """Publish one claimed batch and settle it; returns True when the batch came back full."""
+        batch_size = self._batch_sizes.setdefault(
+            consumer_key,
+            AdaptiveBatchSize(
+                minimum=settings.outbox_dispatch_batch_size,
+                maximum=settings.outbox_dispatch_max_batch_size,
+            ),
+        )
+        requested = batch_size.current
         now = datetime.now(UTC)
         async with AsyncSessionLocal() as session:
             repo = OutboxRepository(session)
             claimed = await repo.claim_publications(
                 consumer_key=consumer_key,
-                batch_size=settings.outbox_dispatch_batch_size,
+                batch_size=requested,
                 lease_owner=lease_owner,
                 leased_until=now.replace(microsecond=0) + timedelta(seconds=settings.outbox_dispatch_lease_seconds),
                 now=now,
             )
-            envelopes = [
-                (
-                    publication.id,
-                    self._build_envelope(publication=publication),
-                )
+            items = [
+                (ClaimedPublication.from_model(publication), self._build_envelope(publication=publication))
                 for publication in claimed
             ]
             await session.commit()
 
-        for publication_id, envelope in envelopes:
-            try:
-                ack = await self._publish_envelope(envelope)
-                async with AsyncSessionLocal() as session:
-                    repo = OutboxRepository(session)
-                    publication = await repo.get_publication_by_id(publication_id)
-                    if publication is None:
-                        continue
-                    outbox_event = publication.outbox_event
-                    await repo.mark_publication_submitted(
-                        publication=publication,
-                        lease_owner=lease_owner,
-                        submitted_at=datetime.now(UTC),
-                    )
-                    await repo.mark_publication_published(
-                        publication=publication,
-                        lease_owner=lease_owner,
-                        published_at=datetime.now(UTC),
-                        publication_payload=ack,
-                    )
-                    observe_partner_outbox_event_published(
-                        event_type=outbox_event.event_name,
-                        consumer_name=publication.consumer_key,
-                        result="success",
-                        lag_seconds=_lag_seconds(
-                            start=outbox_event.occurred_at,
-                            end=publication.published_at or datetime.now(UTC),
-                        ),
-                    )
-                    log_partner_runtime_event(
-                        "partner_outbox.publication_published",
-                        surface="partner_backend",
-                        route_group="outbox",
-                        event_type=outbox_event.event_name,
-                        consumer_name=publication.consumer_key,
-                        publication_id=str(publication.id),
-                        result="success",
-                    )
-                    await session.commit()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                async with AsyncSessionLocal() as session:
-                    repo = OutboxRepository(session)
-                    publication = await repo.get_publication_by_id(publication_id)
-                    if publication is not None:
-                        outbox_event = publication.outbox_event
-                        failed_at = datetime.now(UTC)
-                        error_message = str(exc)
-                        if int(publication.attempts or 0) >= settings.outbox_dispatch_dead_letter_after_attempts:
-                            await repo.mark_publication_dead_letter(
-                                publication=publication,
-                                lease_owner=lease_owner,
-                                failed_at=failed_at,
-                                error_message=error_message,
-                            )
-                            failure_result = "dead_letter"
-                        else:
-                            await repo.mark_publication_failed(
-                                publication=publication,
-                                lease_owner=lease_owner,
-                                failed_at=failed_at,
-                                retry_at=failed_at.replace(microsecond=0)
-                                + timedelta(seconds=settings.outbox_dispatch_retry_after_seconds),
-                                error_message=error_message,
-                            )
-                            failure_result = "failure"
-                        observe_partner_outbox_publish_failure(
-                            event_type=outbox_event.event_name,
-                            consumer_name=publication.consumer_key,
-                            result=failure_result,
-                            lag_seconds=_lag_seconds(start=outbox_event.occurred_at, end=failed_at),
-                        )
-                        log_partner_runtime_event(
-                            "partner_outbox.publication_failed",
-                            surface="partner_backend",
-                            route_group="outbox",
-                            event_type=outbox_event.event_name,
-                            consumer_name=publication.consumer_key,
-                            publication_id=str(publication.id),
-                            error_code=failure_result,
-                            result=failure_result,
-                        )
-                        await session.commit()
-                logger.exception("Partner outbox publication failed", extra={"consumer_key": consumer_key})
+        batch_size.observe(len(items))
+        if not items:
+            return False
+
+        started = perf_counter()
+        outcomes = await publish_claimed(
+            items,
+            self._publish_envelope,
+            concurrency=settings.outbox_dispatch_publish_concurrency,
+            dead_letter_after_attempts=settings.outbox_dispatch_dead_letter_after_attempts,
+        )
+        async with AsyncSessionLocal() as session:
+            await persist_publication_outcomes(
+                OutboxRepository(session),
+                outcomes,
+                lease_owner=lease_owner,
+                retry_after_seconds=settings.outbox_dispatch_retry_after_seconds,
+            )
+            await session.commit()
+
+        for outcome in outcomes:
+            publication = outcome.publication
+            if outcome.result == RESULT_SUCCESS:
+                observe_partner_outbox_event_published(
+                    event_type=publication.event_name,
+                    consumer_name=publication.consumer_key,
+                    result="success",
+                    lag_seconds=outcome.lag_seconds,
+                )
+                log_partner_runtime_event(
+                    "partner_outbox.publication_published",
+                    surface="partner_backend",
+                    route_group="outbox",
+                    event_type=publication.event_name,
+                    consumer_name=publication.consumer_key,
+                    publication_id=str(publication.publication_id),
+                    result="success",
+                )
+            else:
+                observe_partner_outbox_publish_failure(
+                    event_type=publication.event_name,
+                    consumer_name=publication.consumer_key,
+                    result=outcome.result,
+                    lag_seconds=outcome.lag_seconds,
+                )
+                log_partner_runtime_event(
+                    "partner_outbox.publication_failed",
+                    surface="partner_backend",
+                    route_group="outbox",
+                    event_type=publication.event_name,
+                    consumer_name=publication.consumer_key,
+                    publication_id=str(publication.publication_id),
+                    error_code=outcome.result,
+                    result=outcome.result,
+                )
+        observe_dispatch_batch(
+            runtime="partner",
+            consumer_key=consumer_key,
+            batch_size=batch_size.current,
+            outcomes=outcomes,
+            elapsed_seconds=perf_counter() - started,
+        )
+        return len(items) >= requested
 
     async def _publish_envelope(self, envelope: OutboxEnvelope) -> dict[str, Any]:
         payload = json.dumps(envelope.as_payload(), separators=(",", ":"), default=str).encode("utf-8")
@@ -445,7 +443,3 @@ def _normalize_utc(value: datetime) -> datetime:
 
 def _parse_datetime(value: str) -> datetime:
     return _normalize_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
-
-
-def _lag_seconds(*, start: datetime, end: datetime) -> float:
-    return max((_normalize_utc(end) - _normalize_utc(start)).total_seconds(), 0.0)
@@ -0,0 +1,167 @@
+"""Pipelined outbox dispatch shared by the NATS partner and messaging runtimes.
+
+A dispatcher claims a batch, publishes every envelope concurrently (JetStream
+acks are awaited in parallel over the one connection), then settles the whole
+batch with a single transaction of set-based updates. The batch size grows
+while the backlog keeps filling it and shrinks back when it drains.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from src.infrastructure.database.models.outbox_event_model import OutboxPublicationModel
+from src.infrastructure.database.repositories.outbox_repo import OutboxRepository
+from src.infrastructure.monitoring.metrics import (
+    outbox_dispatch_batch_lag_seconds,
+    outbox_dispatch_batch_size,
+    outbox_dispatch_throughput,
+)
+
+RESULT_SUCCESS = "success"
+RESULT_FAILURE = "failure"
+RESULT_DEAD_LETTER = "dead_letter"
+
+
+@dataclass(frozen=True)
+class ClaimedPublication:
+    publication_id: UUID
+    consumer_key: str
+    event_name: str
+    occurred_at: datetime
+    attempts: int
+
+    @classmethod
+    def from_model(cls, publication: OutboxPublicationModel) -> ClaimedPublication:
+        return cls(
+            publication_id=publication.id,
+            consumer_key=publication.consumer_key,
+            event_name=publication.outbox_event.event_name,
+            occurred_at=publication.outbox_event.occurred_at,
+            attempts=int(publication.attempts or 0),
+        )
+
+
+@dataclass(frozen=True)
+class PublicationOutcome:
+    publication: ClaimedPublication
+    result: str
+    finished_at: datetime
+    ack: dict[str, Any] | None = None
+    error_message: str | None = None
+
+    @property
+    def lag_seconds(self) -> float:
+        elapsed = _normalize_utc(self.finished_at) - _normalize_utc(self.publication.occurred_at)
+        return max(elapsed.total_seconds(), 0.0)
+
+
+class AdaptiveBatchSize:
+    """Doubles the claim size while batches come back full, halves it once the backlog drains."""
+
+    def __init__(self, *, minimum: int, maximum: int) -> None:
+        self._minimum = max(1, minimum)
+        self._maximum = max(self._minimum, maximum)
+        self.current = self._minimum
+
+    def observe(self, claimed: int) -> int:
+        if claimed >= self.current:
+            self.current = min(self.current * 2, self._maximum)
+        elif claimed < self.current // 4:
+            self.current = max(self.current // 2, self._minimum)
+        return self.current
+
+
+async def publish_claimed[EnvelopeT](
+    items: list[tuple[ClaimedPublication, EnvelopeT]],
+    publish: Callable[[EnvelopeT], Awaitable[dict[str, Any]]],
+    *,
+    concurrency: int,
+    dead_letter_after_attempts: int,
+) -> list[PublicationOutcome]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _publish_one(claimed: ClaimedPublication, envelope: EnvelopeT) -> PublicationOutcome:
+        async with semaphore:
+            try:
+                ack = await publish(envelope)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                result = RESULT_DEAD_LETTER if claimed.attempts >= dead_letter_after_attempts else RESULT_FAILURE
+                return PublicationOutcome(claimed, result, datetime.now(UTC), error_message=str(exc))
+        return PublicationOutcome(claimed, RESULT_SUCCESS, datetime.now(UTC), ack=ack)
+
+    return list(await asyncio.gather(*(_publish_one(claimed, envelope) for claimed, envelope in items)))
+
+
+async def persist_publication_outcomes(
+    repo: OutboxRepository,
+    outcomes: list[PublicationOutcome],
+    *,
+    lease_owner: str,
+    retry_after_seconds: int,
+) -> int:
+    published: list[dict[str, Any]] = []
+    failed: list[dict[str, Any]] = []
+    dead_lettered: list[dict[str, Any]] = []
+    for outcome in outcomes:
+        publication_id = outcome.publication.publication_id
+        if outcome.result == RESULT_SUCCESS:
+            published.append(
+                {
+                    "publication_id": publication_id,
+                    "published_at": outcome.finished_at,
+                    "publication_payload": dict(outcome.ack or {}),
+                }
+            )
+        elif outcome.result == RESULT_DEAD_LETTER:
+            dead_lettered.append(
+                {
+                    "publication_id": publication_id,
+                    "failed_at": outcome.finished_at,
+                    "error_message": outcome.error_message or "",
+                }
+            )
+        else:
+            failed.append(
+                {
+                    "publication_id": publication_id,
+                    "failed_at": outcome.finished_at,
+                    "retry_at": outcome.finished_at.replace(microsecond=0) + timedelta(seconds=retry_after_seconds),
+                    "error_message": outcome.error_message or "",
+                }
+            )
+    return await repo.record_publication_outcomes(
+        lease_owner=lease_owner,
+        published=published,
+        failed=failed,
+        dead_lettered=dead_lettered,
+    )
+
+
+def observe_dispatch_batch(
+    *,
+    runtime: str,
+    consumer_key: str,
+    batch_size: int,
+    outcomes: list[PublicationOutcome],
+    elapsed_seconds: float,
+) -> None:
+    labels = {"runtime": runtime, "consumer_name": consumer_key}
+    outbox_dispatch_batch_size.labels(**labels).set(batch_size)
+    outbox_dispatch_throughput.labels(**labels).set(len(outcomes) / elapsed_seconds if elapsed_seconds > 0 else 0.0)
+    outbox_dispatch_batch_lag_seconds.labels(**labels).set(
+        max((outcome.lag_seconds for outcome in outcomes), default=0.0)
+    )
+
+
+def _normalize_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
@@ -3,14 +3,37 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
+# KEYS are connection indexes, ARGV[i] the connection key prefix for KEYS[i].
+# Returns the live connection count per index after dropping expired members.
+COUNT_LIVE_CONNECTIONS_SCRIPT = """
+local counts = {}
+for i, index_key in ipairs(KEYS) do
+    local live = 0
+    for _, connection_id in ipairs(redis.call('SMEMBERS', index_key)) do
+        if redis.call('EXISTS', ARGV[i] .. connection_id) == 1 then
+            live = live + 1
+        else
+            redis.call('SREM', index_key, connection_id)
+        end
+    end
+    counts[i] = live
+end
+return counts
+"""
+
+# Participants counted per script call, bounding how long one call blocks Redis.
+COUNT_BATCH_SIZE = 200
+
 
 @dataclass(frozen=True, slots=True)
 class MessagingPresenceIdentity:
@@ -25,6 +48,8 @@ class MessagingPresenceRegistry:
 
     Presence is advisory. Redis failures must not reject an already authenticated
     realtime connection because REST sync remains the source of truth.
+
+    Counts take one script call per ``COUNT_BATCH_SIZE`` participants.
     """
 
     KEY_PREFIX = "messaging:presence"
@@ -32,26 +57,27 @@ class MessagingPresenceRegistry:
     def __init__(self, redis_client: redis.Redis, *, ttl_seconds: int) -> None:
         self._redis = redis_client
         self._ttl_seconds = ttl_seconds
+        self._count_script: AsyncScript | None = None
 
     async def register(self, identity: MessagingPresenceIdentity) -> bool:
-        key = self._connection_key(identity)
         index_key = self._index_key(identity)
-        payload = self._payload(identity)
         try:
-            await self._redis.set(key, payload, ex=self._ttl_seconds)
-            await self._redis.sadd(index_key, identity.connection_id)
-            await self._redis.expire(index_key, self._ttl_seconds)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.set(self._connection_key(identity), self._payload(identity), ex=self._ttl_seconds)
+            pipe.sadd(index_key, identity.connection_id)
+            pipe.expire(index_key, self._ttl_seconds)
+            await pipe.execute()
         except RedisError:
             logger.warning("Messaging presence Redis register failed", exc_info=True)
             return False
         return True
 
     async def refresh(self, identity: MessagingPresenceIdentity) -> bool:
-        key = self._connection_key(identity)
-        index_key = self._index_key(identity)
         try:
-            await self._redis.expire(key, self._ttl_seconds)
-            await self._redis.expire(index_key, self._ttl_seconds)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.expire(self._connection_key(identity), self._ttl_seconds)
+            pipe.expire(self._index_key(identity), self._ttl_seconds)
+            await pipe.execute()
         except RedisError:
             logger.warning("Messaging presence Redis refresh failed", exc_info=True)
             return False
@@ -59,38 +85,60 @@ class MessagingPresenceRegistry:
 
     async def disconnect(self, identity: MessagingPresenceIdentity) -> bool:
         try:
-            await self._redis.delete(self._connection_key(identity))
-            await self._redis.srem(self._index_key(identity), identity.connection_id)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.delete(self._connection_key(identity))
+            pipe.srem(self._index_key(identity), identity.connection_id)
+            await pipe.execute()
         except RedisError:
             logger.warning("Messaging presence Redis disconnect failed", exc_info=True)
             return False
         return True
 
     async def connection_count(self, *, participant_type: str, participant_id: str) -> int:
-        index_key = self._index_key_for(participant_type=participant_type, participant_id=participant_id)
+        counts = await self.connection_counts([(participant_type, participant_id)])
+        return counts[(participant_type, participant_id)]
+
+    async def connection_counts(self, participants: Iterable[tuple[str, str]]) -> dict[tuple[str, str], int]:
+        """Count live connections for many ``(participant_type, participant_id)`` pairs.
+
+        Each batch of participants is one ``EVALSHA`` that reads the connection
+        indexes, checks the connection keys and removes expired members in a
+        single atomic step, so a connection that re-registers while the count
+        runs is never dropped from its index. Redis failures count as zero
+        connections.
+        """
+        unique = list(dict.fromkeys(participants))
+        counts: dict[tuple[str, str], int] = {}
+        if not unique:
+            return counts
+
         try:
-            connection_ids = await self._redis.smembers(index_key)
-            count = 0
-            stale: list[str] = []
-            for raw_connection_id in connection_ids:
-                connection_id = (
-                    raw_connection_id.decode() if isinstance(raw_connection_id, bytes) else raw_connection_id
-                )
-                key = self._connection_key_for(
-                    participant_type=participant_type,
-                    participant_id=participant_id,
-                    connection_id=str(connection_id),
+            script = self._count_script_for()
+            for offset in range(0, len(unique), COUNT_BATCH_SIZE):
+                batch = unique[offset : offset + COUNT_BATCH_SIZE]
+                live = await script(
+                    keys=[
+                        self._index_key_for(participant_type=participant_type, participant_id=participant_id)
+                        for participant_type, participant_id in batch
+                    ],
+                    args=[
+                        self._connection_key_for(
+                            participant_type=participant_type, participant_id=participant_id, connection_id=""
+                        )
+                        for participant_type, participant_id in batch
+                    ],
                 )
-                if await self._redis.exists(key):
-                    count += 1
-                else:
-                    stale.append(str(connection_id))
-            if stale:
-                await self._redis.srem(index_key, *stale)
-            return count
+                counts.update(zip(batch, (int(count) for count in live), strict=True))
         except RedisError:
             logger.warning("Messaging presence Redis count failed", exc_info=True)
-            return 0
+            return dict.fromkeys(unique, 0)
+        return counts
+
+    def _count_script_for(self) -> AsyncScript:
+        # Script objects cache the SHA and fall back to SCRIPT LOAD on NOSCRIPT.
+        if self._count_script is None:
+            self._count_script = self._redis.register_script(COUNT_LIVE_CONNECTIONS_SCRIPT)
+        return self._count_script
 
     def _payload(self, identity: MessagingPresenceIdentity) -> str:
         observed_at = datetime.now(UTC).isoformat().replace("+00:00", "Z")
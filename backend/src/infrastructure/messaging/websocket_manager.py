@@ -1,17 +1,129 @@
+import asyncio
 import json
 import logging
+import time
+from collections.abc import Callable
 from typing import Any
+from uuid import uuid4
 
+import redis.asyncio as redis
 from fastapi import WebSocket
+from redis.exceptions import RedisError
 from starlette.websockets import WebSocketState
 
+from src.config.settings import settings
+from src.infrastructure.monitoring.metrics import (
+    websocket_backplane_messages_total,
+    websocket_messages_dropped_total,
+    websocket_send_latency_seconds,
+    websocket_send_queue_depth,
+)
+
 logger = logging.getLogger(__name__)
 
+_BACKPLANE_RECONNECT_SECONDS = 1.0
+
+
+class _Outbound:
+    """Bounded send queue and writer task owned by one WebSocket."""
+
+    __slots__ = ("queue", "websocket", "writer")
+
+    def __init__(self, websocket: WebSocket, queue_size: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[tuple[str, float]] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task[None] | None = None
+
+
+class RedisWebSocketBackplane:
+    """Redis pub/sub relay that makes ``WebSocketManager.broadcast`` reach every replica.
+
+    Each broadcast is published once as ``origin\\nchannel\\nmessage`` with the
+    already encoded JSON; replicas skip their own messages because the
+    publisher delivered them locally.
+    """
+
+    def __init__(self, redis_client: redis.Redis, pubsub_channel: str, deliver: Callable[[str, str], int]) -> None:
+        self._redis = redis_client
+        self._pubsub_channel = pubsub_channel
+        self._deliver = deliver
+        self._instance_id = uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="websocket-backplane")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._redis.aclose()
+
+    async def publish(self, channel: str, message: str) -> None:
+        try:
+            await self._redis.publish(self._pubsub_channel, f"{self._instance_id}\n{channel}\n{message}")
+        except RedisError as e:
+            websocket_backplane_messages_total.labels(direction="published", result="failure").inc()
+            logger.warning("Failed to publish WebSocket broadcast to backplane: %s", e)
+            return
+        websocket_backplane_messages_total.labels(direction="published", result="success").inc()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._pubsub_channel)
+                async for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        self._handle(item["data"])
+            except (RedisError, OSError) as e:
+                logger.warning("WebSocket backplane connection lost, reconnecting: %s", e)
+                await asyncio.sleep(_BACKPLANE_RECONNECT_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def _handle(self, data: str) -> None:
+        try:
+            origin, channel, message = data.split("\n", 2)
+        except ValueError:
+            websocket_backplane_messages_total.labels(direction="received", result="malformed").inc()
+            return
+        if origin == self._instance_id:
+            return
+        self._deliver(channel, message)
+        websocket_backplane_messages_total.labels(direction="received", result="success").inc()
+
 
 class WebSocketManager:
-    def __init__(self) -> None:
+    """Channel registry with non-blocking, cross-instance broadcast.
+
+    Every connection gets a bounded outbound queue drained by its own writer
+    task, so a slow client only delays itself. When the queue is full the
+    ``overflow_policy`` either drops the oldest pending message or disconnects
+    the client. Messages are JSON-encoded once per broadcast and, with a
+    backplane attached, relayed to the other replicas.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_size: int | None = None,
+        send_timeout_seconds: float | None = None,
+        overflow_policy: str | None = None,
+    ) -> None:
         self._connections: dict[str, set[WebSocket]] = {}
         self._channels_by_connection: dict[WebSocket, set[str]] = {}
+        self._outbound: dict[WebSocket, _Outbound] = {}
+        self._queue_size = queue_size or settings.websocket_send_queue_size
+        self._send_timeout_seconds = send_timeout_seconds or settings.websocket_send_timeout_seconds
+        self._overflow_policy = overflow_policy or settings.websocket_overflow_policy
+        self._backplane: RedisWebSocketBackplane | None = None
+        self._background: set[asyncio.Task[None]] = set()
 
     async def connect(self, websocket: WebSocket, channel: str = "default", *, accept: bool = True) -> None:
         if accept and websocket.application_state == WebSocketState.CONNECTING:
@@ -20,6 +132,10 @@ class WebSocketManager:
             self._connections[channel] = set()
         self._connections[channel].add(websocket)
         self._channels_by_connection.setdefault(websocket, set()).add(channel)
+        if websocket not in self._outbound:
+            outbound = _Outbound(websocket, self._queue_size)
+            outbound.writer = asyncio.create_task(self._write(outbound))
+            self._outbound[websocket] = outbound
 
     def disconnect(self, websocket: WebSocket, channel: str = "default") -> None:
         if channel in self._connections:
@@ -30,31 +146,103 @@ class WebSocketManager:
             self._channels_by_connection[websocket].discard(channel)
             if not self._channels_by_connection[websocket]:
                 del self._channels_by_connection[websocket]
+        if websocket not in self._channels_by_connection:
+            self._release_outbound(websocket)
 
     def disconnect_all(self, websocket: WebSocket) -> None:
         for channel in tuple(self._channels_by_connection.get(websocket, ())):
             self.disconnect(websocket, channel)
+        self._release_outbound(websocket)
 
     async def broadcast(self, channel: str, data: dict[str, Any]) -> None:
-        if channel not in self._connections:
-            return
         message = json.dumps(data)
-        disconnected = set()
-        for ws in self._connections[channel]:
-            try:
-                await ws.send_text(message)
-            except Exception as e:
-                logger.warning("WebSocket send failed, marking for disconnect: %s", e)
-                disconnected.add(ws)
-        for ws in disconnected:
-            self.disconnect(ws, channel)
+        self._deliver_local(channel, message)
+        if self._backplane is not None:
+            await self._backplane.publish(channel, message)
 
     async def send_personal(self, websocket: WebSocket, data: dict[str, Any]) -> None:
         await websocket.send_text(json.dumps(data))
 
+    async def start_backplane(self, redis_client: redis.Redis) -> None:
+        """Relay broadcasts through Redis pub/sub so they reach sockets on every replica."""
+        if self._backplane is not None:
+            return
+        backplane = RedisWebSocketBackplane(redis_client, settings.websocket_backplane_channel, self._deliver_local)
+        await backplane.start()
+        self._backplane = backplane
+
+    async def stop_backplane(self) -> None:
+        if self._backplane is not None:
+            backplane, self._backplane = self._backplane, None
+            await backplane.stop()
+
     @property
     def active_connections(self) -> int:
         return sum(len(conns) for conns in self._connections.values())
 
+    def _deliver_local(self, channel: str, message: str) -> int:
+        delivered = 0
+        for websocket in tuple(self._connections.get(channel, ())):
+            if self._enqueue(websocket, message):
+                delivered += 1
+        return delivered
+
+    def _enqueue(self, websocket: WebSocket, message: str) -> bool:
+        outbound = self._outbound.get(websocket)
+        if outbound is None:
+            return False
+        item = (message, time.monotonic())
+        try:
+            outbound.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            websocket_messages_dropped_total.labels(reason="queue_full").inc()
+            if self._overflow_policy == "disconnect":
+                logger.warning("WebSocket send queue full, disconnecting slow client")
+                self.disconnect_all(websocket)
+                self._spawn(self._close_quietly(websocket))
+                return False
+            outbound.queue.get_nowait()
+            outbound.queue.put_nowait(item)
+            return True
+        websocket_send_queue_depth.inc()
+        return True
+
+    async def _write(self, outbound: _Outbound) -> None:
+        websocket = outbound.websocket
+        while True:
+            message, enqueued_at = await outbound.queue.get()
+            websocket_send_queue_depth.dec()
+            try:
+                await asyncio.wait_for(websocket.send_text(message), timeout=self._send_timeout_seconds)
+            except Exception as e:
+                logger.warning("WebSocket send failed, marking for disconnect: %s", e)
+                websocket_messages_dropped_total.labels(reason="disconnected").inc()
+                self.disconnect_all(websocket)
+                return
+            websocket_send_latency_seconds.observe(time.monotonic() - enqueued_at)
+
+    def _release_outbound(self, websocket: WebSocket) -> None:
+        outbound = self._outbound.pop(websocket, None)
+        if outbound is None:
+            return
+        pending = outbound.queue.qsize()
+        if pending:
+            websocket_send_queue_depth.dec(pending)
+            websocket_messages_dropped_total.labels(reason="disconnected").inc(pending)
+        if outbound.writer is not None and outbound.writer is not asyncio.current_task():
+            outbound.writer.cancel()
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            logger.debug("WebSocket close after overflow failed", exc_info=True)
+
 
 ws_manager = WebSocketManager()
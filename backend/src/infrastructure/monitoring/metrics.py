@@ -97,6 +97,12 @@ external_api_duration_seconds = Histogram(
     buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
 )
 
+remnawave_client_events_total = Counter(
+    "remnawave_client_events_total",
+    "Remnawave client request coalescing and retry events",
+    ["event"],  # event: coalesced/retry/retry_budget_exhausted
+)
+
 # Authentication metrics
 auth_attempts_total = Counter(
     "auth_attempts_total",
@@ -196,6 +202,19 @@ auth_session_detailed_total = Counter(
     ["channel", "method", "operation", "status", "reason"],
 )
 
+# Local auth cache metrics (revocation filter + principal cache)
+auth_local_cache_lookups_total = Counter(
+    "auth_local_cache_lookups_total",
+    "Authenticated-request lookups served by the in-process auth caches",
+    ["cache", "result"],  # cache: revocation/principal, result: hit/miss/fallback
+)
+
+auth_revocation_propagation_seconds = Histogram(
+    "auth_revocation_propagation_seconds",
+    "Delay between a token revocation and its arrival in the local revocation filter",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
 auth_bruteforce_events_total = Counter(
     "auth_bruteforce_events_total",
     "Brute-force protection events by identifier type and lockout tier",
@@ -418,12 +437,53 @@ messaging_outbox_lag_seconds = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0),
 )
 
+outbox_dispatch_batch_size = Gauge(
+    "outbox_dispatch_batch_size",
+    "Current adaptive outbox dispatch batch size.",
+    ["runtime", "consumer_name"],
+)
+
+outbox_dispatch_throughput = Gauge(
+    "outbox_dispatch_throughput_per_second",
+    "Outbox publications settled per second in the last dispatched batch.",
+    ["runtime", "consumer_name"],
+)
+
+outbox_dispatch_batch_lag_seconds = Gauge(
+    "outbox_dispatch_batch_lag_seconds",
+    "Age of the oldest event in the last dispatched outbox batch.",
+    ["runtime", "consumer_name"],
+)
+
 messaging_realtime_dispatch_total = Counter(
     "messaging_realtime_dispatch_total",
     "Messaging realtime dispatcher handoffs to transient delivery adapters.",
     ["event_type", "channel_type", "result"],
 )
 
+websocket_send_queue_depth = Gauge(
+    "websocket_send_queue_depth",
+    "Messages waiting in per-connection WebSocket send queues on this instance.",
+)
+
+websocket_messages_dropped_total = Counter(
+    "websocket_messages_dropped_total",
+    "WebSocket messages dropped before delivery.",
+    ["reason"],  # queue_full / disconnected
+)
+
+websocket_send_latency_seconds = Histogram(
+    "websocket_send_latency_seconds",
+    "Time from WebSocket broadcast enqueue to completed send.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+websocket_backplane_messages_total = Counter(
+    "websocket_backplane_messages_total",
+    "WebSocket fan-out messages exchanged over the cross-instance backplane.",
+    ["direction", "result"],  # direction: published/received
+)
+
 # Wallet operations metrics
 wallet_operations_total = Counter(
     "wallet_operations_total",
@@ -8,29 +8,89 @@ Security improvements:
 """
 
 import asyncio
+import importlib.util
 import logging
+import random
+import re
+import time
+from collections.abc import Hashable
 from typing import Any, TypeVar
 
-from httpx import AsyncClient, HTTPStatusError, RequestError, Response
+from httpx import AsyncClient, HTTPStatusError, Limits, RequestError, Response, Timeout
 from pydantic import BaseModel
 
 from src.config.settings import settings
+from src.infrastructure.monitoring.metrics import external_api_duration_seconds, remnawave_client_events_total
 from src.infrastructure.remnawave.response_validator import response_validator
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# Read timeouts for lookups that sit on request paths (checkout, status, usage);
+# every other call uses ``remnawave_read_timeout_seconds``.
+_GET_READ_TIMEOUTS: tuple[tuple[str, float], ...] = (
+    ("/api/system/health", 5.0),
+    ("/api/users/", 10.0),
+    ("/api/subscriptions/", 10.0),
+)
+
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}|\d+)$")
+
+# Requests with only these keyword arguments can share one in-flight GET.
+_COALESCIBLE_KWARGS = frozenset({"params"})
+
+
+def _route_template(path: str) -> str:
+    """Collapse ids and ``by-*`` lookup values so metric labels stay low-cardinality."""
+    segments = path.split("/")
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) or (index and segments[index - 1].startswith("by-")) else segment
+        for index, segment in enumerate(segments)
+    )
+
+
+class _RetryBudget:
+    """Token bucket that caps retries to a fraction of first attempts.
+
+    Every first attempt deposits ``ratio`` tokens and every retry spends one,
+    so a sustained upstream outage adds at most ``ratio`` extra requests per
+    request instead of multiplying load by the retry count.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float = 10.0) -> None:
+        self._ratio = max(0.0, ratio)
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def record_request(self) -> None:
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
 
 class RemnawaveClient:
-    """HTTP client for Remnawave API with response validation."""
+    """HTTP client for Remnawave API with response validation.
+
+    One pooled keep-alive connection set (optionally HTTP/2) is shared by all
+    callers. Identical concurrent GETs are coalesced into one upstream request,
+    failed requests are retried with exponential backoff and full jitter within
+    a retry budget, and every attempt is timed per route template.
+    """
 
     def __init__(self) -> None:
         self._base_url = self._normalize_base_url(settings.remnawave_url)
         self._token = settings.remnawave_token.get_secret_value()
         self._retry_attempts = max(0, settings.remnawave_request_retries)
         self._retry_backoff_seconds = max(0.0, settings.remnawave_retry_backoff_seconds)
+        self._retry_backoff_max_seconds = max(0.0, settings.remnawave_retry_backoff_max_seconds)
+        self._retry_budget = _RetryBudget(settings.remnawave_retry_budget_ratio)
         self._client: AsyncClient | None = None
+        self._inflight: dict[Hashable, asyncio.Task[Response]] = {}
 
     @staticmethod
     def _normalize_base_url(base_url: str) -> str:
@@ -46,6 +106,15 @@ class RemnawaveClient:
             return normalized
         return f"/api{normalized}"
 
+    @staticmethod
+    def _http2_enabled() -> bool:
+        if not settings.remnawave_http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("REMNAWAVE_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            return False
+        return True
+
     async def _get_client(self) -> AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = AsyncClient(
@@ -56,24 +125,83 @@ class RemnawaveClient:
                     "X-Forwarded-Proto": "https",
                     "X-Forwarded-For": "127.0.0.1",
                 },
-                timeout=30.0,
+                timeout=Timeout(
+                    settings.remnawave_read_timeout_seconds,
+                    connect=settings.remnawave_connect_timeout_seconds,
+                ),
+                limits=Limits(
+                    max_connections=settings.remnawave_max_connections,
+                    max_keepalive_connections=settings.remnawave_max_keepalive_connections,
+                    keepalive_expiry=settings.remnawave_keepalive_expiry_seconds,
+                ),
+                http2=self._http2_enabled(),
             )
         return self._client
 
+    @staticmethod
+    def _route_timeout(method: str, normalized_path: str) -> Timeout | None:
+        if method != "GET":
+            return None
+        for prefix, read_timeout in _GET_READ_TIMEOUTS:
+            if normalized_path.startswith(prefix):
+                return Timeout(read_timeout, connect=settings.remnawave_connect_timeout_seconds)
+        return None
+
+    def _backoff_delay(self, attempt: int) -> float:
+        ceiling = min(self._retry_backoff_max_seconds, self._retry_backoff_seconds * 2 ** (attempt - 1))
+        return random.uniform(0.0, ceiling)  # noqa: S311 - jitter, not cryptography.
+
+    def _may_retry(self, attempt: int, total_attempts: int) -> bool:
+        if attempt >= total_attempts:
+            return False
+        if self._retry_budget.try_spend():
+            remnawave_client_events_total.labels(event="retry").inc()
+            return True
+        remnawave_client_events_total.labels(event="retry_budget_exhausted").inc()
+        return False
+
     async def _request(self, method: str, path: str, **kwargs: Any) -> Response:
-        client = await self._get_client()
         normalized_path = self._normalize_path(path)
+        if method != "GET" or not set(kwargs) <= _COALESCIBLE_KWARGS:
+            return await self._send(method, normalized_path, **kwargs)
+
+        key = (normalized_path, repr(kwargs.get("params")))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, normalized_path, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        else:
+            remnawave_client_events_total.labels(event="coalesced").inc()
+        # Shielded so one cancelled caller does not cancel the request for everyone sharing it.
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, key: Hashable, task: asyncio.Task[Response]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved when every caller has gone away.
+
+    async def _send(self, method: str, normalized_path: str, **kwargs: Any) -> Response:
+        client = await self._get_client()
         sender = getattr(client, method.lower())
         total_attempts = self._retry_attempts + 1
+        route = _route_template(normalized_path)
+        if "timeout" not in kwargs:
+            route_timeout = self._route_timeout(method, normalized_path)
+            if route_timeout is not None:
+                kwargs["timeout"] = route_timeout
+        self._retry_budget.record_request()
 
         for attempt in range(1, total_attempts + 1):
+            started = time.perf_counter()
             try:
                 response = await sender(normalized_path, **kwargs)
                 response.raise_for_status()
                 return response
             except HTTPStatusError as exc:
                 status_code = exc.response.status_code
-                if attempt < total_attempts and status_code >= 500:
+                if status_code >= 500 and self._may_retry(attempt, total_attempts):
                     logger.warning(
                         "Retrying Remnawave request after upstream error",
                         extra={
@@ -84,7 +212,7 @@ class RemnawaveClient:
                             "status_code": status_code,
                         },
                     )
-                    await asyncio.sleep(self._retry_backoff_seconds * attempt)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
 
                 logger.warning(
@@ -97,7 +225,7 @@ class RemnawaveClient:
                 )
                 raise
             except RequestError as exc:
-                if attempt < total_attempts:
+                if self._may_retry(attempt, total_attempts):
                     logger.warning(
                         "Retrying Remnawave request after transport error",
                         extra={
@@ -108,7 +236,7 @@ class RemnawaveClient:
                             "error_type": type(exc).__name__,
                         },
                     )
-                    await asyncio.sleep(self._retry_backoff_seconds * attempt)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
 
                 logger.warning(
@@ -120,6 +248,10 @@ class RemnawaveClient:
                     },
                 )
                 raise
+            finally:
+                external_api_duration_seconds.labels(service="remnawave", endpoint=route, method=method).observe(
+                    time.perf_counter() - started
+                )
 
     async def get(self, path: str, **kwargs: Any) -> dict[str, Any]:
         """GET request without validation (legacy - use get_validated instead)."""
@@ -0,0 +1,83 @@
+"""Write side of the Remnawave user expiry index shared with the task-worker.
+
+The task-worker's ``disable_expired_users`` job reads due users from a Redis
+sorted set instead of scanning the whole Remnawave fleet. Remnawave user
+webhooks keep that index current between the worker's periodic rebuilds.
+
+Key layout must stay in sync with ``services/task-worker/src/utils/constants.py``.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_INDEX_KEY = "cybervpn:users:expiry:index"
+EXPIRY_INDEX_USERS_KEY = "cybervpn:users:expiry:users"
+
+_USER_EVENT_PREFIX = "user."
+_REMOVAL_EVENTS = frozenset({"user.deleted", "user.disabled"})
+
+
+def _expire_at_timestamp(value: Any) -> float | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class RemnawaveExpiryIndex:
+    """Applies Remnawave user webhook events to the shared expiry index.
+
+    Failures are logged and swallowed: the index is advisory and the
+    task-worker rebuilds it from a full fleet scan when it goes stale.
+    """
+
+    def __init__(self, redis_client: redis.Redis) -> None:
+        self._redis = redis_client
+
+    async def apply_event(self, event: str, data: dict[str, Any]) -> None:
+        """Upsert or drop the user carried by a Remnawave ``user.*`` event."""
+        if not event.startswith(_USER_EVENT_PREFIX):
+            return
+        user_uuid = data.get("uuid")
+        if not isinstance(user_uuid, str) or not user_uuid:
+            return
+
+        status = str(data.get("status") or "").lower()
+        expires = _expire_at_timestamp(data.get("expireAt") or data.get("expire_at"))
+
+        remove = event in _REMOVAL_EVENTS or status == "disabled"
+        if not remove and expires is None:
+            return
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            if remove:
+                pipe.zrem(EXPIRY_INDEX_KEY, user_uuid)
+                pipe.hdel(EXPIRY_INDEX_USERS_KEY, user_uuid)
+            else:
+                pipe.zadd(EXPIRY_INDEX_KEY, {user_uuid: expires})
+                pipe.hset(
+                    EXPIRY_INDEX_USERS_KEY,
+                    user_uuid,
+                    json.dumps(
+                        {
+                            "uuid": user_uuid,
+                            "username": data.get("username"),
+                            "telegram_id": data.get("telegramId"),
+                            "expire_at": data.get("expireAt") or data.get("expire_at"),
+                        },
+                        separators=(",", ":"),
+                    ),
+                )
+            await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to update Remnawave expiry index", extra={"event": event}, exc_info=True)
@@ -1,14 +1,20 @@
 """Remnawave subscription client for mobile app integration.
 
 Fetches user subscription data from Remnawave VPN backend
-and maps it to application-layer DTOs.  Includes a Redis caching
-layer (5-min TTL) and graceful fallback when Remnawave is unavailable.
+and maps it to application-layer DTOs.  Includes a batched Redis caching
+layer (5-min TTL, refreshed ahead of expiry) and graceful fallback when
+Remnawave is unavailable.
 """
 
+import asyncio
 import json
 import logging
+import time
+from collections.abc import Coroutine, Iterable
 from dataclasses import asdict
 from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
 
 from src.application.dto.mobile_auth import SubscriptionInfoDTO, SubscriptionStatus
 from src.application.services.cache_service import CacheService
@@ -18,6 +24,10 @@ from src.infrastructure.remnawave.contracts import RemnawaveUserResponse
 logger = logging.getLogger(__name__)
 
 SUBSCRIPTION_CACHE_TTL = 300  # 5 minutes
+SUBSCRIPTION_NEGATIVE_CACHE_TTL = 60
+SUBSCRIPTION_REFRESH_AHEAD_RATIO = 0.8  # refresh hits in the last 20% of their TTL
+SUBSCRIPTION_REFRESH_LOCK_TTL = 30
+SUBSCRIPTION_FETCH_CONCURRENCY = 10
 
 
 # Map Remnawave user status string to SubscriptionStatus enum.
@@ -95,15 +105,32 @@ def _cache_key(remnawave_uuid: str) -> str:
     return f"subscription:{remnawave_uuid}"
 
 
-def _serialize_dto(dto: SubscriptionInfoDTO) -> str:
-    """Serialize SubscriptionInfoDTO to JSON for cache storage."""
-    data = asdict(dto)
-    return json.dumps(data, default=str)
+def _refresh_lock_key(remnawave_uuid: str) -> str:
+    return f"subscription:refresh:{remnawave_uuid}"
 
 
-def _deserialize_dto(raw: str) -> SubscriptionInfoDTO:
-    """Deserialize cached JSON back to SubscriptionInfoDTO."""
-    data = json.loads(raw)
+def _encode_entry(dto: SubscriptionInfoDTO, now: float) -> tuple[dict[str, Any], int]:
+    """Build the cache entry for ``dto`` and its TTL.
+
+    Entries are stored once as compact JSON: ``{"r": refresh_after, "v": dto}``.
+    ``NONE`` results (unknown user or upstream failure) are cached briefly and
+    never refreshed ahead; real subscriptions are refreshed in the background
+    once ``SUBSCRIPTION_REFRESH_AHEAD_RATIO`` of their TTL has passed.
+    """
+    if dto.status == SubscriptionStatus.NONE:
+        ttl = SUBSCRIPTION_NEGATIVE_CACHE_TTL
+        refresh_after = now + ttl
+    else:
+        ttl = SUBSCRIPTION_CACHE_TTL
+        refresh_after = now + ttl * SUBSCRIPTION_REFRESH_AHEAD_RATIO
+    value = asdict(dto)
+    value["status"] = dto.status.value
+    value["expires_at"] = dto.expires_at.isoformat() if dto.expires_at else None
+    return {"r": refresh_after, "v": value}, ttl
+
+
+def _deserialize_dto(data: dict[str, Any]) -> SubscriptionInfoDTO:
+    """Rebuild SubscriptionInfoDTO from its cached ``asdict`` form."""
     return SubscriptionInfoDTO(
         status=SubscriptionStatus(data["status"]),
         plan_name=data.get("plan_name"),
@@ -114,13 +141,26 @@ def _deserialize_dto(raw: str) -> SubscriptionInfoDTO:
     )
 
 
+def _decode_entry(cached: Any) -> tuple[SubscriptionInfoDTO, float]:
+    """Return ``(dto, refresh_after)``; entries written before the envelope are due for refresh."""
+    if isinstance(cached, str):
+        # Older entries were a JSON string stored inside JSON.
+        cached = json.loads(cached)
+    if isinstance(cached, dict) and cached.keys() == {"r", "v"}:
+        return _deserialize_dto(cached["v"]), float(cached["r"])
+    return _deserialize_dto(cached), 0.0
+
+
 class CachedSubscriptionClient:
     """Decorator over RemnawaveSubscriptionClient adding Redis caching + fallback.
 
     Cache strategy:
-    - On HIT: return cached SubscriptionInfoDTO immediately.
-    - On MISS: fetch from Remnawave, cache for 5 min, return.
-    - On Remnawave ERROR: return stale cache (if any) or NONE fallback.
+    - On HIT: return cached SubscriptionInfoDTO immediately; past the
+      refresh-ahead point, also refresh it in the background (one refresh per
+      user across processes) so hot users never see a miss.
+    - On MISS: fetch from Remnawave, cache for 5 min (``NONE`` for 1 min), return.
+    - Batches (``get_subscriptions``) read hits with one ``MGET`` and fetch
+      misses with bounded concurrency.
     """
 
     def __init__(
@@ -133,27 +173,95 @@ class CachedSubscriptionClient:
 
     async def get_subscription(self, remnawave_uuid: str) -> SubscriptionInfoDTO:
         """Get subscription with cache-first strategy and fallback."""
-        key = _cache_key(remnawave_uuid)
+        return (await self.get_subscriptions([remnawave_uuid]))[remnawave_uuid]
 
-        # 1. Try cache.
-        cached = await self._cache.get(key)
-        if cached is not None:
-            try:
-                return _deserialize_dto(cached) if isinstance(cached, str) else _deserialize_dto(json.dumps(cached))
-            except Exception as e:
-                logger.warning("Corrupt subscription cache entry, fetching fresh: %s", e, extra={"key": key})
+    async def get_subscriptions(self, remnawave_uuids: Iterable[str]) -> dict[str, SubscriptionInfoDTO]:
+        """Get subscriptions for many users: one ``MGET``, then bounded upstream fetches for misses.
 
-        # 2. Fetch from Remnawave.
-        dto = await self._inner.get_subscription(remnawave_uuid)
+        Returns:
+            Mapping of every requested UUID to its SubscriptionInfoDTO.
+        """
+        uuids = list(dict.fromkeys(remnawave_uuids))
+        if not uuids:
+            return {}
 
-        # 3. Cache the result (even NONE status, to avoid hammering on missing users).
         try:
-            await self._cache.set(key, _serialize_dto(dto), ttl=SUBSCRIPTION_CACHE_TTL)
+            cached_entries = await self._cache.get_many([_cache_key(uuid) for uuid in uuids])
+        except Exception as e:
+            logger.warning("Subscription cache read failed, fetching fresh: %s", e)
+            cached_entries = [None] * len(uuids)
+
+        now = time.time()
+        results: dict[str, SubscriptionInfoDTO] = {}
+        misses: list[str] = []
+        for uuid, cached in zip(uuids, cached_entries, strict=True):
+            if cached is None:
+                misses.append(uuid)
+                continue
+            try:
+                dto, refresh_after = _decode_entry(cached)
+            except Exception as e:
+                logger.warning(
+                    "Corrupt subscription cache entry, fetching fresh: %s", e, extra={"key": _cache_key(uuid)}
+                )
+                misses.append(uuid)
+                continue
+            results[uuid] = dto
+            if refresh_after <= now:
+                _spawn(self._refresh(uuid))
+
+        if misses:
+            semaphore = asyncio.Semaphore(SUBSCRIPTION_FETCH_CONCURRENCY)
+
+            async def fetch(uuid: str) -> SubscriptionInfoDTO:
+                async with semaphore:
+                    return await self._inner.get_subscription(uuid)
+
+            fetched = await asyncio.gather(*(fetch(uuid) for uuid in misses))
+            results.update(zip(misses, fetched, strict=True))
+            await self._store({uuid: results[uuid] for uuid in misses})
+
+        return {uuid: results[uuid] for uuid in uuids}
+
+    async def _store(self, dtos: dict[str, SubscriptionInfoDTO]) -> None:
+        now = time.time()
+        try:
+            await self._cache.set_many({_cache_key(uuid): _encode_entry(dto, now) for uuid, dto in dtos.items()})
         except Exception as e:
-            logger.warning("Failed to cache subscription: %s", e, extra={"key": key})
+            logger.warning("Failed to cache subscriptions: %s", e, extra={"count": len(dtos)})
 
-        return dto
+    async def _refresh(self, remnawave_uuid: str) -> None:
+        lock_key = _refresh_lock_key(remnawave_uuid)
+        token = uuid4().hex
+        try:
+            if not await self._cache.add(lock_key, token, ttl=SUBSCRIPTION_REFRESH_LOCK_TTL):
+                return
+            dto = await self._inner.get_subscription(remnawave_uuid)
+            if dto.status == SubscriptionStatus.NONE:
+                # Keep serving the last good value until it expires rather than caching a failure over it.
+                return
+            if await self._cache.get(lock_key) != token:
+                # invalidate() ran meanwhile; the fetched value may predate the change behind it.
+                return
+            await self._store({remnawave_uuid: dto})
+        except Exception as e:
+            logger.warning("Subscription refresh-ahead failed: %s", e, extra={"remnawave_uuid": remnawave_uuid})
 
     async def invalidate(self, remnawave_uuid: str) -> None:
-        """Invalidate cached subscription for a user (e.g. after purchase)."""
+        """Invalidate cached subscription for a user (e.g. after purchase).
+
+        Also drops the refresh lock, so a refresh-ahead already in flight does
+        not write its older value back.
+        """
         await self._cache.delete(_cache_key(remnawave_uuid))
+        await self._cache.delete(_refresh_lock_key(remnawave_uuid))
+
+
+# Strong references to background refresh tasks until they finish.
+_background_refreshes: set[asyncio.Task[None]] = set()
+
+
+def _spawn(coro: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.create_task(coro)
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
@@ -194,6 +194,32 @@ async def lifespan(app: FastAPI):
         logger.warning("Messaging event backbone startup failed: %s", e, exc_info=True)
         raise
 
+    if settings.websocket_backplane_enabled:
+        try:
+            from src.infrastructure.cache.redis_client import get_redis_client
+            from src.infrastructure.messaging.websocket_manager import ws_manager
+
+            await ws_manager.start_backplane(await get_redis_client())
+        except Exception as e:
+            logger.warning("WebSocket backplane startup failed: %s", e, exc_info=True)
+
+    if settings.auth_local_cache_enabled:
+        try:
+            from src.infrastructure.cache.auth_cache import auth_cache
+            from src.infrastructure.cache.redis_client import get_redis_client
+
+            await auth_cache.start(await get_redis_client())
+        except Exception as e:
+            logger.warning("Auth cache sync startup failed: %s", e, exc_info=True)
+
+    try:
+        from src.infrastructure.cache.redis_client import get_redis_client
+        from src.infrastructure.cache.response_cache import response_cache
+
+        await response_cache.start_invalidation_listener(await get_redis_client())
+    except Exception as e:
+        logger.warning("Response cache invalidation listener startup failed: %s", e, exc_info=True)
+
     yield
 
     # Shutdown
@@ -237,6 +263,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Shutdown error in email_dispatcher: %s", e, exc_info=True)
 
+    try:
+        from src.infrastructure.messaging.websocket_manager import ws_manager
+
+        await ws_manager.stop_backplane()
+    except Exception as e:
+        logger.warning("Shutdown error in websocket backplane: %s", e, exc_info=True)
+
+    try:
+        from src.infrastructure.cache.auth_cache import auth_cache
+
+        await auth_cache.stop()
+    except Exception as e:
+        logger.warning("Shutdown error in auth cache sync: %s", e, exc_info=True)
+
+    try:
+        from src.infrastructure.cache.response_cache import response_cache
+
+        await response_cache.stop_invalidation_listener()
+    except Exception as e:
+        logger.warning("Shutdown error in response cache listener: %s", e, exc_info=True)
+
     try:
         from src.infrastructure.cache.redis_client import close_redis_pool
 
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.services.stage1_plan_policy import filter_stage1_public_addons
 from src.application.use_cases.auth.permissions import Permission
+from src.application.use_cases.public_catalog import public_catalog_cache
 from src.config.settings import settings
 from src.infrastructure.database.models.admin_user_model import AdminUserModel
 from src.infrastructure.database.models.plan_addon_model import PlanAddonModel
@@ -102,6 +103,7 @@ async def create_addon(
         before=None,
         after=after,
     )
+    public_catalog_cache.invalidate_after_commit(db)
     return _serialize_addon(created)
 
 
@@ -135,4 +137,5 @@ async def update_addon(
         before=before,
         after=after,
     )
+    public_catalog_cache.invalidate_after_commit(db)
     return _serialize_addon(updated)
@@ -0,0 +1,62 @@
+"""Admin download of bulk export files produced by the task worker."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import redis.asyncio as redis
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from src.application.use_cases.auth.permissions import Permission
+from src.config.settings import settings
+from src.infrastructure.cache.redis_client import get_redis
+from src.infrastructure.monitoring.metrics import route_operations_total
+from src.presentation.dependencies.roles import require_permission
+
+router = APIRouter(prefix="/admin/exports", tags=["admin"])
+
+_MEDIA_TYPES = {
+    ".csv": "text/csv",
+    ".json": "application/json",
+    ".ndjson": "application/x-ndjson",
+    ".parquet": "application/vnd.apache.parquet",
+    ".gz": "application/gzip",
+    ".zst": "application/zstd",
+}
+
+
+def _resolve_export_file(file_path: str) -> Path | None:
+    """Return the resolved export file if it exists inside the export directory."""
+    export_dir = Path(settings.export_dir).resolve()
+    path = Path(file_path).resolve()
+    if not path.is_relative_to(export_dir) or not path.is_file():
+        return None
+    return path
+
+
+@router.get("/{job_id}/parts/{part}", response_class=FileResponse)
+async def download_export_file(
+    job_id: str,
+    part: int,
+    redis_client: redis.Redis = Depends(get_redis),
+    _: None = Depends(require_permission(Permission.VIEW_ANALYTICS)),
+) -> FileResponse:
+    """Download one finished chunk (1-based part number) of a bulk export (admin only).
+
+    The file is streamed from the shared export directory and supports HTTP
+    ``Range`` requests, so large chunks can be fetched and resumed in parts.
+    Chunks become available as soon as the worker finishes them.
+    """
+    raw_meta = await redis_client.get(f"cybervpn:export:{job_id}")
+    files = json.loads(raw_meta).get("files", []) if raw_meta else []
+    if not 1 <= part <= len(files):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export file not found")
+
+    # resolve() and is_file() hit the filesystem; keep them off the event loop.
+    path = await asyncio.to_thread(_resolve_export_file, files[part - 1]["file_path"])
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export file not found")
+
+    route_operations_total.labels(route="admin", action="download_export_file", status="success").inc()
+    return FileResponse(path, filename=path.name, media_type=_MEDIA_TYPES.get(path.suffix, "application/octet-stream"))
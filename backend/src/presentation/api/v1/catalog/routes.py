@@ -8,6 +8,7 @@ from src.application.use_cases.public_catalog import (
     PublicCommercialCatalog,
     ResolvePublicCatalogContextUseCase,
     ResolvePublicCommercialCatalogUseCase,
+    public_catalog_cache,
 )
 from src.domain.entities.commercial_context import CommercialContextSignals
 from src.presentation.dependencies.database import get_db
@@ -64,7 +65,7 @@ async def get_public_catalog(
         explicitCurrencyCode=currency,
         channelKey=channel,
     )
-    use_case = ResolvePublicCommercialCatalogUseCase(db)
+    use_case = ResolvePublicCommercialCatalogUseCase(db, cache=public_catalog_cache)
     try:
         catalog = await use_case.execute(
             signals=_build_signals(payload, request),
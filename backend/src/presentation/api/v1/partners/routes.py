@@ -1,12 +1,14 @@
 """Partner API routes for mobile users and admin."""
 
+import hashlib
+import json
 import logging
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from time import perf_counter
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.services.config_service import ConfigService
@@ -49,6 +51,7 @@ from src.application.use_cases.settlement import (
     ListPayoutInstructionsUseCase,
     MakeDefaultPartnerPayoutAccountUseCase,
 )
+from src.config.settings import settings
 from src.domain.entities.partner_permission import PartnerPermission
 from src.domain.enums import (
     AdminRole,
@@ -79,6 +82,10 @@ from src.infrastructure.database.models.order_attribution_result_model import (
 )
 from src.infrastructure.database.models.order_model import OrderModel
 from src.infrastructure.database.models.partner_model import PartnerCodeModel
+from src.infrastructure.database.models.partner_notification_feed_model import (
+    PartnerNotificationFeedItemModel,
+    PartnerNotificationFeedStateModel,
+)
 from src.infrastructure.database.models.partner_workspace_legal_acceptance_model import (
     PartnerWorkspaceLegalAcceptanceModel,
 )
@@ -90,6 +97,11 @@ from src.infrastructure.database.repositories.growth_code_repo import GrowthCode
 from src.infrastructure.database.repositories.partner_account_repository import (
     PartnerAccountRepository,
 )
+from src.infrastructure.database.repositories.partner_notification_feed_repository import (
+    PartnerNotificationFeedEntry,
+    PartnerNotificationFeedRepository,
+    encode_feed_cursor,
+)
 from src.infrastructure.database.repositories.partner_notification_read_state_repository import (
     PartnerNotificationReadStateRepository,
 )
@@ -539,13 +551,15 @@ async def _build_partner_notification_feed(
     current_user: AdminUserModel,
     db: AsyncSession,
     include_archived: bool = False,
+    read_state_by_key: dict[str, object] | None = None,
 ) -> list[PartnerNotificationFeedItemResponse]:
-    read_state_by_key = _notification_state_by_key(
-        await PartnerNotificationReadStateRepository(db).list_for_workspace_and_actor(
-            partner_account_id=access.workspace.id,
-            admin_user_id=current_user.id,
+    if read_state_by_key is None:
+        read_state_by_key = _notification_state_by_key(
+            await PartnerNotificationReadStateRepository(db).list_for_workspace_and_actor(
+                partner_account_id=access.workspace.id,
+                admin_user_id=current_user.id,
+            )
         )
-    )
     items: list[PartnerNotificationFeedItemResponse] = []
 
     workflow_events = await ListPartnerWorkspaceWorkflowEventsUseCase(db).execute(
@@ -913,22 +927,138 @@ async def _build_partner_notification_feed(
     return items
 
 
-async def _build_partner_notification_counters(
+def _partner_notification_feed_fingerprint(
+    *,
+    access: PartnerWorkspaceAccess,
+    current_user: AdminUserModel,
+) -> str:
+    payload = json.dumps(
+        {
+            "permission_keys": sorted(access.permission_keys),
+            "preferences": _build_workspace_notification_preferences(current_user),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _partner_notification_feed_is_current(
+    state: PartnerNotificationFeedStateModel | None,
+    fingerprint: str,
+) -> bool:
+    if state is None or state.synced_at is None:
+        return False
+    if state.synced_version != state.source_version or state.source_fingerprint != fingerprint:
+        return False
+    max_age = timedelta(seconds=settings.partner_notification_feed_max_age_seconds)
+    return _normalize_utc(state.synced_at) > datetime.now(UTC) - max_age
+
+
+async def _sync_partner_notification_feed(
     *,
     access: PartnerWorkspaceAccess,
     current_user: AdminUserModel,
     db: AsyncSession,
-) -> PartnerNotificationCountersResponse:
+) -> PartnerNotificationFeedStateModel:
+    """Return the operator's feed state, re-syncing the stored feed from its sources when it is out of date."""
+    repo = PartnerNotificationFeedRepository(db)
+    fingerprint = _partner_notification_feed_fingerprint(access=access, current_user=current_user)
+    state = await repo.get_state(partner_account_id=access.workspace.id, admin_user_id=current_user.id)
+    if _partner_notification_feed_is_current(state, fingerprint):
+        return state
+
+    if state is None:
+        state = await repo.lock_or_create_state(partner_account_id=access.workspace.id, admin_user_id=current_user.id)
+    else:
+        locked = await repo.get_state(
+            partner_account_id=access.workspace.id,
+            admin_user_id=current_user.id,
+            for_update=True,
+            skip_locked=True,
+        )
+        if locked is None:
+            # Another request is re-syncing this feed; serve the stored rows instead of queueing behind it.
+            return state
+        state = locked
+    if _partner_notification_feed_is_current(state, fingerprint):
+        return state
+    synced_version = state.source_version
+    read_state_by_key = _notification_state_by_key(
+        await PartnerNotificationReadStateRepository(db).list_for_workspace_and_actor(
+            partner_account_id=access.workspace.id,
+            admin_user_id=current_user.id,
+        )
+    )
     items = await _build_partner_notification_feed(
         access=access,
         current_user=current_user,
         db=db,
-        include_archived=False,
+        include_archived=True,
+        read_state_by_key=read_state_by_key,
+    )
+    entries = []
+    for item in items:
+        read_state = read_state_by_key.get(item.id)
+        entries.append(
+            PartnerNotificationFeedEntry(
+                notification_key=item.id,
+                kind=item.kind,
+                tone=item.tone,
+                route_slug=item.route_slug,
+                message=item.message,
+                notes=list(item.notes),
+                action_required=item.action_required,
+                unread=item.unread,
+                read_at=getattr(read_state, "read_at", None),
+                archived_at=getattr(read_state, "archived_at", None),
+                created_at=item.created_at,
+                source_kind=item.source_kind,
+                source_id=item.source_id,
+                source_event_id=item.source_event_id,
+                source_event_kind=item.source_event_kind,
+            )
+        )
+    await repo.sync_items(
+        state,
+        entries,
+        synced_version=synced_version,
+        source_fingerprint=fingerprint,
+        synced_at=datetime.now(UTC),
+    )
+    return state
+
+
+def _serialize_partner_notification_feed_item(
+    item: PartnerNotificationFeedItemModel,
+) -> PartnerNotificationFeedItemResponse:
+    return PartnerNotificationFeedItemResponse(
+        id=item.notification_key,
+        kind=item.kind,
+        tone=item.tone,
+        route_slug=item.route_slug,
+        message=item.message,
+        notes=list(item.notes or []),
+        action_required=item.action_required,
+        unread=item.unread,
+        created_at=_normalize_utc(item.created_at),
+        source_kind=item.source_kind,
+        source_id=item.source_id,
+        source_event_id=item.source_event_id,
+        source_event_kind=item.source_event_kind,
     )
+
+
+async def _build_partner_notification_counters(
+    *,
+    access: PartnerWorkspaceAccess,
+    current_user: AdminUserModel,
+    db: AsyncSession,
+) -> PartnerNotificationCountersResponse:
+    state = await _sync_partner_notification_feed(access=access, current_user=current_user, db=db)
     return PartnerNotificationCountersResponse(
-        total_notifications=len(items),
-        unread_notifications=sum(1 for item in items if item.unread),
-        action_required_notifications=sum(1 for item in items if item.action_required),
+        total_notifications=state.total_count,
+        unread_notifications=state.unread_count,
+        action_required_notifications=state.action_required_count,
     )
 
 def _serialize_workspace_organization_profile_response(
@@ -4483,8 +4613,11 @@ async def get_partner_session_bootstrap(
     response_model=list[PartnerNotificationFeedItemResponse],
 )
 async def list_partner_notifications(
+    response: Response,
     workspace_id: UUID | None = Query(None),
     include_archived: bool = Query(False),
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = Query(None),
     current_user: AdminUserModel = Depends(get_current_active_user),
     current_realm: RealmResolution = Depends(get_request_admin_realm),
     db: AsyncSession = Depends(get_db),
@@ -4496,12 +4629,17 @@ async def list_partner_notifications(
         workspace_id=workspace_id,
     )
     track_partner_operation(operation="list_partner_notifications")
-    return await _build_partner_notification_feed(
-        access=access,
-        current_user=current_user,
-        db=db,
+    await _sync_partner_notification_feed(access=access, current_user=current_user, db=db)
+    items = await PartnerNotificationFeedRepository(db).list_items(
+        partner_account_id=access.workspace.id,
+        admin_user_id=current_user.id,
         include_archived=include_archived,
+        limit=limit,
+        cursor=cursor,
     )
+    if limit is not None and len(items) == limit:
+        response.headers["X-Next-Cursor"] = encode_feed_cursor(items[-1])
+    return [_serialize_partner_notification_feed_item(item) for item in items]
 
 
 @router.get(
@@ -4545,13 +4683,13 @@ async def mark_partner_notification_read(
         db=db,
         workspace_id=workspace_id,
     )
-    items = await _build_partner_notification_feed(
-        access=access,
-        current_user=current_user,
-        db=db,
-        include_archived=True,
+    feed_state = await _sync_partner_notification_feed(access=access, current_user=current_user, db=db)
+    feed_repo = PartnerNotificationFeedRepository(db)
+    target = await feed_repo.get_item(
+        partner_account_id=access.workspace.id,
+        admin_user_id=current_user.id,
+        notification_key=notification_id,
     )
-    target = next((item for item in items if item.id == notification_id), None)
     if target is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner notification not found")
 
@@ -4561,6 +4699,7 @@ async def mark_partner_notification_read(
         notification_key=notification_id,
         read_at=datetime.now(UTC),
     )
+    await feed_repo.apply_read_state(feed_state, target, read_at=state.read_at, archived_at=state.archived_at)
     await db.commit()
     track_partner_operation(operation="mark_partner_notification_read")
     observe_partner_notification_state_change(
@@ -4605,13 +4744,13 @@ async def archive_partner_notification(
         db=db,
         workspace_id=workspace_id,
     )
-    items = await _build_partner_notification_feed(
-        access=access,
-        current_user=current_user,
-        db=db,
-        include_archived=True,
+    feed_state = await _sync_partner_notification_feed(access=access, current_user=current_user, db=db)
+    feed_repo = PartnerNotificationFeedRepository(db)
+    target = await feed_repo.get_item(
+        partner_account_id=access.workspace.id,
+        admin_user_id=current_user.id,
+        notification_key=notification_id,
     )
-    target = next((item for item in items if item.id == notification_id), None)
     if target is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner notification not found")
 
@@ -4622,6 +4761,7 @@ async def archive_partner_notification(
         read_at=datetime.now(UTC),
         archived_at=datetime.now(UTC),
     )
+    await feed_repo.apply_read_state(feed_state, target, read_at=state.read_at, archived_at=state.archived_at)
     await db.commit()
     track_partner_operation(operation="archive_partner_notification")
     observe_partner_notification_state_change(
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.services.stage1_plan_policy import filter_stage1_public_paid_plans
 from src.application.use_cases.auth.permissions import Permission
+from src.application.use_cases.public_catalog import public_catalog_cache
 from src.domain.enums import CatalogVisibility
 from src.infrastructure.database.models.admin_user_model import AdminUserModel
 from src.infrastructure.database.models.subscription_plan_model import SubscriptionPlanModel
@@ -122,6 +123,7 @@ async def create_plan(
         before=None,
         after=after,
     )
+    public_catalog_cache.invalidate_after_commit(db)
     return _serialize_plan(created)
 
 
@@ -188,6 +190,7 @@ async def update_plan(
         before=before,
         after=after,
     )
+    public_catalog_cache.invalidate_after_commit(db)
     return _serialize_plan(updated)
 
 
@@ -219,4 +222,5 @@ async def delete_plan(
             before=before,
             after=None,
         )
+    public_catalog_cache.invalidate_after_commit(db)
     return StatusMessageResponse(status="ok", message="Plan deleted")
@@ -4,6 +4,7 @@ from src.presentation.api.v1.access_delivery_channels.routes import router as ac
 from src.presentation.api.v1.addons.routes import router as addons_router
 from src.presentation.api.v1.admin.customer_operations import router as admin_customer_operations_router
 from src.presentation.api.v1.admin.customer_support import router as admin_customer_support_router
+from src.presentation.api.v1.admin.exports import router as admin_exports_router
 from src.presentation.api.v1.admin.growth import router as admin_growth_router
 from src.presentation.api.v1.admin.invites import router as invites_router
 from src.presentation.api.v1.admin.mobile_users import router as admin_mobile_users_router
@@ -256,6 +257,7 @@ api_router.include_router(monitoring_router)
 api_router.include_router(public_network_router)
 api_router.include_router(admin_router)
 api_router.include_router(admin_system_config_router)
+api_router.include_router(admin_exports_router)
 api_router.include_router(invites_router)
 api_router.include_router(admin_growth_router)
 api_router.include_router(admin_mobile_users_router)
@@ -74,7 +74,7 @@ async def list_servers(
 
         return [_serialize_server_response(server).model_dump(mode="json") for server in servers]
 
-    return await response_cache.get_or_fetch("servers:list", 30, _fetch)
+    return await response_cache.get_or_fetch("servers:list", 30, _fetch, tags=("servers",))
 
 
 @router.post("/", response_model=ServerResponse, status_code=status.HTTP_201_CREATED)
@@ -94,7 +94,7 @@ async def create_server(
         port=request.port,
     )
 
-    await response_cache.invalidate("servers:list", "servers:stats")
+    await response_cache.invalidate_tags("servers")
 
     return _serialize_server_response(server)
 
@@ -120,7 +120,7 @@ async def get_server_stats(
 
         return ServerStatsResponse(**stats).model_dump()
 
-    return await response_cache.get_or_fetch("servers:stats", 15, _fetch)
+    return await response_cache.get_or_fetch("servers:stats", 15, _fetch, tags=("servers",))
 
 
 @router.get("/{server_id}", response_model=ServerResponse)
@@ -167,7 +167,7 @@ async def update_server(
 
     server = await use_case.update(uuid=server_id, **update_kwargs)
 
-    await response_cache.invalidate("servers:list", "servers:stats")
+    await response_cache.invalidate_tags("servers")
 
     return _serialize_server_response(server)
 
@@ -185,6 +185,6 @@ async def delete_server(
 
     await use_case.delete(uuid=server_id)
 
-    await response_cache.invalidate("servers:list", "servers:stats")
+    await response_cache.invalidate_tags("servers")
 
     return None
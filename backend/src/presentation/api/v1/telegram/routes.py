@@ -1,5 +1,7 @@
 """Telegram bot integration routes."""
 
+import asyncio
+import hashlib
 import hmac
 import logging
 import re
@@ -10,7 +12,7 @@ from decimal import Decimal
 from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -94,6 +96,7 @@ from src.presentation.api.v1.telegram.schemas import (
     TelegramBotCheckoutRequest,
     TelegramBotCurrentServiceStateResponse,
     TelegramBotEntitlementsResponse,
+    TelegramBotHomeResponse,
     TelegramBotInviteCodeResponse,
     TelegramBotOrderResponse,
     TelegramBotPaymentStatusResponse,
@@ -666,6 +669,96 @@ def _build_bot_trial_status(
     )
 
 
+async def _list_bot_plans(db: AsyncSession) -> list[TelegramBotPlanResponse]:
+    plans = await SubscriptionPlanRepository(db).list_catalog(
+        visibility="public",
+        sale_channel="telegram_bot",
+        active_only=True,
+    )
+    return [_serialize_plan(plan) for plan in filter_stage1_public_paid_plans(plans, sale_channel="telegram_bot")]
+
+
+async def _list_bot_subscriptions(
+    db: AsyncSession,
+    mobile_user: MobileUserModel,
+    current_realm: RealmResolution,
+) -> list[TelegramBotSubscriptionResponse]:
+    result = await ListCustomerSubscriptionsUseCase(db).execute(
+        customer_account_id=mobile_user.id,
+        auth_realm_id=current_realm.auth_realm.id,
+    )
+    return [_build_bot_subscription_from_summary(item) for item in result.items]
+
+
+async def _get_default_bot_service_state(
+    db: AsyncSession,
+    mobile_user: MobileUserModel,
+    current_realm: RealmResolution,
+    telegram_id: int,
+) -> Any:
+    return await GetCurrentServiceStateUseCase(db).execute(
+        customer_account_id=mobile_user.id,
+        current_realm=current_realm,
+        provider_name="remnawave",
+        channel_type=AccessDeliveryChannelType.TELEGRAM_BOT.value,
+        channel_subject_ref=None,
+        provisioning_profile_key=None,
+        credential_type=DeviceCredentialType.TELEGRAM_BOT.value,
+        credential_subject_key=f"telegram-bot:{telegram_id}",
+    )
+
+
+def _serialize_bot_service_state(
+    mobile_user: MobileUserModel,
+    current_realm: RealmResolution,
+    result: Any,
+    telegram_id: int,
+) -> TelegramBotCurrentServiceStateResponse:
+    return TelegramBotCurrentServiceStateResponse(
+        customer_account_id=mobile_user.id,
+        auth_realm_id=current_realm.auth_realm.id,
+        provider_name="remnawave",
+        entitlement_snapshot=result.entitlement_snapshot,
+        service_identity=(
+            _serialize_service_identity(result.service_identity) if result.service_identity is not None else None
+        ),
+        provisioning_profile=(
+            _serialize_provisioning_profile(result.provisioning_profile)
+            if result.provisioning_profile is not None
+            else None
+        ),
+        device_credential=(
+            _serialize_device_credential(result.device_credential)
+            if getattr(result, "device_credential", None) is not None
+            else None
+        ),
+        access_delivery_channel=(
+            _serialize_access_delivery_channel(result.access_delivery_channel)
+            if result.access_delivery_channel is not None
+            else None
+        ),
+        purchase_context=_serialize_purchase_context(result.active_entitlement_grant),
+        consumption_context=CurrentServiceStateConsumptionContextResponse(
+            channel_type=AccessDeliveryChannelType.TELEGRAM_BOT,
+            channel_subject_ref=result.resolved_channel_subject_ref or f"telegram-bot:{telegram_id}",
+            provisioning_profile_key=result.resolved_provisioning_profile_key,
+            credential_type=DeviceCredentialType.TELEGRAM_BOT,
+            credential_subject_key=f"telegram-bot:{telegram_id}",
+        ),
+    )
+
+
+def _bot_home_etag(body: TelegramBotHomeResponse) -> str:
+    return f'"{hashlib.sha256(body.model_dump_json().encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/user/{telegram_id}", response_model=TelegramUserResponse)
 async def get_telegram_user(
     telegram_id: int,
@@ -779,14 +872,9 @@ async def get_bot_plans(
 ) -> list[TelegramBotPlanResponse]:
     """Return the canonical public catalog for the Telegram bot channel."""
     _require_telegram_bot_secret(telegram_bot_secret)
-    repo = SubscriptionPlanRepository(db)
-    plans = await repo.list_catalog(
-        visibility="public",
-        sale_channel="telegram_bot",
-        active_only=True,
-    )
+    plans = await _list_bot_plans(db)
     route_operations_total.labels(route="telegram_bot", action="list_plans", status="success").inc()
-    return [_serialize_plan(plan) for plan in filter_stage1_public_paid_plans(plans, sale_channel="telegram_bot")]
+    return plans
 
 
 @router.get("/bot/addons/catalog", response_model=list[TelegramBotAddonResponse])
@@ -1024,13 +1112,10 @@ async def get_bot_user_subscriptions(
 
     mobile_user = await _get_mobile_user_or_404(db, telegram_id)
     current_realm = await _resolve_bot_customer_realm(db, mobile_user)
-    result = await ListCustomerSubscriptionsUseCase(db).execute(
-        customer_account_id=mobile_user.id,
-        auth_realm_id=current_realm.auth_realm.id,
-    )
+    subscriptions = await _list_bot_subscriptions(db, mobile_user, current_realm)
 
     route_operations_total.labels(route="telegram_bot", action="list_subscriptions", status="success").inc()
-    return [_build_bot_subscription_from_summary(item) for item in result.items]
+    return subscriptions
 
 
 @router.get("/bot/user/{telegram_id}/entitlements", response_model=TelegramBotEntitlementsResponse)
@@ -1091,49 +1176,67 @@ async def get_bot_user_service_state(
         except PermissionError as exc:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
     else:
-        result = await GetCurrentServiceStateUseCase(db).execute(
-            customer_account_id=mobile_user.id,
-            current_realm=current_realm,
-            provider_name="remnawave",
-            channel_type=AccessDeliveryChannelType.TELEGRAM_BOT.value,
-            channel_subject_ref=None,
-            provisioning_profile_key=None,
-            credential_type=DeviceCredentialType.TELEGRAM_BOT.value,
-            credential_subject_key=f"telegram-bot:{telegram_id}",
-        )
+        result = await _get_default_bot_service_state(db, mobile_user, current_realm, telegram_id)
     route_operations_total.labels(route="telegram_bot", action="service_state", status="success").inc()
-    return TelegramBotCurrentServiceStateResponse(
-        customer_account_id=mobile_user.id,
-        auth_realm_id=current_realm.auth_realm.id,
-        provider_name="remnawave",
-        entitlement_snapshot=result.entitlement_snapshot,
-        service_identity=(
-            _serialize_service_identity(result.service_identity) if result.service_identity is not None else None
-        ),
-        provisioning_profile=(
-            _serialize_provisioning_profile(result.provisioning_profile)
-            if result.provisioning_profile is not None
-            else None
-        ),
-        device_credential=(
-            _serialize_device_credential(result.device_credential)
-            if getattr(result, "device_credential", None) is not None
-            else None
-        ),
-        access_delivery_channel=(
-            _serialize_access_delivery_channel(result.access_delivery_channel)
-            if result.access_delivery_channel is not None
-            else None
-        ),
-        purchase_context=_serialize_purchase_context(result.active_entitlement_grant),
-        consumption_context=CurrentServiceStateConsumptionContextResponse(
-            channel_type=AccessDeliveryChannelType.TELEGRAM_BOT,
-            channel_subject_ref=result.resolved_channel_subject_ref or f"telegram-bot:{telegram_id}",
-            provisioning_profile_key=result.resolved_provisioning_profile_key,
-            credential_type=DeviceCredentialType.TELEGRAM_BOT,
-            credential_subject_key=f"telegram-bot:{telegram_id}",
-        ),
+    return _serialize_bot_service_state(mobile_user, current_realm, result, telegram_id)
+
+
+@router.get("/bot/user/{telegram_id}/home", response_model=TelegramBotHomeResponse)
+async def get_bot_user_home(
+    telegram_id: int,
+    response: Response,
+    telegram_bot_secret: str | None = Header(default=None, alias="X-Telegram-Bot-Secret"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    db: AsyncSession = Depends(get_db),
+    remnawave_client: RemnawaveClient = Depends(get_remnawave_client),
+) -> TelegramBotHomeResponse | Response:
+    """Return everything the bot's menus render (user, entitlements, service state, subscriptions, plans).
+
+    The Remnawave lookup runs concurrently with the database reads; the reads
+    share the request session and therefore stay sequential. The response
+    carries an ETag, and a matching ``If-None-Match`` is answered with 304.
+    """
+    _require_telegram_bot_secret(telegram_bot_secret)
+    user = await _get_bot_user_or_404(db, telegram_id)
+
+    async def load_database_state() -> tuple[
+        dict[str, Any] | None,
+        TelegramBotCurrentServiceStateResponse | None,
+        list[TelegramBotSubscriptionResponse],
+        list[TelegramBotPlanResponse],
+    ]:
+        plans = await _list_bot_plans(db)
+        mobile_user = await MobileUserRepository(db).get_by_telegram_id(telegram_id)
+        if mobile_user is None:
+            return None, None, [], plans
+
+        entitlements = await GetCurrentEntitlementsUseCase(db).execute(mobile_user.id)
+        current_realm = await _resolve_bot_customer_realm(db, mobile_user)
+        subscriptions = await _list_bot_subscriptions(db, mobile_user, current_realm)
+        result = await _get_default_bot_service_state(db, mobile_user, current_realm, telegram_id)
+        service_state = _serialize_bot_service_state(mobile_user, current_realm, result, telegram_id)
+        return entitlements, service_state, subscriptions, plans
+
+    remnawave_user, (entitlements, service_state, subscriptions, plans) = await asyncio.gather(
+        RemnawaveUserGateway(client=remnawave_client).get_by_telegram_id(telegram_id),
+        load_database_state(),
     )
+    body = TelegramBotHomeResponse(
+        user=_build_bot_user_response(user, remnawave_user=remnawave_user, entitlements_snapshot=entitlements),
+        entitlements=TelegramBotEntitlementsResponse(**entitlements) if entitlements is not None else None,
+        service_state=service_state,
+        subscriptions=subscriptions,
+        plans=plans,
+    )
+
+    etag = _bot_home_etag(body)
+    if _etag_matches(if_none_match, etag):
+        route_operations_total.labels(route="telegram_bot", action="home", status="not_modified").inc()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    route_operations_total.labels(route="telegram_bot", action="home", status="success").inc()
+    return body
 
 
 @router.post(
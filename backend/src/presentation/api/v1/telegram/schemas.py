@@ -353,3 +353,13 @@ TelegramBotCheckoutQuoteResponse = CheckoutQuoteResponse
 TelegramBotCheckoutCommitResponse = CheckoutCommitResponse
 TelegramBotOrderResponse = OrderResponse
 TelegramBotCurrentServiceStateResponse = CurrentServiceStateResponse
+
+
+class TelegramBotHomeResponse(BaseModel):
+    """Everything the bot's home, connect and plan screens render, in one response."""
+
+    user: TelegramBotUserResponse
+    entitlements: TelegramBotEntitlementsResponse | None = None
+    service_state: TelegramBotCurrentServiceStateResponse | None = None
+    subscriptions: list[TelegramBotSubscriptionResponse] = Field(default_factory=list)
+    plans: list[TelegramBotPlanResponse] = Field(default_factory=list)
@@ -13,6 +13,7 @@ from src.domain.exceptions.domain_errors import InvalidWebhookSignatureError
 from src.infrastructure.cache.redis_client import get_redis
 from src.infrastructure.monitoring.metrics import webhook_operations_total
 from src.infrastructure.payments.cryptobot.webhook_handler import CryptoBotWebhookHandler
+from src.infrastructure.remnawave.expiry_index import RemnawaveExpiryIndex
 from src.infrastructure.remnawave.webhook_validator import RemnawaveWebhookValidator
 from src.presentation.api.shared.stage1_payment_mapping import Stage1PaymentProvider
 from src.presentation.api.shared.stage1_webhook_signature import verify_stage1_webhook_signature
@@ -27,6 +28,7 @@ _webhook_secret_fallback_warned = False
 async def remnawave_webhook(
     request: Request,
     db: AsyncSession = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
 ) -> dict[str, str]:
     """Handle webhook callbacks from Remnawave VPN service."""
     global _webhook_secret_fallback_warned
@@ -45,7 +47,11 @@ async def remnawave_webhook(
         max_age_seconds=settings.remnawave_webhook_max_age_seconds,
         future_skew_seconds=settings.remnawave_webhook_future_skew_seconds,
     )
-    use_case = ProcessRemnawaveWebhookUseCase(validator=validator, session=db)
+    use_case = ProcessRemnawaveWebhookUseCase(
+        validator=validator,
+        session=db,
+        expiry_index=RemnawaveExpiryIndex(redis_client),
+    )
 
     result = await use_case.execute(
         body=body,
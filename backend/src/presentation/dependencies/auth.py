@@ -20,6 +20,7 @@ from src.application.services.auth_service import AuthService
 from src.application.services.jwt_revocation_service import JWTRevocationService
 from src.application.use_cases.auth_realms import RealmResolution
 from src.domain.enums import PrincipalClass
+from src.infrastructure.cache.auth_cache import PRINCIPAL_REALM_ADMIN, PRINCIPAL_REALM_MOBILE, auth_cache
 from src.infrastructure.cache.redis_client import get_redis
 from src.infrastructure.database.models.admin_user_model import AdminUserModel
 from src.infrastructure.database.models.mobile_user_model import MobileUserModel
@@ -175,10 +176,12 @@ async def _validate_token(
 
     jti = payload.get("jti")
 
-    # SEC-003 + LOW-007: Check if token is revoked
+    # SEC-003 + LOW-007: Check if token is revoked (local filter first, Redis when it is not in sync)
     if check_revocation and jti and redis_client:
-        revocation_service = JWTRevocationService(redis_client)
-        if await revocation_service.is_revoked(jti):
+        revoked = auth_cache.check_revoked(jti)
+        if revoked is None:
+            revoked = await JWTRevocationService(redis_client).is_revoked(jti)
+        if revoked:
             logger.warning(
                 "Revoked token used",
                 extra={"jti": jti[:8] + "..." if jti else None, "user_id": user_id},
@@ -196,6 +199,22 @@ async def _validate_token(
     )
 
 
+async def _principal_is_active(
+    realm: str,
+    repo: AdminUserRepository | MobileUserRepository,
+    principal_id: UUID,
+) -> bool:
+    """Return whether the principal exists and is active, via the short-TTL principal cache."""
+    is_active = auth_cache.principal_active(realm, principal_id)
+    if is_active is not None:
+        return is_active
+    actor = await repo.get_by_id(principal_id)
+    if not actor:
+        return False
+    auth_cache.remember_principal(realm, principal_id, is_active=actor.is_active)
+    return actor.is_active
+
+
 async def _resolve_current_admin_user_for_realm(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None,
@@ -481,8 +500,10 @@ async def get_current_mobile_user_id(
         # SEC-003: Check if token is revoked
         jti = payload.get("jti")
         if jti:
-            revocation_service = JWTRevocationService(redis_client)
-            if await revocation_service.is_revoked(jti):
+            revoked = auth_cache.check_revoked(jti)
+            if revoked is None:
+                revoked = await JWTRevocationService(redis_client).is_revoked(jti)
+            if revoked:
                 logger.warning("Revoked mobile token used", extra={"jti": jti[:8] + "...", "user_id": user_id})
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -490,14 +511,18 @@ async def get_current_mobile_user_id(
                 )
 
         # SEC-006: Verify user is active
-        repo = MobileUserRepository(db)
-        user = await repo.get_by_id(UUID(user_id))
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={"code": "USER_NOT_FOUND", "message": "User not found"},
-            )
-        if not user.is_active:
+        is_active = auth_cache.principal_active(PRINCIPAL_REALM_MOBILE, user_id)
+        if is_active is None:
+            repo = MobileUserRepository(db)
+            user = await repo.get_by_id(UUID(user_id))
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail={"code": "USER_NOT_FOUND", "message": "User not found"},
+                )
+            is_active = user.is_active
+            auth_cache.remember_principal(PRINCIPAL_REALM_MOBILE, user_id, is_active=is_active)
+        if not is_active:
             logger.warning("Inactive user attempted mobile access", extra={"user_id": user_id})
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -640,9 +665,7 @@ async def get_current_principal_actor(
 
     principal_id = UUID(result.user_id)
     if current_realm.realm_type in {"admin", "partner"}:
-        repo = AdminUserRepository(db)
-        actor = await repo.get_by_id(principal_id)
-        if not actor or not actor.is_active:
+        if not await _principal_is_active(PRINCIPAL_REALM_ADMIN, AdminUserRepository(db), principal_id):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail={"code": "USER_NOT_FOUND", "message": "User not found or inactive"},
@@ -653,9 +676,7 @@ async def get_current_principal_actor(
             else PrincipalClass.ADMIN.value
         )
     elif current_realm.realm_type == "customer":
-        repo = MobileUserRepository(db)
-        actor = await repo.get_by_id(principal_id)
-        if not actor or not actor.is_active:
+        if not await _principal_is_active(PRINCIPAL_REALM_MOBILE, MobileUserRepository(db), principal_id):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail={"code": "USER_NOT_FOUND", "message": "User not found or inactive"},
@@ -5,9 +5,9 @@ from __future__ import annotations
 from collections.abc import Collection
 from urllib.parse import urlparse
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 ADMIN_PROTECTED_PATH_PREFIXES = ("/api/v1/admin",)
 ADMIN_INTERNAL_EXEMPT_PATH_PREFIXES = ("/api/v1/admin/growth-reporting/internal/",)
@@ -41,32 +41,35 @@ def is_admin_host_protected_path(path: str) -> bool:
     return any(path == prefix or path.startswith(f"{prefix}/") for prefix in ADMIN_PROTECTED_PATH_PREFIXES)
 
 
-class AdminHostGuardMiddleware(BaseHTTPMiddleware):
+class AdminHostGuardMiddleware:
     """Hide interactive admin API routes when the request is not on an admin host."""
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         allowed_hosts: Collection[str],
         environment: str,
         trust_proxy_headers: bool = False,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.environment = environment.lower()
         self.trust_proxy_headers = trust_proxy_headers
         self.allowed_hosts = frozenset(normalize_host(host) for host in allowed_hosts if normalize_host(host))
         if self.environment != "production":
             self.allowed_hosts = self.allowed_hosts | LOCAL_DEVELOPMENT_ADMIN_HOSTS
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        if not is_admin_host_protected_path(request.url.path):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not is_admin_host_protected_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-        candidate_host = request.headers.get("x-forwarded-host") if self.trust_proxy_headers else None
-        request_host = normalize_host(candidate_host or request.headers.get("host"))
+        headers = Headers(scope=scope)
+        candidate_host = headers.get("x-forwarded-host") if self.trust_proxy_headers else None
+        request_host = normalize_host(candidate_host or headers.get("host"))
 
         if request_host not in self.allowed_hosts:
-            return JSONResponse(status_code=404, content={"detail": "Not found"})
+            await JSONResponse(status_code=404, content={"detail": "Not found"})(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
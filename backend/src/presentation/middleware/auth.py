@@ -1,8 +1,7 @@
 import logging
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.application.services.auth_service import AuthService
 
@@ -11,8 +10,16 @@ logger = logging.getLogger(__name__)
 auth_service = AuthService()
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+class AuthMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         request.state.user = None
         request.state.user_id = None
         request.state.role = None
@@ -28,4 +35,4 @@ class AuthMiddleware(BaseHTTPMiddleware):
             except Exception as e:
                 logger.warning("Auth middleware token decode failed: %s", e)
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
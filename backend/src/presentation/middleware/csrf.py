@@ -5,9 +5,10 @@ from __future__ import annotations
 from collections.abc import Collection
 from urllib.parse import urlparse
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
 LEGACY_AUTH_COOKIES = frozenset({"access_token", "refresh_token"})
@@ -33,30 +34,34 @@ def normalize_origin(value: str | None) -> str | None:
     return f"{parsed.scheme}://{parsed.netloc}"
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     """Validate Origin/Referer for unsafe requests that rely on auth cookies."""
 
-    def __init__(self, app, allowed_origins: Collection[str]) -> None:
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, allowed_origins: Collection[str]) -> None:
+        self.app = app
         self.allowed_origins = frozenset(origin.rstrip("/") for origin in allowed_origins if origin and origin != "*")
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        if request.method.upper() in SAFE_METHODS:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"].upper() in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
 
-        if request.headers.get("authorization"):
-            return await call_next(request)
+        headers = Headers(scope=scope)
+        if headers.get("authorization"):
+            await self.app(scope, receive, send)
+            return
 
-        if not request_has_auth_cookie(dict(request.cookies)):
-            return await call_next(request)
+        if not request_has_auth_cookie(cookie_parser(headers.get("cookie", ""))):
+            await self.app(scope, receive, send)
+            return
 
-        source_origin = normalize_origin(request.headers.get("origin")) or normalize_origin(
-            request.headers.get("referer")
-        )
+        source_origin = normalize_origin(headers.get("origin")) or normalize_origin(headers.get("referer"))
         if source_origin not in self.allowed_origins:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=403,
                 content={"detail": "CSRF origin validation failed"},
             )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
@@ -6,7 +6,7 @@ Logs requests with sensitive data redacted.
 import logging
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config.settings import settings
 from src.presentation.middleware.request_id import get_request_id
@@ -15,32 +15,50 @@ from src.shared.logging.sanitization import sanitize_url
 logger = logging.getLogger("cybervpn")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """HTTP request logging middleware with URL sanitization (LOW-004)."""
+class LoggingMiddleware:
+    """HTTP request logging middleware with URL sanitization (LOW-004).
 
-    async def dispatch(self, request, call_next):
-        start = time.time()
-        response = await call_next(request)
-        duration_ms = (time.time() - start) * 1000
+    The access line is written when the response starts, so streaming and SSE
+    responses are logged with their time-to-first-byte instead of being held
+    until the body finishes.
+    """
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_logging(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._log(scope, message["status"], (time.perf_counter() - start) * 1000)
+            await send(message)
+
+        await self.app(scope, receive, send_with_logging)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: int, duration_ms: float) -> None:
         # Get request ID for correlation (LOW-005)
         request_id = get_request_id() or "-"
 
         # Sanitize URL if enabled (LOW-004)
-        url_path = request.url.path
-        if request.url.query:
-            full_url = f"{url_path}?{request.url.query}"
+        url_path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
+        if query:
+            full_url = f"{url_path}?{query}"
             if getattr(settings, "log_sanitization_enabled", True):
                 full_url = sanitize_url(full_url)
             url_path = full_url
 
         logger.info(
             "%s %s %s %dms",
-            request.method,
+            scope["method"],
             url_path,
-            response.status_code,
+            status_code,
             duration_ms,
             extra={"request_id": request_id},
         )
-
-        return response
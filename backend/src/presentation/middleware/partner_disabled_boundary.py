@@ -5,10 +5,9 @@ from __future__ import annotations
 import logging
 from collections.abc import Iterable
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
 from starlette.status import HTTP_404_NOT_FOUND
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.config.settings import settings
 
@@ -56,7 +55,7 @@ PARTNER_SETTLEMENT_SANDBOX_PREFIXES = (
 )
 
 
-class PartnerDisabledBoundaryMiddleware(BaseHTTPMiddleware):
+class PartnerDisabledBoundaryMiddleware:
     """Blocks public partner surfaces until the relevant S3 flags are enabled.
 
     Admin preview routes under `/api/v1/admin/partner...` are deliberately left
@@ -65,102 +64,117 @@ class PartnerDisabledBoundaryMiddleware(BaseHTTPMiddleware):
     behind disabled-state gates.
     """
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        path = request.url.path
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        if not bool(settings.partner_portal_enabled) and _matches(path, PARTNER_PORTAL_PUBLIC_PREFIXES):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = _blocked_response(scope["path"])
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+def _blocked_response(path: str) -> JSONResponse | None:
+    """Return the disabled-state response for ``path``, or None if it is open."""
+    if not bool(settings.partner_portal_enabled) and _matches(path, PARTNER_PORTAL_PUBLIC_PREFIXES):
+        return _disabled_response(
+            code="partner_portal_disabled",
+            message="Partner portal is not enabled for this release.",
+            path=path,
+        )
+
+    if _matches(path, PARTNER_APPLICATION_PREFIXES):
+        if not bool(settings.partner_portal_enabled):
             return _disabled_response(
                 code="partner_portal_disabled",
                 message="Partner portal is not enabled for this release.",
                 path=path,
             )
+        if not bool(settings.partner_applications_enabled):
+            return _disabled_response(
+                code="partner_applications_disabled",
+                message="Partner applications are not enabled for this release.",
+                path=path,
+                stage="S3-STAGE-06",
+            )
 
-        if _matches(path, PARTNER_APPLICATION_PREFIXES):
-            if not bool(settings.partner_portal_enabled):
-                return _disabled_response(
-                    code="partner_portal_disabled",
-                    message="Partner portal is not enabled for this release.",
-                    path=path,
-                )
-            if not bool(settings.partner_applications_enabled):
-                return _disabled_response(
-                    code="partner_applications_disabled",
-                    message="Partner applications are not enabled for this release.",
-                    path=path,
-                    stage="S3-STAGE-06",
-                )
-
-        if _matches(path, PARTNER_CODE_PREFIXES) or _matches_partner_workspace_codes_path(path):
-            if not bool(settings.partner_portal_enabled):
-                return _disabled_response(
-                    code="partner_portal_disabled",
-                    message="Partner portal is not enabled for this release.",
-                    path=path,
-                )
-            if not bool(settings.partner_codes_enabled):
-                return _disabled_response(
-                    code="partner_codes_disabled",
-                    message="Partner codes are not enabled for this release.",
-                    path=path,
-                    stage="S3-STAGE-08",
-                )
-
-        if _matches(path, PARTNER_ATTRIBUTION_PREFIXES) and not bool(settings.partner_attribution_enabled):
+    if _matches(path, PARTNER_CODE_PREFIXES) or _matches_partner_workspace_codes_path(path):
+        if not bool(settings.partner_portal_enabled):
             return _disabled_response(
-                code="partner_attribution_disabled",
-                message="Partner attribution is not enabled for this release.",
+                code="partner_portal_disabled",
+                message="Partner portal is not enabled for this release.",
+                path=path,
+            )
+        if not bool(settings.partner_codes_enabled):
+            return _disabled_response(
+                code="partner_codes_disabled",
+                message="Partner codes are not enabled for this release.",
                 path=path,
                 stage="S3-STAGE-08",
             )
 
-        if not bool(settings.partner_payouts_enabled) and _matches(path, PARTNER_PAYOUT_PREFIXES):
+    if _matches(path, PARTNER_ATTRIBUTION_PREFIXES) and not bool(settings.partner_attribution_enabled):
+        return _disabled_response(
+            code="partner_attribution_disabled",
+            message="Partner attribution is not enabled for this release.",
+            path=path,
+            stage="S3-STAGE-08",
+        )
+
+    if not bool(settings.partner_payouts_enabled) and _matches(path, PARTNER_PAYOUT_PREFIXES):
+        return _disabled_response(
+            code="partner_payouts_disabled",
+            message="Partner payouts are not enabled for this release.",
+            path=path,
+        )
+
+    if not bool(settings.partner_storefronts_enabled) and _matches(path, PARTNER_STOREFRONT_PREFIXES):
+        return _disabled_response(
+            code="partner_storefronts_disabled",
+            message="Partner storefronts are not enabled for this release.",
+            path=path,
+            stage="S3-STAGE-09",
+        )
+
+    if _matches(path, PARTNER_REPORTING_PREFIXES) or _matches_partner_workspace_reporting_path(path):
+        if not bool(settings.partner_portal_enabled):
             return _disabled_response(
-                code="partner_payouts_disabled",
-                message="Partner payouts are not enabled for this release.",
+                code="partner_portal_disabled",
+                message="Partner portal is not enabled for this release.",
                 path=path,
             )
+        if not bool(settings.partner_reporting_enabled):
+            return _disabled_response(
+                code="partner_reporting_disabled",
+                message="Partner reporting is not enabled for this release.",
+                path=path,
+                stage="S3-STAGE-10",
+            )
 
-        if not bool(settings.partner_storefronts_enabled) and _matches(path, PARTNER_STOREFRONT_PREFIXES):
+    if _matches(path, PARTNER_SETTLEMENT_SANDBOX_PREFIXES) or _matches_partner_workspace_settlement_sandbox_path(
+        path
+    ):
+        if not bool(settings.partner_portal_enabled):
+            return _disabled_response(
+                code="partner_portal_disabled",
+                message="Partner portal is not enabled for this release.",
+                path=path,
+            )
+        if not bool(settings.partner_settlement_sandbox_enabled):
             return _disabled_response(
-                code="partner_storefronts_disabled",
-                message="Partner storefronts are not enabled for this release.",
+                code="partner_settlement_sandbox_disabled",
+                message="Partner settlement sandbox is not enabled for this release.",
                 path=path,
-                stage="S3-STAGE-09",
+                stage="S3-STAGE-11",
             )
 
-        if _matches(path, PARTNER_REPORTING_PREFIXES) or _matches_partner_workspace_reporting_path(path):
-            if not bool(settings.partner_portal_enabled):
-                return _disabled_response(
-                    code="partner_portal_disabled",
-                    message="Partner portal is not enabled for this release.",
-                    path=path,
-                )
-            if not bool(settings.partner_reporting_enabled):
-                return _disabled_response(
-                    code="partner_reporting_disabled",
-                    message="Partner reporting is not enabled for this release.",
-                    path=path,
-                    stage="S3-STAGE-10",
-                )
-
-        if _matches(path, PARTNER_SETTLEMENT_SANDBOX_PREFIXES) or _matches_partner_workspace_settlement_sandbox_path(
-            path
-        ):
-            if not bool(settings.partner_portal_enabled):
-                return _disabled_response(
-                    code="partner_portal_disabled",
-                    message="Partner portal is not enabled for this release.",
-                    path=path,
-                )
-            if not bool(settings.partner_settlement_sandbox_enabled):
-                return _disabled_response(
-                    code="partner_settlement_sandbox_disabled",
-                    message="Partner settlement sandbox is not enabled for this release.",
-                    path=path,
-                    stage="S3-STAGE-11",
-                )
-
-        return await call_next(request)
+    return None
 
 
 def _matches(path: str, prefixes: Iterable[str]) -> bool:
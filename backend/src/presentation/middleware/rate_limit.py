@@ -1,5 +1,9 @@
 """Rate limiting middleware with fail-closed behavior and circuit breaker (MED-1).
 
+Counting is delegated to ``SlidingWindowRateLimiter`` (one Lua ``EVALSHA`` per
+request, O(1) Redis memory per bucket) over a long-lived client on the shared
+connection pool.
+
 Security improvements:
 - Fail-closed: If Redis is unavailable, reject requests (503)
 - Circuit breaker: After consecutive failures, stop trying Redis temporarily
@@ -9,15 +13,18 @@ Security improvements:
 
 import logging
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import lru_cache
 from threading import Lock
 
 import redis.asyncio as redis
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.config.settings import settings
+from src.infrastructure.cache.rate_limiter import SlidingWindowRateLimiter
 from src.infrastructure.cache.redis_client import get_redis_pool
 
 logger = logging.getLogger("cybervpn")
@@ -48,6 +55,51 @@ class RateLimitRule:
         )
 
 
+class RateLimitRuleIndex:
+    """Precompiled first-match lookup over an ordered tuple of rules.
+
+    Exact paths resolve through a per-method dict; only rules with prefix,
+    suffix or substring patterns that rank ahead of the exact hit are scanned.
+    Results are memoized per ``(method, path)``.
+    """
+
+    def __init__(self, rules: tuple[RateLimitRule, ...], cache_size: int = 4096) -> None:
+        self.rules = rules
+        self._per_method: dict[str, tuple[dict[str, int], tuple[tuple[int, RateLimitRule], ...]]] = {}
+        self.lookup: Callable[[str, str], RateLimitRule | None] = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _compiled_for(self, method: str) -> tuple[dict[str, int], tuple[tuple[int, RateLimitRule], ...]]:
+        compiled = self._per_method.get(method)
+        if compiled is None:
+            exact: dict[str, int] = {}
+            patterned: list[tuple[int, RateLimitRule]] = []
+            for index, rule in enumerate(self.rules):
+                if rule.methods and method not in rule.methods:
+                    continue
+                for path in rule.exact_paths:
+                    exact.setdefault(path, index)
+                if rule.path_prefixes or rule.path_suffixes or rule.path_contains:
+                    patterned.append((index, rule))
+            compiled = (exact, tuple(patterned))
+            self._per_method[method] = compiled
+        return compiled
+
+    def _lookup(self, method: str, path: str) -> RateLimitRule | None:
+        exact, patterned = self._compiled_for(method)
+        best = exact.get(path, len(self.rules))
+        for index, rule in patterned:
+            if index >= best:
+                break
+            if (
+                path.startswith(rule.path_prefixes)
+                or path.endswith(rule.path_suffixes)
+                or any(part in path for part in rule.path_contains)
+            ):
+                best = index
+                break
+        return self.rules[best] if best < len(self.rules) else None
+
+
 class CircuitBreaker:
     """Circuit breaker for Redis connection failures.
 
@@ -110,7 +162,7 @@ class CircuitBreaker:
                 self._state = self.OPEN
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """Rate limiting middleware with fail-closed behavior and circuit breaker (MED-1).
 
     When Redis is unavailable:
@@ -140,7 +192,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         requests_per_minute: int = 60,
         window_seconds: int | None = None,
         fail_open: bool | None = None,
@@ -155,8 +207,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         messaging_realtime_requests_per_minute: int | None = None,
         messaging_admin_read_requests_per_minute: int | None = None,
         messaging_broadcast_requests_per_minute: int | None = None,
+        local_batch_size: int | None = None,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.window = self._configured_limit(
             explicit=window_seconds,
@@ -182,6 +235,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             messaging_admin_read_requests_per_minute=messaging_admin_read_requests_per_minute,
             messaging_broadcast_requests_per_minute=messaging_broadcast_requests_per_minute,
         )
+        self._rule_index = RateLimitRuleIndex(self._s1_rules)
+        if local_batch_size is None:
+            configured_batch = getattr(settings, "rate_limit_local_batch_size", 0)
+            local_batch_size = configured_batch if isinstance(configured_batch, int) else 0
+        configured_lease = getattr(settings, "rate_limit_local_lease_seconds", 1.0)
+        self._limiter = SlidingWindowRateLimiter(
+            local_batch_size=local_batch_size,
+            local_lease_seconds=configured_lease if isinstance(configured_lease, int | float) else 1.0,
+        )
+        self._client: redis.Redis | None = None
+        self._client_pool: redis.ConnectionPool | None = None
         # Default to fail-closed in production, configurable via settings
         if fail_open is None:
             configured_fail_open = getattr(settings, "rate_limit_fail_open", False)
@@ -201,13 +265,25 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 )
         self.circuit = RateLimitMiddleware._circuit_breaker
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        if request.url.path in self._EXEMPT_PATHS:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self._EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        response = await self._check(request)
+        if response is not None:
+            await response(scope, receive, send)
+            return
 
+        await self.app(scope, receive, send)
+
+    async def _check(self, request: Request) -> Response | None:
+        """Count the request against its bucket; return a rejection response or None to pass."""
         client_ip = self._get_client_ip(request)
-        key = f"cybervpn:rate_limit:{client_ip}:{self._rate_limit_bucket_for(request)}"
-        request_budget = self._requests_budget_for(request)
+        rule = self._rule_for(request)
+        key = f"cybervpn:rate_limit:{client_ip}:{self._bucket_name(request, rule)}"
+        request_budget = self._budget(request, rule)
 
         # Check circuit breaker first
         if self.circuit.is_open():
@@ -222,34 +298,26 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     headers={"Retry-After": "30"},
                 )
             # In fail-open mode, skip rate limiting when circuit is open
-            return await call_next(request)
+            return None
 
-        pool = None
-        client = None
         try:
-            pool = get_redis_pool()
-            client = redis.Redis(connection_pool=pool)
-            now = time.time()
-
-            async with client.pipeline(transaction=True) as pipe:
-                pipe.zremrangebyscore(key, 0, now - self.window)
-                pipe.zadd(key, {str(now): now})
-                pipe.zcard(key)
-                pipe.expire(key, self.window)
-                results = await pipe.execute()
-
-            request_count = results[2]
+            decision = await self._limiter.hit(
+                self._redis_client(),
+                key,
+                limit=request_budget,
+                window_seconds=self.window,
+            )
 
             # Redis operation succeeded - reset circuit breaker
             self.circuit.record_success()
 
-            if request_count > request_budget:
+            if not decision.allowed:
                 logger.warning(
                     "Rate limit exceeded",
                     extra={
                         "client_ip": client_ip,
                         "path": request.url.path,
-                        "count": request_count,
+                        "count": decision.count,
                         "limit": request_budget,
                     },
                 )
@@ -291,14 +359,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 headers={"Retry-After": "30"},
             )
 
-        finally:
-            if client is not None:
-                await client.aclose()
+        return None
 
-        return await call_next(request)
+    def _redis_client(self) -> redis.Redis:
+        """Return the long-lived client, rebuilt only when the shared pool changes."""
+        pool = get_redis_pool()
+        if self._client is None or self._client_pool is not pool:
+            self._client = redis.Redis(connection_pool=pool)
+            self._client_pool = pool
+        return self._client
 
     def _requests_budget_for(self, request: Request) -> int:
-        rule = self._rule_for(request)
+        return self._budget(request, self._rule_for(request))
+
+    def _rate_limit_bucket_for(self, request: Request) -> str:
+        return self._bucket_name(request, self._rule_for(request))
+
+    def _budget(self, request: Request, rule: RateLimitRule | None) -> int:
         if rule is not None:
             return rule.limit
 
@@ -307,14 +384,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return self.requests_per_minute
 
-    def _rate_limit_bucket_for(self, request: Request) -> str:
-        rule = self._rule_for(request)
+    @staticmethod
+    def _bucket_name(request: Request, rule: RateLimitRule | None) -> str:
         if rule is not None:
             return rule.name
         return request.url.path
 
     def _rule_for(self, request: Request) -> RateLimitRule | None:
-        return next((rule for rule in self._s1_rules if rule.matches(request)), None)
+        return self._rule_index.lookup(request.method.upper(), request.url.path)
 
     @staticmethod
     def _configured_limit(*, explicit: int | None, setting_name: str, default: int) -> int:
@@ -8,9 +8,8 @@ import uuid
 from contextvars import ContextVar
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variable to store request ID across async calls
 request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
@@ -27,8 +26,8 @@ def get_request_id() -> str | None:
     return request_id_var.get()
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware that adds request ID to each request.
+class RequestIDMiddleware:
+    """Pure ASGI middleware that adds request ID to each request.
 
     - Generates UUID if not provided in X-Request-ID header
     - Stores request ID in context variable for logging
@@ -37,13 +36,16 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 
     HEADER_NAME = "X-Request-ID"
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get request ID from header or generate new one
-        request_id = request.headers.get(self.HEADER_NAME)
+        request_id = Headers(scope=scope).get(self.HEADER_NAME)
 
         if not request_id:
             request_id = str(uuid.uuid4())
@@ -54,14 +56,14 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         # Bind request_id to structlog context for all logs in this request
         structlog.contextvars.bind_contextvars(request_id=request_id)
 
-        try:
-            # Process request
-            response = await call_next(request)
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request ID to response headers
+                MutableHeaders(scope=message)[self.HEADER_NAME] = request_id
+            await send(message)
 
-            # Add request ID to response headers
-            response.headers[self.HEADER_NAME] = request_id
-
-            return response
+        try:
+            await self.app(scope, receive, send_with_request_id)
 
         finally:
             # Clear structlog context
@@ -10,15 +10,14 @@ Implements security headers including CSP:
 - Permissions-Policy
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config.settings import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to all responses (MED-2)."""
+class SecurityHeadersMiddleware:
+    """Pure ASGI middleware adding security headers to all responses (MED-2)."""
 
     # Content-Security-Policy for API backend
     # Restrictive policy since this is primarily an API server
@@ -35,31 +34,44 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         "object-src": "'none'",
     }
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        response = await call_next(request)
+    CSP_HEADER = "; ".join(f"{key} {value}" for key, value in CSP_DIRECTIVES.items())
 
+    # Permissions-Policy (replaces Feature-Policy)
+    PERMISSIONS_POLICY = (
+        "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
+        "magnetometer=(), microphone=(), payment=(), usb=()"
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.apply(MutableHeaders(scope=message))
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
+
+    def apply(self, headers: MutableHeaders) -> None:
+        """Set the security headers on an outgoing response's headers."""
         # Basic security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Frame-Options"] = "DENY"
+        headers["X-XSS-Protection"] = "1; mode=block"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         # SEC-009: HSTS - only in production environment (not just debug check)
         if settings.environment == "production":
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-
-        # Content-Security-Policy
-        csp_parts = [f"{key} {value}" for key, value in self.CSP_DIRECTIVES.items()]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_parts)
+            headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
 
-        # Permissions-Policy (replaces Feature-Policy)
-        response.headers["Permissions-Policy"] = (
-            "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
-            "magnetometer=(), microphone=(), payment=(), usb=()"
-        )
+        headers["Content-Security-Policy"] = self.CSP_HEADER
+        headers["Permissions-Policy"] = self.PERMISSIONS_POLICY
 
         # Cache-Control for API responses
-        if "Cache-Control" not in response.headers:
-            response.headers["Cache-Control"] = "no-store, max-age=0"
-
-        return response
+        if "Cache-Control" not in headers:
+            headers["Cache-Control"] = "no-store, max-age=0"
@@ -5,6 +5,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+from src.application.services.snapshot_store import write_streaming_snapshot
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
@@ -338,6 +340,28 @@ def test_phase8_settlement_shadow_builder_and_summary_are_deterministic(tmp_path
     assert "partner_export_available_earnings_amount_mismatch: 1" in stdout
 
 
+def test_phase8_settlement_shadow_builder_streams_nested_snapshot_directory(tmp_path: Path) -> None:
+    repo_root = _repo_root()
+    builder = repo_root / "backend/scripts/build_phase8_settlement_shadow_pack.py"
+    snapshot_path = tmp_path / "snapshot.json"
+    snapshot_dir = tmp_path / "snapshot"
+    _write_snapshot(snapshot_path)
+    write_streaming_snapshot(json.loads(snapshot_path.read_text(encoding="utf-8")), snapshot_dir, compress=False)
+    assert (snapshot_dir / "phase4_snapshot" / "earning_events.ndjson").exists()
+
+    outputs = []
+    for input_path in (snapshot_path, snapshot_dir):
+        output_path = tmp_path / f"report-{input_path.name}.json"
+        subprocess.run(  # noqa: S603
+            [sys.executable, str(builder), "--input", str(input_path), "--output", str(output_path)],
+            check=True,
+            cwd=repo_root,
+        )
+        outputs.append(output_path.read_text(encoding="utf-8"))
+
+    assert outputs[0] == outputs[1]
+
+
 def test_phase8_settlement_shadow_doc_covers_vocabulary_and_tolerances() -> None:
     repo_root = _repo_root()
     content = (
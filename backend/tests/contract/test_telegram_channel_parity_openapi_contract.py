@@ -11,8 +11,10 @@ def test_telegram_channel_parity_paths_are_exposed() -> None:
     assert f"{API_V1_PREFIX}/telegram/bot/user/{{telegram_id}}/entitlements" in paths
     assert f"{API_V1_PREFIX}/telegram/bot/user/{{telegram_id}}/orders" in paths
     assert f"{API_V1_PREFIX}/telegram/bot/user/{{telegram_id}}/service-state" in paths
+    assert f"{API_V1_PREFIX}/telegram/bot/user/{{telegram_id}}/home" in paths
 
     assert "TelegramBotSubscriptionResponse" in components
     assert "CurrentEntitlementStateResponse" in components
     assert "OrderResponse" in components
     assert "CurrentServiceStateResponse" in components
+    assert "TelegramBotHomeResponse" in components
@@ -3197,6 +3197,59 @@ async def initialize_realm_test_database(engine) -> None:
             "ON partner_notification_read_states(notification_key)",
         ):
             conn.exec_driver_sql(index_sql)
+        conn.exec_driver_sql(
+            """
+            CREATE TABLE partner_notification_feed_items (
+                id TEXT PRIMARY KEY,
+                partner_account_id TEXT NOT NULL,
+                admin_user_id TEXT NOT NULL,
+                notification_key TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                tone TEXT NOT NULL,
+                route_slug TEXT NOT NULL,
+                message TEXT NOT NULL,
+                notes TEXT NOT NULL DEFAULT '[]',
+                action_required INTEGER NOT NULL DEFAULT 0,
+                unread INTEGER NOT NULL DEFAULT 1,
+                read_at TEXT,
+                archived_at TEXT,
+                source_kind TEXT,
+                source_id TEXT,
+                source_event_id TEXT,
+                source_event_kind TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (partner_account_id) REFERENCES partner_accounts(id) ON DELETE CASCADE,
+                FOREIGN KEY (admin_user_id) REFERENCES admin_users(id) ON DELETE CASCADE,
+                UNIQUE (partner_account_id, admin_user_id, notification_key)
+            )
+            """
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX ix_partner_notification_feed_items_workspace_actor_created_key "
+            "ON partner_notification_feed_items(partner_account_id, admin_user_id, created_at, notification_key)"
+        )
+        conn.exec_driver_sql(
+            """
+            CREATE TABLE partner_notification_feed_states (
+                id TEXT PRIMARY KEY,
+                partner_account_id TEXT NOT NULL,
+                admin_user_id TEXT NOT NULL,
+                source_version INTEGER NOT NULL DEFAULT 0,
+                synced_version INTEGER,
+                source_fingerprint TEXT,
+                total_count INTEGER NOT NULL DEFAULT 0,
+                unread_count INTEGER NOT NULL DEFAULT 0,
+                action_required_count INTEGER NOT NULL DEFAULT 0,
+                synced_at TEXT,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (partner_account_id) REFERENCES partner_accounts(id) ON DELETE CASCADE,
+                FOREIGN KEY (admin_user_id) REFERENCES admin_users(id) ON DELETE CASCADE,
+                UNIQUE (partner_account_id, admin_user_id)
+            )
+            """
+        )
         conn.exec_driver_sql(
             """
             CREATE TABLE customer_growth_notification_read_states (
@@ -23,6 +23,7 @@ from src.infrastructure.database.models.messaging_conversation_model import (
 from src.infrastructure.database.models.messaging_notification_model import (
     SiteNotificationDeliveryModel,
     SiteNotificationModel,
+    SiteNotificationUnreadCounterModel,
 )
 from src.infrastructure.database.models.mobile_user_model import MobileUserModel
 from src.infrastructure.database.models.outbox_event_model import OutboxEventModel, OutboxPublicationModel
@@ -52,6 +53,41 @@ def _clear_dependency_overrides():
     app.dependency_overrides.pop(get_current_active_user, None)
 
 
+# SQLite stand-in for the PostgreSQL site_notification_unread_counter_sync trigger
+# (migration 20260603_messaging_keyset_lists).
+_SQLITE_UNREAD_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS site_notification_unread_counter_insert
+    AFTER INSERT ON site_notification_deliveries
+    WHEN NEW.status NOT IN ('read', 'dismissed', 'expired')
+    BEGIN
+        INSERT INTO site_notification_unread_counters (recipient_type, recipient_id, unread_count, updated_at)
+        VALUES (NEW.recipient_type, NEW.recipient_id, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT (recipient_type, recipient_id) DO UPDATE SET unread_count = unread_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS site_notification_unread_counter_release
+    AFTER UPDATE OF status, recipient_type, recipient_id ON site_notification_deliveries
+    WHEN OLD.status NOT IN ('read', 'dismissed', 'expired')
+    BEGIN
+        UPDATE site_notification_unread_counters SET unread_count = max(unread_count - 1, 0)
+        WHERE recipient_type = OLD.recipient_type AND recipient_id = OLD.recipient_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS site_notification_unread_counter_acquire
+    AFTER UPDATE OF status, recipient_type, recipient_id ON site_notification_deliveries
+    WHEN NEW.status NOT IN ('read', 'dismissed', 'expired')
+    BEGIN
+        INSERT INTO site_notification_unread_counters (recipient_type, recipient_id, unread_count, updated_at)
+        VALUES (NEW.recipient_type, NEW.recipient_id, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT (recipient_type, recipient_id) DO UPDATE SET unread_count = unread_count + 1;
+    END
+    """,
+)
+
+
 def _create_messaging_tables(engine) -> None:
     with engine.begin() as conn:
         for table in (
@@ -65,9 +101,12 @@ def _create_messaging_tables(engine) -> None:
             BroadcastCampaignModel.__table__,
             SiteNotificationModel.__table__,
             SiteNotificationDeliveryModel.__table__,
+            SiteNotificationUnreadCounterModel.__table__,
             BroadcastCampaignRecipientModel.__table__,
         ):
             table.create(conn, checkfirst=True)
+        for statement in _SQLITE_UNREAD_COUNTER_TRIGGERS:
+            conn.exec_driver_sql(statement)
         # SQLite ignores the PostgreSQL partial-index predicate on this model.
         # The PostgreSQL migration/model keeps the invariant; this local harness
         # drops the degraded test index so admin participants can coexist.
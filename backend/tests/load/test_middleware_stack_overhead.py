@@ -0,0 +1,126 @@
+"""Micro-benchmark for the per-request overhead of the HTTP middleware stack.
+
+Runs fully in-process: the same cheap endpoint is served by a bare FastAPI app
+and by an app wrapped in the production middleware stack (same order as
+``src.main``), and each request is driven directly through the ASGI interface
+so transport overhead does not hide the middleware cost. Run with ``-s`` to
+see the p50/p99 figures.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+
+os.environ.setdefault("REMNAWAVE_TOKEN", "test-token")
+os.environ.setdefault("JWT_SECRET", "0123456789abcdef0123456789abcdefLONG")
+os.environ.setdefault("CRYPTOBOT_TOKEN", "test-crypto")
+
+from fastapi.middleware.cors import CORSMiddleware
+
+from src.presentation.middleware.admin_host_guard import AdminHostGuardMiddleware
+from src.presentation.middleware.csrf import CSRFMiddleware
+from src.presentation.middleware.logging import LoggingMiddleware
+from src.presentation.middleware.partner_disabled_boundary import PartnerDisabledBoundaryMiddleware
+from src.presentation.middleware.rate_limit import RateLimitMiddleware
+from src.presentation.middleware.request_id import RequestIDMiddleware
+from src.presentation.middleware.security_headers import SecurityHeadersMiddleware
+
+_WARMUP_REQUESTS = 200
+_MEASURED_REQUESTS = 2000
+_ORIGIN = "http://localhost:3000"
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = max(math.ceil(len(ordered) * fraction) - 1, 0)
+    return ordered[index]
+
+
+def _build_app(*, with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/auth/me")
+    async def me() -> dict[str, str]:
+        return {"id": "00000000-0000-0000-0000-000000000000", "role": "viewer"}
+
+    if with_middleware:
+        # Same order as src.main: last added runs first.
+        RateLimitMiddleware._circuit_breaker = None
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=1_000_000, fail_open=True)
+        app.add_middleware(CSRFMiddleware, allowed_origins=[_ORIGIN])
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[_ORIGIN],
+            allow_credentials=True,
+            allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+            allow_headers=["Content-Type", "Authorization", "X-Request-ID"],
+        )
+        app.add_middleware(AdminHostGuardMiddleware, allowed_hosts=["admin.localhost"], environment="test")
+        app.add_middleware(PartnerDisabledBoundaryMiddleware)
+    return app
+
+
+async def _measure(app: FastAPI) -> list[float]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/auth/me",
+        "raw_path": b"/api/v1/auth/me",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"origin", _ORIGIN.encode()),
+            (b"authorization", b"Bearer benchmark"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    statuses: list[int] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    latencies_ms: list[float] = []
+    for sequence in range(_WARMUP_REQUESTS + _MEASURED_REQUESTS):
+        started = time.perf_counter()
+        await app({**scope, "state": {}}, receive, send)
+        if sequence >= _WARMUP_REQUESTS:
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    assert set(statuses) == {200}
+    return latencies_ms
+
+
+@pytest.mark.asyncio
+async def test_middleware_stack_per_request_overhead_stays_within_budget():
+    bare = await _measure(_build_app(with_middleware=False))
+    stacked = await _measure(_build_app(with_middleware=True))
+
+    p50_overhead_ms = _percentile(stacked, 0.50) - _percentile(bare, 0.50)
+    p99_overhead_ms = _percentile(stacked, 0.99) - _percentile(bare, 0.99)
+    print(
+        f"middleware stack overhead on /api/v1/auth/me: "
+        f"p50={p50_overhead_ms:.3f}ms p99={p99_overhead_ms:.3f}ms "
+        f"(bare p50={_percentile(bare, 0.50):.3f}ms p99={_percentile(bare, 0.99):.3f}ms)"
+    )
+
+    # Generous budgets so shared CI runners stay green; the point is to catch
+    # regressions like reintroducing a task hop per middleware layer.
+    assert p50_overhead_ms <= 2.0
+    assert p99_overhead_ms <= 10.0
@@ -0,0 +1,103 @@
+"""Benchmark of the Lua sliding-window limiter against the legacy sorted-set pipeline.
+
+Runs in-process against fakeredis (Lua via ``lupa``), so absolute timings only
+reflect client-side cost; the figures that carry over to a real Redis are the
+commands per request and the per-bucket memory footprint. Run with ``-s`` to
+see the comparison.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import fakeredis
+import pytest
+
+os.environ.setdefault("REMNAWAVE_TOKEN", "test-token")
+os.environ.setdefault("JWT_SECRET", "0123456789abcdef0123456789abcdefLONG")
+os.environ.setdefault("CRYPTOBOT_TOKEN", "test-crypto")
+
+from src.infrastructure.cache.rate_limiter import SlidingWindowRateLimiter
+
+pytest.importorskip("lupa")
+
+_REQUESTS = 2000
+_LIMIT = 100_000
+_WINDOW_SECONDS = 3600
+_KEY = "cybervpn:rate_limit:203.0.113.10:/api/v1/status"
+
+
+class _CountingRedis(fakeredis.FakeAsyncRedis):
+    """FakeAsyncRedis that counts commands sent to the server."""
+
+    commands = 0
+
+    async def execute_command(self, *args, **options):
+        type(self).commands += 1
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        original_execute = pipe.execute
+
+        async def counted_execute(raise_on_error: bool = True):
+            # MULTI + queued commands + EXEC
+            type(self).commands += len(pipe.command_stack) + (2 if transaction else 0)
+            return await original_execute(raise_on_error)
+
+        pipe.execute = counted_execute
+        return pipe
+
+
+async def _legacy_hit(client: fakeredis.FakeAsyncRedis, key: str) -> bool:
+    """The pre-Lua implementation: one sorted-set member per request."""
+    now = time.time()
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(key, 0, now - _WINDOW_SECONDS)
+        pipe.zadd(key, {str(now): now})
+        pipe.zcard(key)
+        pipe.expire(key, _WINDOW_SECONDS)
+        results = await pipe.execute()
+    return results[2] <= _LIMIT
+
+
+async def _run(label: str, hit) -> tuple[int, float]:
+    _CountingRedis.commands = 0
+    started = time.perf_counter()
+    for _ in range(_REQUESTS):
+        assert await hit()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"{label}: {_CountingRedis.commands / _REQUESTS:.2f} commands/request, {elapsed_ms:.1f}ms total")
+    return _CountingRedis.commands, elapsed_ms
+
+
+@pytest.mark.asyncio
+async def test_lua_limiter_uses_constant_memory_and_fewer_commands_than_legacy_pipeline():
+    legacy_client = _CountingRedis(decode_responses=True)
+    legacy_commands, _ = await _run("legacy zset pipeline", lambda: _legacy_hit(legacy_client, _KEY))
+    legacy_members = await legacy_client.zcard(_KEY)
+
+    lua_client = _CountingRedis(decode_responses=True)
+    limiter = SlidingWindowRateLimiter()
+
+    async def lua_hit() -> bool:
+        return (await limiter.hit(lua_client, _KEY, limit=_LIMIT, window_seconds=_WINDOW_SECONDS)).allowed
+
+    lua_commands, _ = await _run("lua sliding window", lua_hit)
+    lua_fields = await lua_client.hlen(_KEY)
+
+    batched_client = _CountingRedis(decode_responses=True)
+    batched = SlidingWindowRateLimiter(local_batch_size=50, local_lease_seconds=60)
+
+    async def batched_hit() -> bool:
+        return (await batched.hit(batched_client, _KEY, limit=_LIMIT, window_seconds=_WINDOW_SECONDS)).allowed
+
+    batched_commands, _ = await _run("lua + local batches of 50", batched_hit)
+
+    print(f"bucket size after {_REQUESTS} requests: legacy={legacy_members} members, lua={lua_fields} fields")
+
+    assert legacy_members == _REQUESTS
+    assert lua_fields == 3
+    assert lua_commands < legacy_commands / 4
+    assert batched_commands <= lua_commands / 25
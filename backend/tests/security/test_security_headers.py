@@ -1,84 +1,81 @@
 """Tests for security headers middleware (MED-2)."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
 import pytest
-from starlette.requests import Request
+from starlette.datastructures import Headers
 from starlette.responses import Response
 
 from src.presentation.middleware.security_headers import SecurityHeadersMiddleware
 
 
+class _CapturedResponse:
+    """Response headers captured from the ASGI ``http.response.start`` message."""
+
+    def __init__(self) -> None:
+        self.headers = Headers()
+
+
 class TestSecurityHeadersMiddleware:
     """Tests for SecurityHeadersMiddleware."""
 
     @pytest.fixture
-    def middleware(self):
-        """Create middleware instance with mock app."""
-        app = AsyncMock()
+    def response_headers(self):
+        """Headers the wrapped endpoint responds with."""
+        return {}
+
+    @pytest.fixture
+    def middleware(self, response_headers):
+        """Create middleware instance around a plain response app."""
+
+        async def app(scope, receive, send):
+            await Response(b"", headers=response_headers)(scope, receive, send)
+
         return SecurityHeadersMiddleware(app)
 
     @pytest.fixture
     def mock_request(self):
-        """Create mock request."""
-        request = MagicMock(spec=Request)
-        return request
+        """Create an HTTP request scope."""
+        return {"type": "http", "method": "GET", "path": "/api/v1/auth/me", "headers": []}
 
     @pytest.fixture
     def mock_response(self):
-        """Create mock response with empty headers."""
-        response = MagicMock(spec=Response)
-        response.headers = {}
-        return response
+        """Collects the response headers sent through the middleware."""
+        return _CapturedResponse()
 
     @pytest.mark.asyncio
     async def test_adds_x_content_type_options(self, middleware, mock_request, mock_response):
         """X-Content-Type-Options header is set to nosniff."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         assert mock_response.headers["X-Content-Type-Options"] == "nosniff"
 
     @pytest.mark.asyncio
     async def test_adds_x_frame_options(self, middleware, mock_request, mock_response):
         """X-Frame-Options header is set to DENY."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         assert mock_response.headers["X-Frame-Options"] == "DENY"
 
     @pytest.mark.asyncio
     async def test_adds_x_xss_protection(self, middleware, mock_request, mock_response):
         """X-XSS-Protection header is set correctly."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         assert mock_response.headers["X-XSS-Protection"] == "1; mode=block"
 
     @pytest.mark.asyncio
     async def test_adds_referrer_policy(self, middleware, mock_request, mock_response):
         """Referrer-Policy header is set correctly."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         assert mock_response.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
 
     @pytest.mark.asyncio
     async def test_adds_csp_header(self, middleware, mock_request, mock_response):
         """Content-Security-Policy header is set with required directives."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         csp = mock_response.headers["Content-Security-Policy"]
 
         # Verify key CSP directives are present
@@ -90,10 +87,7 @@ class TestSecurityHeadersMiddleware:
     async def test_adds_permissions_policy(self, middleware, mock_request, mock_response):
         """Permissions-Policy header restricts dangerous features."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         permissions = mock_response.headers["Permissions-Policy"]
 
         # Verify dangerous features are disabled
@@ -105,21 +99,15 @@ class TestSecurityHeadersMiddleware:
     async def test_adds_cache_control_if_missing(self, middleware, mock_request, mock_response):
         """Cache-Control header is added when not present."""
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         assert mock_response.headers["Cache-Control"] == "no-store, max-age=0"
 
     @pytest.mark.asyncio
+    @pytest.mark.parametrize("response_headers", [{"Cache-Control": "public, max-age=3600"}])
     async def test_preserves_existing_cache_control(self, middleware, mock_request, mock_response):
         """Existing Cache-Control header is preserved."""
-        mock_response.headers["Cache-Control"] = "public, max-age=3600"
 
-        async def call_next(_):
-            return mock_response
-
-        await middleware.dispatch(mock_request, call_next)
+        await _dispatch(middleware, mock_request, mock_response)
         assert mock_response.headers["Cache-Control"] == "public, max-age=3600"
 
     @pytest.mark.asyncio
@@ -128,10 +116,7 @@ class TestSecurityHeadersMiddleware:
         with patch("src.presentation.middleware.security_headers.settings") as mock_settings:
             mock_settings.environment = "production"
 
-            async def call_next(_):
-                return mock_response
-
-            await middleware.dispatch(mock_request, call_next)
+            await _dispatch(middleware, mock_request, mock_response)
             assert "Strict-Transport-Security" in mock_response.headers
             assert "max-age=31536000" in mock_response.headers["Strict-Transport-Security"]
 
@@ -141,8 +126,18 @@ class TestSecurityHeadersMiddleware:
         with patch("src.presentation.middleware.security_headers.settings") as mock_settings:
             mock_settings.environment = "development"
 
-            async def call_next(_):
-                return mock_response
-
-            await middleware.dispatch(mock_request, call_next)
+            await _dispatch(middleware, mock_request, mock_response)
             assert "Strict-Transport-Security" not in mock_response.headers
+
+
+async def _dispatch(middleware, scope, captured):
+    """Run one request through the middleware and capture the response headers."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            captured.headers = Headers(raw=message["headers"])
+
+    await middleware(scope, receive, send)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import math
 from collections import defaultdict
 from unittest.mock import MagicMock
 
@@ -46,60 +47,40 @@ def _s1_middleware(**overrides: int) -> RateLimitMiddleware:
     )
 
 
-class _FakeRedisPipeline:
+class _FakeSlidingWindowScript:
+    """In-memory stand-in for SLIDING_WINDOW_SCRIPT with the same semantics."""
+
     def __init__(self, store: dict[str, dict[str, float]]) -> None:
         self.store = store
-        self.ops: list[tuple[str, tuple]] = []
-
-    async def __aenter__(self) -> _FakeRedisPipeline:
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb) -> None:
-        return None
-
-    def zremrangebyscore(self, key: str, minimum: float, maximum: float) -> None:
-        self.ops.append(("zremrangebyscore", (key, minimum, maximum)))
-
-    def zadd(self, key: str, mapping: dict[str, float]) -> None:
-        self.ops.append(("zadd", (key, mapping)))
-
-    def zcard(self, key: str) -> None:
-        self.ops.append(("zcard", (key,)))
-
-    def expire(self, key: str, seconds: int) -> None:
-        self.ops.append(("expire", (key, seconds)))
-
-    async def execute(self) -> list[int | bool]:
-        results: list[int | bool] = []
-        for op_name, args in self.ops:
-            if op_name == "zremrangebyscore":
-                key, _minimum, maximum = args
-                bucket = self.store[key]
-                removed = [member for member, score in bucket.items() if score <= maximum]
-                for member in removed:
-                    bucket.pop(member, None)
-                results.append(len(removed))
-            elif op_name == "zadd":
-                key, mapping = args
-                self.store[key].update(mapping)
-                results.append(len(mapping))
-            elif op_name == "zcard":
-                (key,) = args
-                results.append(len(self.store[key]))
-            elif op_name == "expire":
-                results.append(True)
-        return results
+
+    async def __call__(self, keys: list[str], args: list[int]) -> list[int]:
+        now, window, limit, cost = args
+        current_start = now - (now % window)
+        state = self.store[keys[0]]
+        start = state.get("s", current_start)
+        count = state.get("c", 0)
+        previous = state.get("p", 0)
+        if start != current_start:
+            previous = count if start == current_start - window else 0
+            count = 0
+            start = current_start
+
+        estimated = previous * ((window - (now - current_start)) / window) + count
+        granted = min(cost, math.floor(limit - estimated))
+        if granted < 1:
+            granted = 0
+        else:
+            count += granted
+        state.update({"s": start, "c": count, "p": previous})
+        return [granted, math.ceil(estimated + granted)]
 
 
 class _FakeRedisClient:
     def __init__(self) -> None:
         self.store: dict[str, dict[str, float]] = defaultdict(dict)
 
-    def pipeline(self, transaction: bool = True) -> _FakeRedisPipeline:
-        return _FakeRedisPipeline(self.store)
-
-    async def aclose(self) -> None:
-        return None
+    def register_script(self, script: str) -> _FakeSlidingWindowScript:
+        return _FakeSlidingWindowScript(self.store)
 
 
 @pytest.mark.parametrize(
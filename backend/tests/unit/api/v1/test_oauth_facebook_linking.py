@@ -31,23 +31,12 @@ class _FakeRateLimitRedisClient:
     async def __aexit__(self, exc_type, exc, tb):
         return None
 
-    def pipeline(self, transaction: bool = True):
-        return self
-
-    def zremrangebyscore(self, *args, **kwargs):
-        self._commands.append(("zremrangebyscore", args, kwargs))
-
-    def zadd(self, *args, **kwargs):
-        self._commands.append(("zadd", args, kwargs))
-
-    def zcard(self, *args, **kwargs):
-        self._commands.append(("zcard", args, kwargs))
-
-    def expire(self, *args, **kwargs):
-        self._commands.append(("expire", args, kwargs))
+    def register_script(self, script: str):
+        async def _admit(keys: list[str], args: list[int]):
+            self._commands.append(("evalsha", tuple(keys), {"args": args}))
+            return [args[3], 1]
 
-    async def execute(self):
-        return [0, 1, 1, True]
+        return _admit
 
     async def aclose(self):
         return None
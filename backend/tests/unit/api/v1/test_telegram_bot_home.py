@@ -0,0 +1,161 @@
+"""Unit tests for the Telegram bot home aggregate endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import Response
+
+from src.presentation.api.v1.telegram import routes as telegram_routes
+from src.presentation.api.v1.telegram.schemas import TelegramBotHomeResponse
+
+_NOW = datetime(2026, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def _entitlement_snapshot() -> dict:
+    return {
+        "status": "active",
+        "plan_uuid": "plan-pro-001",
+        "plan_code": "pro",
+        "display_name": "Pro Plan",
+        "period_days": 30,
+        "expires_at": "2026-06-01T12:00:00Z",
+        "effective_entitlements": {"device_limit": 5},
+        "invite_bundle": {"count": 1, "friend_days": 7, "expiry_days": 30},
+        "is_trial": False,
+        "addons": [],
+    }
+
+
+def _admin_user() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid4(),
+        telegram_id=123456,
+        login="tg_123456",
+        display_name="Test",
+        language="en",
+        role="viewer",
+        notification_prefs={"telegram_username": "tester"},
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _patch_home_sources(monkeypatch: pytest.MonkeyPatch, *, mobile_user: SimpleNamespace | None) -> dict[str, int]:
+    calls = {"remnawave_in_flight": 0, "db_reads_during_remnawave": 0}
+    admin_user = _admin_user()
+    remnawave_started = asyncio.Event()
+
+    class FakeGateway:
+        def __init__(self, client) -> None:
+            pass
+
+        async def get_by_telegram_id(self, telegram_id: int):
+            calls["remnawave_in_flight"] = 1
+            remnawave_started.set()
+            await asyncio.sleep(0)
+            calls["remnawave_in_flight"] = 0
+            return None
+
+    class FakeMobileUserRepo:
+        def __init__(self, _db) -> None:
+            pass
+
+        async def get_by_telegram_id(self, telegram_id: int):
+            await remnawave_started.wait()
+            calls["db_reads_during_remnawave"] += calls["remnawave_in_flight"]
+            return mobile_user
+
+    class FakeEntitlementsUseCase:
+        def __init__(self, _db) -> None:
+            pass
+
+        async def execute(self, user_id):
+            return _entitlement_snapshot()
+
+    async def fake_get_bot_user_or_404(_db, _telegram_id):
+        return admin_user
+
+    async def fake_list_bot_plans(_db):
+        return []
+
+    async def fake_resolve_realm(_db, _mobile_user):
+        return SimpleNamespace(auth_realm=SimpleNamespace(id=uuid4()))
+
+    async def fake_list_subscriptions(_db, _mobile_user, _realm):
+        return []
+
+    async def fake_service_state(_db, _mobile_user, _realm, _telegram_id):
+        return SimpleNamespace()
+
+    monkeypatch.setattr(telegram_routes, "_require_telegram_bot_secret", lambda _secret: None)
+    monkeypatch.setattr(telegram_routes, "_get_bot_user_or_404", fake_get_bot_user_or_404)
+    monkeypatch.setattr(telegram_routes, "RemnawaveUserGateway", FakeGateway)
+    monkeypatch.setattr(telegram_routes, "MobileUserRepository", FakeMobileUserRepo)
+    monkeypatch.setattr(telegram_routes, "GetCurrentEntitlementsUseCase", FakeEntitlementsUseCase)
+    monkeypatch.setattr(telegram_routes, "_list_bot_plans", fake_list_bot_plans)
+    monkeypatch.setattr(telegram_routes, "_resolve_bot_customer_realm", fake_resolve_realm)
+    monkeypatch.setattr(telegram_routes, "_list_bot_subscriptions", fake_list_subscriptions)
+    monkeypatch.setattr(telegram_routes, "_get_default_bot_service_state", fake_service_state)
+    monkeypatch.setattr(telegram_routes, "_serialize_bot_service_state", lambda *_args: None)
+    return calls
+
+
+async def _get_home(if_none_match: str | None = None) -> tuple[TelegramBotHomeResponse | Response, Response]:
+    response = Response()
+    result = await telegram_routes.get_bot_user_home(
+        telegram_id=123456,
+        response=response,
+        telegram_bot_secret="internal-secret",
+        if_none_match=if_none_match,
+        db=object(),
+        remnawave_client=object(),
+    )
+    return result, response
+
+
+@pytest.mark.asyncio
+async def test_bot_home_aggregates_user_state_and_overlaps_remnawave_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _patch_home_sources(monkeypatch, mobile_user=SimpleNamespace(id=uuid4(), auth_realm_id=None))
+
+    body, response = await _get_home()
+
+    assert isinstance(body, TelegramBotHomeResponse)
+    assert body.user.telegram_id == 123456
+    assert body.user.status == "active"
+    assert body.entitlements is not None
+    assert body.entitlements.display_name == "Pro Plan"
+    assert response.headers["ETag"].startswith('"')
+    assert calls["db_reads_during_remnawave"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bot_home_without_customer_account_returns_user_and_catalog(monkeypatch: pytest.MonkeyPatch) -> None:
+    _patch_home_sources(monkeypatch, mobile_user=None)
+
+    body, _response = await _get_home()
+
+    assert isinstance(body, TelegramBotHomeResponse)
+    assert body.user.status == "none"
+    assert body.entitlements is None
+    assert body.service_state is None
+    assert body.subscriptions == []
+
+
+@pytest.mark.asyncio
+async def test_bot_home_answers_matching_etag_with_not_modified(monkeypatch: pytest.MonkeyPatch) -> None:
+    _patch_home_sources(monkeypatch, mobile_user=SimpleNamespace(id=uuid4(), auth_realm_id=None))
+
+    _body, first = await _get_home()
+    etag = first.headers["ETag"]
+    not_modified, _response = await _get_home(if_none_match=f'"stale", W/{etag}')
+    changed, _response = await _get_home(if_none_match='"stale"')
+
+    assert isinstance(not_modified, Response)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert isinstance(changed, TelegramBotHomeResponse)
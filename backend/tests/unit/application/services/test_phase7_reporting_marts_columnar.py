@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import json
+import random
+from decimal import InvalidOperation
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.application.services.phase7_reporting_marts import build_phase7_reporting_marts_pack
+from src.application.services.phase8_settlement_shadow import build_phase8_settlement_shadow_pack
+from src.application.services.snapshot_store import open_snapshot, write_streaming_snapshot
+
+pytest.importorskip("numpy")
+
+_AMOUNTS = [None, "", "19.99", "-0.00", "-1.005", "0.125", 5, 2.5, "100", "-3.1", "7.555"]
+
+
+def _random_snapshot(seed: int, size: int = 40) -> dict[str, Any]:
+    """Small snapshots full of the awkward cases: duplicate ids, null keys, orphans and odd amounts."""
+    rnd = random.Random(seed)  # noqa: S311 - reproducible fixtures, not secrets
+
+    def timestamp() -> str | None:
+        return rnd.choice([None, "", f"2026-04-0{rnd.randint(1, 3)}T1{rnd.randint(0, 2)}:00:00+00:00"])
+
+    def partner() -> Any:
+        return rnd.choice(["partner-1", "partner-2", "partner-3", "", None])
+
+    def order_rows(prefix: str, extra: dict[str, list[Any]]) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": rnd.choice([f"{prefix}-{index}", f"{prefix}-{index % 5}", None]),
+                "order_id": rnd.choice([f"order-{rnd.randint(0, size + 5)}", None]),
+                "created_at": timestamp(),
+                **{field: rnd.choice(choices) for field, choices in extra.items()},
+            }
+            for index in range(rnd.randint(0, size))
+        ]
+
+    return {
+        "metadata": {"snapshot_id": f"columnar-{seed}", "replay_generated_at": "2026-04-18T20:00:00+00:00"},
+        "orders": [
+            {
+                "id": rnd.choice([f"order-{index}", f"order-{index}", f"order-{index % 7}"]),
+                "user_id": rnd.choice(["user-1", "user-2", "user-3", None]),
+                "order_status": rnd.choice(["committed", "draft", None]),
+                "settlement_status": rnd.choice(["paid", "paid", "pending", None]),
+                "sale_channel": rnd.choice(["web", None]),
+                "currency_code": rnd.choice(["USD", "EUR", "", None]),
+                "commission_base_amount": rnd.choice(_AMOUNTS),
+                "displayed_price": rnd.choice(_AMOUNTS),
+                "created_at": rnd.choice(["2026-04-01T10:00:00+00:00", "2026-04-02T10:00:00Z"]),
+            }
+            for index in range(size)
+        ],
+        "order_attribution_results": order_rows(
+            "attribution",
+            {"partner_account_id": ["partner-1", "partner-2", "", None], "owner_type": ["affiliate", None, ""]},
+        ),
+        "commissionability_evaluations": order_rows(
+            "evaluation", {"commissionability_status": ["eligible", "eligible", "ineligible", None]}
+        ),
+        "renewal_orders": order_rows(
+            "renewal", {"effective_partner_account_id": ["partner-3", None], "effective_owner_type": ["reseller", None]}
+        ),
+        "refunds": order_rows("refund", {"refund_status": ["succeeded", "failed"]}),
+        "payment_disputes": order_rows("dispute", {"outcome_class": ["open", "lost", "won", None]}),
+        "earning_events": [
+            {"id": f"event-{index}", "partner_account_id": partner(), "created_at": timestamp()}
+            for index in range(rnd.randint(0, size))
+        ],
+        "partner_statements": [
+            {"id": f"statement-{index}", "partner_account_id": partner(), "created_at": timestamp()}
+            for index in range(rnd.randint(0, 5))
+        ],
+        "outbox_events": [
+            {
+                "id": rnd.choice([f"evt-{index}", f"evt-{index % 4}"]),
+                "event_family": rnd.choice(["order", "partner", None]),
+                "created_at": timestamp(),
+            }
+            for index in range(rnd.randint(0, 15))
+        ],
+        "outbox_publications": [
+            {
+                "id": f"pub-{index}",
+                "outbox_event_id": rnd.choice([f"evt-{rnd.randint(0, 20)}", None]),
+                "consumer_key": rnd.choice(["analytics_mart", "operational_replay", "other", None]),
+                "publication_status": rnd.choice(["pending", "claimed", "submitted", "published", "failed", None]),
+                "created_at": timestamp(),
+            }
+            for index in range(rnd.randint(0, 40))
+        ],
+    }
+
+
+def _random_settlement_snapshot(seed: int, size: int = 12) -> dict[str, Any]:
+    """Phase 8 snapshot whose observations sit on, inside and beyond the amount tolerances."""
+    rnd = random.Random(seed)  # noqa: S311 - reproducible fixtures, not secrets
+    partners = [f"partner-{index}" for index in range(1, 4)]
+
+    def amount() -> Any:
+        return rnd.choice([None, "0", "0.00", "23.00", "23.005", "-2.00", "18.4", 5, 2.5, 0.1, "1e2", "-0.00"])
+
+    def observed(statement_id: str | None) -> dict[str, Any]:
+        return {
+            "observed_statement_status": rnd.choice(["closed", "open"]),
+            **{f"observed_{metric}": amount() for metric in _SETTLEMENT_METRICS},
+            "statement_id": statement_id,
+        }
+
+    statements = [
+        {
+            "id": f"statement-{index}",
+            "partner_account_id": rnd.choice(partners),
+            "statement_status": rnd.choice(["closed", "open"]),
+            "currency_code": "USD",
+            "accrual_amount": amount() or "0",
+            "on_hold_amount": "0.00",
+            "reserve_amount": amount() or "0",
+            "adjustment_net_amount": amount() or "0",
+            "available_amount": amount() or "0",
+            "created_at": f"2026-04-19T10:{index:02d}:00+00:00",
+        }
+        for index in range(rnd.randint(1, size))
+    ]
+    instructions = [
+        {
+            "id": f"instruction-{index}",
+            "partner_account_id": rnd.choice([*partners, None]),
+            "partner_statement_id": rnd.choice(statements)["id"],
+            "instruction_status": rnd.choice(["approved", "completed"]),
+            "payout_amount": amount() or "0",
+            "currency_code": "USD",
+            "created_at": f"2026-04-19T11:{index:02d}:00+00:00",
+        }
+        for index in range(rnd.randint(0, size))
+    ]
+    return {
+        "metadata": {
+            "snapshot_id": f"settlement-{seed}",
+            "replay_generated_at": "2026-04-19T18:00:00+00:00",
+            "default_max_amount_delta": rnd.choice([None, "0.00", "0.5", "1e-3"]),
+        },
+        "phase4_snapshot": {
+            "earning_events": [
+                {
+                    "id": f"event-{index}",
+                    "partner_account_id": rnd.choice(partners),
+                    "event_status": rnd.choice(["available", "blocked"]),
+                    "total_amount": amount() or "0",
+                    "currency_code": "USD",
+                    "created_at": f"2026-04-19T09:{index:02d}:00+00:00",
+                }
+                for index in range(rnd.randint(0, size))
+            ],
+            "reserves": [
+                {
+                    "id": f"reserve-{index}",
+                    "partner_account_id": rnd.choice(partners),
+                    "reserve_scope": "partner_account",
+                    "reserve_status": rnd.choice(["active", "released"]),
+                    "amount": amount() or "0",
+                    "currency_code": "USD",
+                    "created_at": f"2026-04-19T09:{index:02d}:30+00:00",
+                }
+                for index in range(rnd.randint(0, 4))
+            ],
+            "partner_statements": statements,
+            "payout_instructions": instructions,
+            "payout_executions": [
+                {
+                    "id": f"execution-{index}",
+                    "payout_instruction_id": rnd.choice(instructions)["id"],
+                    "execution_mode": rnd.choice(["dry_run", "live"]),
+                    "execution_status": rnd.choice(["reconciled", "submitted", None]),
+                    "created_at": f"2026-04-19T12:{index:02d}:00+00:00",
+                }
+                for index in range(rnd.randint(0, size) if instructions else 0)
+            ],
+        },
+        "analytical_snapshot": _random_snapshot(seed, size=20),
+        "statement_shadow_observations": [
+            observed(rnd.choice([statement["id"] for statement in statements] + ["statement-orphan", None]))
+            for _ in range(rnd.randint(0, size))
+        ],
+        "liability_shadow_observations": [
+            {"partner_account_id": rnd.choice([*partners, None]), **observed(None)} for _ in range(rnd.randint(0, 4))
+        ],
+        "payout_dry_run_observations": [
+            {
+                "payout_instruction_id": rnd.choice([instruction["id"] for instruction in instructions] + [None]),
+                "observed_instruction_status": rnd.choice(["approved", "completed"]),
+                "observed_execution_statuses": rnd.choice([[], ["reconciled"], ["submitted", None]]),
+                **observed(None),
+            }
+            for _ in range(rnd.randint(0, size))
+        ],
+        "partner_export_observations": [
+            {
+                "export_key": f"export-{index % 5}",
+                "partner_account_id": rnd.choice([*partners, "partner-unknown"]),
+                "export_status": "ready",
+                "observed_paid_conversion_count": rnd.choice([None, 0, 1, 2]),
+                "observed_currency_codes": rnd.choice([["USD"], ["EUR", "USD"], []]),
+                **observed(None),
+            }
+            for index in range(rnd.randint(0, 8))
+        ],
+        "amount_tolerances": [
+            {
+                "comparison_family": rnd.choice(["statement", "liability", "payout_dry_run", "partner_export"]),
+                "metric_key": rnd.choice(_SETTLEMENT_METRICS),
+                "max_delta_amount": rnd.choice(["0.01", "0.5", "1", "5.005", "-1"]),
+            }
+            for _ in range(rnd.randint(0, 6))
+        ],
+        "approved_divergences": [
+            {"code": "statement_available_amount_delta_exceeded", "approval_reference": "approval-1"},
+        ],
+    }
+
+
+_SETTLEMENT_METRICS = [
+    "available_amount",
+    "reserve_amount",
+    "adjustment_net_amount",
+    "outstanding_statement_liability_amount",
+    "completed_payout_amount",
+    "total_active_reserve_amount",
+    "available_earnings_amount",
+    "statement_liability_amount",
+]
+
+
+def _dump(report: dict[str, Any]) -> str:
+    return json.dumps(report, sort_keys=True, default=str)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_columnar_engine_matches_reference(seed: int) -> None:
+    snapshot = _random_snapshot(seed)
+
+    assert _dump(build_phase7_reporting_marts_pack(snapshot, engine="columnar")) == _dump(
+        build_phase7_reporting_marts_pack(snapshot)
+    )
+
+
+def test_columnar_engine_matches_reference_on_streaming_snapshots(tmp_path: Path) -> None:
+    snapshot = _random_snapshot(7)
+    write_streaming_snapshot(snapshot, tmp_path / "snapshot")
+
+    with open_snapshot(tmp_path / "snapshot") as streamed:
+        columnar = build_phase7_reporting_marts_pack(streamed, engine="columnar")
+    with open_snapshot(tmp_path / "snapshot") as streamed:
+        reference = build_phase7_reporting_marts_pack(streamed)
+
+    assert _dump(columnar) == _dump(reference) == _dump(build_phase7_reporting_marts_pack(snapshot))
+
+
+@pytest.mark.parametrize("amount", ["0.1234567890123456789012", "1e30", "-123456789012345678.5"])
+def test_columnar_engine_falls_back_on_amounts_outside_fixed_point(amount: str) -> None:
+    snapshot = _random_snapshot(3)
+    snapshot["orders"][0]["commission_base_amount"] = amount
+
+    assert _dump(build_phase7_reporting_marts_pack(snapshot, engine="columnar")) == _dump(
+        build_phase7_reporting_marts_pack(snapshot)
+    )
+
+
+def test_columnar_engine_fails_like_reference_on_malformed_amounts() -> None:
+    snapshot = _random_snapshot(3)
+    snapshot["orders"][0]["displayed_price"] = "not-a-number"
+
+    with pytest.raises(InvalidOperation):
+        build_phase7_reporting_marts_pack(snapshot)
+    with pytest.raises(InvalidOperation):
+        build_phase7_reporting_marts_pack(snapshot, engine="columnar")
+
+
+def test_unknown_engine_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown reporting engine"):
+        build_phase7_reporting_marts_pack({}, engine="vectorized")
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_settlement_shadow_columnar_engine_matches_reference(seed: int) -> None:
+    snapshot = _random_settlement_snapshot(seed)
+
+    assert _dump(build_phase8_settlement_shadow_pack(snapshot, engine="columnar")) == _dump(
+        build_phase8_settlement_shadow_pack(snapshot)
+    )
+
+
+@pytest.mark.parametrize("amount", ["0.1234567890123456789012", "1e30", "-123456789012345678.5"])
+def test_settlement_shadow_columnar_engine_checks_out_of_range_amounts_exactly(amount: str) -> None:
+    snapshot = _random_settlement_snapshot(5)
+    snapshot["statement_shadow_observations"].append(
+        {"statement_id": "statement-0", "observed_available_amount": amount}
+    )
+
+    assert _dump(build_phase8_settlement_shadow_pack(snapshot, engine="columnar")) == _dump(
+        build_phase8_settlement_shadow_pack(snapshot)
+    )
+
+
+def test_settlement_shadow_pack_forwards_engine() -> None:
+    snapshot = {
+        "metadata": {"snapshot_id": "phase8-columnar", "replay_generated_at": "2026-04-18T20:00:00+00:00"},
+        "analytical_snapshot": _random_snapshot(11),
+    }
+
+    assert _dump(build_phase8_settlement_shadow_pack(snapshot, engine="columnar")) == _dump(
+        build_phase8_settlement_shadow_pack(snapshot)
+    )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.application.services.snapshot_store import (
+    StreamingSnapshot,
+    open_snapshot,
+    rows_by_key,
+    rows_grouped_by,
+    sorted_rows,
+    write_streaming_snapshot,
+)
+
+ROWS = [
+    {"id": "c", "order_id": "order-2", "created_at": "2026-04-18T10:00:00+00:00"},
+    {"id": "a", "order_id": "order-1", "created_at": "2026-04-18T12:00:00+00:00"},
+    {"id": "b", "order_id": "order-1", "created_at": "2026-04-18T09:00:00+00:00"},
+    {"id": "d", "order_id": None, "created_at": "2026-04-18T09:00:00+00:00"},
+]
+
+
+def _sort_key(row: dict) -> tuple[str, str]:
+    return (str(row.get("created_at") or ""), str(row.get("id") or ""))
+
+
+def _order_id(row: dict) -> str | None:
+    return row.get("order_id")
+
+
+def test_table_helpers_match_in_memory_helpers(tmp_path: Path) -> None:
+    write_streaming_snapshot({"metadata": {"snapshot_id": "s-1"}, "rows": ROWS}, tmp_path / "snapshot")
+
+    with open_snapshot(tmp_path / "snapshot") as snapshot:
+        assert isinstance(snapshot, StreamingSnapshot)
+        assert snapshot["metadata"] == {"snapshot_id": "s-1"}
+        table = snapshot["rows"]
+        assert list(table) == ROWS
+        assert len(table) == 4
+
+        streamed = sorted_rows(table, _sort_key)
+        expected = sorted_rows(ROWS, _sort_key)
+        assert list(streamed) == expected
+        assert len(streamed) == 4
+
+        for source in (streamed, expected):
+            by_order = rows_by_key(source, _order_id)
+            grouped = rows_grouped_by(source, _order_id)
+            assert by_order["order-1"]["id"] == "a"
+            assert "order-3" not in by_order
+            assert [row["id"] for row in grouped["order-1"]] == ["b", "a"]
+            assert grouped.get("order-3", []) == []
+            assert sorted(grouped) == ["order-1", "order-2"]
+
+
+def test_nested_snapshots_and_legacy_json_open_the_same_way(tmp_path: Path) -> None:
+    snapshot = {"metadata": {"snapshot_id": "outer"}, "inner": {"metadata": {}, "rows": ROWS}}
+    write_streaming_snapshot(snapshot, tmp_path / "snapshot", compress=False)
+    (tmp_path / "snapshot.json").write_text('{"rows": []}', encoding="utf-8")
+
+    assert (tmp_path / "snapshot" / "inner" / "rows.ndjson").exists()
+    with open_snapshot(tmp_path / "snapshot") as streamed:
+        inner = dict(streamed["inner"])
+        assert [row["id"] for row in inner["rows"]] == ["c", "a", "b", "d"]
+    with open_snapshot(tmp_path / "snapshot.json") as loaded:
+        assert loaded == {"rows": []}
+
+
+def test_scan_matches_iteration_before_and_after_ingest(tmp_path: Path) -> None:
+    write_streaming_snapshot({"metadata": {}, "rows": ROWS}, tmp_path / "snapshot")
+
+    with open_snapshot(tmp_path / "snapshot") as snapshot:
+        table = snapshot["rows"]
+        assert list(table.scan()) == ROWS
+        assert list(table.scan()) == ROWS
+        assert list(table) == ROWS
+        assert list(table.scan()) == ROWS
+        assert list(table.sorted_by(_sort_key).scan()) == sorted_rows(ROWS, _sort_key)
@@ -0,0 +1,93 @@
+"""Unit tests for the local revocation filter and principal cache."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from sqlalchemy.orm import Session
+
+from src.application.services.jwt_revocation_service import JWTRevocationService
+from src.infrastructure.cache import auth_cache as auth_cache_module
+from src.infrastructure.cache.auth_cache import PRINCIPAL_REALM_MOBILE, LocalAuthCache
+from src.infrastructure.database.models.mobile_user_model import MobileUserModel
+
+
+async def _wait_until(predicate) -> None:
+    for _ in range(50):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+
+
+def _client(server: fakeredis.FakeServer) -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+
+async def test_unsynced_filter_defers_to_redis() -> None:
+    cache = LocalAuthCache(max_staleness_seconds=0.2)
+
+    assert cache.check_revoked("jti-1") is None
+
+
+async def test_filter_seeds_from_blocklist_and_follows_revocations() -> None:
+    server = fakeredis.FakeServer()
+    service = JWTRevocationService(_client(server))
+    expires_at = datetime.now(UTC) + timedelta(minutes=15)
+    await service.revoke_token("revoked-before-start", expires_at)
+
+    cache = LocalAuthCache(max_staleness_seconds=0.2)
+    await cache.start(_client(server))
+    await _wait_until(lambda: cache.is_synced)
+
+    assert cache.check_revoked("revoked-before-start") is True
+    assert cache.check_revoked("still-valid") is False
+
+    await service.revoke_token("revoked-after-start", expires_at)
+    await _wait_until(lambda: cache.check_revoked("revoked-after-start"))
+
+    assert cache.check_revoked("revoked-after-start") is True
+    await cache.stop()
+    assert cache.check_revoked("still-valid") is None
+
+
+async def test_principal_change_evicts_cached_principal_on_other_replicas() -> None:
+    server = fakeredis.FakeServer()
+    writer = LocalAuthCache(max_staleness_seconds=0.2)
+    reader = LocalAuthCache(max_staleness_seconds=0.2)
+    await writer.start(_client(server))
+    await reader.start(_client(server))
+    await _wait_until(lambda: writer.is_synced and reader.is_synced)
+
+    reader.remember_principal(PRINCIPAL_REALM_MOBILE, "user-1", is_active=True)
+    assert reader.principal_active(PRINCIPAL_REALM_MOBILE, "user-1") is True
+
+    writer.broadcast_principal_change(PRINCIPAL_REALM_MOBILE, "user-1")
+    await _wait_until(lambda: reader.principal_active(PRINCIPAL_REALM_MOBILE, "user-1") is None)
+
+    assert reader.principal_active(PRINCIPAL_REALM_MOBILE, "user-1") is None
+    await writer.stop()
+    await reader.stop()
+
+
+def test_principal_changes_are_broadcast_only_after_commit(monkeypatch: pytest.MonkeyPatch) -> None:
+    broadcast: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        auth_cache_module.auth_cache,
+        "broadcast_principal_change",
+        lambda realm, user_id: broadcast.append((realm, str(user_id))),
+    )
+    session = Session()
+    user = MobileUserModel(id=uuid4())
+    session.add(user)
+
+    auth_cache_module._on_mobile_delete(None, None, user)
+    assert broadcast == []
+    auth_cache_module._on_rollback(session)
+    auth_cache_module._on_commit(session)
+    assert broadcast == []
+
+    auth_cache_module._on_mobile_delete(None, None, user)
+    auth_cache_module._on_commit(session)
+    assert broadcast == [(PRINCIPAL_REALM_MOBILE, str(user.id))]
@@ -0,0 +1,40 @@
+"""Unit tests for the Lua sliding-window-counter rate limiter."""
+
+import fakeredis
+import pytest
+
+from src.infrastructure.cache.rate_limiter import SlidingWindowRateLimiter
+
+pytest.importorskip("lupa")
+
+
+async def test_rejects_once_budget_is_spent_and_keeps_one_hash_per_bucket() -> None:
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    limiter = SlidingWindowRateLimiter()
+
+    decisions = [await limiter.hit(client, "rl:ip:bucket", limit=3, window_seconds=3600) for _ in range(5)]
+
+    assert [decision.allowed for decision in decisions] == [True, True, True, False, False]
+    assert await client.type("rl:ip:bucket") == "hash"
+    assert await client.hlen("rl:ip:bucket") == 3
+    assert 0 < await client.pttl("rl:ip:bucket") <= 7_200_000
+
+
+async def test_local_batches_reserve_tokens_and_cut_redis_calls() -> None:
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    limiter = SlidingWindowRateLimiter(local_batch_size=10, local_lease_seconds=60)
+
+    decisions = [await limiter.hit(client, "rl:ip:bucket", limit=40, window_seconds=3600) for _ in range(45)]
+
+    assert sum(decision.allowed for decision in decisions) == 40
+    # Four batches of ten were reserved in Redis; nothing was admitted beyond them.
+    assert int(await client.hget("rl:ip:bucket", "c")) == 40
+
+
+async def test_small_budgets_bypass_local_batching() -> None:
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    limiter = SlidingWindowRateLimiter(local_batch_size=10)
+
+    await limiter.hit(client, "rl:ip:bucket", limit=20, window_seconds=3600)
+
+    assert int(await client.hget("rl:ip:bucket", "c")) == 1
@@ -0,0 +1,80 @@
+"""Unit tests for the two-tier ResponseCache."""
+
+import asyncio
+
+import fakeredis
+
+from src.infrastructure.cache.response_cache import ResponseCache
+
+
+def _cache(server: fakeredis.FakeServer, **kwargs) -> ResponseCache:
+    cache = ResponseCache(invalidation_channel="test:cache:invalidate", **kwargs)
+    cache._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return cache
+
+
+async def test_concurrent_misses_fetch_once() -> None:
+    cache = _cache(fakeredis.FakeServer())
+    calls = 0
+
+    async def _fetch() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"servers": 3}
+
+    results = await asyncio.gather(*(cache.get_or_fetch("status", 30, _fetch) for _ in range(10)))
+
+    assert calls == 1
+    assert results == [{"servers": 3}] * 10
+
+
+async def test_local_tier_serves_without_redis_round_trip() -> None:
+    server = fakeredis.FakeServer()
+    cache = _cache(server)
+
+    async def _fetch() -> dict:
+        return {"n": 1}
+
+    await cache.get_or_fetch("status", 30, _fetch)
+    await cache._redis.flushall()
+
+    assert await cache.get_or_fetch("status", 30, _fetch) == {"n": 1}
+    assert await cache.get("status") == {"n": 1}
+
+
+async def test_stale_value_is_served_while_revalidating() -> None:
+    cache = _cache(fakeredis.FakeServer(), l1_max_entries=0, stale_ttl_seconds=60)
+    values = iter(({"v": "old"}, {"v": "new"}))
+
+    async def _fetch() -> dict:
+        return next(values)
+
+    assert await cache.get_or_fetch("catalog", 0, _fetch) == {"v": "old"}
+    assert await cache.get_or_fetch("catalog", 30, _fetch) == {"v": "old"}
+    await asyncio.gather(*cache._background)
+
+    assert await cache.get_or_fetch("catalog", 30, _fetch) == {"v": "new"}
+
+
+async def test_tag_invalidation_evicts_local_tier_on_other_replicas() -> None:
+    server = fakeredis.FakeServer()
+    writer = _cache(server)
+    reader = _cache(server)
+    await reader.start_invalidation_listener(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    await asyncio.sleep(0.05)
+    version = 0
+
+    async def _fetch() -> dict:
+        return {"version": version}
+
+    assert await reader.get_or_fetch("servers:list", 30, _fetch, tags=("servers",)) == {"version": 0}
+    version = 1
+    await writer.invalidate_tags("servers")
+    for _ in range(20):
+        if await reader.get_or_fetch("servers:list", 30, _fetch, tags=("servers",)) == {"version": 1}:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await reader.get_or_fetch("servers:list", 30, _fetch, tags=("servers",)) == {"version": 1}
+    await reader.stop_invalidation_listener()
@@ -16,7 +16,7 @@ os.environ.setdefault("CRYPTOBOT_TOKEN", "local-cryptobot-token")
 os.environ.setdefault("JWT_SECRET", "0123456789abcdef0123456789abcdef")
 
 from src.application.services.ws_ticket_service import MESSAGING_REALTIME_TICKET_SCOPE, TicketData
-from src.infrastructure.messaging import nats_messaging_runtime
+from src.infrastructure.messaging import nats_messaging_runtime, presence
 from src.infrastructure.messaging.presence import MessagingPresenceIdentity, MessagingPresenceRegistry
 from src.infrastructure.messaging.sse_manager import SSEManager
 from src.presentation.api.v1.messaging import routes as messaging_routes
@@ -27,6 +27,8 @@ class _FakeRedis:
         self.values: dict[str, tuple[str, int | None]] = {}
         self.sets: dict[str, set[str]] = {}
         self.expirations: dict[str, int] = {}
+        self.pipelines = 0
+        self.script_calls = 0
 
     async def set(self, key: str, value: str, *, ex: int | None = None) -> bool:
         self.values[key] = (value, ex)
@@ -55,6 +57,39 @@ class _FakeRedis:
     async def exists(self, key: str) -> int:
         return int(key in self.values)
 
+    def pipeline(self, *, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    def register_script(self, script: str):
+        async def _count_live_connections(*, keys: list[str], args: list[str]) -> list[int]:
+            self.script_calls += 1
+            counts = []
+            for index_key, connection_prefix in zip(keys, args, strict=True):
+                members = self.sets.get(index_key, set())
+                live = {member for member in members if connection_prefix + member in self.values}
+                members.intersection_update(live)
+                counts.append(len(live))
+            return counts
+
+        return _count_live_connections
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def _queue(*args, **kwargs) -> _FakePipeline:
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list:
+        self._redis.pipelines += 1
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
 
 class _FailingRedis(_FakeRedis):
     async def set(self, key: str, value: str, *, ex: int | None = None) -> bool:
@@ -83,6 +118,69 @@ async def test_presence_registry_uses_ttl_and_connection_index() -> None:
     assert redis.sets["messaging:presence:index:customer:customer-1"] == set()
 
 
+@pytest.mark.asyncio
+async def test_presence_registry_counts_many_participants_in_fixed_round_trips() -> None:
+    redis = _FakeRedis()
+    registry = MessagingPresenceRegistry(redis, ttl_seconds=45)  # type: ignore[arg-type]
+    for participant_id, connection_id in (("customer-1", "a"), ("customer-1", "b"), ("customer-2", "c")):
+        await registry.register(
+            MessagingPresenceIdentity(
+                participant_type="customer",
+                participant_id=participant_id,
+                connection_id=connection_id,
+                transport="websocket",
+            )
+        )
+    del redis.values["messaging:presence:customer:customer-1:b"]
+    redis.pipelines = 0
+    redis.script_calls = 0
+
+    participants = [("customer", "customer-1"), ("customer", "customer-2"), ("admin", "admin-1")]
+    counts = await registry.connection_counts(participants)
+
+    assert counts == {("customer", "customer-1"): 1, ("customer", "customer-2"): 1, ("admin", "admin-1"): 0}
+    assert (redis.pipelines, redis.script_calls) == (0, 1)
+    assert redis.sets["messaging:presence:index:customer:customer-1"] == {"a"}
+
+    await registry.disconnect(
+        MessagingPresenceIdentity(
+            participant_type="customer",
+            participant_id="customer-2",
+            connection_id="c",
+            transport="websocket",
+        )
+    )
+    assert await registry.connection_count(participant_type="customer", participant_id="customer-2") == 0
+
+
+@pytest.mark.asyncio
+async def test_presence_count_script_prunes_expired_members_atomically_per_batch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    monkeypatch.setattr(presence, "COUNT_BATCH_SIZE", 2)
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    registry = MessagingPresenceRegistry(client, ttl_seconds=45)
+    for participant_id, connection_id in (("customer-1", "a"), ("customer-1", "b"), ("customer-3", "d")):
+        await registry.register(
+            MessagingPresenceIdentity(
+                participant_type="customer",
+                participant_id=participant_id,
+                connection_id=connection_id,
+                transport="websocket",
+            )
+        )
+    await client.delete("messaging:presence:customer:customer-1:b", "messaging:presence:customer:customer-3:d")
+
+    participants = [("customer", "customer-1"), ("customer", "customer-2"), ("customer", "customer-3")]
+    counts = await registry.connection_counts(participants)
+
+    assert counts == {("customer", "customer-1"): 1, ("customer", "customer-2"): 0, ("customer", "customer-3"): 0}
+    assert await client.smembers("messaging:presence:index:customer:customer-1") == {"a"}
+    assert await client.exists("messaging:presence:index:customer:customer-3") == 0
+
+
 @pytest.mark.asyncio
 async def test_presence_registry_degrades_without_rejecting_connection() -> None:
     registry = MessagingPresenceRegistry(_FailingRedis(), ttl_seconds=45)  # type: ignore[arg-type]
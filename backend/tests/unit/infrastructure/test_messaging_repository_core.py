@@ -1,5 +1,5 @@
 import os
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 import pytest
@@ -9,6 +9,7 @@ os.environ.setdefault("REMNAWAVE_TOKEN", "local-remnawave-token")
 os.environ.setdefault("CRYPTOBOT_TOKEN", "local-cryptobot-token")
 os.environ.setdefault("JWT_SECRET", "0123456789abcdef0123456789abcdef")
 
+from src.application.services.messaging_service import MessagingService  # noqa: E402
 from src.domain.entities.messaging import (  # noqa: E402
     MessagingBodyFormat,
     MessagingConversationCategory,
@@ -29,7 +30,10 @@ from src.infrastructure.database.models.messaging_conversation_model import (  #
     MessagingConversationParticipantModel,
     MessagingMessageModel,
 )
-from src.infrastructure.database.repositories.messaging_repository import SQLAlchemyMessagingRepository  # noqa: E402
+from src.infrastructure.database.repositories.messaging_repository import (  # noqa: E402
+    SQLAlchemyMessagingRepository,
+    _decode_cursor,
+)
 
 
 class _ScalarResult:
@@ -186,7 +190,7 @@ def _participant_model(*, conversation_id, participant_id) -> MessagingConversat
 
 
 @pytest.mark.asyncio
-async def test_repository_customer_list_filters_internal_messages() -> None:
+async def test_repository_customer_list_returns_summaries_without_messages() -> None:
     customer_account_id = uuid4()
     conversation = _conversation_model(customer_account_id=customer_account_id)
     public = _message_model(conversation_id=conversation.id, visibility=MessagingMessageVisibility.PUBLIC)
@@ -194,13 +198,60 @@ async def test_repository_customer_list_filters_internal_messages() -> None:
     conversation.participants = []
     conversation.messages = [public, internal]
     conversation.read_states = []
-    fake_session = _FakeSession([[conversation]])
+    fake_session = _FakeSession([[(conversation, 1)]])
     repo = SQLAlchemyMessagingRepository(fake_session)  # type: ignore[arg-type]
 
     result = await repo.list_for_customer(customer_account_id=customer_account_id)
 
     assert len(result.conversations) == 1
-    assert [message.id for message in result.conversations[0].messages] == [public.id]
+    assert result.conversations[0].messages == ()
+    assert result.conversations[0].customer_unread_count == 1
+    assert MessagingService.unread_count(result.conversations[0], MessagingSenderType.CUSTOMER) == 1
+    assert result.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_repository_admin_list_returns_keyset_cursor_for_next_page() -> None:
+    newer = _conversation_model()
+    older = _conversation_model()
+    older.updated_at = newer.updated_at - timedelta(minutes=5)
+    extra = _conversation_model()
+    extra.updated_at = older.updated_at - timedelta(minutes=5)
+    fake_session = _FakeSession([[newer, older, extra]])
+    repo = SQLAlchemyMessagingRepository(fake_session)  # type: ignore[arg-type]
+
+    result = await repo.list_for_admin(limit=2)
+
+    assert [conversation.id for conversation in result.conversations] == [newer.id, older.id]
+    assert result.next_cursor is not None
+    assert _decode_cursor(result.next_cursor) == (older.updated_at, older.id)
+
+
+def test_cursor_decoding_falls_back_to_first_page_for_unknown_cursors() -> None:
+    assert _decode_cursor(None) is None
+    assert _decode_cursor("50") is None
+    assert _decode_cursor("not-a-cursor") is None
+
+
+@pytest.mark.asyncio
+async def test_repository_unread_notification_count_reads_counter_row() -> None:
+    repo = SQLAlchemyMessagingRepository(_FakeSession([7]))  # type: ignore[arg-type]
+    assert (
+        await repo.count_unread_site_notifications(
+            recipient_type=SiteNotificationRecipientType.CUSTOMER,
+            recipient_id=uuid4(),
+        )
+        == 7
+    )
+
+    repo = SQLAlchemyMessagingRepository(_FakeSession([None]))  # type: ignore[arg-type]
+    assert (
+        await repo.count_unread_site_notifications(
+            recipient_type=SiteNotificationRecipientType.CUSTOMER,
+            recipient_id=uuid4(),
+        )
+        == 0
+    )
 
 
 @pytest.mark.asyncio
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from datetime import UTC, datetime
 from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
 
@@ -153,38 +154,71 @@ async def test_process_message_records_receipt_after_realtime_dispatch(monkeypat
 
 
 @pytest.mark.asyncio
-async def test_mark_publication_failure_moves_to_dead_letter(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_dispatch_settles_whole_batch_in_one_transaction(monkeypatch: pytest.MonkeyPatch) -> None:
     class FakeRepo:
-        failed = False
-        dead_letter = False
+        outcomes: dict[str, list[dict]] = {}
 
-        async def mark_publication_failed(self, **kwargs):
-            self.failed = True
+        def __init__(self, _session) -> None:
+            pass
 
-        async def mark_publication_dead_letter(self, **kwargs):
-            self.dead_letter = True
+        async def claim_publications(self, **kwargs):
+            return [_publication(attempts=1, event_key="evt-ok"), _publication(attempts=3, event_key="evt-dead")]
 
-    repo = FakeRepo()
-    publication = SimpleNamespace(
-        attempts=3,
+        async def record_publication_outcomes(self, **kwargs):
+            FakeRepo.outcomes = kwargs
+            return 2
+
+    commits = 0
+
+    async def commit():
+        nonlocal commits
+        commits += 1
+
+    monkeypatch.setattr(runtime_module, "OutboxRepository", FakeRepo)
+    monkeypatch.setattr(runtime_module, "AsyncSessionLocal", lambda: _AsyncContext(SimpleNamespace(commit=commit)))
+    monkeypatch.setattr(runtime_module.settings, "outbox_dispatch_dead_letter_after_attempts", 3)
+    monkeypatch.setattr(runtime_module.settings, "outbox_dispatch_batch_size", 2)
+
+    runtime = NatsMessagingRuntime()
+
+    async def publish(envelope):
+        if envelope.event_key == "evt-dead":
+            raise RuntimeError("nats unavailable")
+        return {"status": "published"}
+
+    monkeypatch.setattr(runtime, "_publish_envelope", publish)
+
+    full = await runtime._dispatch_pending_publications(
+        consumer_key="messaging_realtime_projection",
+        lease_owner="lease-1",
+    )
+
+    assert full is True
+    assert commits == 2
+    assert [row["publication_payload"] for row in FakeRepo.outcomes["published"]] == [{"status": "published"}]
+    assert FakeRepo.outcomes["failed"] == []
+    assert FakeRepo.outcomes["dead_lettered"][0]["error_message"] == "nats unavailable"
+    assert runtime._batch_sizes["messaging_realtime_projection"].current == 4
+
+
+def _publication(*, attempts: int, event_key: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid4(),
+        attempts=attempts,
         consumer_key="messaging_realtime_projection",
         outbox_event=SimpleNamespace(
+            event_key=event_key,
             event_name="messaging.message.created",
+            event_family="messaging",
+            aggregate_type="messaging_message",
+            aggregate_id="msg-001",
+            schema_version=1,
             occurred_at=datetime(2026, 5, 31, 12, 0, tzinfo=UTC),
+            actor_context={},
+            source_context={},
+            event_payload={},
         ),
     )
-    monkeypatch.setattr(runtime_module.settings, "outbox_dispatch_dead_letter_after_attempts", 3)
-
-    result = await NatsMessagingRuntime()._mark_publication_failure(
-        repo=repo,
-        publication=publication,
-        lease_owner="lease-1",
-        exc=RuntimeError("nats unavailable"),
-    )
-
-    assert result == "dead_letter"
-    assert repo.dead_letter is True
-    assert repo.failed is False
 
 
 class _AsyncContext:
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infrastructure.database.models.outbox_event_model import OutboxEventModel, OutboxPublicationModel
+from src.infrastructure.database.repositories.outbox_repo import OutboxRepository
+
+
+@pytest.fixture
+async def sessionmaker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: OutboxEventModel.metadata.create_all(
+                sync_conn,
+                tables=[OutboxEventModel.__table__, OutboxPublicationModel.__table__],
+            )
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed(sessionmaker, *, consumers: tuple[str, ...]) -> OutboxEventModel:
+    now = datetime.now(UTC)
+    event = OutboxEventModel(
+        id=uuid.uuid4(),
+        event_key=f"evt-{uuid.uuid4().hex}",
+        event_name="messaging.message.created",
+        event_family="messaging",
+        aggregate_type="messaging_message",
+        aggregate_id="msg-001",
+        partition_key="msg-001",
+        occurred_at=now,
+    )
+    publications = [
+        OutboxPublicationModel(
+            id=uuid.uuid4(),
+            outbox_event_id=event.id,
+            consumer_key=consumer_key,
+            publication_status="pending",
+            next_attempt_at=now - timedelta(seconds=1),
+        )
+        for consumer_key in consumers
+    ]
+    async with sessionmaker() as session:
+        await OutboxRepository(session).create_event(event, publications)
+        await session.commit()
+    return event
+
+
+async def _claim_counting_statements(sessionmaker, lease_owner: str) -> tuple[list, int]:
+    statements: list[str] = []
+    now = datetime.now(UTC)
+
+    def listener(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    async with sessionmaker() as session:
+        engine = session.bind.sync_engine
+        sa_event.listen(engine, "before_cursor_execute", listener)
+        try:
+            claimed = await OutboxRepository(session).claim_publications(
+                consumer_key="realtime",
+                batch_size=10,
+                lease_owner=lease_owner,
+                leased_until=now + timedelta(seconds=30),
+                now=now,
+            )
+            await session.commit()
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", listener)
+    return claimed, len(statements)
+
+
+@pytest.mark.asyncio
+async def test_claim_publications_refreshes_event_statuses_in_one_pass(sessionmaker) -> None:
+    await _seed(sessionmaker, consumers=("realtime",))
+    _claimed, single = await _claim_counting_statements(sessionmaker, "lease-1")
+
+    events = [await _seed(sessionmaker, consumers=("realtime",)) for _ in range(4)]
+    claimed, batch = await _claim_counting_statements(sessionmaker, "lease-2")
+
+    assert len(claimed) == 4
+    assert batch == single
+    assert {publication.outbox_event.event_status for publication in claimed} == {"partially_published"}
+    assert {publication.outbox_event_id for publication in claimed} == {event.id for event in events}
+
+
+@pytest.mark.asyncio
+async def test_record_publication_outcomes_settles_batch_and_event_status(sessionmaker) -> None:
+    published_event = await _seed(sessionmaker, consumers=("realtime",))
+    failed_event = await _seed(sessionmaker, consumers=("realtime",))
+    now = datetime.now(UTC)
+
+    async with sessionmaker() as session:
+        claimed = await OutboxRepository(session).claim_publications(
+            consumer_key="realtime",
+            batch_size=10,
+            lease_owner="lease-1",
+            leased_until=now + timedelta(seconds=30),
+            now=now,
+        )
+        await session.commit()
+    by_event = {publication.outbox_event_id: publication.id for publication in claimed}
+
+    async with sessionmaker() as session:
+        updated = await OutboxRepository(session).record_publication_outcomes(
+            lease_owner="lease-1",
+            published=[
+                {
+                    "publication_id": by_event[published_event.id],
+                    "published_at": now,
+                    "publication_payload": {"sequence": 7},
+                }
+            ],
+            failed=[
+                {
+                    "publication_id": by_event[failed_event.id],
+                    "failed_at": now,
+                    "retry_at": now + timedelta(seconds=5),
+                    "error_message": " nats unavailable ",
+                }
+            ],
+            dead_lettered=[],
+        )
+        await session.commit()
+
+    assert updated == 2
+    async with sessionmaker() as session:
+        repo = OutboxRepository(session)
+        published = await repo.get_event_by_id(published_event.id)
+        failed = await repo.get_event_by_id(failed_event.id)
+
+    assert published.event_status == "published"
+    assert published.publications[0].publication_payload == {"sequence": 7}
+    assert published.publications[0].lease_owner is None
+    assert failed.event_status == "failed"
+    assert failed.publications[0].publication_status == "failed"
+    assert failed.publications[0].last_error == "nats unavailable"
+
+
+@pytest.mark.asyncio
+async def test_record_publication_outcomes_skips_publications_leased_by_another_owner(sessionmaker) -> None:
+    event = await _seed(sessionmaker, consumers=("realtime",))
+    now = datetime.now(UTC)
+    async with sessionmaker() as session:
+        claimed = await OutboxRepository(session).claim_publications(
+            consumer_key="realtime",
+            batch_size=10,
+            lease_owner="lease-2",
+            leased_until=now + timedelta(seconds=30),
+            now=now,
+        )
+        await session.commit()
+
+    async with sessionmaker() as session:
+        updated = await OutboxRepository(session).record_publication_outcomes(
+            lease_owner="lease-1",
+            published=[{"publication_id": claimed[0].id, "published_at": now, "publication_payload": {}}],
+            failed=[],
+            dead_lettered=[],
+        )
+        await session.commit()
+
+    assert updated == 0
+    async with sessionmaker() as session:
+        reloaded = await OutboxRepository(session).get_event_by_id(event.id)
+    assert reloaded.publications[0].publication_status == "claimed"
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import src.infrastructure.database.models  # noqa: F401 - registers the tables referenced by foreign keys
+from src.infrastructure.database.models.outbox_event_model import OutboxEventModel
+from src.infrastructure.database.models.partner_notification_feed_model import (
+    PartnerNotificationFeedItemModel,
+    PartnerNotificationFeedStateModel,
+)
+from src.infrastructure.database.models.partner_workspace_feed_event_model import PartnerWorkspaceFeedEventModel
+from src.infrastructure.database.repositories.partner_notification_feed_repository import (
+    PartnerNotificationFeedEntry,
+    PartnerNotificationFeedRepository,
+    encode_feed_cursor,
+)
+
+WORKSPACE_ID = uuid.uuid4()
+OTHER_WORKSPACE_ID = uuid.uuid4()
+ADMIN_USER_ID = uuid.uuid4()
+NOW = datetime(2026, 6, 4, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+async def sessionmaker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: PartnerNotificationFeedItemModel.metadata.create_all(
+                sync_conn,
+                tables=[
+                    PartnerNotificationFeedItemModel.__table__,
+                    PartnerNotificationFeedStateModel.__table__,
+                    PartnerWorkspaceFeedEventModel.__table__,
+                    OutboxEventModel.__table__,
+                ],
+            )
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _entry(key: str, minutes_ago: int, **overrides) -> PartnerNotificationFeedEntry:
+    values = {
+        "notification_key": key,
+        "kind": "case_reply",
+        "tone": "info",
+        "route_slug": "/cases",
+        "message": f"Update for {key}",
+        "created_at": NOW - timedelta(minutes=minutes_ago),
+    }
+    values.update(overrides)
+    return PartnerNotificationFeedEntry(**values)
+
+
+async def _synced_state(session, entries, *, source_fingerprint: str = "fp"):
+    repo = PartnerNotificationFeedRepository(session)
+    state = await repo.lock_or_create_state(partner_account_id=WORKSPACE_ID, admin_user_id=ADMIN_USER_ID)
+    await repo.sync_items(
+        state,
+        entries,
+        synced_version=state.source_version,
+        source_fingerprint=source_fingerprint,
+        synced_at=NOW,
+    )
+    return state
+
+
+@pytest.mark.asyncio
+async def test_sync_items_diffs_feed_and_pages_newest_first(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        await _synced_state(session, [_entry("case:1", 30), _entry("gone", 20)])
+        await session.commit()
+
+    async with sessionmaker() as session:
+        state = await _synced_state(
+            session,
+            [
+                _entry("case:1", 30, message="Edited"),
+                _entry("legal:1", 10, action_required=True),
+                _entry("statement:1", 5, archived_at=NOW, unread=False),
+                _entry("case:2", 1, unread=False),
+            ],
+        )
+        await session.commit()
+
+    assert (state.total_count, state.unread_count, state.action_required_count) == (3, 2, 1)
+    async with sessionmaker() as session:
+        repo = PartnerNotificationFeedRepository(session)
+        first = await repo.list_items(partner_account_id=WORKSPACE_ID, admin_user_id=ADMIN_USER_ID, limit=2)
+        rest = await repo.list_items(
+            partner_account_id=WORKSPACE_ID,
+            admin_user_id=ADMIN_USER_ID,
+            limit=2,
+            cursor=encode_feed_cursor(first[-1]),
+        )
+        archived = await repo.list_items(
+            partner_account_id=WORKSPACE_ID,
+            admin_user_id=ADMIN_USER_ID,
+            include_archived=True,
+        )
+
+    assert [item.notification_key for item in first] == ["case:2", "legal:1"]
+    assert [(item.notification_key, item.message) for item in rest] == [("case:1", "Edited")]
+    assert [item.notification_key for item in archived] == ["case:2", "statement:1", "legal:1", "case:1"]
+
+
+@pytest.mark.asyncio
+async def test_apply_read_state_adjusts_maintained_counters(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        state = await _synced_state(session, [_entry("case:1", 5, action_required=True), _entry("case:2", 1)])
+        repo = PartnerNotificationFeedRepository(session)
+        item = await repo.get_item(
+            partner_account_id=WORKSPACE_ID, admin_user_id=ADMIN_USER_ID, notification_key="case:1"
+        )
+
+        await repo.apply_read_state(state, item, read_at=NOW, archived_at=None)
+        await session.refresh(state)
+        assert (state.total_count, state.unread_count, state.action_required_count) == (2, 1, 1)
+
+        await repo.apply_read_state(state, item, read_at=NOW, archived_at=NOW)
+        await session.refresh(state)
+        assert (state.total_count, state.unread_count, state.action_required_count) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_workspace_events_mark_only_that_workspace_feed_stale(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        state = await _synced_state(session, [_entry("case:1", 5)])
+        await session.commit()
+    synced_version = state.synced_version
+
+    async with sessionmaker() as session:
+        session.add(
+            OutboxEventModel(
+                event_key=f"evt-{uuid.uuid4().hex}",
+                event_name="partner.statement.closed",
+                event_family="partner",
+                aggregate_type="partner_statement",
+                aggregate_id="statement-1",
+                partition_key="statement-1",
+                event_payload={"partner_account_id": str(WORKSPACE_ID)},
+                occurred_at=NOW,
+            )
+        )
+        session.add(
+            PartnerWorkspaceFeedEventModel(
+                workspace_id=OTHER_WORKSPACE_ID,
+                event_key=f"evt-{uuid.uuid4().hex}",
+                event_name="partner.case.replied",
+                event_family="partner",
+                aggregate_type="partner_case",
+                aggregate_id="case-1",
+                consumer_key="operational_replay",
+                subject="partner.operational_replay.partner.case.replied.v1",
+                occurred_at=NOW,
+            )
+        )
+        await session.commit()
+
+    async with sessionmaker() as session:
+        refreshed = await PartnerNotificationFeedRepository(session).get_state(
+            partner_account_id=WORKSPACE_ID,
+            admin_user_id=ADMIN_USER_ID,
+        )
+
+    assert refreshed.synced_version == synced_version
+    assert refreshed.source_version == synced_version + 1
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_writes_leave_feed_current(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        state = await _synced_state(session, [_entry("case:1", 5)])
+        await session.commit()
+    synced_version = state.synced_version
+
+    async with sessionmaker() as session:
+        session.add(
+            PartnerWorkspaceFeedEventModel(
+                workspace_id=WORKSPACE_ID,
+                event_key=f"evt-{uuid.uuid4().hex}",
+                event_name="partner.case.replied",
+                event_family="partner",
+                aggregate_type="partner_case",
+                aggregate_id="case-1",
+                consumer_key="operational_replay",
+                subject="partner.operational_replay.partner.case.replied.v1",
+                occurred_at=NOW,
+            )
+        )
+        await session.flush()
+        await session.rollback()
+        await session.commit()
+
+    async with sessionmaker() as session:
+        refreshed = await PartnerNotificationFeedRepository(session).get_state(
+            partner_account_id=WORKSPACE_ID,
+            admin_user_id=ADMIN_USER_ID,
+        )
+
+    assert refreshed.source_version == synced_version
@@ -1,10 +1,11 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import httpx
 import pytest
 from pydantic import BaseModel
 
-from src.infrastructure.remnawave.client import RemnawaveClient
+from src.infrastructure.remnawave.client import RemnawaveClient, _RetryBudget, _route_template
 from src.infrastructure.remnawave.contracts import RemnawaveDeleteResponse
 
 
@@ -167,3 +168,55 @@ async def test_get_retries_once_on_transport_error(monkeypatch):
 
     assert result == [{"uuid": "node-1"}]
     assert transport.calls == 2
+
+
+class _SlowGetTransport:
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def get(self, *_args, **_kwargs):
+        self.calls += 1
+        await self.release.wait()
+        return self._response
+
+
+@pytest.mark.unit
+async def test_concurrent_identical_gets_share_one_upstream_request(monkeypatch):
+    client = RemnawaveClient()
+    request = httpx.Request("GET", "http://test/api/users/demo")
+    transport = _SlowGetTransport(httpx.Response(200, request=request, json={"response": {"uuid": "user-1"}}))
+    monkeypatch.setattr(client, "_get_client", AsyncMock(return_value=transport))
+
+    pending = [asyncio.create_task(client.get("/users/demo")) for _ in range(5)]
+    await asyncio.sleep(0)
+    transport.release.set()
+    results = await asyncio.gather(*pending)
+
+    assert results == [{"uuid": "user-1"}] * 5
+    assert transport.calls == 1
+    assert client._inflight == {}
+
+
+@pytest.mark.unit
+async def test_retry_budget_stops_retries_once_spent(monkeypatch):
+    client = RemnawaveClient()
+    request = httpx.Request("GET", "http://test/api/nodes")
+    transport = _RetryGetTransport([httpx.ConnectError("upstream unavailable", request=request)] * 4)
+
+    client._retry_attempts = 3
+    client._retry_backoff_seconds = 0.0
+    client._retry_budget = _RetryBudget(ratio=0.0, max_tokens=1.0)
+    monkeypatch.setattr(client, "_get_client", AsyncMock(return_value=transport))
+
+    with pytest.raises(httpx.ConnectError):
+        await client.get("/nodes")
+
+    assert transport.calls == 2
+
+
+def test_route_template_collapses_ids_and_lookup_values():
+    assert _route_template("/api/users/3f2504e0-4f89-11d3-9a0c-0305e82c3301") == "/api/users/{id}"
+    assert _route_template("/api/users/by-username/alice") == "/api/users/by-username/{id}"
+    assert _route_template("/api/system/stats") == "/api/system/stats"
@@ -0,0 +1,106 @@
+import json
+from datetime import UTC, datetime
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.infrastructure.remnawave.expiry_index import (
+    EXPIRY_INDEX_KEY,
+    EXPIRY_INDEX_USERS_KEY,
+    RemnawaveExpiryIndex,
+)
+
+
+class _PipelineSpy:
+    def __init__(self, redis: "_RedisSpy") -> None:
+        self._redis = redis
+        self.commands: list[tuple] = []
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        self.commands.append(("zadd", key, mapping))
+
+    def hset(self, key: str, field: str, value: str) -> None:
+        self.commands.append(("hset", key, field, value))
+
+    def zrem(self, key: str, *members: str) -> None:
+        self.commands.append(("zrem", key, *members))
+
+    def hdel(self, key: str, *fields: str) -> None:
+        self.commands.append(("hdel", key, *fields))
+
+    async def execute(self) -> list:
+        if self._redis.fail:
+            raise RedisConnectionError("redis unavailable")
+        self._redis.executed.extend(self.commands)
+        return []
+
+
+class _RedisSpy:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.fail = fail
+        self.executed: list[tuple] = []
+
+    def pipeline(self, transaction: bool = True) -> _PipelineSpy:
+        return _PipelineSpy(self)
+
+
+async def test_apply_event_indexes_user_by_expiry() -> None:
+    redis = _RedisSpy()
+    index = RemnawaveExpiryIndex(redis)
+
+    await index.apply_event(
+        "user.modified",
+        {
+            "uuid": "user-1",
+            "status": "ACTIVE",
+            "username": "alice",
+            "telegramId": 42,
+            "expireAt": "2027-01-01T00:00:00Z",
+        },
+    )
+
+    expected_score = datetime(2027, 1, 1, tzinfo=UTC).timestamp()
+    assert redis.executed[0] == ("zadd", EXPIRY_INDEX_KEY, {"user-1": expected_score})
+    _, key, field, value = redis.executed[1]
+    assert (key, field) == (EXPIRY_INDEX_USERS_KEY, "user-1")
+    assert json.loads(value) == {
+        "uuid": "user-1",
+        "username": "alice",
+        "telegram_id": 42,
+        "expire_at": "2027-01-01T00:00:00Z",
+    }
+
+
+async def test_apply_event_drops_disabled_and_deleted_users() -> None:
+    redis = _RedisSpy()
+    index = RemnawaveExpiryIndex(redis)
+
+    await index.apply_event("user.deleted", {"uuid": "user-1"})
+    await index.apply_event(
+        "user.modified", {"uuid": "user-2", "status": "DISABLED", "expireAt": "2027-01-01T00:00:00Z"}
+    )
+
+    assert redis.executed == [
+        ("zrem", EXPIRY_INDEX_KEY, "user-1"),
+        ("hdel", EXPIRY_INDEX_USERS_KEY, "user-1"),
+        ("zrem", EXPIRY_INDEX_KEY, "user-2"),
+        ("hdel", EXPIRY_INDEX_USERS_KEY, "user-2"),
+    ]
+
+
+async def test_apply_event_ignores_non_user_events_and_redis_failures() -> None:
+    redis = _RedisSpy(fail=True)
+    index = RemnawaveExpiryIndex(redis)
+
+    await index.apply_event("node.modified", {"uuid": "node-1"})
+    await index.apply_event("user.modified", {"uuid": "user-1", "expireAt": "2027-01-01T00:00:00Z"})
+
+    assert redis.executed == []
+
+
+async def test_apply_event_keeps_user_with_revoked_subscription() -> None:
+    redis = _RedisSpy()
+    index = RemnawaveExpiryIndex(redis)
+
+    await index.apply_event("user.revoked", {"uuid": "user-1", "status": "ACTIVE", "expireAt": "2027-01-01T00:00:00Z"})
+
+    assert redis.executed[0] == ("zadd", EXPIRY_INDEX_KEY, {"user-1": datetime(2027, 1, 1, tzinfo=UTC).timestamp()})
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.application.dto.mobile_auth import SubscriptionInfoDTO, SubscriptionStatus
+from src.infrastructure.remnawave.subscription_client import (
+    SUBSCRIPTION_CACHE_TTL,
+    SUBSCRIPTION_NEGATIVE_CACHE_TTL,
+    CachedSubscriptionClient,
+)
+
+
+class _FakeCache:
+    def __init__(self, entries: dict | None = None):
+        self.entries = dict(entries or {})
+        self.ttls: dict[str, int] = {}
+        self.mget_calls = 0
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def get_many(self, keys):
+        self.mget_calls += 1
+        return [self.entries.get(key) for key in keys]
+
+    async def set_many(self, values):
+        for key, (value, ttl) in values.items():
+            self.entries[key] = value
+            self.ttls[key] = ttl
+
+    async def add(self, key, value, ttl=300):
+        if key in self.entries:
+            return False
+        self.entries[key] = value
+        return True
+
+    async def delete(self, key):
+        self.entries.pop(key, None)
+
+
+class _FakeInner:
+    def __init__(self, dtos: dict[str, SubscriptionInfoDTO]):
+        self._dtos = dtos
+        self.calls: list[str] = []
+
+    async def get_subscription(self, remnawave_uuid: str) -> SubscriptionInfoDTO:
+        self.calls.append(remnawave_uuid)
+        return self._dtos.get(remnawave_uuid, SubscriptionInfoDTO(status=SubscriptionStatus.NONE))
+
+
+def _active(plan_name: str = "VPN") -> SubscriptionInfoDTO:
+    return SubscriptionInfoDTO(
+        status=SubscriptionStatus.ACTIVE,
+        plan_name=plan_name,
+        expires_at=datetime.now(UTC) + timedelta(days=30),
+        traffic_limit_bytes=10,
+        used_traffic_bytes=1,
+    )
+
+
+@pytest.mark.unit
+async def test_get_subscriptions_reads_hits_with_one_mget_and_fetches_only_misses():
+    cached = _active("Cached")
+    cache = _FakeCache()
+    inner = _FakeInner({"user-b": _active("Fresh")})
+    client = CachedSubscriptionClient(inner, cache)  # type: ignore[arg-type]
+    await client._store({"user-a": cached})
+
+    result = await client.get_subscriptions(["user-a", "user-b", "user-c", "user-a"])
+
+    assert list(result) == ["user-a", "user-b", "user-c"]
+    assert result["user-a"] == cached
+    assert result["user-b"].plan_name == "Fresh"
+    assert result["user-c"].status == SubscriptionStatus.NONE
+    assert cache.mget_calls == 1
+    assert inner.calls == ["user-b", "user-c"]
+    assert cache.ttls["subscription:user-b"] == SUBSCRIPTION_CACHE_TTL
+    assert cache.ttls["subscription:user-c"] == SUBSCRIPTION_NEGATIVE_CACHE_TTL
+
+
+@pytest.mark.unit
+async def test_hit_past_refresh_point_is_served_and_refreshed_in_background():
+    stale = _active("Old")
+    cache = _FakeCache()
+    inner = _FakeInner({"user-a": _active("New")})
+    client = CachedSubscriptionClient(inner, cache)  # type: ignore[arg-type]
+    await client._store({"user-a": stale})
+    cache.entries["subscription:user-a"]["r"] = time.time() - 1
+
+    result = await client.get_subscription("user-a")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert result.plan_name == "Old"
+    assert inner.calls == ["user-a"]
+    assert cache.entries["subscription:user-a"]["v"]["plan_name"] == "New"
+
+
+@pytest.mark.unit
+async def test_invalidate_during_refresh_ahead_keeps_stale_value_out_of_cache():
+    cache = _FakeCache()
+    fetch_started = asyncio.Event()
+    release_fetch = asyncio.Event()
+
+    class _SlowInner(_FakeInner):
+        async def get_subscription(self, remnawave_uuid: str) -> SubscriptionInfoDTO:
+            fetch_started.set()
+            await release_fetch.wait()
+            return await super().get_subscription(remnawave_uuid)
+
+    client = CachedSubscriptionClient(_SlowInner({"user-a": _active("Before purchase")}), cache)  # type: ignore[arg-type]
+    refresh = asyncio.create_task(client._refresh("user-a"))
+    await fetch_started.wait()
+
+    await client.invalidate("user-a")
+    release_fetch.set()
+    await refresh
+
+    assert "subscription:user-a" not in cache.entries
+
+
+@pytest.mark.unit
+async def test_legacy_double_encoded_entry_is_still_readable():
+    cache = _FakeCache({"subscription:user-a": '{"status": "active", "plan_name": "VPN", "expires_at": null}'})
+    inner = _FakeInner({"user-a": _active()})
+    client = CachedSubscriptionClient(inner, cache)  # type: ignore[arg-type]
+
+    result = await client.get_subscription("user-a")
+
+    assert result.status == SubscriptionStatus.ACTIVE
+    assert result.plan_name == "VPN"
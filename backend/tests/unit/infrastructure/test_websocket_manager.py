@@ -0,0 +1,111 @@
+"""Unit tests for WebSocketManager fan-out and the Redis backplane."""
+
+import asyncio
+import json
+
+import fakeredis
+from starlette.websockets import WebSocketState
+
+from src.infrastructure.messaging.websocket_manager import WebSocketManager
+
+
+class _FakeWebSocket:
+    def __init__(self, *, block: asyncio.Event | None = None) -> None:
+        self.application_state = WebSocketState.CONNECTED
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+        self._block = block
+
+    async def send_text(self, message: str) -> None:
+        if self._block is not None:
+            await self._block.wait()
+        self.sent.append(json.loads(message))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def _drain() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_slow_client_does_not_stall_channel() -> None:
+    manager = WebSocketManager(queue_size=4)
+    release = asyncio.Event()
+    slow = _FakeWebSocket(block=release)
+    fast = _FakeWebSocket()
+    await manager.connect(slow, "events")
+    await manager.connect(fast, "events")
+
+    await manager.broadcast("events", {"n": 1})
+    await manager.broadcast("events", {"n": 2})
+    await _drain()
+
+    assert fast.sent == [{"n": 1}, {"n": 2}]
+    assert slow.sent == []
+
+    release.set()
+    await _drain()
+    assert slow.sent == [{"n": 1}, {"n": 2}]
+    manager.disconnect_all(slow)
+    manager.disconnect_all(fast)
+
+
+async def test_full_queue_drops_oldest_message() -> None:
+    manager = WebSocketManager(queue_size=2, overflow_policy="drop_oldest")
+    release = asyncio.Event()
+    ws = _FakeWebSocket(block=release)
+    await manager.connect(ws, "events")
+
+    await manager.broadcast("events", {"n": 1})
+    await _drain()  # writer takes n=1 and blocks on send
+    for n in (2, 3, 4):
+        await manager.broadcast("events", {"n": n})
+
+    release.set()
+    await _drain()
+    assert ws.sent == [{"n": 1}, {"n": 3}, {"n": 4}]
+    manager.disconnect_all(ws)
+
+
+async def test_full_queue_disconnects_with_disconnect_policy() -> None:
+    manager = WebSocketManager(queue_size=1, overflow_policy="disconnect")
+    ws = _FakeWebSocket(block=asyncio.Event())
+    await manager.connect(ws, "events")
+
+    await manager.broadcast("events", {"n": 1})
+    await _drain()
+    await manager.broadcast("events", {"n": 2})
+    await manager.broadcast("events", {"n": 3})
+    await _drain()
+
+    assert manager.active_connections == 0
+    assert ws.closed_with == 1013
+
+
+async def test_backplane_relays_broadcast_to_other_instance() -> None:
+    server = fakeredis.FakeServer()
+    publisher = WebSocketManager()
+    subscriber = WebSocketManager()
+    local = _FakeWebSocket()
+    remote = _FakeWebSocket()
+    await publisher.connect(local, "events")
+    await subscriber.connect(remote, "events")
+    await publisher.start_backplane(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    await subscriber.start_backplane(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    await asyncio.sleep(0.05)
+
+    await publisher.broadcast("events", {"type": "user.updated"})
+    for _ in range(20):
+        if remote.sent:
+            break
+        await asyncio.sleep(0.01)
+
+    assert local.sent == [{"type": "user.updated"}]
+    assert remote.sent == [{"type": "user.updated"}]
+
+    await publisher.stop_backplane()
+    await subscriber.stop_backplane()
+    publisher.disconnect_all(local)
+    subscriber.disconnect_all(remote)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from src.presentation.api.v1.admin import exports as export_routes
+
+
+class _FakeRedis:
+    def __init__(self, meta: dict | None) -> None:
+        self._meta = meta
+
+    async def get(self, key: str):
+        assert key == "cybervpn:export:job-1"
+        return json.dumps(self._meta) if self._meta is not None else None
+
+
+def _meta(*paths) -> dict:
+    return {"status": "running", "files": [{"file_path": str(path), "rows": 1, "bytes": 1} for path in paths]}
+
+
+def test_download_export_file_serves_byte_ranges(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(export_routes.settings, "export_dir", str(tmp_path))
+    chunk = tmp_path / "users_job-1.part0001.ndjson.gz"
+    chunk.write_bytes(b"0123456789")
+    redis_client = _FakeRedis(_meta(chunk))
+
+    async def endpoint(_request):
+        return await export_routes.download_export_file("job-1", 1, redis_client=redis_client, _=None)
+
+    async def main():
+        app = Starlette(routes=[Route("/download", endpoint)])
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/download", headers={"Range": "bytes=2-5"})
+
+    response = asyncio.run(main())
+
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+    assert response.headers["content-type"] == "application/gzip"
+
+
+@pytest.mark.parametrize("part", [0, 2])
+def test_download_export_file_rejects_unknown_parts(tmp_path, monkeypatch, part) -> None:
+    monkeypatch.setattr(export_routes.settings, "export_dir", str(tmp_path))
+    chunk = tmp_path / "users_job-1.part0001.csv.gz"
+    chunk.write_bytes(b"x")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(export_routes.download_export_file("job-1", part, redis_client=_FakeRedis(_meta(chunk)), _=None))
+
+    assert exc_info.value.status_code == 404
+
+
+def test_download_export_file_refuses_paths_outside_export_dir(tmp_path, monkeypatch) -> None:
+    export_dir = tmp_path / "exports"
+    export_dir.mkdir()
+    monkeypatch.setattr(export_routes.settings, "export_dir", str(export_dir))
+    outside = tmp_path / "secret.csv"
+    outside.write_bytes(b"x")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(export_routes.download_export_file("job-1", 1, redis_client=_FakeRedis(_meta(outside)), _=None))
+
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,56 @@
+"""RateLimitMiddleware wired to the Lua sliding-window limiter on a fake Redis."""
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.presentation.middleware.rate_limit import RateLimitMiddleware
+
+pytest.importorskip("lupa")
+
+
+def _app(monkeypatch: pytest.MonkeyPatch, client: fakeredis.FakeAsyncRedis, **limits: int) -> FastAPI:
+    RateLimitMiddleware._circuit_breaker = None
+    monkeypatch.setattr("src.presentation.middleware.rate_limit.get_redis_pool", lambda: object())
+    monkeypatch.setattr("src.presentation.middleware.rate_limit.redis.Redis", lambda connection_pool: client)
+
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, requests_per_minute=100, window_seconds=60, fail_open=False, **limits)
+
+    @app.post("/api/v1/payments/checkout/quote")
+    async def quote() -> dict[str, str]:
+        return {"status": "quoted"}
+
+    @app.get("/api/v1/status")
+    async def status() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+async def test_middleware_enforces_budget_through_lua_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    app = _app(monkeypatch, redis_client, payment_write_requests_per_minute=2)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="https://backend") as client:
+        responses = [await client.post("/api/v1/payments/checkout/quote") for _ in range(3)]
+        other_bucket = await client.get("/api/v1/status")
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[2].headers["Retry-After"] == "60"
+    assert other_bucket.status_code == 200
+    keys = await redis_client.keys("*")
+    assert keys
+    assert {await redis_client.type(key) for key in keys} == {"hash"}
+
+
+async def test_middleware_fails_closed_when_redis_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = fakeredis.FakeServer()
+    server.connected = False
+    app = _app(monkeypatch, fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="https://backend") as client:
+        response = await client.get("/api/v1/status")
+
+    assert response.status_code == 503
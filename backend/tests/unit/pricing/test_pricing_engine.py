@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from src.domain.services.pricing_engine import (
+    CatalogItem,
+    CatalogOverride,
+    EffectiveCatalogResolver,
+    PricingContext,
+    compile_overrides,
+)
+
+
+def _item(key: str = "plus_30") -> CatalogItem:
+    return CatalogItem(key=key, plan_code="plus", billing_period_days=30, prices={"USD": "10.00"})
+
+
+def test_overrides_apply_in_fallback_order_then_declaration_order() -> None:
+    overrides = [
+        CatalogOverride(key="promo", scope="promo", target="spring", prices={"USD": "5.00"}),
+        CatalogOverride(key="country", scope="country", targets=("de", "AT"), prices={"USD": "8.00"}),
+        CatalogOverride(key="global-item", scope="global", item_key="plus_30", prices={"USD": "9.00"}),
+        CatalogOverride(key="global-all", scope="global", prices={"USD": "9.50"}),
+        CatalogOverride(key="other-country", scope="country", target="US", prices={"USD": "1.00"}),
+        CatalogOverride(key="untargeted", scope="channel", prices={"USD": "2.00"}),
+    ]
+    context = PricingContext(currency_code="usd", country_code="de", promo_code="SPRING")
+
+    catalog = EffectiveCatalogResolver().resolve(
+        context=context, items=[_item(), _item("plus_365")], overrides=overrides
+    )
+
+    by_key = {item.key: item for item in catalog.items}
+    assert by_key["plus_30"].applied_override_keys == ("global-item", "global-all", "country", "promo")
+    assert by_key["plus_365"].applied_override_keys == ("global-all", "country", "promo")
+    assert by_key["plus_30"].price == Decimal("5.00")
+
+
+def test_compiled_overrides_resolve_like_the_plain_sequence() -> None:
+    overrides = [
+        CatalogOverride(key="segment", scope="segment", target="Students", prices={"USD": "4.00"}),
+        CatalogOverride(key="hide", scope="channel", target="miniapp", hidden=True),
+    ]
+    compiled = compile_overrides(overrides)
+    resolver = EffectiveCatalogResolver()
+
+    for context in (
+        PricingContext(currency_code="USD", segment="students"),
+        PricingContext(currency_code="USD", channel="miniapp"),
+        PricingContext(currency_code="USD"),
+    ):
+        plain = resolver.resolve(context=context, items=[_item()], overrides=overrides)
+        assert resolver.resolve(context=context, items=[_item()], overrides=compiled) == plain
@@ -8,6 +8,7 @@ from uuid import uuid4
 import pytest
 
 from src.application.use_cases.public_catalog import (
+    PublicCatalogCache,
     ResolvePublicCatalogContextUseCase,
     ResolvePublicCommercialCatalogUseCase,
 )
@@ -158,3 +159,55 @@ async def test_catalog_context_returns_payment_method_availability(monkeypatch:
     assert context.payment_methods.available_methods == ("cryptobot", "telegram_stars")
     assert context.payment_methods.cryptobot is True
     assert context.payment_methods.telegram_stars is True
+
+
+class CountingPlanRepo(FakePlanRepo):
+    def __init__(self, plans):
+        super().__init__(plans)
+        self.calls = 0
+
+    async def list_catalog(self, **kwargs):
+        self.calls += 1
+        return await super().list_catalog(**kwargs)
+
+
+class FakeGenerationRedis:
+    def __init__(self):
+        self.values: dict[str, int] = {}
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return None if value is None else str(value)
+
+    async def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+@pytest.mark.asyncio
+async def test_cached_public_catalog_is_served_without_repository_reads_until_invalidated() -> None:
+    plan_repo = CountingPlanRepo([_plan(name="plus_30", duration_days=30)])
+    cache = PublicCatalogCache(ttl_seconds=60, max_entries=16, redis_client=FakeGenerationRedis())
+    use_case = ResolvePublicCommercialCatalogUseCase(
+        None,
+        plan_repo=plan_repo,
+        addon_repo=FakeAddonRepo(),
+        offer_repo=FakeOfferRepo(),
+        pricebook_repo=FakePricebookRepo(),
+        cache=cache,
+    )
+    signals = CommercialContextSignals(explicit_currency_code="USD", channel_key="web")
+
+    first = await use_case.execute(signals=signals, channel="web")
+    second = await use_case.execute(signals=signals, channel="web")
+
+    assert plan_repo.calls == 1
+    assert second.plans is first.plans
+    assert second.cache_key == first.cache_key
+
+    plan_repo.plans = [_plan(name="plus_30", duration_days=30, price_usd=Decimal("9.00"))]
+    await cache.invalidate()
+    refreshed = await use_case.execute(signals=signals, channel="web")
+
+    assert plan_repo.calls == 2
+    assert refreshed.plans[0].billing_periods[0].display_price.amount == "9.00"
@@ -103,9 +103,15 @@ class Settings(BaseSettings):
     # Cleanup Configuration
     cleanup_audit_retention_days: int = 90
     cleanup_webhook_retention_days: int = 30
+    cleanup_delete_batch_size: int = 5000  # Rows per bounded DELETE transaction
+    cleanup_delete_pause_seconds: float = 0.2  # Pause between bounded DELETE batches
+    cleanup_delete_max_batches: int = 200  # Batches per run; the rest waits for the next run
+    cleanup_partitions_ahead: int = 3  # Future log partitions kept pre-created
 
     # Bulk Operations
     bulk_batch_size: int = 50
+    export_batch_size: int = 5000  # Rows fetched per server-side cursor round trip
+    export_chunk_rows: int = 1_000_000  # Rows per export chunk file; progress is saved after each chunk
 
     # Monitoring
     metrics_enabled: bool = True
@@ -123,6 +123,25 @@ STAGE1_PROVISIONING_RETRY_CLAIMS_TOTAL = Counter(
     ["result"],
 )
 
+# Notification queue delivery metrics
+NOTIFICATION_QUEUE_DELIVERIES_TOTAL = Counter(
+    "cybervpn_notification_queue_deliveries_total",
+    "Notification queue delivery outcomes",
+    ["result"],  # result=sent|failed|deferred
+)
+
+NOTIFICATION_QUEUE_BATCH_DURATION = Histogram(
+    "cybervpn_notification_queue_batch_duration_seconds",
+    "Time to deliver and persist one claimed notification batch",
+    buckets=[0.5, 1, 2, 5, 10, 30, 60, 120],
+)
+
+NOTIFICATION_QUEUE_THROUGHPUT = Gauge(
+    "cybervpn_notification_queue_throughput_per_second",
+    "Messages delivered per second in the last notification batch",
+    multiprocess_mode="livemax" if MULTIPROC_ENABLED else "all",
+)
+
 # OTP Email metrics (for Grafana monitoring per PRD requirements)
 OTP_EMAILS_SENT = Counter(
     "cybervpn_otp_emails_sent_total",
@@ -20,10 +20,12 @@ from src.models.notification_queue import NotificationQueueModel
 from src.models.payment import PaymentModel
 from src.models.refresh_token import RefreshTokenModel
 from src.models.server_geolocation import ServerGeolocationModel
+from src.models.stats_rollup import AuditLogHourlyRollupModel, PaymentHourlyRollupModel, StatsRollupWatermarkModel
 from src.models.subscription_plan import SubscriptionPlanModel
 from src.models.webhook_log import WebhookLogModel
 
 __all__ = [
+    "AuditLogHourlyRollupModel",
     "AuditLogModel",
     "BroadcastCampaignModel",
     "BroadcastCampaignRecipientModel",
@@ -33,11 +35,13 @@ __all__ = [
     "MessagingOutboxEventModel",
     "MessagingOutboxPublicationModel",
     "NotificationQueueModel",
+    "PaymentHourlyRollupModel",
     "PaymentModel",
     "RefreshTokenModel",
     "ServerGeolocationModel",
     "SiteNotificationDeliveryModel",
     "SiteNotificationModel",
+    "StatsRollupWatermarkModel",
     "SubscriptionPlanModel",
     "WebhookLogModel",
 ]
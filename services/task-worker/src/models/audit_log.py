@@ -18,6 +18,8 @@ class AuditLogModel(Base):
 
     Tracks all administrative actions with old/new values, IP address,
     and user agent for compliance and debugging.
+
+    Range-partitioned by month on ``created_at``; see ``src.services.table_retention``.
     """
 
     __tablename__ = "audit_logs"
@@ -0,0 +1,53 @@
+"""Hourly rollups of audit-log and payment history (synced with backend migration)."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.session import Base
+
+
+class AuditLogHourlyRollupModel(Base):
+    """
+    Per-hour counts of the audit-log events used by daily business metrics.
+
+    Rows are recomputed from ``audit_logs`` with ``GROUP BY`` by the stats
+    rollup refresh, never edited in place.
+    """
+
+    __tablename__ = "audit_log_hourly_rollups"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    new_users: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    churned_users: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    admin_ops: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class PaymentHourlyRollupModel(Base):
+    """
+    Per-hour count and amount of completed payments by currency, provider and plan.
+    """
+
+    __tablename__ = "payment_hourly_rollups"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    currency: Mapped[str] = mapped_column(String(10), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(20), primary_key=True)
+    plan_name: Mapped[str] = mapped_column(String(120), primary_key=True)
+    payment_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    amount_total: Mapped[float] = mapped_column(Numeric(20, 8), nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class StatsRollupWatermarkModel(Base):
+    """
+    High-water mark of the source rows already folded into a rollup table.
+    """
+
+    __tablename__ = "stats_rollup_watermarks"
+
+    rollup_name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    watermark_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -19,6 +19,8 @@ class WebhookLogModel(Base):
     Stores allowlisted webhook metadata from payment providers and other
     services, including non-replayable signature fingerprints, validation status,
     and processing results.
+
+    Range-partitioned by day on ``created_at``; see ``src.services.table_retention``.
     """
 
     __tablename__ = "webhook_logs"
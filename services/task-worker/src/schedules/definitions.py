@@ -35,6 +35,7 @@ from src.utils.constants import (
     SCHEDULE_HELIX_HEALTH,
     SCHEDULE_HELIX_ROLLOUTS,
     SCHEDULE_HOURLY_BANDWIDTH,
+    SCHEDULE_PARTITION_MAINTENANCE,
     SCHEDULE_PARTNER_BOT_PROVISIONING,
     SCHEDULE_PAYMENT_VERIFY,
     SCHEDULE_PUBLIC_NETWORK_DPI_SCORE,
@@ -44,6 +45,7 @@ from src.utils.constants import (
     SCHEDULE_SERVICES_HEALTH,
     SCHEDULE_STAGE1_PAYMENT_RECONCILIATION,
     SCHEDULE_STAGE1_PROVISIONING_RETRY,
+    SCHEDULE_STATS_ROLLUPS,
     SCHEDULE_SUBSCRIPTION_CHECK,
     SCHEDULE_SYNC_GEOLOCATIONS,
     SCHEDULE_SYNC_NODE_CONFIGS,
@@ -200,6 +202,10 @@ from src.tasks.analytics.financial_stats import aggregate_financial_stats
 
 aggregate_financial_stats = _schedule_task(aggregate_financial_stats, [{"cron": SCHEDULE_FINANCIAL_STATS}])
 
+from src.tasks.analytics.stats_rollups import refresh_stats_rollups
+
+refresh_stats_rollups = _schedule_task(refresh_stats_rollups, [{"cron": SCHEDULE_STATS_ROLLUPS}])
+
 from src.tasks.analytics.refresh_growth_reporting import refresh_growth_reporting_rollups
 
 refresh_growth_reporting_rollups = _schedule_task(
@@ -296,6 +302,10 @@ from src.tasks.cleanup.notifications import cleanup_notifications
 
 cleanup_notifications = _schedule_task(cleanup_notifications, [{"cron": SCHEDULE_CLEANUP_NOTIFICATIONS}])
 
+from src.tasks.cleanup.partitions import manage_log_partitions
+
+manage_log_partitions = _schedule_task(manage_log_partitions, [{"cron": SCHEDULE_PARTITION_MAINTENANCE}])
+
 from src.tasks.cleanup.cache import cleanup_cache
 
 cleanup_cache = _schedule_task(cleanup_cache, [{"cron": SCHEDULE_CLEANUP_CACHE}])
@@ -0,0 +1,306 @@
+"""Redis time-series store for per-node bandwidth samples and their rollups.
+
+Every node has one sorted set of raw samples instead of one key per node per
+collection run, so writes, rollups and retention are a handful of pipelined
+commands regardless of how many samples a node has accumulated:
+
+- ``BANDWIDTH_SERIES_KEY`` (ZSET): ``"{ts}:{up}:{down}"`` scored by ``ts``
+- ``BANDWIDTH_ROLLUP_KEY`` (ZSET, per resolution): compact JSON bucket
+  ``[start, sum, avg, max, min, p95, samples, up, down]`` scored by ``start``
+- ``BANDWIDTH_NODES_KEY`` (ZSET): node uuid -> last sample timestamp, used to
+  find nodes without ``SCAN`` and to drop series of decommissioned nodes
+
+Retention is enforced on write with ``ZREMRANGEBYSCORE``, so series never need
+a separate sweep; ``prune`` only removes nodes that stopped reporting.
+"""
+
+import json
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import structlog
+from redis.asyncio import Redis
+
+from src.utils.constants import (
+    BANDWIDTH_NODES_KEY,
+    BANDWIDTH_RAW_RETENTION_SECONDS,
+    BANDWIDTH_RESOLUTIONS,
+    BANDWIDTH_ROLLUP_KEY,
+    BANDWIDTH_SERIES_KEY,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BandwidthSample:
+    """Single raw bandwidth sample of a node."""
+
+    ts: int
+    up: int
+    down: int
+
+    @property
+    def total(self) -> int:
+        """Upload plus download bytes."""
+        return self.up + self.down
+
+
+@dataclass(frozen=True)
+class BandwidthBucket:
+    """Aggregate of the raw samples of one node within one rollup bucket."""
+
+    start: int
+    sum: int
+    avg: int
+    max: int
+    min: int
+    p95: int
+    samples: int
+    up: int
+    down: int
+
+    def to_dict(self) -> dict[str, int]:
+        """Return the bucket as a JSON-serializable dictionary."""
+        return {
+            "start": self.start,
+            "sum": self.sum,
+            "avg": self.avg,
+            "max": self.max,
+            "min": self.min,
+            "p95": self.p95,
+            "samples": self.samples,
+            "up": self.up,
+            "down": self.down,
+        }
+
+
+def percentile(values: list[int], fraction: float) -> int:
+    """Return the nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * fraction) - 1, 0)]
+
+
+def summarize(start: int, samples: list[BandwidthSample]) -> BandwidthBucket | None:
+    """Aggregate raw samples into a bucket, or None if there are no samples."""
+    if not samples:
+        return None
+    totals = [sample.total for sample in samples]
+    total = sum(totals)
+    return BandwidthBucket(
+        start=start,
+        sum=total,
+        avg=total // len(totals),
+        max=max(totals),
+        min=min(totals),
+        p95=percentile(totals, 0.95),
+        samples=len(totals),
+        up=sum(sample.up for sample in samples),
+        down=sum(sample.down for sample in samples),
+    )
+
+
+def _parse_sample(member: str) -> BandwidthSample | None:
+    try:
+        ts, up, down = member.split(":")
+        return BandwidthSample(ts=int(ts), up=int(up), down=int(down))
+    except (ValueError, AttributeError):
+        logger.warning("invalid_bandwidth_sample", value=member)
+        return None
+
+
+def _parse_bucket(member: str) -> BandwidthBucket | None:
+    try:
+        return BandwidthBucket(*(int(value) for value in json.loads(member)))
+    except (ValueError, TypeError):
+        logger.warning("invalid_bandwidth_bucket", value=member)
+        return None
+
+
+class BandwidthSeries:
+    """Per-node bandwidth time series with 1h/1d rollups.
+
+    Args:
+        redis: AsyncIO Redis client (``decode_responses=True``)
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        """Initialize the series store with a Redis client."""
+        self._redis = redis
+
+    async def record(self, timestamp: int, samples: dict[str, tuple[int, int]]) -> int:
+        """Append one sample per node and trim expired raw samples in one pipeline.
+
+        Re-recording the same timestamp replaces the earlier sample.
+
+        Args:
+            timestamp: Unix timestamp of the collection run
+            samples: Node uuid -> ``(bytes_up, bytes_down)``
+
+        Returns:
+            Number of samples written
+        """
+        if not samples:
+            return 0
+
+        cutoff = timestamp - BANDWIDTH_RAW_RETENTION_SECONDS
+        pipe = self._redis.pipeline(transaction=False)
+        for node_uuid, (bytes_up, bytes_down) in samples.items():
+            key = BANDWIDTH_SERIES_KEY.format(node_uuid=node_uuid)
+            pipe.zremrangebyscore(key, timestamp, timestamp)
+            pipe.zadd(key, {f"{timestamp}:{int(bytes_up)}:{int(bytes_down)}": timestamp})
+            pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+        pipe.zadd(BANDWIDTH_NODES_KEY, dict.fromkeys(samples, timestamp))
+        await pipe.execute()
+        return len(samples)
+
+    async def node_uuids(self) -> list[str]:
+        """Return every node with at least one retained sample or bucket."""
+        return list(await self._redis.zrange(BANDWIDTH_NODES_KEY, 0, -1))
+
+    async def samples(
+        self, node_uuids: Iterable[str], start: int, end: int
+    ) -> dict[str, list[BandwidthSample]]:
+        """Read raw samples in ``[start, end)`` for many nodes with one pipeline.
+
+        Args:
+            node_uuids: Nodes to read
+            start: Inclusive unix timestamp
+            end: Exclusive unix timestamp
+
+        Returns:
+            Node uuid -> samples ordered by timestamp
+        """
+        nodes = list(node_uuids)
+        if not nodes:
+            return {}
+        pipe = self._redis.pipeline(transaction=False)
+        for node_uuid in nodes:
+            pipe.zrangebyscore(BANDWIDTH_SERIES_KEY.format(node_uuid=node_uuid), start, f"({end}")
+        results = await pipe.execute()
+        return {
+            node_uuid: [sample for member in members if (sample := _parse_sample(member)) is not None]
+            for node_uuid, members in zip(nodes, results, strict=True)
+        }
+
+    async def rollup(
+        self, resolution: str, bucket_start: int, node_uuids: Iterable[str] | None = None
+    ) -> dict[str, BandwidthBucket]:
+        """Aggregate raw samples of one bucket and store the result per node.
+
+        Reads all nodes with one ``ZRANGEBYSCORE`` pipeline and writes every
+        bucket (replacing a previous rollup of the same bucket) with another.
+
+        Args:
+            resolution: ``"1h"`` or ``"1d"``
+            bucket_start: Unix timestamp aligned to the resolution
+            node_uuids: Nodes to roll up, defaults to every known node
+
+        Returns:
+            Node uuid -> bucket for nodes that had samples
+        """
+        step, retention = BANDWIDTH_RESOLUTIONS[resolution]
+        nodes = await self.node_uuids() if node_uuids is None else list(node_uuids)
+        samples = await self.samples(nodes, bucket_start, bucket_start + step)
+
+        buckets = {
+            node_uuid: bucket
+            for node_uuid, node_samples in samples.items()
+            if (bucket := summarize(bucket_start, node_samples)) is not None
+        }
+        if not buckets:
+            return buckets
+
+        cutoff = bucket_start - retention
+        pipe = self._redis.pipeline(transaction=False)
+        for node_uuid, bucket in buckets.items():
+            key = BANDWIDTH_ROLLUP_KEY.format(resolution=resolution, node_uuid=node_uuid)
+            member = json.dumps(list(bucket.to_dict().values()), separators=(",", ":"))
+            pipe.zremrangebyscore(key, bucket_start, bucket_start)
+            pipe.zadd(key, {member: bucket_start})
+            pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+        await pipe.execute()
+        return buckets
+
+    async def buckets(
+        self, resolution: str, start: int, end: int, node_uuids: Iterable[str] | None = None
+    ) -> dict[str, list[BandwidthBucket]]:
+        """Query stored rollup buckets in ``[start, end)`` for dashboards.
+
+        Args:
+            resolution: ``"1h"`` or ``"1d"``
+            start: Inclusive unix timestamp
+            end: Exclusive unix timestamp
+            node_uuids: Nodes to read, defaults to every known node
+
+        Returns:
+            Node uuid -> buckets ordered by start
+        """
+        if resolution not in BANDWIDTH_RESOLUTIONS:
+            raise ValueError(f"Unknown bandwidth resolution: {resolution}")
+        nodes = await self.node_uuids() if node_uuids is None else list(node_uuids)
+        if not nodes:
+            return {}
+        pipe = self._redis.pipeline(transaction=False)
+        for node_uuid in nodes:
+            key = BANDWIDTH_ROLLUP_KEY.format(resolution=resolution, node_uuid=node_uuid)
+            pipe.zrangebyscore(key, start, f"({end}")
+        results = await pipe.execute()
+        return {
+            node_uuid: [bucket for member in members if (bucket := _parse_bucket(member)) is not None]
+            for node_uuid, members in zip(nodes, results, strict=True)
+        }
+
+    async def fleet_totals(
+        self, resolution: str, start: int, end: int, node_uuids: Iterable[str] | None = None
+    ) -> list[dict[str, int]]:
+        """Sum per-node buckets into fleet-wide totals per bucket start.
+
+        Args:
+            resolution: ``"1h"`` or ``"1d"``
+            start: Inclusive unix timestamp
+            end: Exclusive unix timestamp
+            node_uuids: Nodes to include, defaults to every known node
+
+        Returns:
+            Ordered list of ``{"start", "sum", "up", "down", "nodes"}`` dictionaries
+        """
+        totals: dict[int, dict[str, int]] = {}
+        for node_buckets in (await self.buckets(resolution, start, end, node_uuids)).values():
+            for bucket in node_buckets:
+                entry = totals.setdefault(
+                    bucket.start, {"start": bucket.start, "sum": 0, "up": 0, "down": 0, "nodes": 0}
+                )
+                entry["sum"] += bucket.sum
+                entry["up"] += bucket.up
+                entry["down"] += bucket.down
+                entry["nodes"] += 1
+        return [totals[bucket_start] for bucket_start in sorted(totals)]
+
+    async def prune(self, now: float | None = None) -> int:
+        """Drop every series of nodes that stopped reporting past the longest retention.
+
+        Args:
+            now: Unix timestamp, defaults to now
+
+        Returns:
+            Number of nodes removed
+        """
+        longest = max(retention for _step, retention in BANDWIDTH_RESOLUTIONS.values())
+        cutoff = (now if now is not None else time.time()) - longest
+        stale = list(await self._redis.zrangebyscore(BANDWIDTH_NODES_KEY, "-inf", f"({cutoff}"))
+        if not stale:
+            return 0
+
+        pipe = self._redis.pipeline(transaction=True)
+        for node_uuid in stale:
+            pipe.delete(BANDWIDTH_SERIES_KEY.format(node_uuid=node_uuid))
+            for resolution in BANDWIDTH_RESOLUTIONS:
+                pipe.delete(BANDWIDTH_ROLLUP_KEY.format(resolution=resolution, node_uuid=node_uuid))
+        pipe.zrem(BANDWIDTH_NODES_KEY, *stale)
+        await pipe.execute()
+        return len(stale)
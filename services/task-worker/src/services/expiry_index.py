@@ -0,0 +1,174 @@
+"""Redis sorted-set index of Remnawave users keyed by subscription expiry.
+
+The index lets ``disable_expired_users`` find due users with a single
+``ZRANGEBYSCORE`` instead of downloading the whole fleet every run:
+
+- ``EXPIRY_INDEX_KEY`` (ZSET): user uuid -> expiry unix timestamp
+- ``EXPIRY_INDEX_USERS_KEY`` (HASH): user uuid -> compact JSON with the fields
+  needed to disable and notify (username, telegram_id, expire_at)
+- ``EXPIRY_INDEX_SYNCED_AT_KEY``: unix timestamp of the last full rebuild
+
+Only users that can still expire (have ``expire_at`` and are not disabled) are
+indexed. The backend Remnawave webhook handler and ``sync_user_stats`` keep the
+index current; a full rebuild also happens whenever the index is stale.
+"""
+
+import json
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+import structlog
+from redis.asyncio import Redis
+
+from src.utils.constants import EXPIRY_INDEX_KEY, EXPIRY_INDEX_SYNCED_AT_KEY, EXPIRY_INDEX_USERS_KEY
+
+logger = structlog.get_logger(__name__)
+
+
+def expire_at_timestamp(expire_at: Any) -> float | None:
+    """Parse a Remnawave ``expire_at`` value into a unix timestamp.
+
+    Args:
+        expire_at: ISO-8601 string (``Z`` suffix allowed) or None
+
+    Returns:
+        Unix timestamp, or None if the value is missing or malformed
+    """
+    if not expire_at:
+        return None
+    try:
+        return datetime.fromisoformat(str(expire_at).replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+class ExpiryIndex:
+    """Sorted-set expiry index shared by the subscription tasks.
+
+    Args:
+        redis: AsyncIO Redis client (``decode_responses=True``)
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        """Initialize the index with a Redis client."""
+        self._redis = redis
+
+    async def upsert_users(self, users: Iterable[dict]) -> int:
+        """Write a batch of normalized users into the index with one pipeline.
+
+        Users without an expiry or with ``status == "disabled"`` are removed
+        from the index instead.
+
+        Args:
+            users: Normalized Remnawave user dictionaries
+
+        Returns:
+            Number of users currently indexed from this batch
+        """
+        scores: dict[str, float] = {}
+        payloads: dict[str, str] = {}
+        stale: list[str] = []
+
+        for user in users:
+            user_uuid = user.get("uuid")
+            if not user_uuid:
+                continue
+            expires = expire_at_timestamp(user.get("expire_at"))
+            if expires is None or user.get("status") == "disabled":
+                stale.append(user_uuid)
+                continue
+            scores[user_uuid] = expires
+            payloads[user_uuid] = json.dumps(
+                {
+                    "uuid": user_uuid,
+                    "username": user.get("username"),
+                    "telegram_id": user.get("telegram_id"),
+                    "expire_at": user.get("expire_at"),
+                },
+                separators=(",", ":"),
+            )
+
+        if not scores and not stale:
+            return 0
+
+        pipe = self._redis.pipeline(transaction=False)
+        if scores:
+            pipe.zadd(EXPIRY_INDEX_KEY, scores)
+            pipe.hset(EXPIRY_INDEX_USERS_KEY, mapping=payloads)
+        if stale:
+            pipe.zrem(EXPIRY_INDEX_KEY, *stale)
+            pipe.hdel(EXPIRY_INDEX_USERS_KEY, *stale)
+        await pipe.execute()
+        return len(scores)
+
+    async def remove(self, uuids: Iterable[str]) -> None:
+        """Drop users from the index.
+
+        Args:
+            uuids: User UUIDs to remove
+        """
+        uuids = list(uuids)
+        if not uuids:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zrem(EXPIRY_INDEX_KEY, *uuids)
+        pipe.hdel(EXPIRY_INDEX_USERS_KEY, *uuids)
+        await pipe.execute()
+
+    async def due(self, until: float, limit: int) -> list[dict]:
+        """Return indexed users whose expiry is at or before ``until``.
+
+        Entries are removed once their user is disabled, so anything left
+        before the previous run is a failed disable that gets retried here.
+
+        Args:
+            until: Upper bound unix timestamp (inclusive)
+            limit: Maximum number of users to return
+
+        Returns:
+            User dictionaries with uuid, username, telegram_id and expire_at
+        """
+        uuids = await self._redis.zrangebyscore(EXPIRY_INDEX_KEY, "-inf", until, start=0, num=limit)
+        if not uuids:
+            return []
+
+        raw_users = await self._redis.hmget(EXPIRY_INDEX_USERS_KEY, uuids)
+        users = []
+        for user_uuid, raw in zip(uuids, raw_users, strict=True):
+            if raw is None:
+                users.append({"uuid": user_uuid})
+                continue
+            try:
+                users.append(json.loads(raw))
+            except json.JSONDecodeError:
+                users.append({"uuid": user_uuid})
+        return users
+
+    async def mark_synced(self, synced_at: float | None = None) -> None:
+        """Record that the index was rebuilt from a full fleet scan.
+
+        Args:
+            synced_at: Unix timestamp of the rebuild, defaults to now
+        """
+        await self._redis.set(EXPIRY_INDEX_SYNCED_AT_KEY, str(synced_at if synced_at is not None else time.time()))
+
+    async def is_fresh(self, max_age_seconds: int) -> bool:
+        """Check whether the index was fully rebuilt within ``max_age_seconds``.
+
+        Args:
+            max_age_seconds: Maximum tolerated age of the last full rebuild
+
+        Returns:
+            True if the index can be trusted without a fleet scan
+        """
+        raw = await self._redis.get(EXPIRY_INDEX_SYNCED_AT_KEY)
+        if raw is None:
+            return False
+        try:
+            synced_at = float(raw)
+        except (TypeError, ValueError):
+            logger.warning("expiry_index_invalid_synced_at", value=raw)
+            return False
+        return time.time() - synced_at <= max_age_seconds
@@ -0,0 +1,202 @@
+"""Streaming, compressed file writers for bulk exports.
+
+Each writer appends batches of rows to one output file without holding more
+than the current batch in memory. Text formats are written through a
+streaming ``gzip``/``zstd`` compressor; Parquet uses its own column codec.
+
+Optional dependencies (``exports`` extra):
+- ``zstd``: ``compression.zstd`` (Python 3.14+) or the ``zstandard`` package
+- ``parquet``: ``pyarrow``
+"""
+
+import csv
+import gzip
+import io
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import orjson
+
+EXPORT_FORMATS = ("csv", "json", "ndjson", "parquet")
+EXPORT_COMPRESSIONS = ("none", "gzip", "zstd")
+
+_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def export_suffix(export_format: str, compression: str) -> str:
+    """Return the file suffix, e.g. ``.ndjson.gz``; Parquet compresses internally."""
+    if export_format == "parquet":
+        return ".parquet"
+    return f".{export_format}{_COMPRESSION_SUFFIXES[compression]}"
+
+
+def _open_zstd(path: Path) -> BinaryIO:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd.open(path, "wb")
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise RuntimeError("zstd compression requires Python 3.14+ or the 'zstandard' package") from exc
+    return zstandard.ZstdCompressor().stream_writer(path.open("wb"), closefd=True)
+
+
+def open_compressed(path: Path, compression: str) -> BinaryIO:
+    """Open ``path`` for binary writing through a streaming compressor."""
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        return _open_zstd(path)
+    return path.open("wb")
+
+
+def _to_csv_value(value: Any) -> Any:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> str:
+    return str(value)
+
+
+class ExportWriter(ABC):
+    """Base class: append row batches to one export file, then ``close``."""
+
+    def __init__(self, path: Path, columns: Sequence[str], compression: str) -> None:
+        """Open the output file for ``columns``."""
+        self.path = path
+        self.columns = list(columns)
+        self.compression = compression
+        self.rows = 0
+
+    @abstractmethod
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append a batch of rows (value sequences in ``columns`` order)."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and close the file."""
+
+
+class CsvExportWriter(ExportWriter):
+    """CSV with a header row."""
+
+    def __init__(self, path: Path, columns: Sequence[str], compression: str) -> None:
+        """Open the file and write the header."""
+        super().__init__(path, columns, compression)
+        self._text = io.TextIOWrapper(open_compressed(path, compression), encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(self.columns)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append a batch of rows."""
+        self._writer.writerows([_to_csv_value(value) for value in row] for row in rows)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self._text.close()
+
+
+class NdjsonExportWriter(ExportWriter):
+    """One compact JSON object per line."""
+
+    def __init__(self, path: Path, columns: Sequence[str], compression: str) -> None:
+        """Open the file."""
+        super().__init__(path, columns, compression)
+        self._file = open_compressed(path, compression)
+
+    def _encode(self, row: Sequence[Any]) -> bytes:
+        return orjson.dumps(dict(zip(self.columns, row, strict=True)), default=_json_default)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append a batch of rows."""
+        self._file.write(b"".join(self._encode(row) + b"\n" for row in rows))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self._file.close()
+
+
+class JsonExportWriter(NdjsonExportWriter):
+    """A single JSON array, streamed element by element."""
+
+    def __init__(self, path: Path, columns: Sequence[str], compression: str) -> None:
+        """Open the file and start the array."""
+        super().__init__(path, columns, compression)
+        self._file.write(b"[")
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append a batch of rows as array elements."""
+        if not rows:
+            return
+        separator = b",\n" if self.rows else b"\n"
+        self._file.write(separator + b",\n".join(self._encode(row) for row in rows))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Close the array and the file."""
+        self._file.write(b"\n]\n")
+        self._file.close()
+
+
+class ParquetExportWriter(ExportWriter):
+    """Parquet, one row group per batch; the schema is inferred from the first batch."""
+
+    def __init__(self, path: Path, columns: Sequence[str], compression: str) -> None:
+        """Check that pyarrow is available; the file is created with the first batch."""
+        super().__init__(path, columns, compression)
+        try:
+            import pyarrow as pa  # type: ignore[import-not-found]
+            import pyarrow.parquet as pq  # type: ignore[import-not-found]
+        except ImportError as exc:
+            raise RuntimeError("Parquet exports require the 'pyarrow' package") from exc
+        self._pa = pa
+        self._pq = pq
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Append a batch of rows as one row group."""
+        if not rows:
+            return
+        pa = self._pa
+        data = {column: [row[index] for row in rows] for index, column in enumerate(self.columns)}
+        if self._writer is None:
+            inferred = pa.Table.from_pydict(data).schema
+            # Columns that are all NULL in the first batch get a type wide enough for any later value.
+            self._schema = pa.schema(
+                [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in inferred]
+            )
+            codec = "none" if self.compression == "none" else self.compression
+            self._writer = self._pq.ParquetWriter(self.path, self._schema, compression=codec)
+        self._writer.write_table(pa.Table.from_pydict(data, schema=self._schema))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Write the footer and close the file."""
+        if self._writer is None:
+            self._pq.write_table(self._pa.table({column: [] for column in self.columns}), self.path)
+        else:
+            self._writer.close()
+
+
+_WRITERS: dict[str, type[ExportWriter]] = {
+    "csv": CsvExportWriter,
+    "json": JsonExportWriter,
+    "ndjson": NdjsonExportWriter,
+    "parquet": ParquetExportWriter,
+}
+
+
+def open_export_writer(path: Path, export_format: str, columns: Sequence[str], compression: str) -> ExportWriter:
+    """Open a writer for ``export_format`` (one of ``EXPORT_FORMATS``)."""
+    return _WRITERS[export_format](path, columns, compression)
@@ -0,0 +1,133 @@
+"""Concurrent Telegram delivery shaped to Bot API rate limits.
+
+Used by the notification queue processor to send a claimed batch in parallel
+while respecting Telegram's limits:
+
+- global: ~30 messages/second per bot (token bucket, kept below the limit)
+- per chat: ~1 message/second (messages to the same chat are sent in order,
+  spaced by ``per_chat_interval``)
+- ``retry_after``: a persistent 429 pauses the whole pool for the requested
+  time and the affected message is reported as deferred
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import structlog
+
+from src.services.telegram_client import TelegramAPIError, TelegramClient, TelegramRateLimitError
+from src.utils.constants import (
+    TELEGRAM_DELIVERY_CONCURRENCY,
+    TELEGRAM_GLOBAL_BURST,
+    TELEGRAM_GLOBAL_RATE_PER_SECOND,
+    TELEGRAM_PER_CHAT_INTERVAL_SECONDS,
+)
+from src.utils.rate_limiter import AsyncTokenBucket
+
+logger = structlog.get_logger(__name__)
+
+OUTCOME_SENT = "sent"
+OUTCOME_FAILED = "failed"
+OUTCOME_DEFERRED = "deferred"
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramSendJob:
+    """A single message to deliver; ``key`` identifies it in the outcomes."""
+
+    key: Any
+    chat_id: int
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramSendOutcome:
+    """Result of a :class:`TelegramSendJob`."""
+
+    key: Any
+    status: str
+    sent_at: datetime | None = None
+    error: str | None = None
+    retry_after: float | None = None
+
+
+class TelegramDeliveryPool:
+    """Worker pool that sends Telegram messages concurrently within rate limits.
+
+    Args:
+        tg: Open TelegramClient used for sending
+        concurrency: Number of parallel send workers
+        rate_limiter: Global token bucket; defaults to one shaped to Telegram's bot limit
+        per_chat_interval: Minimum seconds between two messages to the same chat
+    """
+
+    def __init__(
+        self,
+        tg: TelegramClient,
+        *,
+        concurrency: int = TELEGRAM_DELIVERY_CONCURRENCY,
+        rate_limiter: AsyncTokenBucket | None = None,
+        per_chat_interval: float = TELEGRAM_PER_CHAT_INTERVAL_SECONDS,
+    ) -> None:
+        """Initialize the pool around an open Telegram client."""
+        self._tg = tg
+        self._concurrency = max(1, concurrency)
+        self._rate_limiter = rate_limiter or AsyncTokenBucket(
+            rate=TELEGRAM_GLOBAL_RATE_PER_SECOND, capacity=TELEGRAM_GLOBAL_BURST
+        )
+        self._per_chat_interval = per_chat_interval
+        self._resume_at = 0.0
+
+    async def deliver(self, jobs: list[TelegramSendJob]) -> list[TelegramSendOutcome]:
+        """Send all jobs and return one outcome per job, in input order.
+
+        Args:
+            jobs: Messages to send
+
+        Returns:
+            Outcomes aligned with ``jobs``
+        """
+        if not jobs:
+            return []
+
+        by_chat: dict[int, list[int]] = defaultdict(list)
+        for position, job in enumerate(jobs):
+            by_chat[job.chat_id].append(position)
+
+        queue: asyncio.Queue[list[int]] = asyncio.Queue()
+        for positions in by_chat.values():
+            queue.put_nowait(positions)
+
+        outcomes: list[TelegramSendOutcome | None] = [None] * len(jobs)
+
+        async def _worker() -> None:
+            while not queue.empty():
+                positions = queue.get_nowait()
+                for index, position in enumerate(positions):
+                    if index:
+                        await asyncio.sleep(self._per_chat_interval)
+                    outcomes[position] = await self._send(jobs[position])
+
+        workers = min(self._concurrency, len(by_chat))
+        await asyncio.gather(*(_worker() for _ in range(workers)))
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    async def _send(self, job: TelegramSendJob) -> TelegramSendOutcome:
+        pause = self._resume_at - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        await self._rate_limiter.acquire()
+
+        try:
+            await self._tg.send_message(chat_id=job.chat_id, text=job.text)
+        except TelegramRateLimitError as e:
+            self._resume_at = max(self._resume_at, time.monotonic() + e.retry_after)
+            logger.warning("telegram_delivery_paused", retry_after=e.retry_after)
+            return TelegramSendOutcome(key=job.key, status=OUTCOME_DEFERRED, error=str(e), retry_after=e.retry_after)
+        except TelegramAPIError as e:
+            return TelegramSendOutcome(key=job.key, status=OUTCOME_FAILED, error=str(e))
+        return TelegramSendOutcome(key=job.key, status=OUTCOME_SENT, sent_at=datetime.now(UTC))
@@ -7,7 +7,7 @@ Includes rate limiting, connection pooling, timeouts, retries, and structured lo
 import asyncio
 import time
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Any
 
 import httpx
@@ -15,6 +15,7 @@ import structlog
 
 from src.config import get_settings
 from src.services.remnawave_normalizers import normalize_nodes, normalize_user, normalize_users
+from src.utils.constants import REMNAWAVE_USERS_PAGE_SIZE
 from src.utils.rate_limiter import AsyncTokenBucket
 
 logger = structlog.get_logger(__name__)
@@ -52,8 +53,8 @@ class RemnawaveClient:
 
     Example:
         async with RemnawaveClient() as client:
-            users = await client.get_users()
-            await client.disable_user(user_uuid)
+            async for user in client.iter_users():
+                await client.disable_user(user["uuid"])
     """
 
     def __init__(self, rate_limiter: AsyncTokenBucket | None = None) -> None:
@@ -310,7 +311,10 @@ class RemnawaveClient:
         return response if isinstance(response, list) else response.get("hosts", [])
 
     async def get_users(self) -> list[dict]:
-        """Get list of all users.
+        """Get list of all users in a single request.
+
+        Prefer :meth:`iter_users` for fleet-wide jobs; this loads every user
+        into memory at once.
 
         Returns:
             List of user dictionaries
@@ -322,6 +326,81 @@ class RemnawaveClient:
         users = response if isinstance(response, list) else response.get("users", [])
         return normalize_users(users)
 
+    async def _get_users_page(self, start: int, size: int) -> tuple[list[dict], int | None]:
+        """Fetch one raw page of users.
+
+        Args:
+            start: Offset of the first user in the page
+            size: Maximum number of users in the page
+
+        Returns:
+            Tuple of (raw user dictionaries, total user count if reported)
+
+        Raises:
+            RemnawaveAPIError: If request fails
+        """
+        response = await self.get("/api/users", params={"start": start, "size": size})
+        if isinstance(response, list):
+            return response, None
+        total = response.get("total")
+        return response.get("users", []), int(total) if total is not None else None
+
+    async def iter_user_pages(self, page_size: int = REMNAWAVE_USERS_PAGE_SIZE) -> AsyncIterator[list[dict]]:
+        """Stream users page by page using ``start``/``size`` pagination.
+
+        The next page is requested while the caller processes the current one,
+        so at most two pages are held in memory regardless of fleet size.
+
+        Args:
+            page_size: Number of users requested per page
+
+        Yields:
+            Lists of normalized user dictionaries
+
+        Raises:
+            RemnawaveAPIError: If any page request fails
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        start = 0
+        pending: asyncio.Task | None = asyncio.create_task(self._get_users_page(start, page_size))
+        try:
+            while pending is not None:
+                users, total = await pending
+                pending = None
+                start += len(users)
+
+                # Stop on a short/empty page, or when the reported total is reached
+                has_more = bool(users) and (start < total if total is not None else len(users) >= page_size)
+                if has_more:
+                    pending = asyncio.create_task(self._get_users_page(start, page_size))
+
+                if users:
+                    yield normalize_users(users)
+        finally:
+            # Early exit by the consumer: drop the prefetched page
+            if pending is not None:
+                pending.cancel()
+                with suppress(asyncio.CancelledError, RemnawaveAPIError):
+                    await pending
+
+    async def iter_users(self, page_size: int = REMNAWAVE_USERS_PAGE_SIZE) -> AsyncIterator[dict]:
+        """Stream all users one at a time without materializing the fleet.
+
+        Args:
+            page_size: Number of users requested per page
+
+        Yields:
+            Normalized user dictionaries
+
+        Raises:
+            RemnawaveAPIError: If any page request fails
+        """
+        async for page in self.iter_user_pages(page_size=page_size):
+            for user in page:
+                yield user
+
     async def get_user(self, uuid: str) -> dict:
         """Get detailed information for a specific user.
 
@@ -0,0 +1,236 @@
+"""Incrementally refreshed hourly rollups of audit-log and payment history.
+
+``aggregate_daily_stats`` and ``aggregate_financial_stats`` read these small
+tables instead of loading and summing raw rows, so their run time no longer
+grows with the size of ``audit_logs`` and ``payments``:
+
+- ``audit_log_hourly_rollups``: new users, churned users and admin operations
+  per UTC hour. ``audit_logs`` is append-only, so each refresh re-aggregates
+  only the hours from the ``created_at`` high-water mark onwards.
+- ``payment_hourly_rollups``: completed payment count and amount per UTC hour,
+  currency, provider and plan. Payments change status after creation, so each
+  refresh finds the hours touched since the ``updated_at`` high-water mark and
+  re-aggregates exactly those hours.
+- ``stats_rollup_watermarks``: high-water mark per rollup.
+
+All aggregation runs in SQL ``GROUP BY``; Python only moves watermarks.
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.audit_log import AuditLogModel
+from src.models.payment import PaymentModel
+from src.models.stats_rollup import AuditLogHourlyRollupModel, PaymentHourlyRollupModel, StatsRollupWatermarkModel
+from src.utils.constants import STATS_ROLLUP_LAG_SECONDS, STATS_ROLLUP_LOCK_ID
+
+logger = structlog.get_logger(__name__)
+
+AUDIT_ROLLUP = "audit_logs"
+PAYMENT_ROLLUP = "payments"
+
+# Breakdown name -> rollup column, used by ``payment_totals`` GROUP BY.
+_PAYMENT_DIMENSIONS = {
+    "currency": PaymentHourlyRollupModel.currency,
+    "provider": PaymentHourlyRollupModel.provider,
+    "plan_name": PaymentHourlyRollupModel.plan_name,
+}
+
+
+def _hour_bucket(column: Any) -> Any:
+    return func.date_trunc("hour", column, "UTC")
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _plan_name() -> Any:
+    metadata = PaymentModel.metadata_
+    return func.left(
+        func.coalesce(
+            func.nullif(metadata["plan_name"].astext, ""),
+            func.nullif(metadata["planName"].astext, ""),
+            "unknown",
+        ),
+        120,
+    )
+
+
+class StatsRollups:
+    """Hourly audit-log and payment rollups shared by the analytics tasks.
+
+    Args:
+        session: Async SQLAlchemy session (PostgreSQL)
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the rollups with a database session."""
+        self._session = session
+
+    async def refresh(self) -> dict[str, int]:
+        """Fold source rows changed since the last refresh into the rollups and commit.
+
+        Concurrent refreshes are serialized with a transaction-scoped advisory lock.
+
+        Returns:
+            Number of hourly buckets rewritten per rollup
+        """
+        await self._session.execute(select(func.pg_advisory_xact_lock(STATS_ROLLUP_LOCK_ID)))
+        result = {
+            AUDIT_ROLLUP: await self._refresh_audit_logs(),
+            PAYMENT_ROLLUP: await self._refresh_payments(),
+        }
+        await self._session.commit()
+        logger.info("stats_rollups_refreshed", **result)
+        return result
+
+    async def audit_totals(self, start: datetime, end: datetime) -> dict[str, int]:
+        """Sum audit-log rollups over ``[start, end)``.
+
+        Args:
+            start: Inclusive start, aligned to an hour
+            end: Exclusive end, aligned to an hour
+
+        Returns:
+            Dictionary with new_users, churned_users and admin_ops
+        """
+        stmt = select(
+            func.coalesce(func.sum(AuditLogHourlyRollupModel.new_users), 0).label("new_users"),
+            func.coalesce(func.sum(AuditLogHourlyRollupModel.churned_users), 0).label("churned_users"),
+            func.coalesce(func.sum(AuditLogHourlyRollupModel.admin_ops), 0).label("admin_ops"),
+        ).where(
+            AuditLogHourlyRollupModel.bucket_start >= start,
+            AuditLogHourlyRollupModel.bucket_start < end,
+        )
+        row = (await self._session.execute(stmt)).one()
+        return {
+            "new_users": int(row.new_users or 0),
+            "churned_users": int(row.churned_users or 0),
+            "admin_ops": int(row.admin_ops or 0),
+        }
+
+    async def payment_totals(self, start: datetime, end: datetime, *group_by: str) -> list[Any]:
+        """Sum completed-payment rollups over ``[start, end)``, optionally broken down.
+
+        Args:
+            start: Inclusive start, aligned to an hour
+            end: Exclusive end, aligned to an hour
+            *group_by: Any of ``currency``, ``provider`` and ``plan_name``
+
+        Returns:
+            Rows with the requested dimensions plus ``count`` and ``total``
+        """
+        dimensions = [_PAYMENT_DIMENSIONS[name] for name in group_by]
+        stmt = (
+            select(
+                *dimensions,
+                func.coalesce(func.sum(PaymentHourlyRollupModel.payment_count), 0).label("count"),
+                func.coalesce(func.sum(PaymentHourlyRollupModel.amount_total), 0).label("total"),
+            )
+            .where(
+                PaymentHourlyRollupModel.bucket_start >= start,
+                PaymentHourlyRollupModel.bucket_start < end,
+            )
+            .group_by(*dimensions)
+        )
+        return list((await self._session.execute(stmt)).all())
+
+    async def _refresh_audit_logs(self) -> int:
+        watermark = await self._watermark(AUDIT_ROLLUP)
+        latest = (await self._session.execute(select(func.max(AuditLogModel.created_at)))).scalar()
+        if latest is None:
+            return 0
+
+        bucket = _hour_bucket(AuditLogModel.created_at)
+        source = select(
+            bucket.label("bucket_start"),
+            func.count().filter(AuditLogModel.action == "user.created").label("new_users"),
+            func.count()
+            .filter(
+                AuditLogModel.action == "user.updated",
+                AuditLogModel.new_value["status"].astext.in_(("disabled", "expired")),
+            )
+            .label("churned_users"),
+            func.count().filter(AuditLogModel.admin_id.is_not(None)).label("admin_ops"),
+        ).group_by(bucket)
+        if watermark is not None:
+            # Rows commit slightly out of created_at order; re-read a short lag behind the mark.
+            since = _floor_hour(watermark - timedelta(seconds=STATS_ROLLUP_LAG_SECONDS))
+            source = source.where(AuditLogModel.created_at >= since)
+
+        stmt = insert(AuditLogHourlyRollupModel).from_select(
+            ["bucket_start", "new_users", "churned_users", "admin_ops"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AuditLogHourlyRollupModel.bucket_start],
+            set_={
+                "new_users": stmt.excluded.new_users,
+                "churned_users": stmt.excluded.churned_users,
+                "admin_ops": stmt.excluded.admin_ops,
+                "refreshed_at": func.now(),
+            },
+        )
+        rewritten = (await self._session.execute(stmt)).rowcount or 0
+        await self._set_watermark(AUDIT_ROLLUP, latest)
+        return rewritten
+
+    async def _refresh_payments(self) -> int:
+        watermark = await self._watermark(PAYMENT_ROLLUP)
+        latest = (await self._session.execute(select(func.max(PaymentModel.updated_at)))).scalar()
+        if latest is None:
+            return 0
+
+        bucket = _hour_bucket(PaymentModel.created_at)
+        plan_name = _plan_name()
+        source = select(
+            bucket.label("bucket_start"),
+            PaymentModel.currency,
+            PaymentModel.provider,
+            plan_name.label("plan_name"),
+            func.count().label("payment_count"),
+            func.sum(PaymentModel.amount).label("amount_total"),
+        ).where(PaymentModel.status == "completed")
+
+        if watermark is None:
+            await self._session.execute(delete(PaymentHourlyRollupModel))
+        else:
+            since = watermark - timedelta(seconds=STATS_ROLLUP_LAG_SECONDS)
+            touched_stmt = select(bucket).where(PaymentModel.updated_at >= since).distinct()
+            touched = list((await self._session.execute(touched_stmt)).scalars().all())
+            if not touched:
+                await self._set_watermark(PAYMENT_ROLLUP, latest)
+                return 0
+            await self._session.execute(
+                delete(PaymentHourlyRollupModel).where(PaymentHourlyRollupModel.bucket_start.in_(touched))
+            )
+            source = source.where(
+                PaymentModel.created_at >= min(touched),
+                PaymentModel.created_at < max(touched) + timedelta(hours=1),
+                bucket.in_(touched),
+            )
+
+        source = source.group_by(bucket, PaymentModel.currency, PaymentModel.provider, plan_name)
+        stmt = insert(PaymentHourlyRollupModel).from_select(
+            ["bucket_start", "currency", "provider", "plan_name", "payment_count", "amount_total"], source
+        )
+        rewritten = (await self._session.execute(stmt)).rowcount or 0
+        await self._set_watermark(PAYMENT_ROLLUP, latest)
+        return rewritten
+
+    async def _watermark(self, name: str) -> datetime | None:
+        stmt = select(StatsRollupWatermarkModel.watermark_at).where(StatsRollupWatermarkModel.rollup_name == name)
+        return (await self._session.execute(stmt)).scalar()
+
+    async def _set_watermark(self, name: str, value: datetime) -> None:
+        stmt = insert(StatsRollupWatermarkModel).values(rollup_name=name, watermark_at=value)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatsRollupWatermarkModel.rollup_name],
+            set_={"watermark_at": stmt.excluded.watermark_at, "refreshed_at": func.now()},
+        )
+        await self._session.execute(stmt)
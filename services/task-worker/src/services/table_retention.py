@@ -0,0 +1,304 @@
+"""Retention for large append-heavy tables: range partitions and bounded deletes.
+
+``audit_logs`` (monthly) and ``webhook_logs`` (daily) are range-partitioned by
+``created_at`` (backend migration ``20260602_partition_log_tables``), so
+expiring data is a catalog operation instead of a mass ``DELETE``:
+
+- ``PartitionManager.ensure_partitions`` pre-creates the next periods so
+  inserts never hit a missing range;
+- ``PartitionManager.drop_expired`` detaches and drops partitions whose whole
+  range is older than the retention cutoff. Rows are therefore kept up to one
+  partition interval past the retention period. A drop that cannot get its
+  lock within ``lock_timeout`` is retried on the next run.
+
+Each table also has a ``DEFAULT`` partition catching rows outside every range.
+It is expected to stay empty: should the manager fall behind, rows that land
+there are moved into the range partition created for them later, and the
+partition itself is never dropped but trimmed like the legacy one.
+
+Rows that cannot be expired by dropping a partition, i.e. the ``*_legacy``
+partition holding pre-migration history, the ``DEFAULT`` partition and tables that are not partitioned
+(``notification_queue`` is referenced by foreign keys), are removed with
+``bounded_delete``: ``ctid``-batched ``DELETE``s of at most ``batch_size`` rows,
+each in its own short transaction, with a pause between batches so autovacuum
+and replicas keep up.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import TextClause, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+PARTITION_INTERVALS = ("day", "month")
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+_LOCK_NOT_AVAILABLE = "55P03"
+_BOUND = re.compile(r"FROM \((?:MINVALUE|'([^']+)')\) TO \((?:MAXVALUE|'([^']+)')\)")
+
+
+@dataclass(frozen=True)
+class DeleteBudget:
+    """Limits of one ``bounded_delete`` run."""
+
+    batch_size: int
+    pause_seconds: float
+    max_batches: int
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "DeleteBudget":
+        """Build the budget from the ``cleanup_delete_*`` settings."""
+        return cls(
+            batch_size=settings.cleanup_delete_batch_size,
+            pause_seconds=settings.cleanup_delete_pause_seconds,
+            max_batches=settings.cleanup_delete_max_batches,
+        )
+
+
+@dataclass(frozen=True)
+class Partition:
+    """Partition of a table; ``None`` bounds stand for MINVALUE/MAXVALUE.
+
+    The ``DEFAULT`` partition has no bounds and ``default`` set.
+    """
+
+    name: str
+    start: datetime | None
+    end: datetime | None
+    default: bool = False
+
+
+def period_start(value: datetime, interval: str) -> datetime:
+    """Return the UTC start of the day or month containing ``value``."""
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(f"Unknown partition interval: {interval}")
+    start = value.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start.replace(day=1) if interval == "month" else start
+
+
+def next_period(value: datetime, interval: str) -> datetime:
+    """Return the UTC start of the period following the one containing ``value``."""
+    start = period_start(value, interval)
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """Return the partition name for the period starting at ``start``."""
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def _quote(identifier: str) -> str:
+    if not _IDENTIFIER.match(identifier):
+        raise ValueError(f"Unsafe SQL identifier: {identifier}")
+    return f'"{identifier}"'
+
+
+def _parse_bound(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value).astimezone(UTC) if value else None
+
+
+async def bounded_delete(
+    session: AsyncSession,
+    table: str,
+    condition: str,
+    params: dict[str, Any],
+    budget: DeleteBudget,
+) -> int:
+    """Delete matching rows ``budget.batch_size`` at a time, committing every batch.
+
+    ``ctid`` is only unique within one physical table, so ``table`` must be a
+    plain table or a leaf partition, never a partitioned parent.
+
+    Args:
+        session: Async SQLAlchemy session (PostgreSQL)
+        table: Table or leaf partition name
+        condition: SQL ``WHERE`` condition with bind parameters
+        params: Bind parameters of ``condition``
+        budget: Batch size, pause between batches and maximum batches
+
+    Returns:
+        Number of rows deleted; stops early once ``max_batches`` is reached
+    """
+    quoted = _quote(table)
+    stmt = text(
+        f"DELETE FROM {quoted} WHERE ctid = ANY(ARRAY("  # noqa: S608 - identifiers pass _quote.
+        f"SELECT ctid FROM {quoted} WHERE {condition} LIMIT :batch_size))"
+    )
+    deleted = 0
+    for batch in range(budget.max_batches):
+        result = await session.execute(stmt, {**params, "batch_size": budget.batch_size})
+        await session.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < budget.batch_size:
+            break
+        if batch + 1 < budget.max_batches:
+            await asyncio.sleep(budget.pause_seconds)
+    else:
+        logger.info("bounded_delete_budget_exhausted", table=table, deleted=deleted)
+    return deleted
+
+
+def _sqlstate(error: DBAPIError) -> str | None:
+    """Return the SQLSTATE of a driver error, if the driver exposes one."""
+    return getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+
+
+class PartitionManager:
+    """Creates, lists and drops ``created_at`` range partitions.
+
+    Args:
+        session: Async SQLAlchemy session (PostgreSQL)
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the manager with a database session."""
+        self._session = session
+
+    async def is_partitioned(self, table: str) -> bool:
+        """Return True if ``table`` exists and is a partitioned table."""
+        stmt = text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))")
+        return bool((await self._session.execute(stmt, {"table": table})).scalar())
+
+    async def partitions(self, table: str) -> list[Partition]:
+        """List the range and default partitions of ``table`` ordered by name."""
+        stmt = text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+        )
+        partitions = []
+        for name, bound in (await self._session.execute(stmt, {"table": table})).all():
+            if bound == "DEFAULT":
+                partitions.append(Partition(name, None, None, default=True))
+                continue
+            match = _BOUND.search(bound or "")
+            if match is None:
+                continue
+            partitions.append(Partition(name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+        return partitions
+
+    async def ensure_partitions(self, table: str, interval: str, ahead: int, now: datetime) -> list[str]:
+        """Create missing partitions up to ``ahead`` periods after the current one.
+
+        New partitions continue from the highest existing upper bound, so they
+        never overlap the legacy partition or each other. Rows already sitting
+        in the default partition for a new range are moved into it, since
+        Postgres refuses to create a partition the default holds rows for.
+
+        Returns:
+            Names of the partitions created
+        """
+        horizon = period_start(now, interval)
+        for _ in range(ahead + 1):
+            horizon = next_period(horizon, interval)
+
+        partitions = await self.partitions(table)
+        default = next((partition.name for partition in partitions if partition.default), None)
+        bounds = [partition.end for partition in partitions if partition.end is not None]
+        start = max(bounds) if bounds else period_start(now, interval)
+        created = []
+        while start < horizon:
+            end = next_period(start, interval)
+            name = partition_name(table, start)
+            create = text(
+                f"CREATE TABLE IF NOT EXISTS {_quote(name)} PARTITION OF {_quote(table)} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            if default is not None and await self._holds_rows(default, start, end):
+                await self._create_from_default(table, default, name, create, start, end)
+            else:
+                await self._session.execute(create)
+            created.append(name)
+            start = end
+        await self._session.commit()
+        if created:
+            logger.info("partitions_created", table=table, partitions=created)
+        return created
+
+    async def _holds_rows(self, partition: str, start: datetime, end: datetime) -> bool:
+        stmt = text(
+            f"SELECT EXISTS (SELECT 1 FROM {_quote(partition)} "  # noqa: S608 - identifiers pass _quote.
+            "WHERE created_at >= :start AND created_at < :end)"
+        )
+        return bool((await self._session.execute(stmt, {"start": start, "end": end})).scalar())
+
+    async def _create_from_default(
+        self, table: str, default: str, name: str, create: TextClause, start: datetime, end: datetime
+    ) -> None:
+        """Create partition ``name`` and move its rows out of the default partition.
+
+        The default partition is detached meanwhile, so the new bound is not
+        checked against the rows it still holds for that range.
+        """
+        parent, source = _quote(table), _quote(default)
+        params = {"start": start, "end": end}
+        in_range = "WHERE created_at >= :start AND created_at < :end"
+        # Identifiers pass _quote.
+        move = f"INSERT INTO {_quote(name)} SELECT * FROM {source} {in_range}"  # noqa: S608
+        purge = f"DELETE FROM {source} {in_range}"  # noqa: S608
+        await self._session.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {source}"))
+        await self._session.execute(create)
+        moved = await self._session.execute(text(move), params)
+        await self._session.execute(text(purge), params)
+        await self._session.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {source} DEFAULT"))
+        logger.warning("default_partition_rows_moved", table=table, partition=name, rows=moved.rowcount)
+
+    async def drop_expired(self, table: str, cutoff: datetime) -> list[str]:
+        """Detach and drop partitions whose whole range ends at or before ``cutoff``.
+
+        Returns:
+            Names of the partitions dropped
+        """
+        dropped = []
+        for partition in await self.partitions(table):
+            if partition.end is None or partition.end > cutoff:
+                continue
+            # DETACH takes an exclusive lock on the parent; give up instead of queueing writers behind it.
+            try:
+                await self._session.execute(text("SET LOCAL lock_timeout = '5s'"))
+                await self._session.execute(
+                    text(f"ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(partition.name)}")
+                )
+                await self._session.execute(text(f"DROP TABLE {_quote(partition.name)}"))
+                await self._session.commit()
+            except DBAPIError as e:
+                if _sqlstate(e) != _LOCK_NOT_AVAILABLE:
+                    raise
+                await self._session.rollback()
+                logger.warning("partition_drop_lock_timeout", table=table, partition=partition.name)
+                break
+            dropped.append(partition.name)
+        if dropped:
+            logger.info("partitions_dropped", table=table, partitions=dropped)
+        return dropped
+
+    async def apply_retention(self, table: str, cutoff: datetime, budget: DeleteBudget) -> dict[str, int]:
+        """Remove rows of ``table`` created before ``cutoff``.
+
+        Drops expired partitions, then trims the legacy partition (the one
+        starting at MINVALUE) and the default partition with ``bounded_delete``. Tables that are not
+        partitioned are trimmed with ``bounded_delete`` directly.
+
+        Returns:
+            Dictionary with rows ``deleted`` and ``partitions_dropped``
+        """
+        params = {"cutoff": cutoff}
+        if not await self.is_partitioned(table):
+            deleted = await bounded_delete(self._session, table, "created_at < :cutoff", params, budget)
+            return {"deleted": deleted, "partitions_dropped": 0}
+
+        dropped = await self.drop_expired(table, cutoff)
+        deleted = 0
+        for partition in await self.partitions(table):
+            if partition.start is None:
+                deleted += await bounded_delete(self._session, partition.name, "created_at < :cutoff", params, budget)
+        return {"deleted": deleted, "partitions_dropped": len(dropped)}
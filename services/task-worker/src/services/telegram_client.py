@@ -22,6 +22,19 @@ class TelegramAPIError(Exception):
     pass
 
 
+class TelegramRateLimitError(TelegramAPIError):
+    """Raised when Telegram still answers 429 after the built-in retry.
+
+    Attributes:
+        retry_after: Seconds Telegram asked the caller to wait
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize with the ``retry_after`` hint from Telegram."""
+        self.retry_after = retry_after
+        super().__init__(f"Telegram rate limit exceeded, retry after {retry_after}s")
+
+
 class TelegramClient:
     """Async HTTP client for Telegram Bot API with rate limiting and error handling.
 
@@ -117,10 +130,17 @@ class TelegramClient:
                     # Retry once
                     try:
                         response = await client.request(method, endpoint, json=json_data)
+                        if response.status_code == 429:
+                            raise TelegramRateLimitError(
+                                retry_after=response.json().get("parameters", {}).get("retry_after", retry_after)
+                            )
                         response.raise_for_status()
                         result = response.json()
                         if result.get("ok"):
                             return result.get("result", {})
+                    except TelegramRateLimitError:
+                        logger.warning("telegram_rate_limit_persisted", endpoint=endpoint)
+                        raise
                     except Exception as retry_error:
                         logger.error("telegram_retry_failed", endpoint=endpoint, error=str(retry_error))
                         raise TelegramAPIError(f"Telegram API retry failed: {retry_error}") from retry_error
@@ -0,0 +1,413 @@
+"""Redis snapshot of the Remnawave user fleet with delta-maintained aggregates.
+
+``sync_user_stats`` is the only task that streams the whole fleet; every page is
+diffed against the previous snapshot and only changed users are rewritten.
+Fleet aggregates are kept as counters that move by the difference between a
+user's old and new contribution, so analytics tasks read them in O(1) instead
+of downloading every user again:
+
+- ``USER_SNAPSHOT_KEY`` (HASH): user uuid -> packed record
+  ``[status, is_online, traffic_limit_bytes, used_traffic_bytes, expire_at]``
+- ``USER_SNAPSHOT_UUIDS_KEY`` (SET): uuids present in the snapshot
+- ``USER_SNAPSHOT_EXPIRY_KEY`` (ZSET): uuid -> expiry unix timestamp, so the
+  time-dependent ``expired`` count is a single ``ZCOUNT``
+- ``USER_SNAPSHOT_COUNTERS_KEY`` (HASH): running aggregate counters
+- ``USER_SNAPSHOT_SEEN_KEY``: uuids seen by the sync in progress, used to find
+  users deleted from Remnawave since the previous sync
+- ``USER_SNAPSHOT_SYNCED_AT_KEY``: unix timestamp of the last complete sync
+- ``USER_SNAPSHOT_RECOUNTED_AT_KEY``: unix timestamp of the last full recount
+  of the counters from the records
+- ``USER_SNAPSHOT_LOCK_KEY``: run lock holding the generation of the sync in
+  progress; every write checks it inside a ``WATCH`` transaction
+"""
+
+import json
+import time
+import uuid as uuid_lib
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from src.services.expiry_index import expire_at_timestamp
+from src.utils.constants import (
+    USER_SNAPSHOT_COUNTERS_KEY,
+    USER_SNAPSHOT_EXPIRY_KEY,
+    USER_SNAPSHOT_KEY,
+    USER_SNAPSHOT_LOCK_KEY,
+    USER_SNAPSHOT_LOCK_TTL_SECONDS,
+    USER_SNAPSHOT_RECOUNT_INTERVAL_SECONDS,
+    USER_SNAPSHOT_RECOUNTED_AT_KEY,
+    USER_SNAPSHOT_SEEN_KEY,
+    USER_SNAPSHOT_SYNCED_AT_KEY,
+    USER_SNAPSHOT_UUIDS_KEY,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Counters kept in USER_SNAPSHOT_COUNTERS_KEY; ``expired`` is derived from the expiry ZSET.
+SNAPSHOT_COUNTERS = ("total", "active", "disabled", "limited", "online", "active_online", "used_traffic_bytes")
+
+# The in-progress "seen" set outlives a crashed sync by at most this long.
+_SEEN_TTL_SECONDS = 3600
+
+# HSCAN batch size of a full counter recount.
+_RECOUNT_SCAN_COUNT = 1000
+
+
+class SnapshotLockLostError(RuntimeError):
+    """Raised when a sync no longer holds the snapshot run lock."""
+
+
+@dataclass
+class SnapshotDiff:
+    """Change summary of one snapshot sync (or one page of it)."""
+
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    updated: list[str] = field(default_factory=list)  # uuids of added or changed users
+
+    def merge(self, other: "SnapshotDiff") -> None:
+        """Accumulate ``other`` into this summary."""
+        self.added += other.added
+        self.changed += other.changed
+        self.unchanged += other.unchanged
+        self.removed += other.removed
+        self.updated.extend(other.updated)
+
+
+def pack_user(user: dict) -> str:
+    """Pack the aggregate-relevant fields of a normalized user into a compact record."""
+    return json.dumps(
+        [
+            user.get("status") or "",
+            1 if user.get("is_online") else 0,
+            int(user.get("traffic_limit_bytes") or 0),
+            int(user.get("used_traffic_bytes") or 0),
+            user.get("expire_at"),
+        ],
+        separators=(",", ":"),
+    )
+
+
+def _contribution(record: str | None) -> Counter:
+    """Return the counter contribution of a packed record (empty for None/corrupt)."""
+    if record is None:
+        return Counter()
+    try:
+        status, is_online, data_limit, data_used, _expire_at = json.loads(record)
+    except (ValueError, TypeError):
+        return Counter()
+
+    contribution = Counter(total=1, used_traffic_bytes=data_used)
+    if status == "active":
+        contribution["active"] += 1
+        if is_online:
+            contribution["active_online"] += 1
+    elif status == "disabled":
+        contribution["disabled"] += 1
+    if is_online:
+        contribution["online"] += 1
+    if data_limit > 0 and data_used >= data_limit:
+        contribution["limited"] += 1
+    return contribution
+
+
+class UserSnapshot:
+    """Packed Redis snapshot of Remnawave users shared by the worker tasks.
+
+    Only ``sync_user_stats`` writes the snapshot. A sync holds a ``SET NX EX``
+    run lock for its whole duration, and every page is read, diffed and
+    written inside a ``WATCH`` transaction that also checks the lock still
+    carries its generation, so an overlapping or expired run can never apply
+    the same delta twice. The counters are additionally rebuilt from the
+    records every ``USER_SNAPSHOT_RECOUNT_INTERVAL_SECONDS``.
+
+    Args:
+        redis: AsyncIO Redis client (``decode_responses=True``)
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        """Initialize the snapshot with a Redis client."""
+        self._redis = redis
+
+    async def begin(self) -> str | None:
+        """Start a sync by taking the run lock.
+
+        Returns:
+            Token to pass to ``apply_page``, ``finish`` and ``release``, or
+            None if another sync holds the lock
+        """
+        generation = uuid_lib.uuid4().hex
+        acquired = await self._redis.set(USER_SNAPSHOT_LOCK_KEY, generation, ex=USER_SNAPSHOT_LOCK_TTL_SECONDS, nx=True)
+        if not acquired:
+            logger.info("user_snapshot_sync_in_progress")
+            return None
+        return generation
+
+    async def release(self, generation: str) -> None:
+        """Release the run lock if it is still held by ``generation``.
+
+        Args:
+            generation: Token returned by ``begin``
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(USER_SNAPSHOT_LOCK_KEY)
+                if await pipe.get(USER_SNAPSHOT_LOCK_KEY) != generation:
+                    return
+                pipe.multi()
+                pipe.delete(USER_SNAPSHOT_LOCK_KEY)
+                await pipe.execute()
+            except WatchError:
+                # The lock changed hands in between; it is no longer ours to delete.
+                pass
+
+    async def _check_lock(self, pipe: Any, generation: str) -> None:
+        """Fail the sync if the run lock no longer carries ``generation``."""
+        if await pipe.get(USER_SNAPSHOT_LOCK_KEY) != generation:
+            msg = "user snapshot run lock was lost"
+            raise SnapshotLockLostError(msg)
+
+    async def apply_page(self, generation: str, users: Iterable[dict]) -> SnapshotDiff:
+        """Diff a page of normalized users against the snapshot and store the changes.
+
+        Args:
+            generation: Token returned by ``begin``
+            users: Normalized Remnawave user dictionaries
+
+        Returns:
+            Diff summary for this page
+
+        Raises:
+            SnapshotLockLostError: If the run lock expired or was taken over
+        """
+        records: dict[str, str] = {}
+        expire_ats: dict[str, Any] = {}
+        for user in users:
+            user_uuid = user.get("uuid")
+            if user_uuid:
+                records[user_uuid] = pack_user(user)
+                expire_ats[user_uuid] = user.get("expire_at")
+
+        if not records:
+            return SnapshotDiff()
+
+        uuids = list(records)
+        seen_key = USER_SNAPSHOT_SEEN_KEY.format(generation=generation)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(USER_SNAPSHOT_LOCK_KEY, USER_SNAPSHOT_KEY)
+                    await self._check_lock(pipe, generation)
+                    previous = await pipe.hmget(USER_SNAPSHOT_KEY, uuids)
+
+                    diff = SnapshotDiff()
+                    delta: Counter = Counter()
+                    changed: dict[str, str] = {}
+                    expiries: dict[str, float] = {}
+                    no_expiry: list[str] = []
+                    for user_uuid, old in zip(uuids, previous, strict=True):
+                        new = records[user_uuid]
+                        if old == new:
+                            diff.unchanged += 1
+                            continue
+                        if old is None:
+                            diff.added += 1
+                        else:
+                            diff.changed += 1
+                        diff.updated.append(user_uuid)
+                        changed[user_uuid] = new
+                        delta.update(_contribution(new))
+                        delta.subtract(_contribution(old))
+                        expires = expire_at_timestamp(expire_ats[user_uuid])
+                        if expires is None:
+                            no_expiry.append(user_uuid)
+                        else:
+                            expiries[user_uuid] = expires
+
+                    pipe.multi()
+                    pipe.expire(USER_SNAPSHOT_LOCK_KEY, USER_SNAPSHOT_LOCK_TTL_SECONDS)
+                    pipe.sadd(seen_key, *uuids)
+                    pipe.expire(seen_key, _SEEN_TTL_SECONDS)
+                    if changed:
+                        pipe.hset(USER_SNAPSHOT_KEY, mapping=changed)
+                        pipe.sadd(USER_SNAPSHOT_UUIDS_KEY, *changed)
+                    if expiries:
+                        pipe.zadd(USER_SNAPSHOT_EXPIRY_KEY, expiries)
+                    if no_expiry:
+                        pipe.zrem(USER_SNAPSHOT_EXPIRY_KEY, *no_expiry)
+                    for name, amount in delta.items():
+                        if amount:
+                            pipe.hincrby(USER_SNAPSHOT_COUNTERS_KEY, name, amount)
+                    await pipe.execute()
+                    return diff
+                except WatchError:
+                    continue
+
+    async def finish(self, generation: str, synced_at: float | None = None) -> int:
+        """Drop users not seen during this sync and mark the snapshot as synced.
+
+        Must only be called after the whole fleet was streamed successfully,
+        otherwise users on unread pages would be treated as deleted. Rebuilds
+        the counters from the records when the last recount is older than
+        ``USER_SNAPSHOT_RECOUNT_INTERVAL_SECONDS``.
+
+        Args:
+            generation: Token returned by ``begin``
+            synced_at: Unix timestamp of the sync, defaults to now
+
+        Returns:
+            Number of users removed from the snapshot
+
+        Raises:
+            SnapshotLockLostError: If the run lock expired or was taken over
+        """
+        synced_at = synced_at if synced_at is not None else time.time()
+        seen_key = USER_SNAPSHOT_SEEN_KEY.format(generation=generation)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(USER_SNAPSHOT_LOCK_KEY, USER_SNAPSHOT_KEY, USER_SNAPSHOT_UUIDS_KEY)
+                    await self._check_lock(pipe, generation)
+                    removed = list(await pipe.sdiff(USER_SNAPSHOT_UUIDS_KEY, seen_key))
+                    previous = await pipe.hmget(USER_SNAPSHOT_KEY, removed) if removed else []
+                    raw_recounted_at = await pipe.get(USER_SNAPSHOT_RECOUNTED_AT_KEY)
+
+                    pipe.multi()
+                    if removed:
+                        delta: Counter = Counter()
+                        for old in previous:
+                            delta.subtract(_contribution(old))
+                        pipe.hdel(USER_SNAPSHOT_KEY, *removed)
+                        pipe.srem(USER_SNAPSHOT_UUIDS_KEY, *removed)
+                        pipe.zrem(USER_SNAPSHOT_EXPIRY_KEY, *removed)
+                        for name, amount in delta.items():
+                            if amount:
+                                pipe.hincrby(USER_SNAPSHOT_COUNTERS_KEY, name, amount)
+                    pipe.delete(seen_key)
+                    pipe.set(USER_SNAPSHOT_SYNCED_AT_KEY, str(synced_at))
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+
+        try:
+            recounted_at = float(raw_recounted_at) if raw_recounted_at is not None else None
+        except (TypeError, ValueError):
+            recounted_at = None
+        if recounted_at is None or synced_at - recounted_at >= USER_SNAPSHOT_RECOUNT_INTERVAL_SECONDS:
+            await self.recount(generation, synced_at)
+        return len(removed)
+
+    async def recount(self, generation: str, recounted_at: float | None = None) -> dict[str, int]:
+        """Rebuild the counters from the stored records.
+
+        Delta counters cannot heal themselves once they drift (a crash between
+        a sync's pages, a manual edit); this replaces them with a full count.
+
+        Args:
+            generation: Token returned by ``begin``
+            recounted_at: Unix timestamp stored as the recount time, defaults to now
+
+        Returns:
+            The rebuilt counters
+
+        Raises:
+            SnapshotLockLostError: If the run lock expired or was taken over
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(USER_SNAPSHOT_LOCK_KEY, USER_SNAPSHOT_KEY)
+                    await self._check_lock(pipe, generation)
+                    totals: Counter = Counter()
+                    async for _user_uuid, record in self._redis.hscan_iter(
+                        USER_SNAPSHOT_KEY, count=_RECOUNT_SCAN_COUNT
+                    ):
+                        totals.update(_contribution(record))
+                    counters = {name: totals[name] for name in SNAPSHOT_COUNTERS}
+
+                    pipe.multi()
+                    pipe.delete(USER_SNAPSHOT_COUNTERS_KEY)
+                    pipe.hset(USER_SNAPSHOT_COUNTERS_KEY, mapping=counters)
+                    pipe.set(
+                        USER_SNAPSHOT_RECOUNTED_AT_KEY,
+                        str(recounted_at if recounted_at is not None else time.time()),
+                    )
+                    await pipe.execute()
+                except WatchError:
+                    continue
+                else:
+                    logger.info("user_snapshot_recounted", **counters)
+                    return counters
+
+    async def sync(self, pages: AsyncIterator[list[dict]]) -> SnapshotDiff | None:
+        """Run a complete sync from a stream of user pages.
+
+        Args:
+            pages: Async iterator of normalized user pages
+
+        Returns:
+            Diff summary of the whole sync, or None if another sync is running
+        """
+        generation = await self.begin()
+        if generation is None:
+            return None
+        try:
+            diff = SnapshotDiff()
+            async for page in pages:
+                diff.merge(await self.apply_page(generation, page))
+            diff.removed = await self.finish(generation)
+            return diff
+        finally:
+            await self.release(generation)
+
+    async def aggregates(self, now: float | None = None) -> dict[str, int]:
+        """Return fleet aggregates maintained by the snapshot.
+
+        Args:
+            now: Unix timestamp used for the ``expired`` count, defaults to now
+
+        Returns:
+            Dictionary with total, active, disabled, expired, limited, online,
+            active_online and used_traffic_bytes
+        """
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hgetall(USER_SNAPSHOT_COUNTERS_KEY)
+        pipe.zcount(USER_SNAPSHOT_EXPIRY_KEY, "-inf", f"({now if now is not None else time.time()}")
+        raw_counters, expired = await pipe.execute()
+
+        result: dict[str, int] = {}
+        for name in SNAPSHOT_COUNTERS:
+            try:
+                result[name] = int(raw_counters.get(name, 0))
+            except (TypeError, ValueError):
+                result[name] = 0
+        result["expired"] = int(expired)
+        return result
+
+    async def is_fresh(self, max_age_seconds: int) -> bool:
+        """Check whether a complete sync finished within ``max_age_seconds``.
+
+        Args:
+            max_age_seconds: Maximum tolerated age of the last complete sync
+
+        Returns:
+            True if the aggregates can be used instead of a fleet scan
+        """
+        raw = await self._redis.get(USER_SNAPSHOT_SYNCED_AT_KEY)
+        if raw is None:
+            return False
+        try:
+            synced_at = float(raw)
+        except (TypeError, ValueError):
+            logger.warning("user_snapshot_invalid_synced_at", value=raw)
+            return False
+        return time.time() - synced_at <= max_age_seconds
@@ -3,5 +3,11 @@
 from src.tasks.analytics.daily_stats import aggregate_daily_stats
 from src.tasks.analytics.financial_stats import aggregate_financial_stats
 from src.tasks.analytics.refresh_growth_reporting import refresh_growth_reporting_rollups
+from src.tasks.analytics.stats_rollups import refresh_stats_rollups
 
-__all__ = ["aggregate_daily_stats", "aggregate_financial_stats", "refresh_growth_reporting_rollups"]
+__all__ = [
+    "aggregate_daily_stats",
+    "aggregate_financial_stats",
+    "refresh_growth_reporting_rollups",
+    "refresh_stats_rollups",
+]
@@ -1,7 +1,7 @@
 """Daily business metrics aggregation."""
 
 import json
-from collections import Counter, defaultdict
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 
 import structlog
@@ -9,13 +9,13 @@ from sqlalchemy import func, select
 
 from src.broker import broker
 from src.database.session import get_session_factory
-from src.models.audit_log import AuditLogModel
-from src.models.payment import PaymentModel
 from src.models.webhook_log import WebhookLogModel
 from src.services.cache_service import CacheService
 from src.services.redis_client import get_redis_client
 from src.services.remnawave_client import RemnawaveClient
-from src.utils.constants import REDIS_PREFIX, STATS_DAILY_KEY
+from src.services.stats_rollups import StatsRollups
+from src.services.user_snapshot import UserSnapshot
+from src.utils.constants import REDIS_PREFIX, STATS_DAILY_KEY, USER_SNAPSHOT_DAILY_MAX_AGE_SECONDS
 
 logger = structlog.get_logger(__name__)
 
@@ -27,105 +27,47 @@ async def aggregate_daily_stats() -> dict:
     cache = CacheService(redis)
 
     try:
-        async with RemnawaveClient() as rw:
-            users = await rw.get_users()
-            await rw.get_system_stats()
-
         now = datetime.now(UTC)
         today = now.date()
         start = datetime.combine(today - timedelta(days=1), datetime.min.time(), tzinfo=UTC)
         end = datetime.combine(today, datetime.min.time(), tzinfo=UTC)
 
-        total_users = len(users)
-        active_users = sum(1 for u in users if u.get("status") == "active")
-        disabled_users = sum(1 for u in users if u.get("status") == "disabled")
-        expired_users = 0
-        limited_users = 0
-        online_users = sum(1 for u in users if u.get("is_online", False))
-        total_bandwidth = sum(u.get("used_traffic_bytes", 0) or 0 for u in users)
-
-        for user in users:
-            expire_at = user.get("expire_at")
-            if expire_at:
-                try:
-                    exp_dt = datetime.fromisoformat(expire_at.replace("Z", "+00:00"))
-                    if exp_dt < now:
-                        expired_users += 1
-                except (ValueError, TypeError):
-                    pass
-
-            data_limit = user.get("traffic_limit_bytes", 0)
-            data_used = user.get("used_traffic_bytes", 0)
-            if data_limit and data_used >= data_limit:
-                limited_users += 1
-
-        new_users = 0
-        churned_users = 0
-        admin_ops = 0
-        revenue_total = 0.0
+        snapshot = UserSnapshot(redis)
+        async with RemnawaveClient() as rw:
+            if await snapshot.is_fresh(USER_SNAPSHOT_DAILY_MAX_AGE_SECONDS):
+                aggregates = await snapshot.aggregates(now.timestamp())
+            else:
+                aggregates = await _scan_user_aggregates(rw, now)
+            await rw.get_system_stats()
+
         revenue_by_provider: dict[str, float] = defaultdict(float)
         revenue_by_plan: dict[str, float] = defaultdict(float)
-        top_errors: list[str] = []
 
         session_factory = get_session_factory()
         async with session_factory() as session:
-            new_users_stmt = (
-                select(func.count())
-                .select_from(AuditLogModel)
+            rollups = StatsRollups(session)
+            await rollups.refresh()
+            audit_totals = await rollups.audit_totals(start, end)
+            for row in await rollups.payment_totals(start, end, "provider", "plan_name"):
+                amount = float(row.total or 0)
+                revenue_by_provider[row.provider] += amount
+                revenue_by_plan[row.plan_name] += amount
+            revenue_total = sum(revenue_by_provider.values())
+
+            error_count = func.count().label("count")
+            errors_stmt = (
+                select(WebhookLogModel.error_message, error_count)
                 .where(
-                    AuditLogModel.action == "user.created",
-                    AuditLogModel.created_at >= start,
-                    AuditLogModel.created_at < end,
+                    WebhookLogModel.error_message.is_not(None),
+                    WebhookLogModel.error_message != "",
+                    WebhookLogModel.created_at >= start,
+                    WebhookLogModel.created_at < end,
                 )
+                .group_by(WebhookLogModel.error_message)
+                .order_by(error_count.desc(), WebhookLogModel.error_message)
+                .limit(5)
             )
-            new_users = (await session.execute(new_users_stmt)).scalar() or 0
-
-            admin_ops_stmt = (
-                select(func.count())
-                .select_from(AuditLogModel)
-                .where(
-                    AuditLogModel.admin_id.is_not(None),
-                    AuditLogModel.created_at >= start,
-                    AuditLogModel.created_at < end,
-                )
-            )
-            admin_ops = (await session.execute(admin_ops_stmt)).scalar() or 0
-
-            updated_stmt = select(AuditLogModel).where(
-                AuditLogModel.action == "user.updated",
-                AuditLogModel.created_at >= start,
-                AuditLogModel.created_at < end,
-            )
-            updated_logs = (await session.execute(updated_stmt)).scalars().all()
-            for log in updated_logs:
-                new_value = log.new_value or {}
-                if new_value.get("status") in {"disabled", "expired"}:
-                    churned_users += 1
-
-            payments_stmt = select(PaymentModel).where(
-                PaymentModel.status == "completed",
-                PaymentModel.created_at >= start,
-                PaymentModel.created_at < end,
-            )
-            payments = (await session.execute(payments_stmt)).scalars().all()
-            for payment in payments:
-                amount = float(payment.amount)
-                revenue_total += amount
-                revenue_by_provider[payment.provider] += amount
-                plan_name = ""
-                if payment.metadata_ and isinstance(payment.metadata_, dict):
-                    plan_name = payment.metadata_.get("plan_name") or payment.metadata_.get("planName") or ""
-                revenue_by_plan[plan_name or "unknown"] += amount
-
-            errors_stmt = select(WebhookLogModel.error_message).where(
-                WebhookLogModel.error_message.is_not(None),
-                WebhookLogModel.created_at >= start,
-                WebhookLogModel.created_at < end,
-            )
-            error_rows = (await session.execute(errors_stmt)).all()
-            error_messages = [row[0] for row in error_rows if row[0]]
-            error_counts = Counter(error_messages)
-            top_errors = [err for err, _ in error_counts.most_common(5)]
+            top_errors = [row[0] for row in (await session.execute(errors_stmt)).all()]
 
         incidents = 0
         incidents_by_node: dict[str, int] = defaultdict(int)
@@ -185,22 +127,22 @@ async def aggregate_daily_stats() -> dict:
 
         stats = {
             "date": start.strftime("%Y-%m-%d"),
-            "total_users": total_users,
-            "active_users": active_users,
-            "disabled_users": disabled_users,
-            "expired_users": expired_users,
-            "limited_users": limited_users,
-            "online_users": online_users,
-            "new_users": new_users,
-            "churned_users": churned_users,
+            "total_users": aggregates["total"],
+            "active_users": aggregates["active"],
+            "disabled_users": aggregates["disabled"],
+            "expired_users": aggregates["expired"],
+            "limited_users": aggregates["limited"],
+            "online_users": aggregates["online"],
+            "new_users": audit_totals["new_users"],
+            "churned_users": audit_totals["churned_users"],
             "revenue_usd": revenue_total,
             "revenue_by_provider": dict(revenue_by_provider),
             "revenue_by_plan": dict(revenue_by_plan),
-            "total_bandwidth_bytes": total_bandwidth,
+            "total_bandwidth_bytes": aggregates["used_traffic_bytes"],
             "server_uptime_pct": uptime_pct,
             "incidents": incidents,
             "incidents_by_node": dict(incidents_by_node),
-            "admin_ops": admin_ops,
+            "admin_ops": audit_totals["admin_ops"],
             "top_errors": top_errors,
         }
 
@@ -211,3 +153,41 @@ async def aggregate_daily_stats() -> dict:
 
     logger.info("daily_stats_aggregated", stats=stats)
     return stats
+
+
+async def _scan_user_aggregates(rw: RemnawaveClient, now: datetime) -> dict[str, int]:
+    """Compute the user aggregates by streaming the fleet when the snapshot is stale."""
+    aggregates = {
+        "total": 0,
+        "active": 0,
+        "disabled": 0,
+        "expired": 0,
+        "limited": 0,
+        "online": 0,
+        "used_traffic_bytes": 0,
+    }
+    async for user in rw.iter_users():
+        aggregates["total"] += 1
+        status = user.get("status")
+        if status == "active":
+            aggregates["active"] += 1
+        elif status == "disabled":
+            aggregates["disabled"] += 1
+        if user.get("is_online", False):
+            aggregates["online"] += 1
+        aggregates["used_traffic_bytes"] += user.get("used_traffic_bytes", 0) or 0
+
+        expire_at = user.get("expire_at")
+        if expire_at:
+            try:
+                exp_dt = datetime.fromisoformat(expire_at.replace("Z", "+00:00"))
+                if exp_dt < now:
+                    aggregates["expired"] += 1
+            except (ValueError, TypeError):
+                pass
+
+        data_limit = user.get("traffic_limit_bytes", 0)
+        data_used = user.get("used_traffic_bytes", 0)
+        if data_limit and data_used >= data_limit:
+            aggregates["limited"] += 1
+    return aggregates
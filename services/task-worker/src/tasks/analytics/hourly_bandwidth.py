@@ -1,25 +1,25 @@
-"""Aggregate 5-minute bandwidth snapshots into hourly buckets."""
+"""Roll up 5-minute bandwidth samples into hourly and daily buckets."""
 
-import json
 from datetime import UTC, datetime, timedelta
 
 import structlog
 from redis.asyncio import Redis
 
 from src.broker import broker
+from src.services.bandwidth_series import BandwidthSeries
 from src.services.redis_client import get_redis_client
-from src.utils.constants import BANDWIDTH_KEY, REDIS_PREFIX
 
 logger = structlog.get_logger(__name__)
 
 
 @broker.task(task_name="aggregate_hourly_bandwidth", queue="analytics")
 async def aggregate_hourly_bandwidth() -> dict:
-    """Aggregate 5-minute bandwidth snapshots into hourly buckets.
+    """Roll up 5-minute bandwidth samples into hourly (and, after midnight, daily) buckets.
 
-    Reads raw bandwidth data from Redis sorted sets (5-minute snapshots),
-    aggregates them into hourly buckets with sum/avg/max metrics,
-    and sets appropriate TTLs (30 days for hourly, deletes raw > 48h).
+    Reads the previous hour of every node's time series with one pipelined
+    ``ZRANGEBYSCORE`` round-trip, stores sum/avg/max/min/p95 per node in the
+    1h rollup series (30 day retention), and on the first run of a UTC day also
+    rolls the previous day into the 1d series (365 day retention).
 
     Returns:
         Dictionary with nodes_processed and snapshots_aggregated counts
@@ -27,95 +27,34 @@ async def aggregate_hourly_bandwidth() -> dict:
     redis: Redis = get_redis_client()
     nodes_processed = 0
     snapshots_aggregated = 0
+    daily_nodes = 0
 
     try:
-        # Get current hour timestamp (aligned to hour boundary)
-        now = datetime.now(UTC)
-        current_hour = now.replace(minute=0, second=0, microsecond=0)
-        hour_timestamp = int(current_hour.timestamp())
-
-        # Time range for last hour of 5-minute snapshots
+        series = BandwidthSeries(redis)
+        current_hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
         hour_start = current_hour - timedelta(hours=1)
-        hour_end = current_hour
-
-        # Get all node UUIDs from raw bandwidth key pattern
-        cursor = 0
-        node_uuids = set()
-
-        while True:
-            cursor, keys = await redis.scan(cursor, match=f"{REDIS_PREFIX}bandwidth:*", count=100)
-            for key in keys:
-                key_str = key.decode("utf-8") if isinstance(key, bytes) else key
-                if ":bandwidth:hourly:" in key_str:
-                    continue
-                # Parse node UUID from key pattern: cybervpn:bandwidth:{node_uuid}:{timestamp}
-                parts = key_str.split(":")
-                if len(parts) >= 4:
-                    node_uuids.add(parts[2])
-            if cursor == 0:
-                break
-
-        # Aggregate for each node
-        for node_uuid in node_uuids:
-            bandwidth_values = []
-
-            # Collect all 5-minute snapshots from the last hour
-            timestamp = hour_start
-            while timestamp < hour_end:
-                ts = int(timestamp.timestamp())
-                key = BANDWIDTH_KEY.format(node_uuid=node_uuid, timestamp=ts)
-                value = await redis.get(key)
-
-                if value:
-                    try:
-                        payload = json.loads(value)
-                        total_value = payload.get("total")
-                        if total_value is None:
-                            total_value = (payload.get("up", 0) or 0) + (payload.get("down", 0) or 0)
-                        bandwidth_values.append(int(total_value))
-                    except (ValueError, TypeError, json.JSONDecodeError):
-                        logger.warning("invalid_bandwidth_value", node=node_uuid, value=value)
-
-                timestamp += timedelta(minutes=5)
-
-            # Compute aggregates
-            if bandwidth_values:
-                total = sum(bandwidth_values)
-                avg = total // len(bandwidth_values)
-                max_val = max(bandwidth_values)
-                min_val = min(bandwidth_values)
+        node_uuids = await series.node_uuids()
 
-                # Store hourly aggregates
-                hourly_key = f"{REDIS_PREFIX}bandwidth:hourly:{node_uuid}:{hour_timestamp}"
-                await redis.hset(  # type: ignore[misc]
-                    hourly_key,
-                    mapping={
-                        "sum": str(total),
-                        "avg": str(avg),
-                        "max": str(max_val),
-                        "min": str(min_val),
-                        "samples": str(len(bandwidth_values)),
-                    },
-                )
-                # TTL: 30 days
-                await redis.expire(hourly_key, 30 * 24 * 3600)  # type: ignore[misc]
-                snapshots_aggregated += len(bandwidth_values)
-                nodes_processed += 1
+        hourly = await series.rollup("1h", int(hour_start.timestamp()), node_uuids)
+        nodes_processed = len(hourly)
+        snapshots_aggregated = sum(bucket.samples for bucket in hourly.values())
 
-                logger.debug(
-                    "hourly_bandwidth_aggregated",
-                    node=node_uuid,
-                    hour=current_hour.isoformat(),
-                    sum=total,
-                    avg=avg,
-                    max=max_val,
-                )
+        if current_hour.hour == 0:
+            day_start = current_hour - timedelta(days=1)
+            daily = await series.rollup("1d", int(day_start.timestamp()), node_uuids)
+            daily_nodes = len(daily)
 
+        logger.debug("hourly_bandwidth_aggregated", hour=hour_start.isoformat(), nodes=nodes_processed)
     except Exception as e:
         logger.exception("hourly_bandwidth_aggregation_failed", error=str(e))
         raise
     finally:
         await redis.aclose()
 
-    logger.info("hourly_bandwidth_complete", nodes_processed=nodes_processed, snapshots_aggregated=snapshots_aggregated)
+    logger.info(
+        "hourly_bandwidth_complete",
+        nodes_processed=nodes_processed,
+        snapshots_aggregated=snapshots_aggregated,
+        daily_nodes=daily_nodes,
+    )
     return {"nodes_processed": nodes_processed, "snapshots_aggregated": snapshots_aggregated}
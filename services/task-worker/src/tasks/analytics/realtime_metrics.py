@@ -5,7 +5,8 @@ import structlog
 from src.broker import broker
 from src.services.redis_client import get_redis_client
 from src.services.remnawave_client import RemnawaveClient
-from src.utils.constants import DASHBOARD_REALTIME_KEY
+from src.services.user_snapshot import UserSnapshot
+from src.utils.constants import DASHBOARD_REALTIME_KEY, USER_SNAPSHOT_REALTIME_MAX_AGE_SECONDS
 
 logger = structlog.get_logger(__name__)
 
@@ -20,19 +21,32 @@ async def update_realtime_metrics() -> dict:
     - Current bandwidth usage
     - Latest events/alerts
 
+    User counts come from the user snapshot maintained by ``sync_user_stats``
+    when it is fresh; the fleet is only streamed from Remnawave otherwise.
+
     Caches results in Redis under DASHBOARD_REALTIME_KEY.
 
     Returns:
         Dictionary with online_users, active_servers, and updated status
     """
     redis = get_redis_client()
+    snapshot = UserSnapshot(redis)
     metrics = {}
 
     try:
         async with RemnawaveClient() as rw:
-            # Get users and count online
-            users = await rw.get_users()
-            online_users = sum(1 for u in users if u.get("status") == "active" and u.get("is_online", False))
+            if await snapshot.is_fresh(USER_SNAPSHOT_REALTIME_MAX_AGE_SECONDS):
+                aggregates = await snapshot.aggregates()
+                total_users = aggregates["total"]
+                online_users = aggregates["active_online"]
+            else:
+                # Snapshot is stale: stream users and count online
+                total_users = 0
+                online_users = 0
+                async for user in rw.iter_users():
+                    total_users += 1
+                    if user.get("status") == "active" and user.get("is_online", False):
+                        online_users += 1
 
             # Get nodes and count active/connected
             nodes = await rw.get_nodes()
@@ -51,7 +65,7 @@ async def update_realtime_metrics() -> dict:
                 "online_users": online_users,
                 "active_servers": active_servers,
                 "total_servers": len(nodes),
-                "total_users": len(users),
+                "total_users": total_users,
                 "current_bandwidth": current_bandwidth,
                 "last_updated": int(__import__("time").time()),
             }
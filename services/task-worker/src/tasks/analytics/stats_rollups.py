@@ -0,0 +1,24 @@
+"""Incremental refresh of the audit-log and payment hourly rollups."""
+
+import structlog
+
+from src.broker import broker
+from src.database.session import get_session_factory
+from src.services.stats_rollups import StatsRollups
+
+logger = structlog.get_logger(__name__)
+
+
+@broker.task(task_name="refresh_stats_rollups", queue="analytics")
+async def refresh_stats_rollups() -> dict:
+    """Fold audit-log and payment rows changed since the last run into the hourly rollups.
+
+    Runs frequently so every refresh only touches the last few hours; the daily
+    stats tasks refresh once more before reading so their day is complete.
+
+    Returns:
+        Number of hourly buckets rewritten per rollup
+    """
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        return await StatsRollups(session).refresh()
@@ -1,7 +1,9 @@
-"""Generate CSV/JSON data exports."""
+"""Generate streaming, compressed, resumable data exports."""
 
-import csv
 import json
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -10,146 +12,237 @@ import structlog
 from sqlalchemy import text
 
 from src.broker import broker
+from src.config import get_settings
 from src.database.session import get_session_factory
+from src.services.export_writers import EXPORT_COMPRESSIONS, EXPORT_FORMATS, export_suffix, open_export_writer
 from src.services.redis_client import get_redis_client
 
 logger = structlog.get_logger(__name__)
 
 EXPORT_DIR = Path("/tmp/exports")  # noqa: S108 - task exports are intentionally temporary files.
+EXPORT_META_TTL_SECONDS = 86400
 
-# Export types and their corresponding SQL queries
-EXPORT_QUERIES = {
-    "users": "SELECT uuid, username, status, created_at, expires_at FROM users ORDER BY created_at DESC",
-    "payments": "SELECT id, user_uuid, amount, currency, status, created_at FROM payments ORDER BY created_at DESC",
-    "servers": "SELECT uuid, name, country_code, is_connected, created_at FROM servers ORDER BY name",
-    "audit": "SELECT id, user_uuid, action, resource, created_at FROM audit_log ORDER BY created_at DESC",
-}
-
-
-def _to_csv_value(value: Any) -> Any:
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return value
-
+_RESUME_FIELDS = ("export_type", "format", "compression", "since", "until")
 
-def _to_json_value(value: Any) -> Any:
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return str(value) if value is not None else None
 
+@dataclass(frozen=True)
+class ExportSource:
+    """Table exported by ``bulk_export``.
 
-def _write_csv_export(file_path: Path, result: Any) -> int:
-    rows_exported = 0
-
-    with file_path.open("w", newline="", encoding="utf-8") as file:
-        writer = None
-        batch_size = 1000
-
-        while True:
-            rows = result.fetchmany(batch_size)
-            if not rows:
-                break
-
-            if writer is None:
-                writer = csv.DictWriter(file, fieldnames=rows[0]._mapping.keys())
-                writer.writeheader()
-
-            for row in rows:
-                writer.writerow({key: _to_csv_value(value) for key, value in row._mapping.items()})
-                rows_exported += 1
-
-            if len(rows) < batch_size:
-                break
+    ``key`` is a unique ordering used for keyset pagination and for resuming
+    after the last completed chunk; each entry pairs a column with the parser
+    that restores its value from the JSON progress record.
+    """
 
-    return rows_exported
+    table: str
+    columns: tuple[str, ...]
+    key: tuple[tuple[str, Callable[[str], Any]], ...]
+    date_column: str
+
+
+EXPORT_SOURCES = {
+    "users": ExportSource(
+        "users",
+        ("uuid", "username", "status", "created_at", "expires_at"),
+        (("created_at", datetime.fromisoformat), ("uuid", uuid.UUID)),
+        "created_at",
+    ),
+    "payments": ExportSource(
+        "payments",
+        ("id", "user_uuid", "amount", "currency", "status", "created_at"),
+        (("created_at", datetime.fromisoformat), ("id", uuid.UUID)),
+        "created_at",
+    ),
+    "servers": ExportSource(
+        "servers",
+        ("uuid", "name", "country_code", "is_connected", "created_at"),
+        (("name", str), ("uuid", uuid.UUID)),
+        "created_at",
+    ),
+    "audit": ExportSource(
+        "audit_log",
+        ("id", "user_uuid", "action", "resource", "created_at"),
+        (("created_at", datetime.fromisoformat), ("id", uuid.UUID)),
+        "created_at",
+    ),
+}
 
 
-def _prepare_export_file_path(export_type: str, export_format: str, timestamp: str, job_id: str) -> Path:
+def _build_query(source: ExportSource, *, since: bool, until: bool, after: bool) -> Any:
+    conditions = []
+    if since:
+        conditions.append(f"{source.date_column} >= :since")
+    if until:
+        conditions.append(f"{source.date_column} < :until")
+    key_columns = [column for column, _parse in source.key]
+    if after:
+        placeholders = ", ".join(f":after_{index}" for index in range(len(key_columns)))
+        conditions.append(f"({', '.join(key_columns)}) > ({placeholders})")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return text(
+        f"SELECT {', '.join(source.columns)} FROM {source.table}{where} "  # noqa: S608 - identifiers are constants.
+        f"ORDER BY {', '.join(key_columns)}"
+    )
+
+
+def _chunk_path(export_type: str, job_id: str, index: int, export_format: str, compression: str) -> Path:
     EXPORT_DIR.mkdir(exist_ok=True)
-    return EXPORT_DIR / f"{export_type}_{timestamp}_{job_id}.{export_format}"
+    return EXPORT_DIR / f"{export_type}_{job_id}.part{index:04d}{export_suffix(export_format, compression)}"
 
 
-def _write_json_export(file_path: Path, result: Any) -> int:
-    rows_exported = 0
+def _key_values(source: ExportSource, row: Sequence[Any]) -> list[Any]:
+    return [row[source.columns.index(column)] for column, _parse in source.key]
 
-    with file_path.open("w", encoding="utf-8") as file:
-        file.write("[\n")
-        batch_size = 1000
-        first_item = True
 
-        while True:
-            rows = result.fetchmany(batch_size)
-            if not rows:
-                break
+def _parse_cursor(source: ExportSource, cursor: list[str]) -> list[Any]:
+    return [parse(value) for (_column, parse), value in zip(source.key, cursor, strict=True)]
 
-            for row in rows:
-                row_dict = {key: _to_json_value(value) for key, value in row._mapping.items()}
 
-                if not first_item:
-                    file.write(",\n")
-                json.dump(row_dict, file, ensure_ascii=False, indent=2)
-                first_item = False
-                rows_exported += 1
+def _parse_date(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
 
-            if len(rows) < batch_size:
-                break
 
-        file.write("\n]")
+def _result(meta: dict, job_id: str) -> dict:
+    files = [entry["file_path"] for entry in meta["files"]]
+    return {"file_path": files[0] if files else None, "files": files, "rows_exported": meta["rows"], "job_id": job_id}
 
-    return rows_exported
 
+def _file_entry(writer: Any) -> dict:
+    return {"file_path": str(writer.path), "rows": writer.rows, "bytes": writer.path.stat().st_size}
 
-@broker.task(task_name="bulk_export", queue="bulk")
-async def bulk_export(export_type: str, format: str = "csv", job_id: str | None = None) -> dict:  # noqa: A002
-    """Generate CSV/JSON data exports.
 
-    Queries data from PostgreSQL in batches of 1000, streams to file,
-    and stores file path in Redis for download.
+@broker.task(task_name="bulk_export", queue="bulk")
+async def bulk_export(
+    export_type: str,
+    format: str = "csv",  # noqa: A002
+    job_id: str | None = None,
+    compression: str = "gzip",
+    since: str | None = None,
+    until: str | None = None,
+) -> dict:
+    """Stream a table export into compressed, resumable chunk files.
+
+    Rows are read through a server-side cursor (``yield_per``) in keyset order
+    and written straight into chunk files of at most ``export_chunk_rows``
+    rows. After every finished chunk the progress (chunk list and last key) is
+    stored under ``cybervpn:export:{job_id}``, so re-running the task with the
+    same ``job_id`` continues after the last complete chunk instead of
+    starting over.
 
     Args:
         export_type: Type of data to export (users, payments, servers, audit)
-        format: Export format (csv or json). This name is part of the task payload contract.
-        job_id: Optional job ID for tracking
+        format: Export format (csv, json, ndjson or parquet). This name is part of the task payload contract.
+        job_id: Optional job ID for tracking and resuming
+        compression: Output compression (none, gzip or zstd)
+        since: Optional inclusive ISO-8601 lower bound on the source date column
+        until: Optional exclusive ISO-8601 upper bound on the source date column
 
     Returns:
-        Dictionary with file_path, rows_exported, and job_id
+        Dictionary with file_path (first chunk), files, rows_exported, and job_id
     """
-    if export_type not in EXPORT_QUERIES:
-        raise ValueError(f"Invalid export_type: {export_type}. Must be one of {list(EXPORT_QUERIES.keys())}")
+    if export_type not in EXPORT_SOURCES:
+        raise ValueError(f"Invalid export_type: {export_type}. Must be one of {list(EXPORT_SOURCES.keys())}")
 
-    if format not in ["csv", "json"]:
-        raise ValueError(f"Invalid format: {format}. Must be 'csv' or 'json'")
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format: {format}. Must be one of {list(EXPORT_FORMATS)}")
 
-    if not job_id:
-        import uuid
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Invalid compression: {compression}. Must be one of {list(EXPORT_COMPRESSIONS)}")
 
+    if not job_id:
         job_id = str(uuid.uuid4())
 
+    settings = get_settings()
+    source = EXPORT_SOURCES[export_type]
     session_factory = get_session_factory()
     redis = get_redis_client()
+    export_key = f"cybervpn:export:{job_id}"
 
     try:
-        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-        file_path = _prepare_export_file_path(export_type, format, timestamp, job_id)
-
-        async with session_factory() as session:
-            query = text(EXPORT_QUERIES[export_type])
-            result = await session.execute(query)
-            rows_exported = (
-                _write_csv_export(file_path, result) if format == "csv" else _write_json_export(file_path, result)
-            )
-
-        export_key = f"cybervpn:export:{job_id}"
-        export_meta = {
-            "file_path": str(file_path),
+        meta = {
             "export_type": export_type,
             "format": format,
-            "rows": rows_exported,
+            "compression": compression,
+            "since": since,
+            "until": until,
+            "status": "running",
+            "files": [],
+            "rows": 0,
+            "cursor": None,
             "created_at": datetime.now(UTC).isoformat(),
         }
-        await redis.set(export_key, json.dumps(export_meta), ex=86400)
+        previous = await redis.get(export_key)
+        if previous:
+            stored = json.loads(previous)
+            # Only resume a run of the same export; anything else starts over under this job id.
+            if all(stored.get(field) == meta[field] for field in _RESUME_FIELDS):
+                meta = stored
+        if meta["status"] == "complete":
+            logger.info("bulk_export_already_complete", job_id=job_id)
+            return _result(meta, job_id)
+
+        params: dict[str, Any] = {}
+        if since is not None:
+            params["since"] = _parse_date(since)
+        if until is not None:
+            params["until"] = _parse_date(until)
+        if meta["cursor"] is not None:
+            params.update(
+                {f"after_{index}": value for index, value in enumerate(_parse_cursor(source, meta["cursor"]))}
+            )
+            logger.info("bulk_export_resuming", job_id=job_id, chunks=len(meta["files"]), rows=meta["rows"])
+        query = _build_query(source, since=since is not None, until=until is not None, after=meta["cursor"] is not None)
+
+        async def finish_chunk(writer: Any, last_row: Sequence[Any]) -> None:
+            writer.close()
+            meta["files"].append(_file_entry(writer))
+            meta["rows"] += writer.rows
+            meta["cursor"] = [str(value) for value in _key_values(source, last_row)]
+            await redis.set(export_key, json.dumps(meta), ex=EXPORT_META_TTL_SECONDS)
 
-        logger.info("bulk_export_complete", export_type=export_type, format=format, rows=rows_exported, job_id=job_id)
+        chunk_rows = settings.export_chunk_rows
+        writer = None
+        last_row: Sequence[Any] = ()
+        async with session_factory() as session:
+            result = await session.stream(query, params, execution_options={"yield_per": settings.export_batch_size})
+            async for partition in result.partitions():
+                rows = [tuple(row) for row in partition]
+                while rows:
+                    if writer is None:
+                        path = _chunk_path(export_type, job_id, len(meta["files"]) + 1, format, compression)
+                        writer = open_export_writer(path, format, source.columns, compression)
+                    batch, rows = rows[: chunk_rows - writer.rows], rows[chunk_rows - writer.rows :]
+                    writer.write_rows(batch)
+                    last_row = batch[-1]
+                    if writer.rows >= chunk_rows:
+                        await finish_chunk(writer, last_row)
+                        writer = None
+
+        if writer is not None:
+            await finish_chunk(writer, last_row)
+        elif not meta["files"]:
+            # Nothing matched: still produce one (empty) file so downloads behave uniformly.
+            path = _chunk_path(export_type, job_id, 1, format, compression)
+            writer = open_export_writer(path, format, source.columns, compression)
+            writer.close()
+            meta["files"].append(_file_entry(writer))
+
+        meta["status"] = "complete"
+        meta["completed_at"] = datetime.now(UTC).isoformat()
+        await redis.set(export_key, json.dumps(meta), ex=EXPORT_META_TTL_SECONDS)
+
+        logger.info(
+            "bulk_export_complete",
+            export_type=export_type,
+            format=format,
+            compression=compression,
+            rows=meta["rows"],
+            chunks=len(meta["files"]),
+            job_id=job_id,
+        )
 
     except Exception as e:
         logger.exception("bulk_export_failed", export_type=export_type, error=str(e), job_id=job_id)
@@ -157,4 +250,5 @@ async def bulk_export(export_type: str, format: str = "csv", job_id: str | None
     finally:
         await redis.aclose()
 
-    return {"file_path": str(file_path), "rows_exported": rows_exported, "job_id": job_id}
+    return _result(meta, job_id)
+
@@ -5,6 +5,7 @@ from datetime import UTC, datetime, timedelta
 import structlog
 
 from src.broker import broker
+from src.services.bandwidth_series import BandwidthSeries
 from src.services.redis_client import get_redis_client
 from src.utils.constants import REDIS_PREFIX
 
@@ -19,7 +20,8 @@ async def cleanup_cache() -> dict:
     - cybervpn:cache:* - General cache (stale entries only)
     - cybervpn:stats:daily:* - Daily stats older than 90 days
     - cybervpn:health:*:history - Health history older than 7 days
-    - cybervpn:bandwidth:* - Raw bandwidth data older than 48h, hourly older than 30 days
+    - cybervpn:bandwidth:* - Time series of nodes that stopped reporting (raw and
+      rollup retention is already enforced whenever a series is written)
 
     Uses SCAN for iteration to avoid blocking Redis, and UNLINK for async deletion.
     """
@@ -44,22 +46,9 @@ async def cleanup_cache() -> dict:
         health_deleted = await _cleanup_health_history(redis, health_cutoff)
         total_deleted += health_deleted
 
-        # Pattern 3: Raw bandwidth data older than 48 hours
-        bandwidth_raw_cutoff = now - timedelta(hours=48)
-        bandwidth_raw_deleted = await _scan_and_delete_by_timestamp(
-            redis,
-            f"{REDIS_PREFIX}bandwidth:*",
-            bandwidth_raw_cutoff,
-            exclude_substring=":bandwidth:hourly:",
-        )
-        total_deleted += bandwidth_raw_deleted
-
-        # Pattern 4: Hourly bandwidth aggregates older than 30 days
-        bandwidth_hourly_cutoff = now - timedelta(days=30)
-        bandwidth_hourly_deleted = await _scan_and_delete_by_timestamp(
-            redis, f"{REDIS_PREFIX}bandwidth:hourly:*", bandwidth_hourly_cutoff
-        )
-        total_deleted += bandwidth_hourly_deleted
+        # Pattern 3: Bandwidth series of decommissioned nodes
+        bandwidth_nodes_pruned = await BandwidthSeries(redis).prune(now.timestamp())
+        total_deleted += bandwidth_nodes_pruned
 
         logger.info(
             "cache_cleanup_complete",
@@ -67,8 +56,7 @@ async def cleanup_cache() -> dict:
             stats_deleted=stats_deleted,
             cache_deleted=cache_deleted,
             health_deleted=health_deleted,
-            bandwidth_raw_deleted=bandwidth_raw_deleted,
-            bandwidth_hourly_deleted=bandwidth_hourly_deleted,
+            bandwidth_nodes_pruned=bandwidth_nodes_pruned,
         )
     finally:
         await redis.aclose()
@@ -78,8 +66,7 @@ async def cleanup_cache() -> dict:
         "stats_deleted": stats_deleted,
         "cache_deleted": cache_deleted,
         "health_deleted": health_deleted,
-        "bandwidth_raw_deleted": bandwidth_raw_deleted,
-        "bandwidth_hourly_deleted": bandwidth_hourly_deleted,
+        "bandwidth_nodes_pruned": bandwidth_nodes_pruned,
     }
 
 
@@ -122,35 +109,6 @@ async def _scan_and_delete_by_date(redis, pattern: str, cutoff: datetime, date_f
     return deleted
 
 
-async def _scan_and_delete_by_timestamp(
-    redis, pattern: str, cutoff: datetime, exclude_substring: str | None = None
-) -> int:
-    """Scan keys with Unix timestamp suffix and delete those older than cutoff."""
-    deleted = 0
-    cursor = 0
-    cutoff_ts = int(cutoff.timestamp())
-
-    while True:
-        cursor, keys = await redis.scan(cursor, match=pattern, count=100)
-        for key in keys:
-            key_str = key.decode("utf-8") if isinstance(key, bytes) else key
-            if exclude_substring and exclude_substring in key_str:
-                continue
-            try:
-                # Extract timestamp from key (assumes format like "prefix:node_uuid:1234567890")
-                timestamp_part = key_str.split(":")[-1]
-                key_ts = int(timestamp_part)
-                if key_ts < cutoff_ts:
-                    deleted += await redis.unlink(key)
-            except (ValueError, IndexError):
-                # Skip keys that don't match expected format
-                continue
-        if cursor == 0:
-            break
-
-    return deleted
-
-
 async def _cleanup_health_history(redis, cutoff: datetime) -> int:
     """Remove health history entries older than cutoff from sorted sets."""
     deleted = 0
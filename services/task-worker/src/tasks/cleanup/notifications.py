@@ -3,52 +3,39 @@
 from datetime import UTC, datetime, timedelta
 
 import structlog
-from sqlalchemy import delete
 
 from src.broker import broker
+from src.config import get_settings
 from src.database.session import get_session_factory
-from src.models.notification_queue import NotificationQueueModel
+from src.services.table_retention import DeleteBudget, bounded_delete
 
 logger = structlog.get_logger(__name__)
 
 
 @broker.task(task_name="cleanup_notifications", queue="cleanup")
 async def cleanup_notifications() -> dict:
-    """Delete sent and failed notifications older than 7 days in batches.
+    """Delete sent and failed notifications older than 7 days in bounded batches.
 
     Removes notification queue entries where:
     - status is 'sent' OR 'failed'
     - created_at is older than 7 days
 
-    Processes in batches of 1000 to avoid long-running transactions.
+    ``notification_queue`` is referenced by delivery tables and cannot be
+    partitioned, so rows go in throttled ``ctid`` batches of
+    ``cleanup_delete_batch_size``, one short transaction each.
     """
+    settings = get_settings()
     factory = get_session_factory()
-    now = datetime.now(UTC)
-    cutoff = now - timedelta(days=7)
-    total_deleted = 0
-    batch_size = 1000
+    cutoff = datetime.now(UTC) - timedelta(days=7)
 
     async with factory() as session:
-        while True:
-            # Delete in batches
-            stmt = (
-                delete(NotificationQueueModel)
-                .where(
-                    NotificationQueueModel.status.in_(["sent", "failed"]),
-                    NotificationQueueModel.created_at < cutoff,
-                )
-                .execution_options(synchronize_session=False)
-            )
-
-            result = await session.execute(stmt)
-            deleted_count = result.rowcount
-            await session.commit()
-
-            total_deleted += deleted_count
-
-            # Stop when no more rows to delete
-            if deleted_count == 0 or deleted_count < batch_size:
-                break
+        total_deleted = await bounded_delete(
+            session,
+            "notification_queue",
+            "status IN ('sent', 'failed') AND created_at < :cutoff",
+            {"cutoff": cutoff},
+            DeleteBudget.from_settings(settings),
+        )
 
     logger.info("notifications_cleanup_complete", deleted=total_deleted)
     return {"deleted": total_deleted}
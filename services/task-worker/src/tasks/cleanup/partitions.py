@@ -0,0 +1,44 @@
+"""Pre-create and expire range partitions of the log tables."""
+
+from datetime import UTC, datetime, timedelta
+
+import structlog
+
+from src.broker import broker
+from src.config import get_settings
+from src.database.session import get_session_factory
+from src.services.table_retention import PartitionManager
+from src.utils.constants import PARTITIONED_LOG_TABLES
+
+logger = structlog.get_logger(__name__)
+
+
+@broker.task(task_name="manage_log_partitions", queue="cleanup")
+async def manage_log_partitions() -> dict:
+    """Create upcoming partitions and drop expired ones for every partitioned log table.
+
+    Keeps ``cleanup_partitions_ahead`` future periods created so inserts never
+    fall outside a partition, and detaches and drops partitions that ended
+    before the table's retention cutoff. Tables not yet partitioned are skipped.
+    """
+    settings = get_settings()
+    factory = get_session_factory()
+    now = datetime.now(UTC)
+    retention_days = {
+        "audit_logs": settings.cleanup_audit_retention_days,
+        "webhook_logs": settings.cleanup_webhook_retention_days,
+    }
+    results: dict[str, dict] = {}
+
+    async with factory() as session:
+        manager = PartitionManager(session)
+        for table, interval in PARTITIONED_LOG_TABLES.items():
+            if not await manager.is_partitioned(table):
+                logger.warning("log_table_not_partitioned", table=table)
+                continue
+            created = await manager.ensure_partitions(table, interval, settings.cleanup_partitions_ahead, now)
+            dropped = await manager.drop_expired(table, now - timedelta(days=retention_days[table]))
+            results[table] = {"created": len(created), "dropped": len(dropped)}
+
+    logger.info("log_partitions_maintained", **results)
+    return results
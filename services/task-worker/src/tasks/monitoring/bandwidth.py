@@ -5,10 +5,11 @@ import time
 import structlog
 
 from src.broker import broker
+from src.services.bandwidth_series import BandwidthSeries
 from src.services.cache_service import CacheService
 from src.services.redis_client import get_redis_client
 from src.services.remnawave_client import RemnawaveClient
-from src.utils.constants import BANDWIDTH_KEY, DASHBOARD_REALTIME_KEY
+from src.utils.constants import DASHBOARD_REALTIME_KEY
 
 logger = structlog.get_logger(__name__)
 
@@ -18,8 +19,8 @@ async def collect_bandwidth_snapshot() -> dict:
     """Collect bandwidth data from all VPN nodes and store in Redis.
 
     Queries bandwidth statistics (upload/download bytes) from each VPN node via the
-    Remnawave API, stores individual snapshots in Redis with timestamps, and updates
-    the real-time dashboard cache with aggregated totals.
+    Remnawave API, appends one sample per node to the bandwidth time series with a
+    single pipeline, and updates the real-time dashboard cache with aggregated totals.
 
     Returns:
         Dictionary with nodes count, total_up bytes, and total_down bytes
@@ -31,6 +32,8 @@ async def collect_bandwidth_snapshot() -> dict:
     total_bytes_up = 0
     total_bytes_down = 0
 
+    samples: dict[str, tuple[int, int]] = {}
+
     try:
         async with RemnawaveClient() as client:
             nodes = await client.get_nodes()
@@ -39,19 +42,16 @@ async def collect_bandwidth_snapshot() -> dict:
             node_uuid = node.get("uuid", "")
             bytes_up = node.get("traffic_up", 0) or 0
             bytes_down = node.get("traffic_down", 0) or 0
-            total_bytes = bytes_up + bytes_down
 
-            bw_key = BANDWIDTH_KEY.format(node_uuid=node_uuid, timestamp=timestamp)
-            await cache.set(
-                bw_key,
-                {"up": bytes_up, "down": bytes_down, "total": total_bytes, "ts": timestamp},
-                ttl=48 * 3600,
-            )
+            if node_uuid:
+                samples[node_uuid] = (bytes_up, bytes_down)
 
             total_bytes_up += bytes_up
             total_bytes_down += bytes_down
             nodes_collected += 1
 
+        await BandwidthSeries(redis).record(timestamp, samples)
+
         # Update realtime dashboard cache
         await cache.set(
             DASHBOARD_REALTIME_KEY,
@@ -4,29 +4,84 @@ import json
 from datetime import UTC, datetime
 
 import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.broker import broker
 from src.database.session import get_session_factory
-from src.models.notification_queue import NotificationQueueModel
 from src.services.redis_client import get_redis_client
-from src.utils.constants import BULK_PROGRESS_KEY, STATUS_PENDING
+from src.utils.constants import BROADCAST_ENQUEUE_CHUNK_SIZE, BULK_PROGRESS_KEY, STATUS_PENDING
 
 logger = structlog.get_logger(__name__)
 
+# Server-side audiences: WHERE clauses over mobile_users, selected by name only
+BROADCAST_SEGMENTS = {
+    "all": "is_active",
+    "active": "is_active AND status = 'active'",
+    "trial": "is_active AND trial_expires_at > now()",
+    "partners": "is_active AND is_partner",
+}
+
+_ENQUEUE_IDS_SQL = """
+    INSERT INTO notification_queue (id, telegram_id, message, notification_type, status, attempts, scheduled_at)
+    SELECT gen_random_uuid(), recipient.telegram_id, :message, :notification_type, :status, 0, :scheduled_at
+    FROM unnest(CAST(:telegram_ids AS BIGINT[])) AS recipient(telegram_id)
+"""
+
+_ENQUEUE_SEGMENT_SQL = """
+    INSERT INTO notification_queue (id, telegram_id, message, notification_type, status, attempts, scheduled_at)
+    SELECT gen_random_uuid(), audience.telegram_id, :message, :notification_type, :status, 0, :scheduled_at
+    FROM (
+        SELECT DISTINCT telegram_id FROM mobile_users WHERE telegram_id IS NOT NULL AND ({segment_filter})
+    ) AS audience
+"""
+
+
+async def _enqueue_telegram_ids(session: AsyncSession, telegram_ids: list[int], params: dict) -> int:
+    """Insert one chunk of explicit recipients with a single ``INSERT ... SELECT unnest()``."""
+    result = await session.execute(text(_ENQUEUE_IDS_SQL), {**params, "telegram_ids": telegram_ids})
+    return result.rowcount
+
+
+async def _enqueue_segment(session: AsyncSession, segment: str, params: dict) -> int:
+    """Insert every recipient of a named segment without loading ids into the worker."""
+    statement = _ENQUEUE_SEGMENT_SQL.format(segment_filter=BROADCAST_SEGMENTS[segment])
+    result = await session.execute(text(statement), params)
+    return result.rowcount
+
 
 @broker.task(task_name="broadcast_message", queue="notifications")
 async def broadcast_message(
-    telegram_ids: list[int],
-    text: str,
+    telegram_ids: list[int] | None = None,
+    text: str = "",
     notification_type: str = "broadcast",
     job_id: str | None = None,
+    segment: str | None = None,
 ) -> dict:
     """Queue broadcast notifications for deferred delivery.
 
-    Inserts notification records into the notification_queue table for processing
-    by the queue worker. Tracks progress in Redis using BULK_PROGRESS_KEY.
+    Recipients are either an explicit list of Telegram ids, inserted in large
+    chunks with ``INSERT ... SELECT unnest(:ids)``, or a named ``segment`` from
+    ``BROADCAST_SEGMENTS``, inserted with one ``INSERT ... SELECT`` over
+    mobile_users so the id list never reaches the worker. Progress is tracked
+    in Redis under BULK_PROGRESS_KEY using the inserted row counts.
+
+    Args:
+        telegram_ids: Explicit Telegram chat ids to send to
+        text: HTML-formatted message text
+        notification_type: Type of notification (default: "broadcast")
+        job_id: Optional job ID for progress tracking
+        segment: Named audience to select server-side instead of ``telegram_ids``
+
+    Returns:
+        Dictionary with queued count and job_id
+
+    Raises:
+        ValueError: If ``segment`` is not a known audience
     """
-    if not telegram_ids:
+    if segment is not None and segment not in BROADCAST_SEGMENTS:
+        raise ValueError(f"Unknown broadcast segment: {segment}")
+    if segment is None and not telegram_ids:
         return {"queued": 0, "job_id": job_id}
 
     if not job_id:
@@ -36,45 +91,44 @@ async def broadcast_message(
 
     session_factory = get_session_factory()
     redis = get_redis_client()
+    progress_key = BULK_PROGRESS_KEY.format(job_id=job_id)
+    total = len(telegram_ids) if segment is None else None
     queued = 0
 
-    logger.info("broadcast_queue_started", recipient_count=len(telegram_ids), job_id=job_id)
+    logger.info("broadcast_queue_started", recipient_count=total, segment=segment, job_id=job_id)
 
     try:
         async with session_factory() as session:
-            scheduled_at = datetime.now(UTC)
-            batch_size = 500
-
-            for i in range(0, len(telegram_ids), batch_size):
-                batch = telegram_ids[i : i + batch_size]
-                notifications = [
-                    NotificationQueueModel(
-                        telegram_id=telegram_id,
-                        message=text,
-                        notification_type=notification_type,
-                        status=STATUS_PENDING,
-                        scheduled_at=scheduled_at,
-                    )
-                    for telegram_id in batch
-                ]
-
-                session.add_all(notifications)
+            params = {
+                "message": text,
+                "notification_type": notification_type,
+                "status": STATUS_PENDING,
+                "scheduled_at": datetime.now(UTC),
+            }
+
+            if segment is not None:
+                queued = await _enqueue_segment(session, segment, params)
                 await session.commit()
-
-                queued += len(batch)
-                progress_key = BULK_PROGRESS_KEY.format(job_id=job_id)
-                progress = {
-                    "total": len(telegram_ids),
-                    "queued": queued,
-                    "status": "in_progress" if queued < len(telegram_ids) else "completed",
-                }
-                await redis.set(progress_key, json.dumps(progress), ex=86400)
+                total = queued
+                await redis.set(
+                    progress_key,
+                    json.dumps({"total": total, "queued": queued, "status": "completed"}),
+                    ex=86400,
+                )
+            else:
+                for i in range(0, len(telegram_ids), BROADCAST_ENQUEUE_CHUNK_SIZE):
+                    chunk = telegram_ids[i : i + BROADCAST_ENQUEUE_CHUNK_SIZE]
+                    queued += await _enqueue_telegram_ids(session, chunk, params)
+                    await session.commit()
+
+                    done = i + len(chunk) >= len(telegram_ids)
+                    progress = {"total": total, "queued": queued, "status": "completed" if done else "in_progress"}
+                    await redis.set(progress_key, json.dumps(progress), ex=86400)
 
     except Exception as e:
         logger.exception("broadcast_queue_failed", error=str(e), job_id=job_id)
-        progress_key = BULK_PROGRESS_KEY.format(job_id=job_id)
         progress = {
-            "total": len(telegram_ids),
+            "total": total,
             "queued": queued,
             "status": "failed",
             "error": str(e),
@@ -84,5 +138,5 @@ async def broadcast_message(
     finally:
         await redis.aclose()
 
-    logger.info("broadcast_queue_complete", queued=queued, job_id=job_id)
+    logger.info("broadcast_queue_complete", queued=queued, segment=segment, job_id=job_id)
     return {"queued": queued, "job_id": job_id}
@@ -1,13 +1,20 @@
 """Process notification queue - picks up pending notifications and sends via Telegram."""
 
-from datetime import UTC, datetime
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
 
 import structlog
-from sqlalchemy import func, select, update
+from sqlalchemy import func, insert, select, update
 
 from src.broker import broker
 from src.config import get_settings
 from src.database.session import get_session_factory
+from src.metrics import (
+    NOTIFICATION_QUEUE_BATCH_DURATION,
+    NOTIFICATION_QUEUE_DELIVERIES_TOTAL,
+    NOTIFICATION_QUEUE_THROUGHPUT,
+)
 from src.models.customer_growth_notification_delivery import (
     CustomerGrowthNotificationDeliveryModel,
 )
@@ -15,49 +22,58 @@ from src.models.customer_growth_notification_delivery_event import (
     CustomerGrowthNotificationDeliveryEventModel,
 )
 from src.models.notification_queue import NotificationQueueModel
-from src.services.telegram_client import TelegramAPIError, TelegramClient
+from src.services.notification_delivery import (
+    OUTCOME_DEFERRED,
+    OUTCOME_SENT,
+    TelegramDeliveryPool,
+    TelegramSendJob,
+    TelegramSendOutcome,
+)
+from src.services.telegram_client import TelegramClient
 from src.utils.constants import STATUS_FAILED, STATUS_PENDING, STATUS_PROCESSING, STATUS_SENT
 
 logger = structlog.get_logger(__name__)
 
 
-def _record_delivery_event(
-    session,
+def _delivery_event(
     *,
     delivery_id,
     notification_queue_id,
     delivery_status: str,
     event_type: str,
+    occurred_at: datetime,
     reason_code: str | None = None,
     event_payload: dict | None = None,
-) -> None:
-    session.add(
-        CustomerGrowthNotificationDeliveryEventModel(
-            delivery_id=delivery_id,
-            event_type=event_type,
-            delivery_status=delivery_status,
-            reason_code=reason_code,
-            event_payload=dict(event_payload or {}),
-            notification_queue_id=notification_queue_id,
-            occurred_at=datetime.now(UTC),
-        )
-    )
+) -> dict:
+    return {
+        "id": uuid4(),
+        "delivery_id": delivery_id,
+        "event_type": event_type,
+        "delivery_status": delivery_status,
+        "reason_code": reason_code,
+        "event_payload": dict(event_payload or {}),
+        "notification_queue_id": notification_queue_id,
+        "occurred_at": occurred_at,
+    }
 
 
 @broker.task(task_name="process_notification_queue", queue="notifications")
 async def process_notification_queue() -> dict:
     """Process pending notifications from the queue.
 
-    Fetches pending notifications in batches, marks as processing,
-    sends via Telegram, then updates status to sent/failed.
+    Claims a batch of pending notifications and marks it as processing,
+    sends the batch concurrently through a rate-shaped Telegram delivery pool,
+    then writes every queue row, growth delivery row and delivery event back
+    in a single transaction.
+
+    Messages deferred by a Telegram ``retry_after`` go back to pending,
+    scheduled after the requested delay, without consuming a retry attempt.
     """
     settings = get_settings()
     batch_size = settings.notification_batch_size
     max_retries = settings.notification_max_retries
     factory = get_session_factory()
-
-    sent_count = 0
-    failed_count = 0
+    started = time.monotonic()
 
     async with factory() as session:
         # Fetch pending notifications
@@ -87,127 +103,174 @@ async def process_notification_queue() -> dict:
         )
         await session.commit()
 
-    # Send notifications via Telegram
+        # Growth delivery rows for the whole batch in one query
+        delivery_result = await session.execute(
+            select(
+                CustomerGrowthNotificationDeliveryModel.id,
+                CustomerGrowthNotificationDeliveryModel.notification_queue_id,
+                CustomerGrowthNotificationDeliveryModel.delivery_status,
+            ).where(CustomerGrowthNotificationDeliveryModel.notification_queue_id.in_(notification_ids))
+        )
+        delivery_ids = {row.notification_queue_id: row.id for row in delivery_result.all()}
+
+    by_id = {notification.id: notification for notification in notifications}
+    jobs = [
+        TelegramSendJob(key=notification.id, chat_id=notification.telegram_id, text=notification.message)
+        for notification in notifications
+    ]
+
     async with TelegramClient() as tg:
-        for notification in notifications:
-            async with factory() as session:
-                delivery = None
-                try:
-                    delivery_result = await session.execute(
-                        select(CustomerGrowthNotificationDeliveryModel).where(
-                            CustomerGrowthNotificationDeliveryModel.notification_queue_id == notification.id
-                        )
-                    )
-                    delivery = delivery_result.scalars().first()
-                    if delivery is not None:
-                        _record_delivery_event(
-                            session,
-                            delivery_id=delivery.id,
-                            notification_queue_id=notification.id,
-                            delivery_status="processing",
-                            event_type="telegram_processing_started",
-                            event_payload={"channel": "telegram"},
-                        )
-                    await tg.send_message(
-                        chat_id=notification.telegram_id,
-                        text=notification.message,
-                    )
-                    notification.status = STATUS_SENT
-                    notification.sent_at = datetime.now(UTC)
-                    if delivery is not None:
-                        delivery.delivery_status = "delivered"
-                        delivery.delivered_at = notification.sent_at
-                        delivery.status_reason = None
-                        _record_delivery_event(
-                            session,
-                            delivery_id=delivery.id,
-                            notification_queue_id=notification.id,
-                            delivery_status="delivered",
-                            event_type="telegram_delivered",
-                            event_payload={"channel": "telegram"},
-                        )
-                    else:
-                        await session.execute(
-                            update(CustomerGrowthNotificationDeliveryModel)
-                            .where(CustomerGrowthNotificationDeliveryModel.notification_queue_id == notification.id)
-                            .values(
-                                delivery_status="delivered",
-                                delivered_at=notification.sent_at,
-                                status_reason=None,
-                            )
-                        )
-                    sent_count += 1
-                except TelegramAPIError as e:
-                    next_attempts = notification.attempts + 1
-                    notification.attempts = next_attempts
-                    notification.error_message = str(e)[:500]
-                    notification.status = STATUS_FAILED if next_attempts >= max_retries else STATUS_PENDING
-                    delivery_status = "failed" if next_attempts >= max_retries else "queued"
-                    delivery_reason = (
-                        "telegram_delivery_failed" if next_attempts >= max_retries else "telegram_retry_pending"
-                    )
-                    if delivery is None:
-                        delivery_result = await session.execute(
-                            select(CustomerGrowthNotificationDeliveryModel).where(
-                                CustomerGrowthNotificationDeliveryModel.notification_queue_id == notification.id
-                            )
-                        )
-                        delivery = delivery_result.scalars().first()
-                    if delivery is not None:
-                        delivery.delivery_status = delivery_status
-                        delivery.delivered_at = None
-                        delivery.status_reason = delivery_reason
-                        _record_delivery_event(
-                            session,
-                            delivery_id=delivery.id,
-                            notification_queue_id=notification.id,
-                            delivery_status=delivery_status,
-                            event_type=(
-                                "telegram_failed" if next_attempts >= max_retries else "telegram_retry_scheduled"
-                            ),
-                            reason_code=delivery_reason,
-                            event_payload={
-                                "channel": "telegram",
-                                "attempts": next_attempts,
-                                "queue_error_message": notification.error_message,
-                            },
-                        )
-                    else:
-                        await session.execute(
-                            update(CustomerGrowthNotificationDeliveryModel)
-                            .where(CustomerGrowthNotificationDeliveryModel.notification_queue_id == notification.id)
-                            .values(
-                                delivery_status=delivery_status,
-                                delivered_at=None,
-                                status_reason=delivery_reason,
-                            )
-                        )
-                    failed_count += 1
-                    logger.warning(
-                        "notification_send_failed",
-                        notification_id=str(notification.id),
-                        attempts=next_attempts,
-                        error=str(e),
-                    )
-
-                    if next_attempts >= max_retries:
-                        alert_text = (
-                            "Notification permanently failed\n"
-                            f"Notification ID: {notification.id}\n"
-                            f"Telegram ID: {notification.telegram_id}\n"
-                            f"Error: {notification.error_message}"
-                        )
-                        try:
-                            await tg.send_admin_alert(alert_text, severity="critical")
-                        except Exception as alert_error:
-                            logger.warning(
-                                "notification_failure_alert_failed",
-                                notification_id=str(notification.id),
-                                error=str(alert_error),
-                            )
-
-                session.add(notification)
-                await session.commit()
-
-    logger.info("notification_batch_complete", sent=sent_count, failed=failed_count)
-    return {"sent": sent_count, "failed": failed_count}
+        outcomes = await TelegramDeliveryPool(tg).deliver(jobs)
+
+        sent_count, failed_count, deferred_count, permanent_failures = await _write_back(
+            factory, by_id, delivery_ids, outcomes, max_retries
+        )
+
+        for notification in permanent_failures:
+            alert_text = (
+                "Notification permanently failed\n"
+                f"Notification ID: {notification.id}\n"
+                f"Telegram ID: {notification.telegram_id}\n"
+                f"Error: {notification.error_message}"
+            )
+            try:
+                await tg.send_admin_alert(alert_text, severity="critical")
+            except Exception as alert_error:
+                logger.warning(
+                    "notification_failure_alert_failed",
+                    notification_id=str(notification.id),
+                    error=str(alert_error),
+                )
+
+    elapsed = time.monotonic() - started
+    NOTIFICATION_QUEUE_BATCH_DURATION.observe(elapsed)
+    NOTIFICATION_QUEUE_THROUGHPUT.set(sent_count / elapsed if elapsed > 0 else 0)
+    for result_label, count in (("sent", sent_count), ("failed", failed_count), ("deferred", deferred_count)):
+        if count:
+            NOTIFICATION_QUEUE_DELIVERIES_TOTAL.labels(result=result_label).inc(count)
+
+    logger.info(
+        "notification_batch_complete",
+        sent=sent_count,
+        failed=failed_count,
+        deferred=deferred_count,
+        duration_seconds=round(elapsed, 3),
+    )
+    return {"sent": sent_count, "failed": failed_count, "deferred": deferred_count}
+
+
+async def _write_back(
+    factory,
+    by_id: dict,
+    delivery_ids: dict,
+    outcomes: list[TelegramSendOutcome],
+    max_retries: int,
+) -> tuple[int, int, int, list]:
+    """Persist a delivered batch with set-based statements in one transaction.
+
+    Returns:
+        Tuple of (sent, failed, deferred, permanently failed notifications)
+    """
+    now = datetime.now(UTC)
+    queue_rows: list[dict] = []
+    delivery_rows: list[dict] = []
+    events: list[dict] = []
+    permanent_failures = []
+    sent_count = failed_count = deferred_count = 0
+
+    for outcome in outcomes:
+        notification = by_id[outcome.key]
+        delivery_id = delivery_ids.get(notification.id)
+        if delivery_id is not None:
+            events.append(
+                _delivery_event(
+                    delivery_id=delivery_id,
+                    notification_queue_id=notification.id,
+                    delivery_status="processing",
+                    event_type="telegram_processing_started",
+                    occurred_at=now,
+                    event_payload={"channel": "telegram"},
+                )
+            )
+
+        if outcome.status == OUTCOME_SENT:
+            notification.status = STATUS_SENT
+            notification.sent_at = outcome.sent_at
+            queue_rows.append({"id": notification.id, "status": STATUS_SENT, "sent_at": outcome.sent_at})
+            delivery_status, delivery_reason, event_type = "delivered", None, "telegram_delivered"
+            event_payload = {"channel": "telegram"}
+            sent_count += 1
+        elif outcome.status == OUTCOME_DEFERRED:
+            notification.status = STATUS_PENDING
+            notification.scheduled_at = now + timedelta(seconds=outcome.retry_after or 0)
+            queue_rows.append(
+                {"id": notification.id, "status": STATUS_PENDING, "scheduled_at": notification.scheduled_at}
+            )
+            delivery_status, delivery_reason, event_type = "queued", "telegram_rate_limited", "telegram_retry_scheduled"
+            event_payload = {"channel": "telegram", "retry_after": outcome.retry_after}
+            deferred_count += 1
+        else:
+            next_attempts = notification.attempts + 1
+            exhausted = next_attempts >= max_retries
+            notification.attempts = next_attempts
+            notification.error_message = (outcome.error or "")[:500]
+            notification.status = STATUS_FAILED if exhausted else STATUS_PENDING
+            queue_rows.append(
+                {
+                    "id": notification.id,
+                    "status": notification.status,
+                    "attempts": next_attempts,
+                    "error_message": notification.error_message,
+                }
+            )
+            delivery_status = "failed" if exhausted else "queued"
+            delivery_reason = "telegram_delivery_failed" if exhausted else "telegram_retry_pending"
+            event_type = "telegram_failed" if exhausted else "telegram_retry_scheduled"
+            event_payload = {
+                "channel": "telegram",
+                "attempts": next_attempts,
+                "queue_error_message": notification.error_message,
+            }
+            failed_count += 1
+            logger.warning(
+                "notification_send_failed",
+                notification_id=str(notification.id),
+                attempts=next_attempts,
+                error=outcome.error,
+            )
+            if exhausted:
+                permanent_failures.append(notification)
+
+        if delivery_id is not None:
+            delivery_rows.append(
+                {
+                    "id": delivery_id,
+                    "delivery_status": delivery_status,
+                    "delivered_at": outcome.sent_at,
+                    "status_reason": delivery_reason,
+                }
+            )
+            events.append(
+                _delivery_event(
+                    delivery_id=delivery_id,
+                    notification_queue_id=notification.id,
+                    delivery_status=delivery_status,
+                    event_type=event_type,
+                    occurred_at=now,
+                    reason_code=delivery_reason,
+                    event_payload=event_payload,
+                )
+            )
+
+    async with factory() as session:
+        # Rows carry different column sets per outcome, so group them for executemany
+        for columns in {tuple(sorted(row)) for row in queue_rows}:
+            rows = [row for row in queue_rows if tuple(sorted(row)) == columns]
+            await session.execute(update(NotificationQueueModel), rows)
+        if delivery_rows:
+            await session.execute(update(CustomerGrowthNotificationDeliveryModel), delivery_rows)
+        if events:
+            await session.execute(insert(CustomerGrowthNotificationDeliveryEventModel), events)
+        await session.commit()
+
+    return sent_count, failed_count, deferred_count, permanent_failures
@@ -18,7 +18,7 @@ logger = structlog.get_logger(__name__)
 async def auto_renew_subscriptions() -> dict:
     """Auto-renew subscriptions for users with auto_renew=true and expire_at < now() + 1 hour.
 
-    Queries users from Remnawave API, filters those with auto_renew enabled
+    Streams users from Remnawave API, filters those with auto_renew enabled
     and expiring within 1 hour, creates CryptoBot invoices, and sends
     Telegram notifications with payment links.
 
@@ -30,13 +30,10 @@ async def auto_renew_subscriptions() -> dict:
     users_checked = 0
 
     try:
-        async with RemnawaveClient() as rw:
-            users = await rw.get_users()
-
         renewal_threshold = datetime.now(UTC) + timedelta(hours=1)
 
-        async with CryptoBotClient(settings.cryptobot_token) as cb, TelegramClient() as tg:
-            for user in users:
+        async with RemnawaveClient() as rw, CryptoBotClient(settings.cryptobot_token) as cb, TelegramClient() as tg:
+            async for user in rw.iter_users():
                 users_checked += 1
 
                 # Check auto_renew flag
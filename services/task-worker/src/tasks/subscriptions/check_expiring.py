@@ -33,61 +33,59 @@ async def check_expiring_subscriptions() -> dict:
     reminder_keys: list[tuple[str, int]] = []
 
     try:
-        async with RemnawaveClient() as rw:
-            users = await rw.get_users()
-
         now = datetime.now(UTC)
 
-        for user in users:
-            if user.get("status") != "active":
-                continue
-
-            expire_at = user.get("expire_at")
-            if not expire_at:
-                continue
-
-            try:
-                exp_dt = datetime.fromisoformat(expire_at.replace("Z", "+00:00"))
-            except (ValueError, TypeError):
-                continue
-
-            time_left = (exp_dt - now).total_seconds()
-            if time_left <= 0:
-                continue
-
-            user_uuid = user.get("uuid", "")
-            username = user.get("username", "unknown")
-            telegram_id = user.get("telegram_id")
-
-            if not telegram_id or not user_uuid:
-                continue
-
-            selected_bracket = None
-            for bracket_label, bracket_seconds in REMINDER_BRACKETS:
-                if time_left <= bracket_seconds:
-                    selected_bracket = (bracket_label, bracket_seconds)
-                    break
-
-            if not selected_bracket:
-                continue
-
-            bracket_label, bracket_seconds = selected_bracket
-            reminder_key = SUB_REMINDER_KEY.format(user_uuid=user_uuid, bracket=bracket_label)
-            if await cache.exists(reminder_key):
-                continue
-
-            days_left = max(1, int(time_left // 86400))
-            msg = subscription_expiring(username, days_left, expire_at)
-            pending_notifications.append(
-                NotificationQueueModel(
-                    telegram_id=int(telegram_id),
-                    message=msg,
-                    notification_type=NOTIFICATION_TYPE_SUBSCRIPTION_EXPIRING,
-                    status=STATUS_PENDING,
-                    scheduled_at=now,
+        async with RemnawaveClient() as rw:
+            async for user in rw.iter_users():
+                if user.get("status") != "active":
+                    continue
+
+                expire_at = user.get("expire_at")
+                if not expire_at:
+                    continue
+
+                try:
+                    exp_dt = datetime.fromisoformat(expire_at.replace("Z", "+00:00"))
+                except (ValueError, TypeError):
+                    continue
+
+                time_left = (exp_dt - now).total_seconds()
+                if time_left <= 0:
+                    continue
+
+                user_uuid = user.get("uuid", "")
+                username = user.get("username", "unknown")
+                telegram_id = user.get("telegram_id")
+
+                if not telegram_id or not user_uuid:
+                    continue
+
+                selected_bracket = None
+                for bracket_label, bracket_seconds in REMINDER_BRACKETS:
+                    if time_left <= bracket_seconds:
+                        selected_bracket = (bracket_label, bracket_seconds)
+                        break
+
+                if not selected_bracket:
+                    continue
+
+                bracket_label, bracket_seconds = selected_bracket
+                reminder_key = SUB_REMINDER_KEY.format(user_uuid=user_uuid, bracket=bracket_label)
+                if await cache.exists(reminder_key):
+                    continue
+
+                days_left = max(1, int(time_left // 86400))
+                msg = subscription_expiring(username, days_left, expire_at)
+                pending_notifications.append(
+                    NotificationQueueModel(
+                        telegram_id=int(telegram_id),
+                        message=msg,
+                        notification_type=NOTIFICATION_TYPE_SUBSCRIPTION_EXPIRING,
+                        status=STATUS_PENDING,
+                        scheduled_at=now,
+                    )
                 )
-            )
-            reminder_keys.append((reminder_key, int(bracket_seconds)))
+                reminder_keys.append((reminder_key, int(bracket_seconds)))
 
         if pending_notifications:
             async with session_factory() as session:
@@ -1,13 +1,31 @@
 """Disable expired user subscriptions."""
 
-from contextlib import suppress
-from datetime import UTC, datetime
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
 
 import structlog
 
 from src.broker import broker
-from src.services.remnawave_client import RemnawaveClient
+from src.database.session import get_session_factory
+from src.models.notification_queue import NotificationQueueModel
+from src.services.expiry_index import ExpiryIndex, expire_at_timestamp
+from src.services.notification_delivery import (
+    OUTCOME_SENT,
+    TelegramDeliveryPool,
+    TelegramSendJob,
+    TelegramSendOutcome,
+)
+from src.services.redis_client import get_redis_client
+from src.services.remnawave_client import RemnawaveAPIError, RemnawaveClient
 from src.services.telegram_client import TelegramClient
+from src.utils.constants import (
+    EXPIRY_INDEX_BATCH_LIMIT,
+    EXPIRY_INDEX_MAX_AGE_SECONDS,
+    NOTIFICATION_TYPE_SUBSCRIPTION_EXPIRED,
+    REMNAWAVE_DISABLE_CONCURRENCY,
+    STATUS_PENDING,
+)
 from src.utils.formatting import subscription_expired
 
 logger = structlog.get_logger(__name__)
@@ -15,42 +33,127 @@ logger = structlog.get_logger(__name__)
 
 @broker.task(task_name="disable_expired_users", queue="subscriptions")
 async def disable_expired_users() -> dict:
-    """Find and disable users whose subscriptions have expired."""
-    disabled_count = 0
+    """Find and disable users whose subscriptions have expired.
 
-    async with RemnawaveClient() as rw:
-        users = await rw.get_users()
+    Due users are read from the Redis expiry index with one ``ZRANGEBYSCORE``,
+    so a run costs O(expiring users) rather than O(fleet). When the index has
+    not been rebuilt recently the fleet is streamed once instead, and the
+    index is rebuilt as a side effect.
 
-    expired_users = []
-    for user in users:
-        expire_at = user.get("expire_at")
-        if not expire_at:
-            continue
-        try:
-            exp_dt = datetime.fromisoformat(expire_at.replace("Z", "+00:00"))
-            if exp_dt < datetime.now(UTC) and user.get("status") != "disabled":
-                expired_users.append(user)
-        except (ValueError, TypeError):
-            continue
+    Index entries may lag behind renewals, so each indexed candidate is
+    re-read from Remnawave before it is disabled. Disables run through a
+    bounded-concurrency pipeline. Telegram notices are then sent through the
+    rate-shaped delivery pool; notices it could not deliver go to the
+    notification queue, which retries them.
+    """
+    redis = get_redis_client()
+    index = ExpiryIndex(redis)
+    now = time.time()
+
+    try:
+        async with RemnawaveClient() as rw, TelegramClient() as tg:
+            if await index.is_fresh(EXPIRY_INDEX_MAX_AGE_SECONDS):
+                candidates = await index.due(now, limit=EXPIRY_INDEX_BATCH_LIMIT)
+                verify = True
+                source = "index"
+            else:
+                candidates = await _scan_fleet(rw, index, now)
+                verify = False
+                source = "fleet_scan"
+
+            if not candidates:
+                return {"disabled": 0}
 
-    if not expired_users:
-        return {"disabled": 0}
+            semaphore = asyncio.Semaphore(REMNAWAVE_DISABLE_CONCURRENCY)
+            notices: list[TelegramSendJob] = []
 
-    async with RemnawaveClient() as rw, TelegramClient() as tg:
-        for user in expired_users:
-            user_uuid = user.get("uuid", "")
-            username = user.get("username", "unknown")
-            try:
-                await rw.disable_user(user_uuid)
-                disabled_count += 1
+            async def _process(candidate: dict) -> bool:
+                async with semaphore:
+                    user = await _confirm_expired(rw, index, candidate, now) if verify else candidate
+                    if user is None:
+                        return False
 
+                    user_uuid = user.get("uuid", "")
+                    username = user.get("username") or "unknown"
+                    try:
+                        await rw.disable_user(user_uuid)
+                    except Exception as e:
+                        logger.error("disable_user_failed", user=username, error=str(e))
+                        return False
+
+                await index.remove([user_uuid])
                 telegram_id = user.get("telegram_id")
                 if telegram_id:
                     msg = subscription_expired(username, user.get("expire_at", ""))
-                    with suppress(Exception):
-                        await tg.send_message(chat_id=int(telegram_id), text=msg)
-            except Exception as e:
-                logger.error("disable_user_failed", user=username, error=str(e))
+                    notices.append(TelegramSendJob(key=user_uuid, chat_id=int(telegram_id), text=msg))
+                return True
+
+            results = await asyncio.gather(*(_process(candidate) for candidate in candidates))
+            outcomes = await TelegramDeliveryPool(tg).deliver(notices)
+            await _queue_undelivered(notices, outcomes)
+    finally:
+        await redis.aclose()
 
-    logger.info("expired_users_disabled", count=disabled_count)
+    disabled_count = sum(results)
+    logger.info("expired_users_disabled", count=disabled_count, candidates=len(candidates), source=source)
     return {"disabled": disabled_count}
+
+
+async def _queue_undelivered(notices: list[TelegramSendJob], outcomes: list[TelegramSendOutcome]) -> None:
+    """Hand notices the pool did not deliver to the notification queue for retry."""
+    now = datetime.now(UTC)
+    pending = [
+        NotificationQueueModel(
+            telegram_id=notice.chat_id,
+            message=notice.text,
+            notification_type=NOTIFICATION_TYPE_SUBSCRIPTION_EXPIRED,
+            status=STATUS_PENDING,
+            scheduled_at=now + timedelta(seconds=outcome.retry_after or 0),
+            error_message=outcome.error,
+        )
+        for notice, outcome in zip(notices, outcomes, strict=True)
+        if outcome.status != OUTCOME_SENT
+    ]
+    if not pending:
+        return
+
+    try:
+        async with get_session_factory()() as session:
+            session.add_all(pending)
+            await session.commit()
+    except Exception as e:
+        logger.error("expired_notice_queue_failed", count=len(pending), error=str(e))
+        return
+    logger.warning("expired_notices_queued", count=len(pending))
+
+
+async def _scan_fleet(rw: RemnawaveClient, index: ExpiryIndex, now: float) -> list[dict]:
+    """Stream the fleet once, rebuilding the expiry index and collecting due users."""
+    expired_users = []
+    async for page in rw.iter_user_pages():
+        await index.upsert_users(page)
+        for user in page:
+            expires = expire_at_timestamp(user.get("expire_at"))
+            if expires is not None and expires < now and user.get("status") != "disabled":
+                expired_users.append(user)
+    await index.mark_synced(now)
+    return expired_users
+
+
+async def _confirm_expired(rw: RemnawaveClient, index: ExpiryIndex, candidate: dict, now: float) -> dict | None:
+    """Re-read an indexed candidate and re-index it if it was renewed or disabled meanwhile."""
+    user_uuid = candidate.get("uuid", "")
+    try:
+        user = await rw.get_user(user_uuid)
+    except RemnawaveAPIError as e:
+        if e.status_code == 404:
+            await index.remove([user_uuid])
+        else:
+            logger.error("expired_user_lookup_failed", user_uuid=user_uuid, error=str(e))
+        return None
+
+    expires = expire_at_timestamp(user.get("expire_at"))
+    if expires is None or expires >= now or user.get("status") == "disabled":
+        await index.upsert_users([user])
+        return None
+    return user
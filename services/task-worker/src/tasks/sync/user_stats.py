@@ -6,18 +6,22 @@ import structlog
 
 from src.broker import broker
 from src.services.cache_service import CacheService
+from src.services.expiry_index import ExpiryIndex
 from src.services.redis_client import get_redis_client
 from src.services.remnawave_client import RemnawaveClient
-from src.utils.constants import USER_STATS_KEY
+from src.services.user_snapshot import SnapshotDiff, UserSnapshot
+from src.utils.constants import EXPIRY_INDEX_MAX_AGE_SECONDS, USER_STATS_KEY
 
 logger = structlog.get_logger(__name__)
 
 
 @broker.task(task_name="sync_user_stats", queue="sync")
 async def sync_user_stats() -> dict:
-    """Sync user statistics summary to Redis cache.
+    """Sync the user snapshot and cache the user statistics summary.
 
-    Fetches all users from Remnawave API and calculates aggregated statistics:
+    Streams all users from Remnawave API page by page and diffs each page
+    against the shared user snapshot (see ``src.services.user_snapshot``).
+    Only changed users are rewritten and the aggregates move incrementally:
     - total: total user count
     - active: users with status=active
     - disabled: users with status=disabled
@@ -25,64 +29,65 @@ async def sync_user_stats() -> dict:
     - limited: users with data_limit reached
     - online: users currently connected
 
-    Caches results in Redis under USER_STATS_KEY with 15-minute TTL.
+    Caches results in Redis under USER_STATS_KEY with 15-minute TTL. Users the
+    diff reports as added or changed are also written into the expiry index
+    used by ``disable_expired_users``. Once the index is half its maximum age
+    old, every page is written instead and the index is marked as fully
+    synced, so it is rebuilt before ``disable_expired_users`` would fall back
+    to its own fleet scan.
+
+    Runs are serialized by the snapshot run lock; a run that starts while the
+    previous one is still streaming is skipped.
 
     Returns:
-        Dictionary with user stats
+        Dictionary with user stats (empty if the run was skipped)
     """
     redis = get_redis_client()
     cache = CacheService(redis)
-    stats = {
-        "total": 0,
-        "active": 0,
-        "disabled": 0,
-        "expired": 0,
-        "limited": 0,
-        "online": 0,
-    }
+    expiry_index = ExpiryIndex(redis)
+    snapshot = UserSnapshot(redis)
 
     try:
-        async with RemnawaveClient() as rw:
-            users = await rw.get_users()
-
-        stats["total"] = len(users)
-
         now = datetime.now(UTC)
-
-        for user in users:
-            status = user.get("status", "")
-            is_online = user.get("is_online", False)
-            expire_at = user.get("expire_at")
-            data_limit = user.get("traffic_limit_bytes", 0)
-            data_used = user.get("used_traffic_bytes", 0)
-
-            # Count by status
-            if status == "active":
-                stats["active"] += 1
-            elif status == "disabled":
-                stats["disabled"] += 1
-
-            # Check expiration
-            if expire_at:
-                try:
-                    exp_dt = datetime.fromisoformat(expire_at.replace("Z", "+00:00"))
-                    if exp_dt < now:
-                        stats["expired"] += 1
-                except (ValueError, TypeError):
-                    pass
-
-            # Check data limit
-            if data_limit > 0 and data_used >= data_limit:
-                stats["limited"] += 1
-
-            # Count online
-            if is_online:
-                stats["online"] += 1
+        diff = SnapshotDiff()
+
+        generation = await snapshot.begin()
+        if generation is None:
+            logger.info("user_stats_sync_skipped", reason="previous sync still running")
+            return {}
+
+        rebuild_index = not await expiry_index.is_fresh(EXPIRY_INDEX_MAX_AGE_SECONDS // 2)
+        try:
+            async with RemnawaveClient() as rw:
+                async for page in rw.iter_user_pages():
+                    page_diff = await snapshot.apply_page(generation, page)
+                    if rebuild_index:
+                        await expiry_index.upsert_users(page)
+                    elif page_diff.updated:
+                        updated = set(page_diff.updated)
+                        await expiry_index.upsert_users(user for user in page if user.get("uuid") in updated)
+                    diff.merge(page_diff)
+            diff.removed = await snapshot.finish(generation, now.timestamp())
+        finally:
+            await snapshot.release(generation)
+        if rebuild_index:
+            await expiry_index.mark_synced(now.timestamp())
+
+        aggregates = await snapshot.aggregates(now.timestamp())
+        stats = {name: aggregates[name] for name in ("total", "active", "disabled", "expired", "limited", "online")}
 
         # Cache in Redis with 15-minute TTL
         await cache.set(USER_STATS_KEY, stats, ttl=900)
 
-        logger.info("user_stats_synced", **stats)
+        logger.info(
+            "user_stats_synced",
+            added=diff.added,
+            changed=diff.changed,
+            unchanged=diff.unchanged,
+            removed=diff.removed,
+            expiry_index_rebuilt=rebuild_index,
+            **stats,
+        )
 
     except Exception as e:
         logger.exception("user_stats_sync_failed", error=str(e))
@@ -21,13 +21,26 @@ REDIS_PREFIX: Final[str] = "cybervpn:"
 HEALTH_KEY: Final[str] = f"{REDIS_PREFIX}health:{{node_uuid}}:current"
 HEALTH_HISTORY_KEY: Final[str] = f"{REDIS_PREFIX}health:{{node_uuid}}:history"
 HEALTH_SERVICE_KEY: Final[str] = f"{REDIS_PREFIX}health:services:{{service_name}}"
-BANDWIDTH_KEY: Final[str] = f"{REDIS_PREFIX}bandwidth:{{node_uuid}}:{{timestamp}}"
+BANDWIDTH_SERIES_KEY: Final[str] = f"{REDIS_PREFIX}bandwidth:series:{{node_uuid}}"
+BANDWIDTH_ROLLUP_KEY: Final[str] = f"{REDIS_PREFIX}bandwidth:rollup:{{resolution}}:{{node_uuid}}"
+BANDWIDTH_NODES_KEY: Final[str] = f"{REDIS_PREFIX}bandwidth:nodes"
 BULK_PROGRESS_KEY: Final[str] = f"{REDIS_PREFIX}bulk:{{job_id}}:progress"
 DASHBOARD_REALTIME_KEY: Final[str] = f"{REDIS_PREFIX}dashboard:realtime"
 STATS_DAILY_KEY: Final[str] = f"{REDIS_PREFIX}stats:daily:{{date}}"
 STATS_PAYMENTS_KEY: Final[str] = f"{REDIS_PREFIX}stats:payments:{{date}}"
 SUB_REMINDER_KEY: Final[str] = f"{REDIS_PREFIX}sub_reminder:{{user_uuid}}:{{bracket}}"
 USER_STATS_KEY: Final[str] = f"{REDIS_PREFIX}users:stats:summary"
+EXPIRY_INDEX_KEY: Final[str] = f"{REDIS_PREFIX}users:expiry:index"
+EXPIRY_INDEX_USERS_KEY: Final[str] = f"{REDIS_PREFIX}users:expiry:users"
+EXPIRY_INDEX_SYNCED_AT_KEY: Final[str] = f"{REDIS_PREFIX}users:expiry:synced_at"
+USER_SNAPSHOT_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:records"
+USER_SNAPSHOT_UUIDS_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:uuids"
+USER_SNAPSHOT_EXPIRY_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:expiry"
+USER_SNAPSHOT_COUNTERS_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:counters"
+USER_SNAPSHOT_SEEN_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:seen:{{generation}}"
+USER_SNAPSHOT_SYNCED_AT_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:synced_at"
+USER_SNAPSHOT_RECOUNTED_AT_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:recounted_at"
+USER_SNAPSHOT_LOCK_KEY: Final[str] = f"{REDIS_PREFIX}users:snapshot:lock"
 NODE_CONFIG_KEY: Final[str] = f"{REDIS_PREFIX}nodes:config:{{node_uuid}}"
 HELIX_ROLLOUT_AUDIT_KEY: Final[str] = f"{REDIS_PREFIX}helix:rollout:{{rollout_id}}:audit"
 HELIX_NODE_HEALTH_KEY: Final[str] = f"{REDIS_PREFIX}helix:node:{{node_id}}:health"
@@ -38,6 +51,58 @@ HELIX_CANARY_GATE_KEY: Final[str] = f"{REDIS_PREFIX}helix:rollout:{{rollout_id}}
 HELIX_CANARY_CONTROL_KEY: Final[str] = f"{REDIS_PREFIX}helix:rollout:{{rollout_id}}:canary-control"
 HELIX_CANARY_CONTROL_KEY: Final[str] = f"{REDIS_PREFIX}helix:rollout:{{rollout_id}}:canary-control"
 
+# ============================================================================
+# Remnawave API
+# ============================================================================
+
+REMNAWAVE_USERS_PAGE_SIZE: Final[int] = 500  # Users per page when streaming the fleet
+REMNAWAVE_DISABLE_CONCURRENCY: Final[int] = 10  # Parallel disable calls in disable_expired_users
+EXPIRY_INDEX_MAX_AGE_SECONDS: Final[int] = 3600  # Rebuild the expiry index from a fleet scan after this
+EXPIRY_INDEX_BATCH_LIMIT: Final[int] = 1000  # Max due users handled per disable_expired_users run
+USER_SNAPSHOT_REALTIME_MAX_AGE_SECONDS: Final[int] = 150  # Realtime metrics scan the fleet if the snapshot is older
+USER_SNAPSHOT_DAILY_MAX_AGE_SECONDS: Final[int] = 900  # Daily stats scan the fleet if the snapshot is older
+USER_SNAPSHOT_LOCK_TTL_SECONDS: Final[int] = 300  # Run lock of a snapshot sync, refreshed on every page
+USER_SNAPSHOT_RECOUNT_INTERVAL_SECONDS: Final[int] = 3600  # Rebuild the delta counters from the records this often
+
+# ============================================================================
+# Stats Rollups
+# ============================================================================
+
+STATS_ROLLUP_LAG_SECONDS: Final[int] = 300  # Re-read this far behind a watermark for late-committed rows
+STATS_ROLLUP_LOCK_ID: Final[int] = 7_221_001  # pg_advisory_xact_lock key serializing rollup refreshes
+
+# ============================================================================
+# Table Retention
+# ============================================================================
+
+PARTITIONED_LOG_TABLES: Final[dict[str, str]] = {  # created_at range partition interval per table
+    "audit_logs": "month",
+    "webhook_logs": "day",
+}
+
+# ============================================================================
+# Bandwidth Time Series
+# ============================================================================
+
+BANDWIDTH_RAW_RETENTION_SECONDS: Final[int] = 48 * 3600  # Raw 5-minute samples per node
+BANDWIDTH_HOURLY_RETENTION_SECONDS: Final[int] = 30 * 24 * 3600
+BANDWIDTH_DAILY_RETENTION_SECONDS: Final[int] = 365 * 24 * 3600
+# Rollup resolution -> (bucket width, retention) in seconds
+BANDWIDTH_RESOLUTIONS: Final[dict[str, tuple[int, int]]] = {
+    "1h": (3600, BANDWIDTH_HOURLY_RETENTION_SECONDS),
+    "1d": (24 * 3600, BANDWIDTH_DAILY_RETENTION_SECONDS),
+}
+
+# ============================================================================
+# Telegram Delivery
+# ============================================================================
+
+TELEGRAM_DELIVERY_CONCURRENCY: Final[int] = 10  # Parallel senders draining the notification queue
+TELEGRAM_GLOBAL_RATE_PER_SECOND: Final[float] = 25.0  # Below Bot API's ~30 msg/s per bot
+TELEGRAM_GLOBAL_BURST: Final[int] = 25
+TELEGRAM_PER_CHAT_INTERVAL_SECONDS: Final[float] = 1.0  # Bot API allows ~1 msg/s per chat
+BROADCAST_ENQUEUE_CHUNK_SIZE: Final[int] = 50_000  # Recipients per INSERT ... SELECT unnest() statement
+
 # ============================================================================
 # Cron Schedule Expressions
 # ============================================================================
@@ -65,14 +130,16 @@ SCHEDULE_CLEANUP_NOTIFICATIONS: Final[str] = "0 1 * * *"  # Daily at 1 AM UTC
 SCHEDULE_CLEANUP_CACHE: Final[str] = "0 4 * * *"  # Daily at 4 AM UTC
 SCHEDULE_CLEANUP_WEEKLY: Final[str] = "0 3 * * 0"  # Sunday at 3 AM UTC
 SCHEDULE_CLEANUP_WEBHOOK_WEEKLY: Final[str] = "0 3 * * 1"  # Monday at 3 AM UTC
+SCHEDULE_PARTITION_MAINTENANCE: Final[str] = "30 0 * * *"  # Daily at 00:30 UTC
 SCHEDULE_REPORT_DAILY: Final[str] = "0 6 * * *"  # Daily at 6 AM UTC (09:00 MSK)
 SCHEDULE_REPORT_WEEKLY: Final[str] = "0 7 * * 1"  # Monday at 7 AM UTC
 SCHEDULE_ANOMALY_CHECK: Final[str] = "*/5 * * * *"  # Every 5 minutes
 SCHEDULE_SYNC_NODES: Final[str] = "*/5 * * * *"  # Every 5 minutes (legacy)
 SCHEDULE_SYNC_GEOLOCATIONS: Final[str] = "0 */6 * * *"  # Every 6 hours
-SCHEDULE_SYNC_USER_STATS: Final[str] = "*/10 * * * *"  # Every 10 minutes
+SCHEDULE_SYNC_USER_STATS: Final[str] = "*/2 * * * *"  # Every 2 minutes (feeds the user snapshot)
 SCHEDULE_SYNC_NODE_CONFIGS: Final[str] = "*/30 * * * *"  # Every 30 minutes
 SCHEDULE_FINANCIAL_STATS: Final[str] = "30 0 * * *"  # Daily at 00:30 UTC
+SCHEDULE_STATS_ROLLUPS: Final[str] = "*/15 * * * *"  # Every 15 minutes
 SCHEDULE_GROWTH_REPORTING_REFRESH: Final[str] = "20 * * * *"  # Hourly at :20 UTC
 SCHEDULE_GROWTH_REPORTING_DELIVERY: Final[str] = "*/15 * * * *"  # Every 15 minutes
 SCHEDULE_GROWTH_REPORTING_GOVERNANCE_FOLLOWUP: Final[str] = "*/30 * * * *"  # Every 30 minutes
@@ -222,7 +289,9 @@ __all__ = [  # noqa: RUF022
     "HEALTH_KEY",
     "HEALTH_HISTORY_KEY",
     "HEALTH_SERVICE_KEY",
-    "BANDWIDTH_KEY",
+    "BANDWIDTH_SERIES_KEY",
+    "BANDWIDTH_ROLLUP_KEY",
+    "BANDWIDTH_NODES_KEY",
     "BULK_PROGRESS_KEY",
     "DASHBOARD_REALTIME_KEY",
     "STATS_DAILY_KEY",
@@ -262,6 +331,7 @@ __all__ = [  # noqa: RUF022
     "SCHEDULE_CLEANUP_CACHE",
     "SCHEDULE_CLEANUP_WEEKLY",
     "SCHEDULE_CLEANUP_WEBHOOK_WEEKLY",
+    "SCHEDULE_PARTITION_MAINTENANCE",
     "SCHEDULE_REPORT_DAILY",
     "SCHEDULE_REPORT_WEEKLY",
     "SCHEDULE_ANOMALY_CHECK",
@@ -270,6 +340,7 @@ __all__ = [  # noqa: RUF022
     "SCHEDULE_SYNC_USER_STATS",
     "SCHEDULE_SYNC_NODE_CONFIGS",
     "SCHEDULE_FINANCIAL_STATS",
+    "SCHEDULE_STATS_ROLLUPS",
     "SCHEDULE_GROWTH_REPORTING_REFRESH",
     "SCHEDULE_GROWTH_REPORTING_DELIVERY",
     "SCHEDULE_GROWTH_REPORTING_GOVERNANCE_FOLLOWUP",
@@ -13,6 +13,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 import pytest_asyncio
 
+from tests.remnawave_fixtures import stream_remnawave_user_pages, stream_remnawave_users
+
 
 @pytest.fixture(scope="session", autouse=True)
 def mock_settings_for_imports():
@@ -68,9 +70,15 @@ def mock_settings_for_imports():
     # Cleanup Configuration
     settings.cleanup_audit_retention_days = 90
     settings.cleanup_webhook_retention_days = 30
+    settings.cleanup_delete_batch_size = 5000
+    settings.cleanup_delete_pause_seconds = 0.0
+    settings.cleanup_delete_max_batches = 200
+    settings.cleanup_partitions_ahead = 3
 
     # Bulk Operations
     settings.bulk_batch_size = 50
+    settings.export_batch_size = 5000
+    settings.export_chunk_rows = 1_000_000
 
     # Monitoring
     settings.metrics_enabled = True
@@ -144,9 +152,15 @@ def mock_settings():
     # Cleanup Configuration
     settings.cleanup_audit_retention_days = 90
     settings.cleanup_webhook_retention_days = 30
+    settings.cleanup_delete_batch_size = 5000
+    settings.cleanup_delete_pause_seconds = 0.0
+    settings.cleanup_delete_max_batches = 200
+    settings.cleanup_partitions_ahead = 3
 
     # Bulk Operations
     settings.bulk_batch_size = 50
+    settings.export_batch_size = 5000
+    settings.export_chunk_rows = 1_000_000
 
     # Monitoring
     settings.metrics_enabled = True
@@ -248,6 +262,8 @@ async def mock_remnawave():
 
     # API methods
     client.get_users = AsyncMock(return_value=[])
+    client.iter_users = MagicMock(return_value=stream_remnawave_users([]))
+    client.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages([]))
     client.get_nodes = AsyncMock(return_value=[])
     client.create_user = AsyncMock(return_value={"uuid": "test-uuid"})
     client.update_user = AsyncMock(return_value={"uuid": "test-uuid"})
@@ -67,6 +67,7 @@ class TestE2EIntegration:
             "src.tasks.cleanup.audit_logs",
             "src.tasks.cleanup.webhook_logs",
             "src.tasks.cleanup.notifications",
+            "src.tasks.cleanup.partitions",
             "src.tasks.cleanup.cache",
             "src.tasks.cleanup.export_files",
             # Sync
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
@@ -13,3 +14,19 @@ def load_remnawave_fixture(name: str) -> dict[str, Any]:
     """Load a JSON fixture by filename from the Remnawave fixture directory."""
 
     return json.loads((_FIXTURES_ROOT / name).read_text(encoding="utf-8"))
+
+
+async def stream_remnawave_users(users: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Async-iterate ``users`` the way ``RemnawaveClient.iter_users`` does."""
+
+    for user in users:
+        yield user
+
+
+async def stream_remnawave_user_pages(
+    users: list[dict[str, Any]], page_size: int = 500
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Async-iterate ``users`` in pages the way ``RemnawaveClient.iter_user_pages`` does."""
+
+    for start in range(0, len(users), page_size):
+        yield users[start : start + page_size]
@@ -1,10 +1,13 @@
 """Tests for analytics task modules."""
 
 import json
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fakeredis import FakeAsyncRedis
+
+from tests.remnawave_fixtures import stream_remnawave_users
 
 
 @pytest.mark.asyncio
@@ -22,9 +25,10 @@ async def test_aggregate_daily_stats_success():
         patch("src.tasks.analytics.daily_stats.get_redis_client") as mock_redis_fn,
         patch("src.tasks.analytics.daily_stats.CacheService") as mock_cache_cls,
         patch("src.tasks.analytics.daily_stats.get_session_factory") as mock_factory,
+        patch("src.tasks.analytics.daily_stats.StatsRollups") as mock_rollups_cls,
     ):
         mock_rw = AsyncMock()
-        mock_rw.get_users.return_value = mock_users
+        mock_rw.iter_users = MagicMock(return_value=stream_remnawave_users(mock_users))
         mock_rw.get_system_stats.return_value = mock_system_stats
         mock_rw_cls.return_value.__aenter__.return_value = mock_rw
 
@@ -40,23 +44,21 @@ async def test_aggregate_daily_stats_success():
         mock_session = AsyncMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=False)
-        new_users_result = MagicMock()
-        new_users_result.scalar.return_value = 2
-        admin_ops_result = MagicMock()
-        admin_ops_result.scalar.return_value = 1
-        updated_result = MagicMock()
-        updated_result.scalars.return_value.all.return_value = [MagicMock(new_value={"status": "disabled"})]
-        payments_result = MagicMock()
-        payments_result.scalars.return_value.all.return_value = [
-            MagicMock(amount=10.0, provider="cryptobot", metadata_={"plan_name": "Basic"}),
-        ]
         errors_result = MagicMock()
-        errors_result.all.return_value = [("error-1",), ("error-1",), ("error-2",)]
-        mock_session.execute = AsyncMock(
-            side_effect=[new_users_result, admin_ops_result, updated_result, payments_result, errors_result]
-        )
+        errors_result.all.return_value = [("error-1", 2), ("error-2", 1)]
+        mock_session.execute = AsyncMock(return_value=errors_result)
         mock_factory.return_value = MagicMock(return_value=mock_session)
 
+        mock_rollups = mock_rollups_cls.return_value
+        mock_rollups.refresh = AsyncMock()
+        mock_rollups.audit_totals = AsyncMock(return_value={"new_users": 2, "churned_users": 1, "admin_ops": 1})
+        mock_rollups.payment_totals = AsyncMock(
+            return_value=[
+                MagicMock(provider="cryptobot", plan_name="Basic", total=10.0),
+                MagicMock(provider="cryptobot", plan_name="unknown", total=5.0),
+            ]
+        )
+
         from src.tasks.analytics.daily_stats import aggregate_daily_stats
 
         result = await aggregate_daily_stats()
@@ -66,6 +68,10 @@ async def test_aggregate_daily_stats_success():
         assert result["new_users"] == 2
         assert result["churned_users"] == 1
         assert result["total_bandwidth_bytes"] == 3500
+        assert result["revenue_usd"] == 15.0
+        assert result["revenue_by_plan"] == {"Basic": 10.0, "unknown": 5.0}
+        assert result["top_errors"] == ["error-1", "error-2"]
+        mock_rollups.refresh.assert_awaited_once()
         mock_cache.set.assert_called_once()
 
 
@@ -76,21 +82,18 @@ async def test_aggregate_financial_stats_grouping():
         patch("src.tasks.analytics.financial_stats.get_session_factory") as mock_factory,
         patch("src.tasks.analytics.financial_stats.get_redis_client") as mock_redis_fn,
         patch("src.tasks.analytics.financial_stats.CacheService") as mock_cache_cls,
+        patch("src.tasks.analytics.financial_stats.StatsRollups") as mock_rollups_cls,
     ):
-        mock_session = AsyncMock()
-        result_currency = MagicMock()
-        result_currency.all.return_value = [
-            MagicMock(count=5, total=100.50, currency="USD"),
-            MagicMock(count=3, total=50.25, currency="EUR"),
-        ]
-        result_provider = MagicMock()
-        result_provider.all.return_value = [
-            MagicMock(count=4, total=80.0, provider="cryptobot"),
-        ]
-        result_totals = MagicMock()
-        result_totals.one.return_value = MagicMock(count=8, total=150.75, avg=18.84)
-        mock_session.execute = AsyncMock(side_effect=[result_currency, result_provider, result_totals])
-        mock_factory.return_value.return_value.__aenter__.return_value = mock_session
+        mock_rollups = mock_rollups_cls.return_value
+        mock_rollups.refresh = AsyncMock()
+        mock_rollups.payment_totals = AsyncMock(
+            side_effect=[
+                [MagicMock(count=5, total=100.50, currency="USD"), MagicMock(count=3, total=50.25, currency="EUR")],
+                [MagicMock(count=4, total=80.0, provider="cryptobot")],
+                [MagicMock(count=8, total=150.75)],
+            ]
+        )
+        mock_factory.return_value.return_value.__aenter__.return_value = AsyncMock()
 
         mock_redis = AsyncMock()
         mock_redis_fn.return_value = mock_redis
@@ -107,45 +110,113 @@ async def test_aggregate_financial_stats_grouping():
         assert result["by_currency"]["USD"]["total"] == 100.50
         assert result["by_currency"]["EUR"]["count"] == 3
         assert result["by_provider"]["cryptobot"]["count"] == 4
+        assert result["avg_amount"] == pytest.approx(150.75 / 8)
+        mock_rollups.refresh.assert_awaited_once()
         mock_cache.set.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_aggregate_hourly_bandwidth_rollup():
-    """Test hourly bandwidth aggregation and cleanup."""
-    with patch("src.tasks.analytics.hourly_bandwidth.get_redis_client") as mock_redis_fn:
-        mock_redis = AsyncMock()
-        mock_redis.scan.side_effect = [
-            (0, [b"cybervpn:bandwidth:node1:1234567890"]),
+async def test_stats_rollups_refresh_only_reaggregates_from_watermarks():
+    """Test rollup refresh pushes aggregation into GROUP BY and resumes from the high-water marks."""
+    from sqlalchemy.dialects import postgresql
+
+    from src.services.stats_rollups import StatsRollups
+
+    watermark = datetime(2026, 6, 1, 10, 42, tzinfo=UTC)
+    touched_hour = datetime(2026, 5, 20, 8, tzinfo=UTC)
+
+    def scalar_result(value):
+        result = MagicMock()
+        result.scalar.return_value = value
+        result.scalars.return_value.all.return_value = [value]
+        result.rowcount = 1
+        return result
+
+    session = AsyncMock()
+    session.execute = AsyncMock(
+        side_effect=[
+            scalar_result(None),  # advisory lock
+            scalar_result(watermark),  # audit watermark
+            scalar_result(watermark + timedelta(minutes=30)),  # max(audit_logs.created_at)
+            scalar_result(None),  # audit upsert
+            scalar_result(None),  # audit watermark upsert
+            scalar_result(watermark),  # payment watermark
+            scalar_result(watermark + timedelta(minutes=20)),  # max(payments.updated_at)
+            scalar_result(touched_hour),  # touched hours
+            scalar_result(None),  # delete touched hours
+            scalar_result(None),  # payment insert
+            scalar_result(None),  # payment watermark upsert
         ]
-        # Provide enough values for the loop (function checks multiple timestamps)
-        mock_redis.get.return_value = None  # Default to None for most calls
-        mock_redis_fn.return_value = mock_redis
+    )
+
+    result = await StatsRollups(session).refresh()
 
+    assert result == {"audit_logs": 1, "payments": 1}
+    session.commit.assert_awaited_once()
+    statements = [
+        str(call.args[0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        for call in session.execute.call_args_list
+    ]
+    audit_upsert, payment_insert = statements[3], statements[9]
+    assert "GROUP BY date_trunc('hour', audit_logs.created_at, 'UTC')" in audit_upsert
+    assert "audit_logs.created_at >= '2026-06-01 10:00:00+00:00'" in audit_upsert
+    assert "ON CONFLICT (bucket_start) DO UPDATE" in audit_upsert
+    assert "payments.updated_at >= '2026-06-01 10:37:00+00:00'" in statements[7]
+    assert "DELETE FROM payment_hourly_rollups" in statements[8]
+    assert "payments.created_at >= '2026-05-20 08:00:00+00:00'" in payment_insert
+    assert "GROUP BY" in payment_insert and "sum(payments.amount)" in payment_insert
+
+
+@pytest.mark.asyncio
+async def test_aggregate_hourly_bandwidth_rollup():
+    """Test hourly rollup reads the previous hour of every node series."""
+    from src.services.bandwidth_series import BandwidthSeries
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    current_hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    hour_start = int((current_hour - timedelta(hours=1)).timestamp())
+    series = BandwidthSeries(redis)
+    for minute in range(0, 60, 5):
+        await series.record(hour_start + minute * 60, {"node1": (minute, 100), "node2": (0, 10)})
+    await series.record(int(current_hour.timestamp()), {"node1": (10**9, 0)})
+
+    with patch("src.tasks.analytics.hourly_bandwidth.get_redis_client", return_value=redis):
         from src.tasks.analytics.hourly_bandwidth import aggregate_hourly_bandwidth
 
         result = await aggregate_hourly_bandwidth()
 
-        assert result["nodes_processed"] >= 0
-        assert result["snapshots_aggregated"] >= 0
+    assert result == {"nodes_processed": 2, "snapshots_aggregated": 24}
+    buckets = await series.buckets("1h", hour_start, hour_start + 3600)
+    node1 = buckets["node1"][0]
+    assert (node1.samples, node1.sum, node1.max, node1.min, node1.p95) == (12, 1530, 155, 100, 155)
+    assert buckets["node2"][0].avg == 10
 
 
 @pytest.mark.asyncio
-async def test_aggregate_hourly_bandwidth_invalid_values():
-    """Test bandwidth aggregation handles invalid values gracefully."""
-    with patch("src.tasks.analytics.hourly_bandwidth.get_redis_client") as mock_redis_fn:
-        mock_redis = AsyncMock()
-        mock_redis.scan.side_effect = [(0, [b"cybervpn:bandwidth:node1:1234567890"])]
-        # Return None for all get calls (no data available)
-        mock_redis.get.return_value = None
-        mock_redis_fn.return_value = mock_redis
-
-        from src.tasks.analytics.hourly_bandwidth import aggregate_hourly_bandwidth
+async def test_bandwidth_series_rollups_queries_and_retention():
+    """Test daily rollups, fleet totals, raw retention and pruning of stale nodes."""
+    from src.services.bandwidth_series import BandwidthSeries
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    series = BandwidthSeries(redis)
+    day = 1_700_006_400  # 2023-11-15T00:00:00Z
+    for hour in range(24):
+        await series.record(day + hour * 3600, {"node1": (hour, 0), "node2": (1, 1)})
+
+    daily = await series.rollup("1d", day)
+    assert daily["node1"].samples == 24
+    assert daily["node1"].p95 == 22
+    assert await series.fleet_totals("1d", day, day + 86400) == [
+        {"start": day, "sum": sum(range(24)) + 48, "up": sum(range(24)) + 24, "down": 24, "nodes": 2}
+    ]
 
-        result = await aggregate_hourly_bandwidth()
+    # Raw samples older than the retention are trimmed on the next write.
+    await series.record(day + 3 * 86400, {"node1": (1, 1)})
+    assert await redis.zcard("cybervpn:bandwidth:series:node1") == 1
 
-        assert "nodes_processed" in result
-        assert "snapshots_aggregated" in result
+    assert await series.prune(day + 3 * 86400 + 365 * 86400 - 1) == 1
+    assert await series.node_uuids() == ["node1"]
+    assert not await redis.exists("cybervpn:bandwidth:rollup:1d:node2")
 
 
 @pytest.mark.asyncio
@@ -165,7 +236,7 @@ async def test_update_realtime_metrics_caching():
         patch("src.tasks.analytics.realtime_metrics.get_redis_client") as mock_redis_fn,
     ):
         mock_rw = AsyncMock()
-        mock_rw.get_users.return_value = mock_users
+        mock_rw.iter_users = MagicMock(return_value=stream_remnawave_users(mock_users))
         mock_rw.get_nodes.return_value = mock_nodes
         mock_rw_cls.return_value.__aenter__.return_value = mock_rw
 
@@ -194,7 +265,7 @@ async def test_update_realtime_metrics_no_online():
         patch("src.tasks.analytics.realtime_metrics.get_redis_client") as mock_redis_fn,
     ):
         mock_rw = AsyncMock()
-        mock_rw.get_users.return_value = []
+        mock_rw.iter_users = MagicMock(return_value=stream_remnawave_users([]))
         mock_rw.get_nodes.return_value = []
         mock_rw_cls.return_value.__aenter__.return_value = mock_rw
 
@@ -1,7 +1,12 @@
 """Tests for bulk operations task modules."""
 
+import asyncio
+import gzip
 import json
+from datetime import UTC, datetime
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
 
 import pytest
 
@@ -175,28 +180,49 @@ async def test_bulk_broadcast_large_batch():
         assert mock_session.add_all.call_count == 2
 
 
+def _stream_result(*partitions):
+    """Build a mock AsyncResult whose ``partitions()`` yields the given row batches."""
+
+    async def _partitions(*_args):
+        for partition in partitions:
+            yield partition
+
+    result = MagicMock()
+    result.partitions = _partitions
+    return result
+
+
+def _export_mocks(mock_factory, mock_redis_fn, mock_settings, *partitions, chunk_rows=1000, stored=None):
+    mock_settings.return_value.export_batch_size = 500
+    mock_settings.return_value.export_chunk_rows = chunk_rows
+
+    mock_session = AsyncMock()
+    mock_session.stream.return_value = _stream_result(*partitions)
+    mock_factory.return_value.return_value.__aenter__.return_value = mock_session
+
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = json.dumps(stored) if stored else None
+    mock_redis_fn.return_value = mock_redis
+    return mock_session, mock_redis
+
+
+USER_ROWS = [
+    (UUID("00000000-0000-0000-0000-000000000001"), "user1", "active", datetime(2026, 1, 1, tzinfo=UTC), None),
+    (UUID("00000000-0000-0000-0000-000000000002"), "user2", "disabled", datetime(2026, 1, 2, tzinfo=UTC), None),
+    (UUID("00000000-0000-0000-0000-000000000003"), "user3", "active", datetime(2026, 1, 3, tzinfo=UTC), None),
+]
+
+
 @pytest.mark.asyncio
-async def test_bulk_export_csv():
-    """Test CSV export generation."""
+async def test_bulk_export_csv(tmp_path):
+    """Test CSV export streams rows into a gzip-compressed file."""
     with (
         patch("src.tasks.bulk.export.get_session_factory") as mock_factory,
         patch("src.tasks.bulk.export.get_redis_client") as mock_redis_fn,
-        patch("builtins.open", create=True) as mock_open,
+        patch("src.tasks.bulk.export.get_settings") as mock_settings,
+        patch("src.tasks.bulk.export.EXPORT_DIR", tmp_path),
     ):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.fetchmany.side_effect = [
-            [MagicMock(_mapping={"id": 1, "name": "User 1"}), MagicMock(_mapping={"id": 2, "name": "User 2"})],
-            [],
-        ]
-        mock_session.execute.return_value = mock_result
-        mock_factory.return_value.return_value.__aenter__.return_value = mock_session
-
-        mock_redis = AsyncMock()
-        mock_redis_fn.return_value = mock_redis
-
-        mock_file = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file
+        mock_session, mock_redis = _export_mocks(mock_factory, mock_redis_fn, mock_settings, USER_ROWS[:2])
 
         from src.tasks.bulk.export import bulk_export
 
@@ -204,38 +230,118 @@ async def test_bulk_export_csv():
 
         assert result["rows_exported"] == 2
         assert "file_path" in result
-        assert ".csv" in result["file_path"]
+        assert result["file_path"].endswith(".csv.gz")
+        with gzip.open(result["file_path"], "rt", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        assert lines[0] == "uuid,username,status,created_at,expires_at"
+        assert lines[1].startswith("00000000-0000-0000-0000-000000000001,user1,active,2026-01-01T00:00:00+00:00")
+
+        assert mock_session.stream.call_args.kwargs["execution_options"] == {"yield_per": 500}
+        meta = json.loads(mock_redis.set.call_args.args[1])
+        assert meta["status"] == "complete"
+        assert meta["rows"] == 2
 
 
 @pytest.mark.asyncio
-async def test_bulk_export_json():
-    """Test JSON export generation."""
+async def test_bulk_export_json(tmp_path):
+    """Test JSON export generation without compression."""
     with (
         patch("src.tasks.bulk.export.get_session_factory") as mock_factory,
         patch("src.tasks.bulk.export.get_redis_client") as mock_redis_fn,
-        patch("builtins.open", create=True) as mock_open,
+        patch("src.tasks.bulk.export.get_settings") as mock_settings,
+        patch("src.tasks.bulk.export.EXPORT_DIR", tmp_path),
     ):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.fetchmany.side_effect = [
-            [MagicMock(_mapping={"id": 1, "name": "User 1"})],
-            [],
+        _export_mocks(mock_factory, mock_redis_fn, mock_settings, USER_ROWS[:1])
+
+        from src.tasks.bulk.export import bulk_export
+
+        result = await bulk_export("users", "json", compression="none")
+
+        assert result["rows_exported"] == 1
+        assert result["file_path"].endswith(".json")
+        data = json.loads(await asyncio.to_thread(Path(result["file_path"]).read_text, encoding="utf-8"))
+        assert data == [
+            {
+                "uuid": "00000000-0000-0000-0000-000000000001",
+                "username": "user1",
+                "status": "active",
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "expires_at": None,
+            }
         ]
-        mock_session.execute.return_value = mock_result
-        mock_factory.return_value.return_value.__aenter__.return_value = mock_session
 
-        mock_redis = AsyncMock()
-        mock_redis_fn.return_value = mock_redis
 
-        mock_file = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file
+@pytest.mark.asyncio
+async def test_bulk_export_ndjson_chunks_and_keyset_filters(tmp_path):
+    """Test NDJSON export splits into chunks and records the keyset cursor after each one."""
+    with (
+        patch("src.tasks.bulk.export.get_session_factory") as mock_factory,
+        patch("src.tasks.bulk.export.get_redis_client") as mock_redis_fn,
+        patch("src.tasks.bulk.export.get_settings") as mock_settings,
+        patch("src.tasks.bulk.export.EXPORT_DIR", tmp_path),
+    ):
+        mock_session, mock_redis = _export_mocks(
+            mock_factory, mock_redis_fn, mock_settings, USER_ROWS[:1], USER_ROWS[1:], chunk_rows=2
+        )
 
         from src.tasks.bulk.export import bulk_export
 
-        result = await bulk_export("users", "json")
+        result = await bulk_export("users", "ndjson", job_id="job-1", since="2026-01-01")
 
-        assert result["rows_exported"] == 1
-        assert ".json" in result["file_path"]
+        assert result["rows_exported"] == 3
+        assert [path.rsplit("/", 1)[1] for path in result["files"]] == [
+            "users_job-1.part0001.ndjson.gz",
+            "users_job-1.part0002.ndjson.gz",
+        ]
+        with gzip.open(result["files"][0], "rb") as file:
+            assert [json.loads(line)["username"] for line in file] == ["user1", "user2"]
+
+        query, params = mock_session.stream.call_args.args
+        assert "WHERE created_at >= :since ORDER BY created_at, uuid" in str(query)
+        assert params == {"since": datetime(2026, 1, 1, tzinfo=UTC)}
+
+        first_progress = json.loads(mock_redis.set.call_args_list[0].args[1])
+        assert first_progress["status"] == "running"
+        assert first_progress["cursor"] == ["2026-01-02 00:00:00+00:00", "00000000-0000-0000-0000-000000000002"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_export_resumes_after_last_chunk(tmp_path):
+    """Test a re-run with the same job id continues after the stored keyset cursor."""
+    stored = {
+        "export_type": "users",
+        "format": "csv",
+        "compression": "gzip",
+        "since": None,
+        "until": None,
+        "status": "running",
+        "files": [{"file_path": str(tmp_path / "users_job-2.part0001.csv.gz"), "rows": 2, "bytes": 10}],
+        "rows": 2,
+        "cursor": ["2026-01-02 00:00:00+00:00", "00000000-0000-0000-0000-000000000002"],
+        "created_at": "2026-01-03T00:00:00+00:00",
+    }
+    with (
+        patch("src.tasks.bulk.export.get_session_factory") as mock_factory,
+        patch("src.tasks.bulk.export.get_redis_client") as mock_redis_fn,
+        patch("src.tasks.bulk.export.get_settings") as mock_settings,
+        patch("src.tasks.bulk.export.EXPORT_DIR", tmp_path),
+    ):
+        mock_session, _ = _export_mocks(
+            mock_factory, mock_redis_fn, mock_settings, USER_ROWS[2:], chunk_rows=2, stored=stored
+        )
+
+        from src.tasks.bulk.export import bulk_export
+
+        result = await bulk_export("users", "csv", job_id="job-2")
+
+        assert result["rows_exported"] == 3
+        assert result["files"][1].endswith("users_job-2.part0002.csv.gz")
+        query, params = mock_session.stream.call_args.args
+        assert "(created_at, uuid) > (:after_0, :after_1)" in str(query)
+        assert params == {
+            "after_0": datetime(2026, 1, 2, tzinfo=UTC),
+            "after_1": UUID("00000000-0000-0000-0000-000000000002"),
+        }
 
 
 @pytest.mark.asyncio
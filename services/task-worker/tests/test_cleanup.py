@@ -2,15 +2,28 @@
 
 import os
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 
+def _budget_settings(settings: MagicMock) -> None:
+    settings.cleanup_delete_batch_size = 100
+    settings.cleanup_delete_pause_seconds = 0.0
+    settings.cleanup_delete_max_batches = 10
+
+
+def _rows(rowcount: int = 0, scalar=None, rows=None) -> MagicMock:
+    result = MagicMock(rowcount=rowcount)
+    result.scalar.return_value = scalar
+    result.all.return_value = rows or []
+    return result
+
+
 @pytest.mark.asyncio
 async def test_cleanup_old_records_deletes_both():
-    """Test cleanup deletes both audit and webhook logs."""
+    """Test cleanup deletes both audit and webhook logs in bounded batches."""
     # Import the function first
     from src.tasks.cleanup.cleanup_old_records import cleanup_old_records
 
@@ -19,19 +32,24 @@ async def test_cleanup_old_records_deletes_both():
 
         mock_settings.return_value.cleanup_audit_retention_days = 90
         mock_settings.return_value.cleanup_webhook_retention_days = 30
+        _budget_settings(mock_settings.return_value)
 
         mock_session = AsyncMock()
-        mock_audit_result = MagicMock(rowcount=10)
-        mock_webhook_result = MagicMock(rowcount=5)
-        mock_session.execute.side_effect = [mock_audit_result, mock_webhook_result]
+        # Neither table is partitioned: one existence check, then one short batch each.
+        mock_session.execute.side_effect = [
+            _rows(scalar=False),
+            _rows(rowcount=10),
+            _rows(scalar=False),
+            _rows(rowcount=5),
+        ]
         mock_factory.return_value.return_value.__aenter__.return_value = mock_session
 
         result = await cleanup_old_records()
 
         assert result["audit_deleted"] == 10
         assert result["webhook_deleted"] == 5
-        assert mock_session.execute.call_count == 2
-        mock_session.commit.assert_called_once()
+        assert mock_session.execute.call_count == 4
+        assert mock_session.commit.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -62,36 +80,57 @@ async def test_cleanup_audit_logs_retention():
          patch("src.tasks.cleanup.audit_logs.get_settings") as mock_settings:
 
         mock_settings.return_value.cleanup_audit_retention_days = 90
+        _budget_settings(mock_settings.return_value)
 
         mock_session = AsyncMock()
-        mock_result = MagicMock(rowcount=25)
-        mock_session.execute.return_value = mock_result
+        mock_session.execute.side_effect = [_rows(scalar=False), _rows(rowcount=25)]
         mock_factory.return_value.return_value.__aenter__.return_value = mock_session
 
         result = await cleanup_audit_logs()
 
         assert result["deleted"] == 25
+        assert result["partitions_dropped"] == 0
         assert result["retention_days"] == 90
 
 
 @pytest.mark.asyncio
 async def test_cleanup_webhook_logs_batch():
-    """Test webhook log cleanup in batches."""
+    """Test webhook log cleanup drops expired partitions and trims the legacy one."""
     from src.tasks.cleanup.webhook_logs import cleanup_webhook_logs
 
+    now = datetime.now(UTC)
+    old = now - timedelta(days=60)
+    bounds = [
+        ("webhook_logs_legacy", f"FOR VALUES FROM (MINVALUE) TO ('{(now - timedelta(days=10)).isoformat()}')"),
+        ("webhook_logs_p_old", f"FOR VALUES FROM ('{old.isoformat()}') TO ('{(old + timedelta(days=1)).isoformat()}')"),
+    ]
+
     with patch("src.tasks.cleanup.webhook_logs.get_session_factory") as mock_factory, \
          patch("src.tasks.cleanup.webhook_logs.get_settings") as mock_settings:
 
         mock_settings.return_value.cleanup_webhook_retention_days = 30
+        _budget_settings(mock_settings.return_value)
 
         mock_session = AsyncMock()
-        mock_result = MagicMock(rowcount=100)
-        mock_session.execute.return_value = mock_result
+        mock_session.execute.side_effect = [
+            _rows(scalar=True),  # is_partitioned
+            _rows(rows=bounds),  # partitions before dropping
+            _rows(),  # SET LOCAL lock_timeout
+            _rows(),  # DETACH
+            _rows(),  # DROP
+            _rows(rows=bounds[:1]),  # partitions after dropping
+            _rows(rowcount=100),  # legacy batch 1 (full)
+            _rows(rowcount=40),  # legacy batch 2
+        ]
         mock_factory.return_value.return_value.__aenter__.return_value = mock_session
 
         result = await cleanup_webhook_logs()
 
-        assert result["deleted"] == 100
+        assert result == {"deleted": 140, "partitions_dropped": 1, "retention_days": 30}
+        statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+        assert 'DETACH PARTITION "webhook_logs_p_old"' in statements[3]
+        assert 'DELETE FROM "webhook_logs_legacy" WHERE ctid' in statements[6]
+        assert "LIMIT :batch_size" in statements[6]
 
 
 @pytest.mark.asyncio
@@ -99,7 +138,10 @@ async def test_cleanup_notifications_old_only():
     """Test notifications cleanup only deletes old sent/failed."""
     from src.tasks.cleanup.notifications import cleanup_notifications
 
-    with patch("src.tasks.cleanup.notifications.get_session_factory") as mock_factory:
+    with patch("src.tasks.cleanup.notifications.get_session_factory") as mock_factory, \
+         patch("src.tasks.cleanup.notifications.get_settings") as mock_settings:
+        _budget_settings(mock_settings.return_value)
+
         mock_session = AsyncMock()
         mock_result = MagicMock(rowcount=15)
         mock_session.execute.return_value = mock_result
@@ -108,6 +150,137 @@ async def test_cleanup_notifications_old_only():
         result = await cleanup_notifications()
 
         assert result["deleted"] == 15
+        statement = str(mock_session.execute.call_args.args[0])
+        assert "status IN ('sent', 'failed') AND created_at < :cutoff" in statement
+
+
+@pytest.mark.asyncio
+async def test_bounded_delete_throttles_and_stops_at_budget():
+    """Test bounded delete commits every batch, pauses between them and honours max_batches."""
+    from src.services.table_retention import DeleteBudget, bounded_delete
+
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = MagicMock(rowcount=100)
+
+    with patch("src.services.table_retention.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        deleted = await bounded_delete(
+            mock_session, "notification_queue", "created_at < :cutoff", {"cutoff": 1}, DeleteBudget(100, 0.5, 3)
+        )
+
+    assert deleted == 300
+    assert mock_session.execute.call_count == 3
+    assert mock_session.commit.call_count == 3
+    assert mock_sleep.await_count == 2
+    mock_sleep.assert_awaited_with(0.5)
+    assert mock_session.execute.call_args.args[1] == {"cutoff": 1, "batch_size": 100}
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_continues_after_legacy_bound():
+    """Test partition pre-creation starts at the highest existing bound and stops at the horizon."""
+    from src.services.table_retention import PartitionManager
+
+    now = datetime(2026, 6, 15, 12, tzinfo=UTC)
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = [
+        _rows(rows=[("audit_logs_legacy", "FOR VALUES FROM (MINVALUE) TO ('2026-07-01 00:00:00+00')")]),
+        _rows(),
+        _rows(),
+    ]
+
+    created = await PartitionManager(mock_session).ensure_partitions("audit_logs", "month", 2, now)
+
+    assert created == ["audit_logs_p20260701", "audit_logs_p20260801"]
+    statement = str(mock_session.execute.call_args_list[1].args[0])
+    assert "PARTITION OF \"audit_logs\"" in statement
+    assert "FROM ('2026-07-01T00:00:00+00:00') TO ('2026-08-01T00:00:00+00:00')" in statement
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default_partition():
+    """Test a range the default partition already holds rows for is created with the default detached."""
+    from src.services.table_retention import PartitionManager
+
+    now = datetime(2026, 6, 15, 12, tzinfo=UTC)
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = [
+        _rows(rows=[
+            ("audit_logs_default", "DEFAULT"),
+            ("audit_logs_legacy", "FOR VALUES FROM (MINVALUE) TO ('2026-07-01 00:00:00+00')"),
+        ]),
+        _rows(scalar=True),  # default holds July rows
+        _rows(),  # DETACH default
+        _rows(),  # CREATE July
+        _rows(rowcount=3),  # INSERT moved rows
+        _rows(rowcount=3),  # DELETE moved rows
+        _rows(),  # ATTACH default
+        _rows(scalar=False),  # nothing for August
+        _rows(),  # CREATE August
+    ]
+
+    created = await PartitionManager(mock_session).ensure_partitions("audit_logs", "month", 2, now)
+
+    assert created == ["audit_logs_p20260701", "audit_logs_p20260801"]
+    statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+    assert 'DETACH PARTITION "audit_logs_default"' in statements[2]
+    assert 'PARTITION OF "audit_logs"' in statements[3]
+    assert 'INSERT INTO "audit_logs_p20260701" SELECT * FROM "audit_logs_default"' in statements[4]
+    assert 'DELETE FROM "audit_logs_default"' in statements[5]
+    assert 'ATTACH PARTITION "audit_logs_default" DEFAULT' in statements[6]
+    assert mock_session.execute.call_args_list[4].args[1] == {
+        "start": datetime(2026, 7, 1, tzinfo=UTC),
+        "end": datetime(2026, 8, 1, tzinfo=UTC),
+    }
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_apply_retention_trims_default_partition():
+    """Test rows in the default partition are expired with bounded deletes."""
+    from src.services.table_retention import DeleteBudget, PartitionManager
+
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = [
+        _rows(scalar=True),  # is_partitioned
+        _rows(rows=[("webhook_logs_default", "DEFAULT")]),  # partitions before dropping
+        _rows(rows=[("webhook_logs_default", "DEFAULT")]),  # partitions after dropping
+        _rows(rowcount=7),
+    ]
+
+    result = await PartitionManager(mock_session).apply_retention(
+        "webhook_logs", datetime(2026, 2, 1, tzinfo=UTC), DeleteBudget(100, 0.0, 10)
+    )
+
+    assert result == {"deleted": 7, "partitions_dropped": 0}
+    assert 'DELETE FROM "webhook_logs_default" WHERE ctid' in str(mock_session.execute.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_drop_expired_stops_on_lock_timeout():
+    """Test a partition drop that hits lock_timeout is rolled back and left for the next run."""
+    from sqlalchemy.exc import DBAPIError
+
+    from src.services.table_retention import PartitionManager
+
+    lock_error = DBAPIError("DETACH", {}, MagicMock(sqlstate="55P03"))
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = [
+        _rows(rows=[
+            ("webhook_logs_default", "DEFAULT"),
+            ("webhook_logs_p20260101", "FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-01-02 00:00:00+00')"),
+            ("webhook_logs_p20260102", "FOR VALUES FROM ('2026-01-02 00:00:00+00') TO ('2026-01-03 00:00:00+00')"),
+        ]),
+        _rows(),
+        lock_error,
+    ]
+
+    dropped = await PartitionManager(mock_session).drop_expired("webhook_logs", datetime(2026, 2, 1, tzinfo=UTC))
+
+    assert dropped == []
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+    assert mock_session.execute.call_count == 3
 
 
 @pytest.mark.asyncio
@@ -118,22 +291,21 @@ async def test_cleanup_cache_patterns():
     with patch("src.tasks.cleanup.cache.get_redis_client") as mock_redis_fn, \
          patch("src.tasks.cleanup.cache._scan_and_delete_by_date") as mock_scan_date, \
          patch("src.tasks.cleanup.cache._scan_and_delete_pattern") as mock_scan_pattern, \
-         patch("src.tasks.cleanup.cache._scan_and_delete_by_timestamp") as mock_scan_ts:
+         patch("src.tasks.cleanup.cache.BandwidthSeries") as mock_series_cls:
 
         mock_redis = AsyncMock()
         mock_redis_fn.return_value = mock_redis
 
         mock_scan_date.return_value = 10
         mock_scan_pattern.return_value = 5
-        mock_scan_ts.side_effect = [3, 7]
+        mock_series_cls.return_value.prune = AsyncMock(return_value=10)
 
         result = await cleanup_cache()
 
         assert result["total_deleted"] == 25
         assert result["stats_deleted"] == 10
         assert result["health_deleted"] == 5
-        assert result["bandwidth_raw_deleted"] == 3
-        assert result["bandwidth_hourly_deleted"] == 7
+        assert result["bandwidth_nodes_pruned"] == 10
 
 
 @pytest.mark.asyncio
@@ -150,7 +322,7 @@ async def test_cleanup_cache_scan_and_delete_by_date():
         mock_redis.unlink.return_value = 1
         mock_redis_fn.return_value = mock_redis
 
-        cutoff = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        cutoff = datetime(2024, 1, 1, tzinfo=UTC)
         result = await _scan_and_delete_by_date(mock_redis, "cybervpn:stats:daily:*", cutoff)
 
         assert result == 1
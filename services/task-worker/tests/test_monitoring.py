@@ -209,7 +209,9 @@ async def test_bandwidth_collects_snapshots(mock_redis, mock_remnawave):
         patch("src.tasks.monitoring.bandwidth.get_redis_client", return_value=mock_redis),
         patch("src.tasks.monitoring.bandwidth.CacheService") as MockCache,
         patch("src.tasks.monitoring.bandwidth.RemnawaveClient") as MockRW,
+        patch("src.tasks.monitoring.bandwidth.BandwidthSeries") as mock_series_cls,
     ):
+        mock_series_cls.return_value.record = AsyncMock(return_value=len(nodes))
         mock_cache = MagicMock()
         mock_cache.set = AsyncMock()
         MockCache.return_value = mock_cache
@@ -222,7 +224,9 @@ async def test_bandwidth_collects_snapshots(mock_redis, mock_remnawave):
         assert result["nodes"] == 2
         assert result["total_up"] == 3000000
         assert result["total_down"] == 13000000
-        assert mock_cache.set.call_count == 3  # 2 nodes + 1 dashboard
+        assert mock_cache.set.call_count == 1  # dashboard only
+        _timestamp, samples = mock_series_cls.return_value.record.call_args.args
+        assert samples == {"node-1": (1000000, 5000000), "node-2": (2000000, 8000000)}
 
 
 @pytest.mark.asyncio
@@ -241,7 +245,9 @@ async def test_bandwidth_updates_dashboard_cache(mock_redis, mock_remnawave):
         patch("src.tasks.monitoring.bandwidth.get_redis_client", return_value=mock_redis),
         patch("src.tasks.monitoring.bandwidth.CacheService") as MockCache,
         patch("src.tasks.monitoring.bandwidth.RemnawaveClient") as MockRW,
+        patch("src.tasks.monitoring.bandwidth.BandwidthSeries") as mock_series_cls,
     ):
+        mock_series_cls.return_value.record = AsyncMock(return_value=len(nodes))
         mock_cache = MagicMock()
         mock_cache.set = AsyncMock()
         MockCache.return_value = mock_cache
@@ -284,7 +290,9 @@ async def test_bandwidth_handles_null_traffic(mock_redis, mock_remnawave):
         patch("src.tasks.monitoring.bandwidth.get_redis_client", return_value=mock_redis),
         patch("src.tasks.monitoring.bandwidth.CacheService") as MockCache,
         patch("src.tasks.monitoring.bandwidth.RemnawaveClient") as MockRW,
+        patch("src.tasks.monitoring.bandwidth.BandwidthSeries") as mock_series_cls,
     ):
+        mock_series_cls.return_value.record = AsyncMock(return_value=len(nodes))
         mock_cache = MagicMock()
         mock_cache.set = AsyncMock()
         MockCache.return_value = mock_cache
@@ -1,5 +1,6 @@
 """Unit tests for notification tasks."""
 
+import json
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -11,7 +12,8 @@ os.environ.setdefault("REMNAWAVE_API_TOKEN", "test-token")
 os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123:test-bot")
 os.environ.setdefault("CRYPTOBOT_TOKEN", "test-crypto")
 
-from src.services.telegram_client import TelegramAPIError
+from src.services.notification_delivery import TelegramDeliveryPool, TelegramSendJob
+from src.services.telegram_client import TelegramAPIError, TelegramRateLimitError
 from src.tasks.notifications.broadcast import broadcast_message
 from src.tasks.notifications.process_queue import process_notification_queue
 from src.tasks.notifications.send_notification import send_notification
@@ -240,11 +242,70 @@ async def test_process_queue_max_retries_reached(mock_settings, mock_db_session,
         assert notif.attempts == 5
 
 
+@pytest.mark.asyncio
+async def test_process_queue_defers_rate_limited_without_attempt(mock_settings, mock_db_session, mock_telegram):
+    """A persistent Telegram 429 reschedules the message without consuming a retry."""
+    notif = MagicMock()
+    notif.id = uuid4()
+    notif.telegram_id = 123
+    notif.message = "Message"
+    notif.attempts = 2
+    notif.status = "pending"
+
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = [notif]
+    mock_db_session.execute = AsyncMock(return_value=mock_result)
+    mock_telegram.send_message.side_effect = TelegramRateLimitError(retry_after=0)
+
+    with (
+        patch("src.tasks.notifications.process_queue.get_settings", return_value=mock_settings),
+        patch("src.tasks.notifications.process_queue.get_session_factory") as mock_factory,
+        patch("src.tasks.notifications.process_queue.TelegramClient") as mock_tg,
+    ):
+        mock_factory.return_value = MagicMock(return_value=mock_db_session)
+        mock_tg.return_value.__aenter__ = AsyncMock(return_value=mock_telegram)
+        mock_tg.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        result = await process_notification_queue()
+
+        assert result == {"sent": 0, "failed": 0, "deferred": 1}
+        assert notif.status == "pending"
+        assert notif.attempts == 2
+        mock_telegram.send_admin_alert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delivery_pool_keeps_per_chat_order(mock_telegram):
+    """Messages to one chat are sent in order; every job gets an outcome in input order."""
+    sent = []
+
+    async def _send(chat_id, text):
+        sent.append((chat_id, text))
+        if text == "b2":
+            raise TelegramAPIError("blocked")
+        return {"message_id": 1}
+
+    mock_telegram.send_message.side_effect = _send
+    jobs = [
+        TelegramSendJob(key=1, chat_id=10, text="a1"),
+        TelegramSendJob(key=2, chat_id=20, text="b1"),
+        TelegramSendJob(key=3, chat_id=10, text="a2"),
+        TelegramSendJob(key=4, chat_id=20, text="b2"),
+    ]
+
+    outcomes = await TelegramDeliveryPool(mock_telegram, concurrency=4, per_chat_interval=0).deliver(jobs)
+
+    assert [outcome.key for outcome in outcomes] == [1, 2, 3, 4]
+    assert [outcome.status for outcome in outcomes] == ["sent", "sent", "sent", "failed"]
+    assert [text for chat_id, text in sent if chat_id == 10] == ["a1", "a2"]
+    assert [text for chat_id, text in sent if chat_id == 20] == ["b1", "b2"]
+
+
 @pytest.mark.asyncio
 async def test_broadcast_queues_notifications(mock_db_session, mock_redis):
     """Test broadcast queues notifications via DB and tracks progress."""
     telegram_ids = [111, 222, 333]
-    mock_db_session.add_all = MagicMock()
+    mock_db_session.execute = AsyncMock(return_value=MagicMock(rowcount=3))
 
     with (
         patch("src.tasks.notifications.broadcast.get_session_factory") as mock_factory,
@@ -257,11 +318,42 @@ async def test_broadcast_queues_notifications(mock_db_session, mock_redis):
 
         assert result["queued"] == 3
         assert result["job_id"]
-        mock_db_session.add_all.assert_called()
+        statement, params = mock_db_session.execute.await_args.args
+        assert "unnest" in str(statement)
+        assert params["telegram_ids"] == telegram_ids
         mock_db_session.commit.assert_called()
         mock_redis.set.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_broadcast_selects_segment_server_side(mock_db_session, mock_redis):
+    """Segment broadcasts insert from mobile_users and report the inserted row count."""
+    mock_db_session.execute = AsyncMock(return_value=MagicMock(rowcount=1200))
+
+    with (
+        patch("src.tasks.notifications.broadcast.get_session_factory") as mock_factory,
+        patch("src.tasks.notifications.broadcast.get_redis_client") as mock_redis_fn,
+    ):
+        mock_factory.return_value = MagicMock(return_value=mock_db_session)
+        mock_redis_fn.return_value = mock_redis
+
+        result = await broadcast_message(text="Hello", segment="active", job_id="job-1")
+
+        assert result == {"queued": 1200, "job_id": "job-1"}
+        statement, params = mock_db_session.execute.await_args.args
+        assert "FROM mobile_users" in str(statement)
+        assert "telegram_ids" not in params
+        progress = json.loads(mock_redis.set.await_args.args[1])
+        assert progress == {"total": 1200, "queued": 1200, "status": "completed"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_rejects_unknown_segment():
+    """Unknown segment names never reach SQL."""
+    with pytest.raises(ValueError, match="Unknown broadcast segment"):
+        await broadcast_message(text="Hello", segment="everyone; DROP TABLE users")
+
+
 @pytest.mark.asyncio
 async def test_broadcast_empty_list(mock_db_session, mock_redis):
     """Test broadcast handles empty recipient list."""
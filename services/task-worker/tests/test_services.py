@@ -57,6 +57,58 @@ async def test_remnawave_client_get_users_normalizes_aliases():
             assert users[0]["dataUsed"] == 64
 
 
+@pytest.mark.asyncio
+async def test_remnawave_client_iter_users_paginates():
+    """Test RemnawaveClient iter_users streams start/size pages until total is reached."""
+    pages = {
+        0: {"users": [{"uuid": "u-1"}, {"uuid": "u-2"}], "total": 3},
+        2: {"users": [{"uuid": "u-3", "expireAt": "2027-01-01T00:00:00Z"}], "total": 3},
+    }
+
+    def _respond(method, path, params=None, **kwargs):
+        response = MagicMock()
+        response.is_success = True
+        response.status_code = 200
+        response.json.return_value = {"response": pages[params["start"]]}
+        return response
+
+    with patch("src.services.remnawave_client.httpx.AsyncClient") as mock_client_cls:
+        mock_client = AsyncMock()
+        mock_client.request.side_effect = _respond
+        mock_client_cls.return_value = mock_client
+
+        from src.services.remnawave_client import RemnawaveClient
+
+        async with RemnawaveClient() as client:
+            users = [user async for user in client.iter_users(page_size=2)]
+
+        assert [user["uuid"] for user in users] == ["u-1", "u-2", "u-3"]
+        assert users[2]["expire_at"] == "2027-01-01T00:00:00Z"
+        requested = [call.kwargs["params"] for call in mock_client.request.call_args_list]
+        assert requested == [{"start": 0, "size": 2}, {"start": 2, "size": 2}]
+
+
+@pytest.mark.asyncio
+async def test_remnawave_client_iter_users_stops_on_short_page_without_total():
+    """Test RemnawaveClient iter_users stops on a short page when no total is reported."""
+    with patch("src.services.remnawave_client.httpx.AsyncClient") as mock_client_cls:
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.is_success = True
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"uuid": "u-1"}]
+        mock_client.request.return_value = mock_response
+        mock_client_cls.return_value = mock_client
+
+        from src.services.remnawave_client import RemnawaveClient
+
+        async with RemnawaveClient() as client:
+            users = [user async for user in client.iter_users(page_size=2)]
+
+        assert [user["uuid"] for user in users] == ["u-1"]
+        assert mock_client.request.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_remnawave_client_get_nodes_normalizes_aliases():
     """Test RemnawaveClient get_nodes normalizes node metadata and traffic aliases."""
@@ -5,6 +5,9 @@ import os
 from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
+from fakeredis import FakeAsyncRedis
+
+from tests.remnawave_fixtures import stream_remnawave_user_pages, stream_remnawave_users
 
 # Set required environment variables before importing modules
 os.environ.setdefault("REMNAWAVE_API_TOKEN", "test-token")
@@ -15,6 +18,13 @@ from src.tasks.subscriptions.check_expiring import check_expiring_subscriptions
 from src.tasks.subscriptions.disable_expired import disable_expired_users
 from src.tasks.subscriptions.reset_traffic import reset_monthly_traffic
 from src.tasks.subscriptions.auto_renew import auto_renew_subscriptions
+from src.services.expiry_index import ExpiryIndex
+from src.services.telegram_client import TelegramAPIError
+from src.utils.constants import (
+    EXPIRY_INDEX_KEY,
+    NOTIFICATION_TYPE_SUBSCRIPTION_EXPIRED,
+    STATUS_PENDING,
+)
 
 
 @pytest.mark.asyncio
@@ -37,7 +47,7 @@ async def test_check_expiring_sends_reminders(mock_redis, mock_remnawave, mock_t
             "expire_at": (now + timedelta(days=3)).isoformat(),
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.check_expiring.get_redis_client", return_value=mock_redis),
@@ -78,7 +88,7 @@ async def test_check_expiring_skips_already_sent(mock_redis, mock_remnawave, moc
             "expire_at": (now + timedelta(days=1)).isoformat(),
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.check_expiring.get_redis_client", return_value=mock_redis),
@@ -119,7 +129,7 @@ async def test_check_expiring_correct_bracket(mock_redis, mock_remnawave, mock_t
             "expire_at": (now + timedelta(days=7)).isoformat(),  # 7 day bracket
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.check_expiring.get_redis_client", return_value=mock_redis),
@@ -162,7 +172,7 @@ async def test_check_expiring_skips_no_telegram_id(mock_redis, mock_remnawave, m
             "expire_at": (now + timedelta(days=1)).isoformat(),
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.check_expiring.get_redis_client", return_value=mock_redis),
@@ -207,11 +217,15 @@ async def test_disable_expired_disables_users(mock_remnawave, mock_telegram):
             "telegram_id": 222,
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(users))
 
     with (
         patch("src.tasks.subscriptions.disable_expired.RemnawaveClient") as mock_rw_cls,
         patch("src.tasks.subscriptions.disable_expired.TelegramClient") as mock_tg_cls,
+        patch(
+            "src.tasks.subscriptions.disable_expired.get_redis_client",
+            return_value=FakeAsyncRedis(decode_responses=True),
+        ),
     ):
         mock_rw_cls.return_value.__aenter__ = AsyncMock(return_value=mock_remnawave)
         mock_rw_cls.return_value.__aexit__ = AsyncMock(return_value=False)
@@ -239,11 +253,15 @@ async def test_disable_expired_sends_notification(mock_remnawave, mock_telegram)
             "telegram_id": 12345,
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(users))
 
     with (
         patch("src.tasks.subscriptions.disable_expired.RemnawaveClient") as mock_rw_cls,
         patch("src.tasks.subscriptions.disable_expired.TelegramClient") as mock_tg_cls,
+        patch(
+            "src.tasks.subscriptions.disable_expired.get_redis_client",
+            return_value=FakeAsyncRedis(decode_responses=True),
+        ),
     ):
         mock_rw_cls.return_value.__aenter__ = AsyncMock(return_value=mock_remnawave)
         mock_rw_cls.return_value.__aexit__ = AsyncMock(return_value=False)
@@ -256,6 +274,61 @@ async def test_disable_expired_sends_notification(mock_remnawave, mock_telegram)
         mock_telegram.send_message.assert_called_once_with(chat_id=12345, text=ANY)
 
 
+@pytest.mark.asyncio
+async def test_disable_expired_queues_undelivered_notices(mock_remnawave, mock_telegram):
+    """Notices Telegram rejects go to the notification queue for retry."""
+    now = datetime.now(UTC)
+    users = [
+        {
+            "uuid": f"user-{telegram_id}",
+            "username": f"user{telegram_id}",
+            "status": "active",
+            "expire_at": (now - timedelta(days=1)).isoformat(),
+            "telegram_id": telegram_id,
+        }
+        for telegram_id in (111, 222)
+    ]
+    mock_remnawave.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(users))
+
+    async def _send_message(*, chat_id: int, text: str) -> bool:
+        if chat_id == 222:
+            raise TelegramAPIError("Bad Gateway")
+        return True
+
+    mock_telegram.send_message = AsyncMock(side_effect=_send_message)
+
+    with (
+        patch("src.tasks.subscriptions.disable_expired.RemnawaveClient") as mock_rw_cls,
+        patch("src.tasks.subscriptions.disable_expired.TelegramClient") as mock_tg_cls,
+        patch("src.tasks.subscriptions.disable_expired.get_session_factory") as mock_session_factory,
+        patch(
+            "src.tasks.subscriptions.disable_expired.get_redis_client",
+            return_value=FakeAsyncRedis(decode_responses=True),
+        ),
+    ):
+        mock_rw_cls.return_value.__aenter__ = AsyncMock(return_value=mock_remnawave)
+        mock_rw_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        mock_tg_cls.return_value.__aenter__ = AsyncMock(return_value=mock_telegram)
+        mock_tg_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_session.commit = AsyncMock()
+        mock_session_factory.return_value = MagicMock(return_value=mock_session)
+
+        result = await disable_expired_users()
+
+    assert result["disabled"] == 2
+    assert mock_telegram.send_message.await_count == 2
+    (queued,) = mock_session.add_all.call_args.args[0]
+    assert queued.telegram_id == 222
+    assert queued.notification_type == NOTIFICATION_TYPE_SUBSCRIPTION_EXPIRED
+    assert queued.status == STATUS_PENDING
+    mock_session.commit.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_disable_expired_skips_already_disabled(mock_remnawave, mock_telegram):
     """Test disable expired skips already disabled users."""
@@ -269,11 +342,15 @@ async def test_disable_expired_skips_already_disabled(mock_remnawave, mock_teleg
             "telegram_id": 111,
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(users))
 
     with (
         patch("src.tasks.subscriptions.disable_expired.RemnawaveClient") as mock_rw_cls,
         patch("src.tasks.subscriptions.disable_expired.TelegramClient") as mock_tg_cls,
+        patch(
+            "src.tasks.subscriptions.disable_expired.get_redis_client",
+            return_value=FakeAsyncRedis(decode_responses=True),
+        ),
     ):
         mock_rw_cls.return_value.__aenter__ = AsyncMock(return_value=mock_remnawave)
         mock_rw_cls.return_value.__aexit__ = AsyncMock(return_value=False)
@@ -287,6 +364,95 @@ async def test_disable_expired_skips_already_disabled(mock_remnawave, mock_teleg
         mock_remnawave.disable_user.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_disable_expired_uses_fresh_index(mock_remnawave, mock_telegram):
+    """Test disable expired reads due users from a fresh expiry index instead of scanning the fleet."""
+    now = datetime.now(UTC)
+    redis = FakeAsyncRedis(decode_responses=True)
+    index = ExpiryIndex(redis)
+    await index.upsert_users(
+        [
+            {
+                "uuid": "user-1",
+                "username": "user1",
+                "status": "active",
+                "expire_at": (now - timedelta(hours=1)).isoformat(),
+                "telegram_id": 111,
+            },
+            {
+                "uuid": "user-2",
+                "username": "user2",
+                "status": "active",
+                "expire_at": (now + timedelta(days=3)).isoformat(),
+                "telegram_id": 222,
+            },
+        ]
+    )
+    await index.mark_synced()
+    mock_remnawave.get_user = AsyncMock(
+        return_value={
+            "uuid": "user-1",
+            "username": "user1",
+            "status": "active",
+            "expire_at": (now - timedelta(hours=1)).isoformat(),
+            "telegram_id": 111,
+        }
+    )
+
+    with (
+        patch("src.tasks.subscriptions.disable_expired.RemnawaveClient") as mock_rw_cls,
+        patch("src.tasks.subscriptions.disable_expired.TelegramClient") as mock_tg_cls,
+        patch("src.tasks.subscriptions.disable_expired.get_redis_client", return_value=redis),
+    ):
+        mock_rw_cls.return_value.__aenter__ = AsyncMock(return_value=mock_remnawave)
+        mock_rw_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        mock_tg_cls.return_value.__aenter__ = AsyncMock(return_value=mock_telegram)
+        mock_tg_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        result = await disable_expired_users()
+
+    assert result["disabled"] == 1
+    mock_remnawave.iter_user_pages.assert_not_called()
+    mock_remnawave.disable_user.assert_called_once_with("user-1")
+    mock_telegram.send_message.assert_called_once_with(chat_id=111, text=ANY)
+    assert await redis.zrange(EXPIRY_INDEX_KEY, 0, -1) == ["user-2"]
+
+
+@pytest.mark.asyncio
+async def test_disable_expired_reindexes_renewed_user(mock_remnawave, mock_telegram):
+    """Test disable expired skips and re-indexes a user renewed after it was indexed."""
+    now = datetime.now(UTC)
+    renewed_expire_at = (now + timedelta(days=30)).isoformat()
+    redis = FakeAsyncRedis(decode_responses=True)
+    index = ExpiryIndex(redis)
+    await index.upsert_users(
+        [{"uuid": "user-1", "status": "active", "expire_at": (now - timedelta(hours=1)).isoformat()}]
+    )
+    await index.mark_synced()
+    mock_remnawave.get_user = AsyncMock(
+        return_value={"uuid": "user-1", "status": "active", "expire_at": renewed_expire_at}
+    )
+
+    with (
+        patch("src.tasks.subscriptions.disable_expired.RemnawaveClient") as mock_rw_cls,
+        patch("src.tasks.subscriptions.disable_expired.TelegramClient") as mock_tg_cls,
+        patch("src.tasks.subscriptions.disable_expired.get_redis_client", return_value=redis),
+    ):
+        mock_rw_cls.return_value.__aenter__ = AsyncMock(return_value=mock_remnawave)
+        mock_rw_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        mock_tg_cls.return_value.__aenter__ = AsyncMock(return_value=mock_telegram)
+        mock_tg_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        result = await disable_expired_users()
+
+    assert result["disabled"] == 0
+    mock_remnawave.disable_user.assert_not_called()
+    score = await redis.zscore(EXPIRY_INDEX_KEY, "user-1")
+    assert score == datetime.fromisoformat(renewed_expire_at).timestamp()
+
+
 @pytest.mark.asyncio
 async def test_reset_traffic_resets_active_users(mock_remnawave, mock_telegram):
     """Test traffic reset resets active users."""
@@ -295,7 +461,7 @@ async def test_reset_traffic_resets_active_users(mock_remnawave, mock_telegram):
         {"uuid": "user-2", "username": "user2", "status": "disabled", "telegram_id": 222, "plan_name": "Basic"},
         {"uuid": "user-3", "username": "user3", "status": "active", "telegram_id": 333, "plan_name": "Premium"},
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.reset_traffic.RemnawaveClient") as mock_rw_cls,
@@ -320,7 +486,7 @@ async def test_reset_traffic_sends_notification(mock_remnawave, mock_telegram):
     users = [
         {"uuid": "user-1", "username": "user1", "status": "active", "telegram_id": 12345, "plan_name": "Pro"},
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.reset_traffic.RemnawaveClient") as mock_rw_cls,
@@ -353,7 +519,7 @@ async def test_auto_renew_creates_invoices(mock_settings, mock_remnawave, mock_c
             "plan_currency": "USD",
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
     mock_cryptobot.create_invoice.return_value = {
         "invoice_id": 123,
         "pay_url": "https://pay.test/123",
@@ -401,7 +567,7 @@ async def test_auto_renew_skips_ineligible_users(mock_settings, mock_remnawave,
             "telegram_id": 222,
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
 
     with (
         patch("src.tasks.subscriptions.auto_renew.get_settings", return_value=mock_settings),
@@ -440,7 +606,7 @@ async def test_auto_renew_sends_payment_link(mock_settings, mock_remnawave, mock
             "plan_currency": "USD",
         },
     ]
-    mock_remnawave.get_users.return_value = users
+    mock_remnawave.iter_users = MagicMock(return_value=stream_remnawave_users(users))
     mock_cryptobot.create_invoice.return_value = {
         "invoice_id": 999,
         "pay_url": "https://pay.test/999",
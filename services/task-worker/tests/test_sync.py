@@ -1,8 +1,11 @@
 """Tests for sync task modules."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fakeredis import FakeAsyncRedis
+
+from tests.remnawave_fixtures import stream_remnawave_user_pages
 
 
 @pytest.mark.asyncio
@@ -93,8 +96,16 @@ async def test_sync_geolocations_unknown_country():
 async def test_sync_user_stats_aggregation():
     """Test user stats sync aggregates all categories."""
     mock_users = [
-        {"status": "active", "is_online": True, "expire_at": None, "traffic_limit_bytes": 0, "used_traffic_bytes": 0},
         {
+            "uuid": "user-1",
+            "status": "active",
+            "is_online": True,
+            "expire_at": None,
+            "traffic_limit_bytes": 0,
+            "used_traffic_bytes": 0,
+        },
+        {
+            "uuid": "user-2",
             "status": "active",
             "is_online": False,
             "expire_at": "2023-01-01T00:00:00Z",
@@ -102,6 +113,7 @@ async def test_sync_user_stats_aggregation():
             "used_traffic_bytes": 1500,
         },
         {
+            "uuid": "user-3",
             "status": "disabled",
             "is_online": False,
             "expire_at": None,
@@ -115,10 +127,10 @@ async def test_sync_user_stats_aggregation():
          patch("src.tasks.sync.user_stats.CacheService") as mock_cache_cls:
 
         mock_rw = AsyncMock()
-        mock_rw.get_users.return_value = mock_users
+        mock_rw.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(mock_users))
         mock_rw_cls.return_value.__aenter__.return_value = mock_rw
 
-        mock_redis = AsyncMock()
+        mock_redis = FakeAsyncRedis(decode_responses=True)
         mock_redis_fn.return_value = mock_redis
 
         mock_cache = AsyncMock()
@@ -145,10 +157,10 @@ async def test_sync_user_stats_no_users():
          patch("src.tasks.sync.user_stats.CacheService") as mock_cache_cls:
 
         mock_rw = AsyncMock()
-        mock_rw.get_users.return_value = []
+        mock_rw.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages([]))
         mock_rw_cls.return_value.__aenter__.return_value = mock_rw
 
-        mock_redis = AsyncMock()
+        mock_redis = FakeAsyncRedis(decode_responses=True)
         mock_redis_fn.return_value = mock_redis
 
         mock_cache = AsyncMock()
@@ -162,6 +174,134 @@ async def test_sync_user_stats_no_users():
         assert result["active"] == 0
 
 
+@pytest.mark.asyncio
+async def test_sync_user_stats_indexes_only_changed_users():
+    """Test the expiry index receives the diff between syncs and every user on a rebuild."""
+    from src.services.expiry_index import ExpiryIndex
+    from src.tasks.sync.user_stats import sync_user_stats
+    from src.utils.constants import EXPIRY_INDEX_SYNCED_AT_KEY
+
+    users = [
+        {"uuid": "u1", "status": "active", "expire_at": "2030-01-01T00:00:00Z"},
+        {"uuid": "u2", "status": "active", "expire_at": "2030-01-01T00:00:00Z"},
+    ]
+    changed = [users[0], {**users[1], "expire_at": "2031-01-01T00:00:00Z"}]
+    indexed: list[list[str]] = []
+
+    async def record_upsert(_index, batch):
+        indexed.append([user["uuid"] for user in batch])
+        return len(indexed[-1])
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    redis.aclose = AsyncMock()
+    with patch("src.tasks.sync.user_stats.RemnawaveClient") as mock_rw_cls, \
+         patch("src.tasks.sync.user_stats.get_redis_client", return_value=redis), \
+         patch("src.tasks.sync.user_stats.CacheService", return_value=AsyncMock()), \
+         patch.object(ExpiryIndex, "upsert_users", record_upsert):
+        mock_rw = AsyncMock()
+        mock_rw_cls.return_value.__aenter__.return_value = mock_rw
+
+        for fleet in (users, changed, changed):
+            mock_rw.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(fleet))
+            await sync_user_stats()
+        synced_at = await redis.get(EXPIRY_INDEX_SYNCED_AT_KEY)
+
+        await redis.set(EXPIRY_INDEX_SYNCED_AT_KEY, "0")
+        mock_rw.iter_user_pages = MagicMock(return_value=stream_remnawave_user_pages(changed))
+        await sync_user_stats()
+
+    assert indexed == [["u1", "u2"], ["u2"], ["u1", "u2"]]
+    assert synced_at is not None
+    assert float(await redis.get(EXPIRY_INDEX_SYNCED_AT_KEY)) > 0
+
+
+@pytest.mark.asyncio
+async def test_user_snapshot_applies_deltas_between_syncs():
+    """Test the user snapshot rewrites only changed users and drops deleted ones."""
+    from src.services.user_snapshot import UserSnapshot
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    snapshot = UserSnapshot(redis)
+    first = [
+        {"uuid": "u1", "status": "active", "is_online": True, "used_traffic_bytes": 100},
+        {"uuid": "u2", "status": "active", "expire_at": "2023-01-01T00:00:00Z"},
+        {"uuid": "u3", "status": "disabled", "traffic_limit_bytes": 10, "used_traffic_bytes": 10},
+    ]
+    diff = await snapshot.sync(stream_remnawave_user_pages(first, page_size=2))
+    assert (diff.added, diff.changed, diff.removed) == (3, 0, 0)
+
+    second = [
+        {"uuid": "u1", "status": "active", "is_online": False, "used_traffic_bytes": 150},
+        {"uuid": "u2", "status": "active", "expire_at": "2023-01-01T00:00:00Z"},
+        {"uuid": "u4", "status": "active"},
+    ]
+    diff = await snapshot.sync(stream_remnawave_user_pages(second, page_size=2))
+    assert (diff.added, diff.changed, diff.unchanged, diff.removed) == (1, 1, 1, 1)
+
+    aggregates = await snapshot.aggregates()
+    assert aggregates["total"] == 3
+    assert aggregates["active"] == 3
+    assert aggregates["disabled"] == 0
+    assert aggregates["online"] == 0
+    assert aggregates["limited"] == 0
+    assert aggregates["expired"] == 1
+    assert aggregates["used_traffic_bytes"] == 150
+    assert await snapshot.is_fresh(60)
+
+
+@pytest.mark.asyncio
+async def test_user_snapshot_serializes_overlapping_syncs():
+    """Test a second sync is refused while the first holds the run lock."""
+    from src.services.user_snapshot import SnapshotLockLostError, UserSnapshot
+    from src.utils.constants import USER_SNAPSHOT_LOCK_KEY
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    snapshot = UserSnapshot(redis)
+    users = [{"uuid": "u1", "status": "active"}]
+
+    generation = await snapshot.begin()
+    assert generation is not None
+    assert await snapshot.begin() is None
+    assert await snapshot.sync(stream_remnawave_user_pages(users)) is None
+
+    await snapshot.apply_page(generation, users)
+    # The lock expired and another run took over: the stale run must not write.
+    await redis.set(USER_SNAPSHOT_LOCK_KEY, "other-run")
+    with pytest.raises(SnapshotLockLostError):
+        await snapshot.apply_page(generation, [{"uuid": "u2", "status": "active"}])
+    await snapshot.release(generation)
+    assert await redis.get(USER_SNAPSHOT_LOCK_KEY) == "other-run"
+    assert (await snapshot.aggregates())["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_snapshot_recount_repairs_drifted_counters():
+    """Test the periodic full recount rebuilds counters from the records."""
+    from src.services.user_snapshot import UserSnapshot
+    from src.utils.constants import USER_SNAPSHOT_COUNTERS_KEY, USER_SNAPSHOT_RECOUNTED_AT_KEY
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    snapshot = UserSnapshot(redis)
+    users = [
+        {"uuid": "u1", "status": "active", "is_online": True, "used_traffic_bytes": 100},
+        {"uuid": "u2", "status": "disabled"},
+    ]
+    await snapshot.sync(stream_remnawave_user_pages(users))
+    await redis.hincrby(USER_SNAPSHOT_COUNTERS_KEY, "total", 5)
+
+    # Within the recount interval the drift is left alone...
+    await snapshot.sync(stream_remnawave_user_pages(users))
+    assert (await snapshot.aggregates())["total"] == 7
+
+    # ...and repaired once the last recount is old enough.
+    await redis.set(USER_SNAPSHOT_RECOUNTED_AT_KEY, "0")
+    await snapshot.sync(stream_remnawave_user_pages(users))
+    aggregates = await snapshot.aggregates()
+    assert aggregates["total"] == 2
+    assert aggregates["active_online"] == 1
+    assert aggregates["used_traffic_bytes"] == 100
+
+
 @pytest.mark.asyncio
 async def test_sync_node_configurations_ttl():
     """Test node config sync sets correct TTL."""
@@ -7,6 +7,7 @@ from aiogram import F, Router
 
 from src.keyboards.account import language_selection_keyboard
 from src.keyboards.menu import profile_kb
+from src.services.user_context import UserContext
 from src.states.account import AccountState
 
 if TYPE_CHECKING:
@@ -26,12 +27,14 @@ async def show_profile_handler(
     callback: CallbackQuery,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    user_context: UserContext | None = None,
 ) -> None:
     """Show user profile."""
     user_id = callback.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
-        user = await api_client.get_user(user_id)
+        user = await user_context.user()
         username = user.get("username")
         username_display = f"@{username}" if username else "N/A"
         telegram_id = user.get("telegram_id", user_id)
@@ -83,6 +86,7 @@ async def language_selected_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     """Handle language selection."""
     if callback.data is None:
@@ -90,10 +94,12 @@ async def language_selected_handler(
         return
     user_id = callback.from_user.id
     language_code = callback.data.split(":")[1]
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
         # Update user language
         await api_client.update_user(user_id, {"language_code": language_code})
+        await user_context.invalidate()
 
         # Update i18n locale
         await i18n.set_locale(language_code)
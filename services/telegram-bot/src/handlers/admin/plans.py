@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
     from src.config import BotSettings
     from src.services.api_client import CyberVPNAPIClient
+    from src.services.cache_service import CacheService
 
 logger = structlog.get_logger(__name__)
 
@@ -193,6 +194,7 @@ async def plan_toggle_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     settings: BotSettings,
+    cache: CacheService | None = None,
 ) -> None:
     """Toggle plan active status."""
     plan_id = callback.data.split(":")[3]
@@ -200,6 +202,8 @@ async def plan_toggle_handler(
     try:
         # Toggle plan status
         result = await api_client.toggle_plan_status(plan_id)
+        if cache is not None:
+            await cache.invalidate_plans()
         is_active = result.get("is_active", False)
 
         if is_active:
@@ -275,6 +279,7 @@ async def plan_create_description_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    cache: CacheService | None = None,
 ) -> None:
     """Handle plan description input and create plan."""
     plan_description = message.text.strip()
@@ -299,6 +304,8 @@ async def plan_create_description_handler(
         }
 
         plan = await api_client.create_plan(plan_data)
+        if cache is not None:
+            await cache.invalidate_plans()
         plan_id = plan.get("id")
 
         await message.answer(
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from aiogram_i18n import I18nContext
 
     from src.services.api_client import CyberVPNAPIClient
+    from src.services.cache_service import CacheService
 
 logger = structlog.get_logger(__name__)
 
@@ -267,6 +268,7 @@ async def user_ban_handler(
     callback: CallbackQuery,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    cache: CacheService | None = None,
 ) -> None:
     """Ban/unban user."""
     user_id = int(callback.data.split(":")[3])
@@ -274,6 +276,8 @@ async def user_ban_handler(
     try:
         # Toggle ban status
         result = await api_client.toggle_user_ban(user_id)
+        if cache is not None:
+            await cache.invalidate_user_context(user_id)
         is_banned = result.get("is_banned", False)
 
         if is_banned:
@@ -318,6 +322,7 @@ async def user_extend_subscription_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    cache: CacheService | None = None,
 ) -> None:
     """Extend user subscription."""
     try:
@@ -338,6 +343,8 @@ async def user_extend_subscription_handler(
 
         # Extend subscription via API
         result = await api_client.extend_user_subscription(user_id, days)
+        if cache is not None:
+            await cache.invalidate_user_context(user_id)
 
         await message.answer(
             i18n.get(
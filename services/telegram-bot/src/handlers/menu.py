@@ -11,6 +11,7 @@ from aiogram.filters import Command
 from src.keyboards.menu import main_menu_keyboard, profile_kb
 from src.keyboards.referral import invite_codes_keyboard
 from src.keyboards.subscription import subscription_keyboard
+from src.services.user_context import UserContext
 
 if TYPE_CHECKING:
     from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
@@ -107,15 +108,14 @@ async def _build_my_invites_response(
 
 async def _build_connect_menu_response(
     *,
-    user_id: int,
     i18n: I18nContext,
-    api_client: CyberVPNAPIClient,
+    user_context: UserContext,
 ) -> tuple[str, InlineKeyboardMarkup]:
-    entitlements = await api_client.get_current_entitlements(user_id)
+    entitlements = await user_context.entitlements()
     status = str(entitlements.get("status") or "none")
 
     if status in {"active", "trial"}:
-        service_state = await api_client.get_current_service_state(user_id)
+        service_state = await user_context.service_state()
         text = i18n.get(
             "subscription-active",
             plan=entitlements.get("display_name") or entitlements.get("plan_code") or "N/A",
@@ -144,14 +144,16 @@ async def main_menu_command_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     settings: BotSettings | None = None,
+    user_context: UserContext | None = None,
 ) -> None:
     """Open the main menu from the Telegram command list."""
     if message.from_user is None:
         return
 
+    user_context = user_context or UserContext(message.from_user.id, api_client)
     user = None
     try:
-        user = await api_client.get_user(message.from_user.id)
+        user = await user_context.user()
     except Exception as e:
         logger.warning("menu_command_user_fetch_failed", user_id=message.from_user.id, error=str(e))
 
@@ -167,11 +169,13 @@ async def main_menu_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     settings: BotSettings | None = None,
+    user_context: UserContext | None = None,
 ) -> None:
     """Handle main menu callback."""
+    user_context = user_context or UserContext(callback.from_user.id, api_client)
     user = None
     try:
-        user = await api_client.get_user(callback.from_user.id)
+        user = await user_context.user()
     except Exception as e:
         logger.warning("menu_user_fetch_failed", user_id=callback.from_user.id, error=str(e))
 
@@ -187,15 +191,16 @@ async def connect_menu_handler(
     callback: CallbackQuery,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    user_context: UserContext | None = None,
 ) -> None:
     """Handle connect/subscription menu callback."""
     user_id = callback.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
         text, reply_markup = await _build_connect_menu_response(
-            user_id=user_id,
             i18n=i18n,
-            api_client=api_client,
+            user_context=user_context,
         )
 
         await callback.message.edit_text(
@@ -215,17 +220,18 @@ async def connect_command_handler(
     message: Message,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    user_context: UserContext | None = None,
 ) -> None:
     """Open the VPN access/config surface from the Telegram command list."""
     if message.from_user is None:
         return
 
     user_id = message.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
     try:
         text, reply_markup = await _build_connect_menu_response(
-            user_id=user_id,
             i18n=i18n,
-            api_client=api_client,
+            user_context=user_context,
         )
     except Exception as e:
         logger.error("connect_command_error", user_id=user_id, error=str(e))
@@ -303,13 +309,15 @@ async def profile_menu_handler(
     callback: CallbackQuery,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    user_context: UserContext | None = None,
 ) -> None:
     """Handle profile menu callback."""
     user_id = callback.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
         # Get user profile
-        user = await api_client.get_user(user_id)
+        user = await user_context.user()
         username = user.get("username")
         username_display = f"@{username}" if username else "N/A"
         telegram_id = user.get("telegram_id", user_id)
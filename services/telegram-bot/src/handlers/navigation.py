@@ -6,6 +6,7 @@ import structlog
 from aiogram import F, Router
 
 from src.keyboards.menu import main_menu_keyboard
+from src.services.user_context import UserContext
 
 if TYPE_CHECKING:
     from aiogram.fsm.context import FSMContext
@@ -29,6 +30,7 @@ async def navigation_handler(
     api_client: CyberVPNAPIClient,
     state: FSMContext,
     settings: BotSettings | None = None,
+    user_context: UserContext | None = None,
 ) -> None:
     """Handle generic navigation callbacks."""
     if callback.message is None:
@@ -37,9 +39,10 @@ async def navigation_handler(
 
     await state.clear()
 
+    user_context = user_context or UserContext(callback.from_user.id, api_client)
     user = None
     try:
-        user = await api_client.get_user(callback.from_user.id)
+        user = await user_context.user()
     except Exception as e:
         logger.warning("navigation_user_fetch_failed", user_id=callback.from_user.id, error=str(e))
 
@@ -6,6 +6,7 @@ import structlog
 from aiogram import F, Router
 from aiogram.types import LabeledPrice
 
+from src.services.user_context import UserContext
 from src.states.subscription import SubscriptionState
 
 if TYPE_CHECKING:
@@ -58,6 +59,7 @@ async def payment_method_selected_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     if callback.data is None:
         await state.clear()
@@ -65,6 +67,7 @@ async def payment_method_selected_handler(
 
     payment_method = callback.data.split(":")[1]
     user_id = callback.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
     data = await state.get_data()
     checkout_payload = dict(data.get("checkout_payload") or {})
 
@@ -138,6 +141,7 @@ async def payment_method_selected_handler(
         await state.update_data(payment_id=payment_id, checkout_payload=checkout_payload)
 
         if status == "completed":
+            await user_context.invalidate()
             await callback.message.edit_text(text=i18n.get("payment-success"))
             await state.clear()
 
@@ -194,6 +198,7 @@ async def check_payment_status_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     if callback.data is None:
         await state.clear()
@@ -209,12 +214,14 @@ async def check_payment_status_handler(
         return
 
     user_id = callback.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
         payment = await api_client.get_payment_status(user_id, payment_id)
         status = payment.get("status")
 
         if status == "completed":
+            await user_context.invalidate()
             await callback.message.edit_text(text=i18n.get("payment-success"))
             await state.clear()
 
@@ -284,6 +291,7 @@ async def successful_payment_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     if message.successful_payment is None:
         return
@@ -322,6 +330,7 @@ async def successful_payment_handler(
             telegram_id=telegram_id,
             already_processed=bool(result.get("already_processed")),
         )
+        await (user_context or UserContext(telegram_id, api_client)).invalidate()
     except Exception as exc:
         logger.error("telegram_stars_payment_confirm_failed", payment_id=payment_id, error=str(exc))
         await message.answer(i18n.get("payment-status-unknown"))
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 import structlog
 from aiogram import F, Router
 
+from src.services.user_context import UserContext
 from src.states.promocode import PromoCodeState
 
 if TYPE_CHECKING:
@@ -42,6 +43,7 @@ async def promocode_entered_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     """Handle promo code input and activation."""
     if message.from_user is None or message.text is None:
@@ -54,6 +56,7 @@ async def promocode_entered_handler(
     try:
         # Validate and activate promo code
         result = await api_client.activate_promocode(user_id, code)
+        await (user_context or UserContext(user_id, api_client)).invalidate()
 
         discount_type = result.get("discount_type", "percentage")
         discount_value = result.get("discount_value", 0)
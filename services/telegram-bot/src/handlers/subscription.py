@@ -12,6 +12,7 @@ from src.keyboards.subscription import (
     payment_methods_keyboard,
     plans_keyboard,
 )
+from src.services.user_context import UserContext
 from src.states.subscription import SubscriptionState
 
 if TYPE_CHECKING:
@@ -305,9 +306,11 @@ async def buy_subscription_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
+    user_context = user_context or UserContext(callback.from_user.id, api_client)
     try:
-        plans = await api_client.get_plans()
+        plans = await user_context.plans()
         plan_catalog = _group_plan_catalog(
             [
                 plan
@@ -344,14 +347,16 @@ async def plans_command_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     """Open the public S1 subscription plan catalog from the command list."""
     if message.from_user is None:
         return
 
     user_id = message.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
     try:
-        plans = await api_client.get_plans()
+        plans = await user_context.plans()
         plan_catalog = _group_plan_catalog(
             [
                 plan
@@ -575,8 +580,10 @@ async def subscription_back_handler(
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
     state: FSMContext,
+    user_context: UserContext | None = None,
 ) -> None:
     current_state = await state.get_state()
+    user_context = user_context or UserContext(callback.from_user.id, api_client)
 
     try:
         if current_state == SubscriptionState.selecting_payment.state:
@@ -634,7 +641,7 @@ async def subscription_back_handler(
                 plan_catalog = _group_plan_catalog(
                     [
                         plan
-                        for plan in await api_client.get_plans()
+                        for plan in await user_context.plans()
                         if isinstance(plan, dict)
                         and str(plan.get("catalog_visibility") or "public") == "public"
                         and _is_telegram_sellable(plan)
@@ -6,6 +6,8 @@ import structlog
 from aiogram import F, Router
 from aiogram.filters import Command
 
+from src.services.user_context import UserContext
+
 if TYPE_CHECKING:
     from aiogram.types import CallbackQuery, Message
     from aiogram_i18n import I18nContext
@@ -33,12 +35,14 @@ async def activate_trial_command_handler(
     message: Message,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    user_context: UserContext | None = None,
 ) -> None:
     """Activate trial subscription from the Telegram command list."""
     if message.from_user is None:
         return
 
     user_id = message.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
         eligibility = await api_client.check_trial_eligibility(user_id)
@@ -48,6 +52,7 @@ async def activate_trial_command_handler(
             return
 
         trial = await api_client.activate_trial(user_id)
+        await user_context.invalidate()
         trial_duration = int(trial.get("duration_days", 7) or 7)
         expires_at = trial.get("expires_at") or trial.get("trial_end") or "N/A"
 
@@ -76,9 +81,11 @@ async def activate_trial_handler(
     callback: CallbackQuery,
     i18n: I18nContext,
     api_client: CyberVPNAPIClient,
+    user_context: UserContext | None = None,
 ) -> None:
     """Activate trial subscription."""
     user_id = callback.from_user.id
+    user_context = user_context or UserContext(user_id, api_client)
 
     try:
         # Check trial eligibility
@@ -94,6 +101,7 @@ async def activate_trial_handler(
 
         # Activate trial
         trial = await api_client.activate_trial(user_id)
+        await user_context.invalidate()
 
         trial_duration = int(trial.get("duration_days", 7) or 7)
         expires_at = trial.get("expires_at") or trial.get("trial_end") or "N/A"
@@ -1,7 +1,8 @@
 """CyberVPN Telegram Bot — Authentication middleware.
 
 Extracts telegram_id, gets/registers user via API, caches in Redis,
-and injects user data into handler context for downstream handlers.
+and injects user data plus a request-scoped UserContext into handler
+context for downstream handlers.
 """
 
 from __future__ import annotations
@@ -15,11 +16,10 @@ from aiogram.utils.deep_linking import decode_payload
 
 from src.services.api_client import APIError, CyberVPNAPIClient
 from src.services.cache_service import CacheService
+from src.services.user_context import USER_CACHE_TTL, UserContext
 
 logger = structlog.get_logger(__name__)
 
-USER_CACHE_TTL = 300  # 5 minutes
-
 
 class AuthMiddleware(BaseMiddleware):
     """Authentication middleware that loads/registers users.
@@ -29,7 +29,7 @@ class AuthMiddleware(BaseMiddleware):
     2. Tries to get user from Redis cache
     3. If cache miss, calls API to get or register user
     4. Caches user in Redis for subsequent requests
-    5. Injects data['user'] for downstream handlers
+    5. Injects data['user'] and data['user_context'] for downstream handlers
 
     Args:
         api_client: CyberVPN API client for user operations.
@@ -58,7 +58,7 @@ class AuthMiddleware(BaseMiddleware):
         Args:
             handler: Next handler in the chain.
             event: Telegram event (Message or CallbackQuery).
-            data: Handler data dict (will be mutated with 'user' key).
+            data: Handler data dict (will be mutated with 'user' and 'user_context' keys).
 
         Returns:
             Result from the next handler.
@@ -91,6 +91,7 @@ class AuthMiddleware(BaseMiddleware):
         if self._should_bypass_user_bootstrap(event):
             data["user"] = None
             data["telegram_user"] = telegram_user
+            data["user_context"] = UserContext(telegram_id, self._api, self._cache)
             logger.info("auth_bootstrap_bypassed", telegram_id=telegram_id, reason="telegram_magic_link")
             return await handler(event, data)
 
@@ -117,6 +118,7 @@ class AuthMiddleware(BaseMiddleware):
         # Inject user into handler context
         data["user"] = user_data
         data["telegram_user"] = telegram_user  # Also provide raw Telegram user
+        data["user_context"] = UserContext(telegram_id, self._api, self._cache, user=user_data, aggregate=True)
 
         return await handler(event, data)
 
@@ -230,31 +230,61 @@ class CyberVPNAPIClient:
             APIError: On API-level errors.
             ServerError: On 5xx errors (triggers retry).
         """
-        if not self._circuit.is_available:
-            msg = "Circuit breaker is open — backend unavailable"
-            raise APIError(msg, status_code=503)
+        response = await self._send(method, path, json=json, params=params)
+        if response.status_code == 204:
+            return {}
+        return response.json()
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> httpx.Response:
+        """Send one HTTP request and map its outcome.
+
+        Requests to the main backend go through the circuit breaker; a
+        dedicated ``client`` (the auth backend) bypasses it. A 304 answer to
+        a conditional request is returned as-is for the caller to handle.
+
+        Raises:
+            APIError: On API-level errors or an open circuit.
+            ServerError: On 5xx or connection errors.
+        """
+        guarded = client is None
+        if guarded:
+            if not self._circuit.is_available:
+                msg = "Circuit breaker is open — backend unavailable"
+                raise APIError(msg, status_code=503)
+            client = self._client
 
         try:
-            response = await self._client.request(
+            response = await client.request(
                 method=method,
                 url=path,
                 json=json,
                 params=params,
+                headers=headers,
             )
+        except (httpx.TransportError, httpx.RemoteProtocolError) as exc:
+            if guarded:
+                self._circuit.record_failure()
+                logger.error("api_connection_error", path=path, error=str(exc))
+                message = f"Backend connection error: {exc}"
+            else:
+                logger.error("auth_backend_connection_error", path=path, error=str(exc))
+                message = f"Auth backend connection error: {exc}"
+            raise ServerError(message=message, status_code=503) from exc
+
+        if response.status_code != 304:
             self._handle_response(response)
+        if guarded:
             self._circuit.record_success()
-
-            if response.status_code == 204:
-                return {}
-            return response.json()
-
-        except (httpx.TransportError, httpx.RemoteProtocolError) as exc:
-            self._circuit.record_failure()
-            logger.error("api_connection_error", path=path, error=str(exc))
-            raise ServerError(
-                message=f"Backend connection error: {exc}",
-                status_code=503,
-            ) from exc
+        return response
 
     async def _request_dict(
         self,
@@ -305,21 +335,7 @@ class CyberVPNAPIClient:
         if self._auth_backend_client is None:
             return await self._request_dict(method, path, json=json, params=params)
 
-        try:
-            response = await self._auth_backend_client.request(
-                method=method,
-                url=path,
-                json=json,
-                params=params,
-            )
-        except (httpx.TransportError, httpx.RemoteProtocolError) as exc:
-            logger.error("auth_backend_connection_error", path=path, error=str(exc))
-            raise ServerError(
-                message=f"Auth backend connection error: {exc}",
-                status_code=503,
-            ) from exc
-
-        self._handle_response(response)
+        response = await self._send(method, path, json=json, params=params, client=self._auth_backend_client)
         data = response.json()
         if isinstance(data, dict):
             return data
@@ -340,21 +356,7 @@ class CyberVPNAPIClient:
         if self._auth_backend_client is None:
             return await self._request_list(method, path, json=json, params=params)
 
-        try:
-            response = await self._auth_backend_client.request(
-                method=method,
-                url=path,
-                json=json,
-                params=params,
-            )
-        except (httpx.TransportError, httpx.RemoteProtocolError) as exc:
-            logger.error("auth_backend_connection_error", path=path, error=str(exc))
-            raise ServerError(
-                message=f"Auth backend connection error: {exc}",
-                status_code=503,
-            ) from exc
-
-        self._handle_response(response)
+        response = await self._send(method, path, json=json, params=params, client=self._auth_backend_client)
         data = response.json()
         if isinstance(data, list):
             return data
@@ -649,6 +651,40 @@ class CyberVPNAPIClient:
             params=params,
         )
 
+    async def get_bot_home(
+        self,
+        telegram_id: int,
+        *,
+        etag: str | None = None,
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Get user, entitlements, service state, subscriptions and plans in one request.
+
+        Args:
+            telegram_id: User's Telegram ID.
+            etag: ETag of a previously fetched payload, sent as ``If-None-Match``.
+
+        Returns:
+            Tuple of the payload and its ETag. The payload is None when the
+            backend answered 304 Not Modified, i.e. ``etag`` is still current.
+        """
+        path = f"/telegram/bot/user/{telegram_id}/home"
+        response = await self._send(
+            "GET",
+            path,
+            headers={"If-None-Match": etag} if etag else None,
+            client=self._auth_backend_client,
+        )
+        if response.status_code == 304:
+            return None, response.headers.get("ETag", etag)
+        data = response.json()
+        if isinstance(data, dict):
+            return data, response.headers.get("ETag")
+        raise APIError(
+            message="Unexpected response format",
+            status_code=500,
+            detail=f"Expected object for GET {path}",
+        )
+
     async def create_support_escalation(
         self,
         telegram_id: int,
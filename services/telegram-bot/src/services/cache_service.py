@@ -18,6 +18,10 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# Per-user state cached next to the ``user:<id>`` entry; all of it is dropped
+# together by invalidate_user_context().
+USER_STATE_NAMES = ("entitlements", "service_state")
+
 
 class CacheService:
     """Redis-backed cache layer with typed accessors and TTL management.
@@ -102,6 +106,19 @@ class CacheService:
         except RedisError:
             logger.exception("cache_delete_error", key=key)
 
+    async def delete_many(self, *keys: str) -> None:
+        """Delete several cache keys in one round-trip.
+
+        Args:
+            keys: Cache keys to delete (will be prefixed).
+        """
+        if not keys:
+            return
+        try:
+            await self._redis.delete(*(self._key(key) for key in keys))
+        except RedisError:
+            logger.exception("cache_delete_error", keys=list(keys))
+
     async def get_json(self, key: str) -> Any | None:
         """Get a JSON-deserialized value from cache.
 
@@ -175,6 +192,48 @@ class CacheService:
         """
         await self.delete(f"user:{telegram_id}")
 
+    # ── User state cache ─────────────────────────────────────────────────
+
+    async def get_user_state(self, telegram_id: int, name: str) -> Any | None:
+        """Get a cached piece of per-user backend state.
+
+        Args:
+            telegram_id: User's Telegram ID.
+            name: State name (one of USER_STATE_NAMES).
+
+        Returns:
+            Cached value or None.
+        """
+        return await self.get_json(f"user:{telegram_id}:{name}")
+
+    async def set_user_state(
+        self,
+        telegram_id: int,
+        name: str,
+        value: Any,
+        ttl: int = 60,
+    ) -> None:
+        """Cache a piece of per-user backend state.
+
+        Args:
+            telegram_id: User's Telegram ID.
+            name: State name (one of USER_STATE_NAMES).
+            value: Value to cache.
+            ttl: Cache TTL in seconds (default: 1 minute).
+        """
+        await self.set_json(f"user:{telegram_id}:{name}", value, ttl=ttl)
+
+    async def invalidate_user_context(self, telegram_id: int) -> None:
+        """Remove the user and all of their cached backend state.
+
+        Args:
+            telegram_id: User's Telegram ID.
+        """
+        await self.delete_many(
+            f"user:{telegram_id}",
+            *(f"user:{telegram_id}:{name}" for name in USER_STATE_NAMES),
+        )
+
     # ── Plans cache ──────────────────────────────────────────────────────
 
     async def get_plans(self) -> list[dict[str, Any]] | None:
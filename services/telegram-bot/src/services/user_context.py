@@ -0,0 +1,195 @@
+"""CyberVPN Telegram Bot — Request-scoped user context.
+
+One ``UserContext`` is built per update by the auth middleware and handed to
+handlers as ``data['user_context']``. It loads the user's backend state lazily
+and at most once per update, with Redis memoization across updates, so a
+button tap that re-renders a menu usually costs no backend round-trip at all.
+
+With ``aggregate=True`` a miss on the user's state is served by the backend's
+bot home endpoint, which returns every section in one response; the payload is
+kept with its ETag so a later refresh that changed nothing costs a 304.
+
+Handlers that change what the backend knows about the user (payments, trial
+activation, promo codes, subscription edits) must call ``invalidate()`` so the
+next update sees fresh state.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from src.services.api_client import NotFoundError
+from src.services.cache_service import USER_STATE_NAMES
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from src.services.api_client import CyberVPNAPIClient
+    from src.services.cache_service import CacheService
+
+logger = structlog.get_logger(__name__)
+
+USER_CACHE_TTL = 300  # 5 minutes
+# Entitlements and service state also change outside the bot (web checkout,
+# expiry), so they are memoized for a shorter window than the user profile.
+USER_STATE_CACHE_TTL = 60
+PLANS_CACHE_TTL = 600  # 10 minutes
+# The bot home payload is only used to revalidate with If-None-Match, never
+# served without asking the backend, so it can be kept much longer.
+HOME_CACHE_TTL = 3600
+
+_UNSET: Any = object()
+
+
+class UserContext:
+    """Lazily loaded backend state for the Telegram user behind one update.
+
+    Each accessor checks the per-update memo, then Redis, then the backend,
+    and stores what it fetched in both. Without a cache (tests, ad-hoc calls)
+    values are still memoized for the lifetime of the context.
+
+    Args:
+        telegram_id: Telegram ID of the user the update came from.
+        api_client: CyberVPN API client used on cache misses.
+        cache: Redis cache service for cross-update memoization.
+        user: User data already loaded by the auth middleware, if any.
+        aggregate: Load missing user state through the bot home endpoint.
+    """
+
+    def __init__(
+        self,
+        telegram_id: int,
+        api_client: CyberVPNAPIClient,
+        cache: CacheService | None = None,
+        *,
+        user: dict[str, Any] | None = _UNSET,
+        aggregate: bool = False,
+    ) -> None:
+        self.telegram_id = telegram_id
+        self._api = api_client
+        self._cache = cache
+        self._aggregate = aggregate
+        self._memo: dict[str, Any] = {}
+        if user is not _UNSET:
+            self._memo["user"] = user
+
+    async def user(self) -> dict[str, Any] | None:
+        """Get the user profile, shared with the auth middleware's ``user:<id>`` cache entry.
+
+        Returns:
+            User data dict, or None if the auth middleware could not load one.
+
+        Raises:
+            APIError: If a lazy backend lookup fails.
+        """
+        if "user" in self._memo:
+            return self._memo["user"]
+
+        user = await self._cache.get_user(self.telegram_id) if self._cache is not None else None
+        if user is None:
+            user = await self._api.get_user(self.telegram_id)
+            if user is not None and self._cache is not None:
+                await self._cache.set_user(self.telegram_id, user, ttl=USER_CACHE_TTL)
+
+        self._memo["user"] = user
+        return user
+
+    async def entitlements(self) -> dict[str, Any]:
+        """Get the user's current entitlements snapshot."""
+        return await self._load("entitlements", self._api.get_current_entitlements, ttl=USER_STATE_CACHE_TTL)
+
+    async def service_state(self) -> dict[str, Any]:
+        """Get the user's current service state (provider, delivery channel, purchase context)."""
+        return await self._load("service_state", self._api.get_current_service_state, ttl=USER_STATE_CACHE_TTL)
+
+    async def plans(self) -> list[Any]:
+        """Get the plan catalog shown to Telegram users.
+
+        Plans are shared by all users, so they are cached under a global key.
+        An empty catalog is never cached: the client returns one when the
+        backend is unreachable.
+        """
+        if "plans" in self._memo:
+            return self._memo["plans"]
+
+        plans = await self._cache.get_plans() if self._cache is not None else None
+        if plans is None:
+            plans = await self._api.get_plans()
+            if plans and self._cache is not None:
+                await self._cache.set_plans(plans, ttl=PLANS_CACHE_TTL)
+
+        self._memo["plans"] = plans
+        return plans
+
+    async def invalidate(self) -> None:
+        """Drop the user's memoized state after a change made through the bot."""
+        for name in ("user", *USER_STATE_NAMES):
+            self._memo.pop(name, None)
+        if self._cache is not None:
+            await self._cache.invalidate_user_context(self.telegram_id)
+        logger.debug("user_context_invalidated", telegram_id=self.telegram_id)
+
+    async def _load(
+        self,
+        name: str,
+        fetch: Callable[[int], Awaitable[Any]],
+        *,
+        ttl: int,
+    ) -> Any:
+        if name in self._memo:
+            return self._memo[name]
+
+        value = None
+        if self._cache is not None:
+            value = await self._cache.get_user_state(self.telegram_id, name)
+        if value is None and self._aggregate:
+            await self._load_home()
+            if name in self._memo:
+                return self._memo[name]
+        if value is None:
+            value = await fetch(self.telegram_id)
+            if value is not None and self._cache is not None:
+                await self._cache.set_user_state(self.telegram_id, name, value, ttl=ttl)
+
+        self._memo[name] = value
+        return value
+
+    async def _load_home(self) -> None:
+        """Fetch every section through the bot home endpoint and memoize the ones it returned.
+
+        Sections the backend leaves empty (no customer account yet) and an
+        endpoint the backend does not serve are left to the per-section calls.
+        """
+        cached = await self._cache.get_user_state(self.telegram_id, "home") if self._cache is not None else None
+        try:
+            payload, etag = await self._api.get_bot_home(
+                self.telegram_id,
+                etag=cached.get("etag") if cached else None,
+            )
+        except NotFoundError:
+            logger.debug("user_context_home_unavailable", telegram_id=self.telegram_id)
+            return
+
+        if payload is None and cached:
+            payload = cached["payload"]
+        elif payload is not None and etag and self._cache is not None:
+            await self._cache.set_user_state(
+                self.telegram_id, "home", {"etag": etag, "payload": payload}, ttl=HOME_CACHE_TTL
+            )
+        if payload is None:
+            return
+
+        for name in USER_STATE_NAMES:
+            value = payload.get(name)
+            if value is None:
+                continue
+            self._memo[name] = value
+            if self._cache is not None:
+                await self._cache.set_user_state(self.telegram_id, name, value, ttl=USER_STATE_CACHE_TTL)
+        plans = payload.get("plans")
+        if isinstance(plans, list) and "plans" not in self._memo:
+            self._memo["plans"] = plans
+            if plans and self._cache is not None:
+                await self._cache.set_plans(plans, ttl=PLANS_CACHE_TTL)
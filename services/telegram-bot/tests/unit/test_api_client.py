@@ -323,6 +323,45 @@ class TestTelegramStarsAPIClient:
 
         await client.close()
 
+    async def test_get_bot_home_revalidates_with_etag(self, mock_settings: BotSettings) -> None:
+        client = CyberVPNAPIClient(settings=mock_settings.backend)
+        home = {"user": {"telegram_id": 123456}, "entitlements": {"status": "active"}, "plans": []}
+
+        with respx.mock:
+            route = respx.get("https://api.test.cybervpn.local/telegram/bot/user/123456/home").mock(
+                side_effect=[
+                    httpx.Response(200, json=home, headers={"ETag": '"v1"'}),
+                    httpx.Response(304, headers={"ETag": '"v1"'}),
+                ]
+            )
+
+            assert await client.get_bot_home(123456) == (home, '"v1"')
+            assert await client.get_bot_home(123456, etag='"v1"') == (None, '"v1"')
+            assert "If-None-Match" not in route.calls[0].request.headers
+            assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+        await client.close()
+
+    async def test_get_bot_home_records_circuit_outcomes(self, mock_settings: BotSettings) -> None:
+        client = CyberVPNAPIClient(settings=mock_settings.backend)
+
+        with respx.mock:
+            respx.get("https://api.test.cybervpn.local/telegram/bot/user/123456/home").mock(
+                side_effect=[
+                    httpx.ConnectError("refused"),
+                    httpx.Response(304, headers={"ETag": '"v1"'}),
+                ]
+            )
+
+            with pytest.raises(ServerError):
+                await client.get_bot_home(123456)
+            assert client._circuit._failure_count == 1
+
+            assert await client.get_bot_home(123456, etag='"v1"') == (None, '"v1"')
+            assert client._circuit._failure_count == 0
+
+        await client.close()
+
     async def test_get_user_not_found(self, mock_settings: BotSettings) -> None:
         """Test user not found raises NotFoundError."""
         client = CyberVPNAPIClient(settings=mock_settings.backend)
@@ -7,6 +7,8 @@ from aiogram.types import CallbackQuery, User
 
 from src.handlers.account import show_subscriptions_handler
 from src.handlers.menu import connect_menu_handler
+from src.services.cache_service import CacheService
+from src.services.user_context import UserContext
 
 
 class _I18nStub:
@@ -67,6 +69,22 @@ async def test_connect_menu_handler_uses_entitlements_and_service_state() -> Non
     api_client.get_current_service_state.assert_awaited_once_with(123456)
 
 
+@pytest.mark.asyncio
+async def test_connect_menu_rerender_is_served_from_user_context_cache(fake_redis) -> None:
+    cache = CacheService(redis=fake_redis)
+    api_client = MagicMock()
+    api_client.get_current_entitlements = AsyncMock(return_value={"status": "active", "display_name": "Pro Plan"})
+    api_client.get_current_service_state = AsyncMock(return_value={"provider_name": "remnawave"})
+
+    for _ in range(2):
+        callback = _callback()
+        await connect_menu_handler(callback, _I18nStub(), api_client, UserContext(123456, api_client, cache))
+        assert "Pro Plan" in callback.message.edit_text.await_args.kwargs["text"]
+
+    api_client.get_current_entitlements.assert_awaited_once_with(123456)
+    api_client.get_current_service_state.assert_awaited_once_with(123456)
+
+
 @pytest.mark.asyncio
 async def test_show_subscriptions_handler_uses_canonical_order_history() -> None:
     callback = _callback()
@@ -0,0 +1,173 @@
+"""Unit tests for the request-scoped UserContext."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.types import Message, User
+
+from src.middlewares.auth import AuthMiddleware
+from src.services.api_client import NotFoundError
+from src.services.cache_service import CacheService
+from src.services.user_context import UserContext
+
+if TYPE_CHECKING:
+    import fakeredis.aioredis
+
+
+def _api_client() -> MagicMock:
+    api_client = MagicMock()
+    api_client.get_user = AsyncMock(return_value={"telegram_id": 123456, "username": "api_user"})
+    api_client.get_current_entitlements = AsyncMock(return_value={"status": "active", "plan_code": "plus"})
+    api_client.get_current_service_state = AsyncMock(return_value={"provider_name": "remnawave"})
+    api_client.get_plans = AsyncMock(return_value=[{"uuid": "plan-1", "name": "Plus"}])
+    return api_client
+
+
+@pytest.mark.asyncio
+class TestUserContext:
+    """Test memoization layers of UserContext."""
+
+    async def test_values_are_memoized_per_update(self) -> None:
+        """Without a cache each value is still fetched at most once."""
+        api_client = _api_client()
+        context = UserContext(123456, api_client)
+
+        assert await context.entitlements() == await context.entitlements()
+        assert await context.plans() == await context.plans()
+        await context.user()
+        await context.user()
+
+        api_client.get_current_entitlements.assert_awaited_once_with(123456)
+        api_client.get_plans.assert_awaited_once()
+        api_client.get_user.assert_awaited_once_with(123456)
+
+    async def test_user_preloaded_by_middleware_skips_lookup(self) -> None:
+        """User data handed over by the auth middleware is used as-is, even when missing."""
+        api_client = _api_client()
+
+        assert await UserContext(123456, api_client, user=None).user() is None
+        api_client.get_user.assert_not_awaited()
+
+    async def test_second_update_is_served_from_redis(self, fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+        """A fresh context for the next update reads what the previous one cached."""
+        api_client = _api_client()
+        cache = CacheService(redis=fake_redis)
+
+        first = UserContext(123456, api_client, cache)
+        await first.entitlements()
+        await first.service_state()
+        await first.plans()
+
+        second = UserContext(123456, api_client, cache)
+        assert await second.entitlements() == {"status": "active", "plan_code": "plus"}
+        assert await second.service_state() == {"provider_name": "remnawave"}
+        assert await second.plans() == [{"uuid": "plan-1", "name": "Plus"}]
+
+        api_client.get_current_entitlements.assert_awaited_once()
+        api_client.get_current_service_state.assert_awaited_once()
+        api_client.get_plans.assert_awaited_once()
+        assert await fake_redis.ttl("cybervpn:bot:user:123456:entitlements") <= 60
+
+    async def test_empty_plan_catalog_is_not_cached(self, fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+        """The client returns [] when the backend is down; that must not stick for ten minutes."""
+        api_client = _api_client()
+        api_client.get_plans.return_value = []
+        cache = CacheService(redis=fake_redis)
+
+        assert await UserContext(123456, api_client, cache).plans() == []
+        assert await cache.get_plans() is None
+
+    async def test_invalidate_drops_memo_and_redis(self, fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+        """After invalidate() the next access goes back to the backend."""
+        api_client = _api_client()
+        cache = CacheService(redis=fake_redis)
+        context = UserContext(123456, api_client, cache)
+        await context.user()
+        await context.entitlements()
+        await context.plans()
+
+        await context.invalidate()
+
+        assert await cache.get_user(123456) is None
+        assert await cache.get_user_state(123456, "entitlements") is None
+        # The plan catalog is not user state and survives.
+        assert await cache.get_plans() == [{"uuid": "plan-1", "name": "Plus"}]
+
+        await context.entitlements()
+        assert api_client.get_current_entitlements.await_count == 2
+
+    async def test_aggregate_loads_all_sections_in_one_round_trip(
+        self, fake_redis: fakeredis.aioredis.FakeRedis
+    ) -> None:
+        """A miss on any user-state section fetches the bot home payload once."""
+        api_client = _api_client()
+        api_client.get_bot_home = AsyncMock(
+            return_value=(
+                {
+                    "user": {"telegram_id": 123456},
+                    "entitlements": {"status": "trial"},
+                    "service_state": {"provider_name": "remnawave"},
+                    "subscriptions": [],
+                    "plans": [{"uuid": "plan-2"}],
+                },
+                '"v1"',
+            )
+        )
+        cache = CacheService(redis=fake_redis)
+        context = UserContext(123456, api_client, cache, aggregate=True)
+
+        assert await context.entitlements() == {"status": "trial"}
+        assert await context.service_state() == {"provider_name": "remnawave"}
+        assert await context.plans() == [{"uuid": "plan-2"}]
+
+        api_client.get_bot_home.assert_awaited_once_with(123456, etag=None)
+        api_client.get_current_entitlements.assert_not_awaited()
+        api_client.get_current_service_state.assert_not_awaited()
+        api_client.get_plans.assert_not_awaited()
+        assert await cache.get_user_state(123456, "service_state") == {"provider_name": "remnawave"}
+
+    async def test_aggregate_revalidates_with_etag_after_invalidation(
+        self, fake_redis: fakeredis.aioredis.FakeRedis
+    ) -> None:
+        """A 304 answer reuses the stored payload."""
+        api_client = _api_client()
+        payload = {"user": {"telegram_id": 123456}, "entitlements": {"status": "active"}, "plans": []}
+        api_client.get_bot_home = AsyncMock(side_effect=[(payload, '"v1"'), (None, '"v1"')])
+        cache = CacheService(redis=fake_redis)
+
+        first = UserContext(123456, api_client, cache, aggregate=True)
+        await first.entitlements()
+        await first.invalidate()
+
+        second = UserContext(123456, api_client, cache, aggregate=True)
+        assert await second.entitlements() == {"status": "active"}
+        assert api_client.get_bot_home.await_args_list[1].kwargs == {"etag": '"v1"'}
+
+    async def test_aggregate_falls_back_to_section_calls(self, fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+        """Sections the home endpoint cannot serve are fetched one by one."""
+        api_client = _api_client()
+        api_client.get_bot_home = AsyncMock(side_effect=NotFoundError("Resource not found", status_code=404))
+        context = UserContext(123456, api_client, CacheService(redis=fake_redis), aggregate=True)
+
+        assert await context.entitlements() == {"status": "active", "plan_code": "plus"}
+        api_client.get_current_entitlements.assert_awaited_once_with(123456)
+
+    async def test_auth_middleware_injects_context(self, fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+        """The auth middleware hands its loaded user to the context it injects."""
+        api_client = _api_client()
+        cache = CacheService(redis=fake_redis)
+        middleware = AuthMiddleware(api_client=api_client, cache=cache)
+
+        message = MagicMock(spec=Message)
+        message.from_user = User(id=123456, is_bot=False, first_name="Test")
+        data: dict = {}
+
+        await middleware(AsyncMock(return_value=None), message, data)
+
+        context = data["user_context"]
+        assert isinstance(context, UserContext)
+        assert await context.user() == data["user"]
+        api_client.get_user.assert_awaited_once_with(123456)